@@ -1,7 +1,7 @@
-from rest_framework.pagination import PageNumberPagination
+from core.api_pagination import KeysetOptionalPageNumberPagination
 
 
-class VATPageNumberPagination(PageNumberPagination):
+class VATPageNumberPagination(KeysetOptionalPageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 200
 
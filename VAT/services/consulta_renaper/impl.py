@@ -7,6 +7,7 @@ import requests
 
 from ciudadanos.models import Ciudadano
 from core.models import Sexo
+from core.services.renaper_cache import consultar_renaper_con_cache
 
 logger = logging.getLogger("django")
 
@@ -79,6 +80,7 @@ class APIClient:
             return {
                 "success": False,
                 "error": "No se encontró coincidencia.",
+                "error_type": "no_match",
                 "raw_response": data,
             }
 
@@ -134,7 +136,7 @@ def _safe_int_renaper(value, dni):
 def consultar_datos_renaper(dni, sexo):
     try:
         client = APIClient()
-        response = client.consultar_ciudadano(dni, sexo)
+        response = consultar_renaper_con_cache(dni, sexo, client.consultar_ciudadano)
 
         if not response["success"]:
             return {
@@ -1,11 +1,14 @@
 import json
-from io import BytesIO
 
 from django.utils import timezone
 from django.utils.text import slugify
-from openpyxl import Workbook
-from openpyxl.styles import Font
 
+from core.services.xlsx_export import (
+    DEFAULT_CHUNK_SIZE,
+    XlsxSheet,
+    build_xlsx_bytes,
+    iter_batches,
+)
 from VAT.services.tipo_alumno_service import anotar_tipo_alumno
 
 
@@ -81,41 +84,51 @@ def _resolve_phone(ciudadano, observaciones):
     return _first_non_empty(ciudadano.telefono, observaciones.get("telefono"))
 
 
-def build_comision_curso_nomina_excel(comision, inscripciones):
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = "Nomina"
-    worksheet.freeze_panes = "A2"
-    worksheet.append(NOMINA_HEADERS)
+def _iter_inscripciones_anotadas(inscripciones):
+    """Recorre el queryset por lotes y anota ``tipo_alumno`` con una query por lote."""
+    if hasattr(inscripciones, "iterator"):
+        inscripciones = inscripciones.iterator(chunk_size=DEFAULT_CHUNK_SIZE)
+    for lote in iter_batches(inscripciones, DEFAULT_CHUNK_SIZE):
+        yield from anotar_tipo_alumno(lote)
 
-    for cell in worksheet[1]:
-        cell.font = Font(bold=True)
 
-    for inscripcion in anotar_tipo_alumno(list(inscripciones)):
+def _nomina_rows(comision, inscripciones):
+    comision_label = str(comision)
+    curso_nombre = comision.curso.nombre
+    centro_nombre = comision.curso.centro.nombre
+    for inscripcion in _iter_inscripciones_anotadas(inscripciones):
         ciudadano = inscripcion.ciudadano
         observaciones = _parse_observaciones_json(inscripcion)
-        worksheet.append(
-            [
-                ciudadano.apellido or "",
-                ciudadano.nombre or "",
-                _resolve_document(ciudadano, observaciones),
-                _format_date(ciudadano.fecha_nacimiento),
-                ciudadano.sexo.sexo if ciudadano.sexo_id and ciudadano.sexo else "",
-                inscripcion.tipo_alumno,
-                str(comision),
-                comision.curso.nombre,
-                comision.curso.centro.nombre,
-                inscripcion.get_estado_display(),
-                _format_datetime(inscripcion.fecha_inscripcion),
-                inscripcion.get_origen_canal_display(),
-                ciudadano.email or "",
-                _resolve_phone(ciudadano, observaciones),
-            ]
-        )
-
-    output = BytesIO()
-    workbook.save(output)
-    return output.getvalue()
+        yield [
+            ciudadano.apellido or "",
+            ciudadano.nombre or "",
+            _resolve_document(ciudadano, observaciones),
+            _format_date(ciudadano.fecha_nacimiento),
+            ciudadano.sexo.sexo if ciudadano.sexo_id and ciudadano.sexo else "",
+            inscripcion.tipo_alumno,
+            comision_label,
+            curso_nombre,
+            centro_nombre,
+            inscripcion.get_estado_display(),
+            _format_datetime(inscripcion.fecha_inscripcion),
+            inscripcion.get_origen_canal_display(),
+            ciudadano.email or "",
+            _resolve_phone(ciudadano, observaciones),
+        ]
+
+
+def build_comision_curso_nomina_excel(comision, inscripciones):
+    return build_xlsx_bytes(
+        [
+            XlsxSheet(
+                title="Nomina",
+                headers=NOMINA_HEADERS,
+                rows=_nomina_rows(comision, inscripciones),
+                bold_headers=True,
+                freeze_headers=True,
+            )
+        ]
+    )
 
 
 def build_nomina_filename(prefix, comision):
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import csv
-from io import BytesIO
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -9,9 +8,8 @@ from django.core.cache import cache
 from django.db.models import Count, F, Q, Value
 from django.db.models.functions import Coalesce, TruncMonth
 from django.http import HttpResponse
-from openpyxl import Workbook
-from openpyxl.styles import Font
 
+from core.services.xlsx_export import DEFAULT_CHUNK_SIZE, XlsxSheet, xlsx_response
 from VAT.models import Centro, Comision, ComisionCurso, Curso, Inscripcion
 from VAT.services.access_scope import filter_centros_queryset_for_user
 from VAT.services.tipo_alumno_service import (
@@ -554,28 +552,59 @@ def export_detalle_to_csv(user, filtros: ReporteFiltros) -> HttpResponse:
 
 
 def export_detalle_to_excel(user, filtros: ReporteFiltros) -> HttpResponse:
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = "Detalle inscripciones"
-    worksheet.freeze_panes = "A2"
-    worksheet.append(DETALLE_HEADERS)
-    for cell in worksheet[1]:
-        cell.font = Font(bold=True)
-
     estado_labels = dict(Inscripcion.ESTADO_INSCRIPCION_CHOICES)
-    for row in _detalle_export_queryset(user, filtros).iterator():
-        worksheet.append(_detalle_row_cells(row, estado_labels))
-
-    output = BytesIO()
-    workbook.save(output)
-    response = HttpResponse(
-        output.getvalue(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    rows = _detalle_export_queryset(user, filtros).iterator(
+        chunk_size=DEFAULT_CHUNK_SIZE
     )
-    response["Content-Disposition"] = (
-        "attachment; filename=vat_reporte_detalle_inscripciones.xlsx"
+    return xlsx_response(
+        "vat_reporte_detalle_inscripciones.xlsx",
+        [
+            XlsxSheet(
+                title="Detalle inscripciones",
+                headers=DETALLE_HEADERS,
+                rows=(_detalle_row_cells(row, estado_labels) for row in rows),
+                bold_headers=True,
+                freeze_headers=True,
+            )
+        ],
     )
-    return response
+
+
+REPORTE_HEADERS = [
+    "Agrupador",
+    "Inscriptos totales",
+    "Preinscriptos",
+    "En espera",
+    "Inscriptos",
+    "Validados presencial",
+    "Completados",
+    "Abandonados",
+    "Registros asistencia",
+    "Presentes",
+    "Ausentes",
+    "% Asistencia",
+    "Sesiones programadas",
+    "Sesiones realizadas",
+]
+
+
+def _reporte_row_cells(row):
+    return [
+        row.get("grupo") or "",
+        row.get("inscripciones_total") or 0,
+        row.get("preinscriptos") or 0,
+        row.get("en_espera") or 0,
+        row.get("inscriptos") or 0,
+        row.get("validados_presencial") or 0,
+        row.get("completados") or 0,
+        row.get("abandonados") or 0,
+        row.get("registros_asistencia") or 0,
+        row.get("presentes") or 0,
+        row.get("ausentes") or 0,
+        row.get("porcentaje_asistencia") or 0,
+        row.get("sesiones_programadas") or 0,
+        row.get("sesiones_realizadas") or 0,
+    ]
 
 
 def export_rows_to_csv(rows, group_by: str) -> HttpResponse:
@@ -585,102 +614,23 @@ def export_rows_to_csv(rows, group_by: str) -> HttpResponse:
     )
 
     writer = csv.writer(response)
-    writer.writerow(
-        [
-            "Agrupador",
-            "Inscriptos totales",
-            "Preinscriptos",
-            "En espera",
-            "Inscriptos",
-            "Validados presencial",
-            "Completados",
-            "Abandonados",
-            "Registros asistencia",
-            "Presentes",
-            "Ausentes",
-            "% Asistencia",
-            "Sesiones programadas",
-            "Sesiones realizadas",
-        ]
-    )
-
+    writer.writerow(REPORTE_HEADERS)
     for row in rows:
-        writer.writerow(
-            [
-                row.get("grupo") or "",
-                row.get("inscripciones_total") or 0,
-                row.get("preinscriptos") or 0,
-                row.get("en_espera") or 0,
-                row.get("inscriptos") or 0,
-                row.get("validados_presencial") or 0,
-                row.get("completados") or 0,
-                row.get("abandonados") or 0,
-                row.get("registros_asistencia") or 0,
-                row.get("presentes") or 0,
-                row.get("ausentes") or 0,
-                row.get("porcentaje_asistencia") or 0,
-                row.get("sesiones_programadas") or 0,
-                row.get("sesiones_realizadas") or 0,
-            ]
-        )
+        writer.writerow(_reporte_row_cells(row))
 
     return response
 
 
 def export_rows_to_excel(rows) -> HttpResponse:
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = "Reporte VAT"
-    worksheet.freeze_panes = "A2"
-
-    headers = [
-        "Agrupador",
-        "Inscriptos totales",
-        "Preinscriptos",
-        "En espera",
-        "Inscriptos",
-        "Validados presencial",
-        "Completados",
-        "Abandonados",
-        "Registros asistencia",
-        "Presentes",
-        "Ausentes",
-        "% Asistencia",
-        "Sesiones programadas",
-        "Sesiones realizadas",
-    ]
-    worksheet.append(headers)
-    for cell in worksheet[1]:
-        cell.font = Font(bold=True)
-
-    for row in rows:
-        worksheet.append(
-            [
-                row.get("grupo") or "",
-                row.get("inscripciones_total") or 0,
-                row.get("preinscriptos") or 0,
-                row.get("en_espera") or 0,
-                row.get("inscriptos") or 0,
-                row.get("validados_presencial") or 0,
-                row.get("completados") or 0,
-                row.get("abandonados") or 0,
-                row.get("registros_asistencia") or 0,
-                row.get("presentes") or 0,
-                row.get("ausentes") or 0,
-                row.get("porcentaje_asistencia") or 0,
-                row.get("sesiones_programadas") or 0,
-                row.get("sesiones_realizadas") or 0,
-            ]
-        )
-
-    output = BytesIO()
-    workbook.save(output)
-
-    response = HttpResponse(
-        output.getvalue(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
-    response["Content-Disposition"] = (
-        "attachment; filename=vat_reporte_inscripciones_asistencias.xlsx"
+    return xlsx_response(
+        "vat_reporte_inscripciones_asistencias.xlsx",
+        [
+            XlsxSheet(
+                title="Reporte VAT",
+                headers=REPORTE_HEADERS,
+                rows=(_reporte_row_cells(row) for row in rows),
+                bold_headers=True,
+                freeze_headers=True,
+            )
+        ],
     )
-    return response
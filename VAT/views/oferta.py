@@ -12,6 +12,7 @@ from django.contrib import messages
 from django.db.models import Q
 from django.http import HttpResponseRedirect
 
+from ciudadanos.services_busqueda import filtro_nombre_ciudadano
 from VAT.models import InscripcionOferta
 from VAT.forms import InscripcionOfertaForm
 from VAT.services.inscripcion_service import InscripcionService
@@ -40,8 +41,7 @@ class InscripcionOfertaListView(LoginRequiredMixin, ListView):
             queryset = queryset.filter(estado=estado)
         if buscar:
             queryset = queryset.filter(
-                Q(ciudadano__nombre__icontains=buscar)
-                | Q(ciudadano__apellido__icontains=buscar)
+                filtro_nombre_ciudadano(buscar, relacion="ciudadano")
                 | Q(ciudadano__documento__icontains=buscar)
             )
 
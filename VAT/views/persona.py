@@ -17,6 +17,7 @@ from django.views.generic import (
 )
 
 from ciudadanos.models import Ciudadano
+from ciudadanos.services_busqueda import filtro_nombre_ciudadano
 from core.soft_delete.view_helpers import SoftDeleteDeleteViewMixin
 from VAT.forms import InscripcionForm, CiudadanoInscripcionRapidaForm
 from VAT.models import Comision, Inscripcion
@@ -54,8 +55,7 @@ class InscripcionListView(LoginRequiredMixin, ListView):
             queryset = queryset.filter(estado=estado)
         if buscar:
             queryset = queryset.filter(
-                Q(ciudadano__apellido__icontains=buscar)
-                | Q(ciudadano__nombre__icontains=buscar)
+                filtro_nombre_ciudadano(buscar, relacion="ciudadano")
                 | Q(comision__codigo_comision__icontains=buscar)
                 | Q(comision_curso__codigo_comision__icontains=buscar)
             )
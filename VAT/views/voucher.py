@@ -8,6 +8,7 @@ from django.urls import reverse_lazy, reverse
 from django.db.models import Q
 
 from ciudadanos.models import Ciudadano
+from ciudadanos.services_busqueda import filtro_nombre_ciudadano
 from VAT.models import Voucher, VoucherRecarga
 from VAT.forms import VoucherForm, VoucherRecargaForm, VoucherAsignacionMasivaForm
 from VAT.services.voucher_service.impl import VoucherService
@@ -34,8 +35,7 @@ class VoucherListView(LoginRequiredMixin, ListView):
             qs = qs.filter(programa_id=programa)
         if buscar:
             qs = qs.filter(
-                Q(ciudadano__nombre__icontains=buscar)
-                | Q(ciudadano__apellido__icontains=buscar)
+                filtro_nombre_ciudadano(buscar, relacion="ciudadano")
                 | Q(ciudadano__documento__icontains=buscar)
             )
         return qs
@@ -10,6 +10,7 @@ from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 
 from ciudadanos.models import Ciudadano
+from ciudadanos.services_busqueda import filtro_nombre_ciudadano
 from VAT.models import VoucherParametria, Voucher
 from VAT.forms import VoucherParametriaForm
 from VAT.services.voucher_service.impl import VoucherService
@@ -157,9 +158,7 @@ class VoucherParametriaDetailView(LoginRequiredMixin, DetailView):
         search_query = (self.request.GET.get("busqueda") or "").strip()
         vouchers_qs = qs.order_by("-fecha_asignacion", "-id")
         if search_query:
-            search_filter = Q(ciudadano__nombre__icontains=search_query) | Q(
-                ciudadano__apellido__icontains=search_query
-            )
+            search_filter = filtro_nombre_ciudadano(search_query, relacion="ciudadano")
             if search_query.isdigit():
                 search_filter |= Q(ciudadano__documento=int(search_query))
             vouchers_qs = vouchers_qs.filter(search_filter)
@@ -8,6 +8,7 @@ from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
+from core.field_tracking import FieldTrackingMixin
 from core.soft_delete import SoftDeleteModelMixin
 
 
@@ -33,7 +34,7 @@ class TipoConvenio(models.Model):
         verbose_name_plural = "tiposconvenios"
 
 
-class Admision(models.Model):
+class Admision(FieldTrackingMixin, models.Model):
     RESPUESTA_SI_NO = [
         ("si", "Sí"),
         ("no", "No"),
@@ -11,12 +11,7 @@ from config.middlewares.threadlocals import get_current_user
 
 @receiver(pre_save, sender=Admision)
 def guardar_historial_admision(sender, instance, **kwargs):
-    if not instance.pk:
-        return
-
-    try:
-        previo = Admision.objects.get(pk=instance.pk)
-    except Admision.DoesNotExist:
+    if not instance.pk or not instance.has_previous_state():
         return
 
     usuario = get_current_user()
@@ -35,14 +30,17 @@ def guardar_historial_admision(sender, instance, **kwargs):
         "complementario_solicitado",
     ]
 
-    for campo in campos_a_trackear:
-        valor_anterior = getattr(previo, campo)
+    # Estado previo desde FieldTrackingMixin: sin releer la fila.
+    for campo in instance.changed_fields(campos_a_trackear):
+        valor_anterior = instance.previous_value(campo)
         valor_nuevo = getattr(instance, campo)
 
         field = sender._meta.get_field(campo)
         if field.choices:
             if valor_anterior is not None:
-                valor_anterior = getattr(previo, f"get_{campo}_display")()
+                valor_anterior = dict(field.flatchoices).get(
+                    valor_anterior, valor_anterior
+                )
             if valor_nuevo is not None:
                 valor_nuevo = getattr(instance, f"get_{campo}_display")()
 
@@ -57,27 +55,6 @@ def guardar_historial_admision(sender, instance, **kwargs):
             )
 
 
-@receiver(pre_save, sender=Admision)
-def cache_estado_admision(sender, instance, **kwargs):
-    if not instance.pk:
-        return
-    prev_data = (
-        Admision.objects.filter(pk=instance.pk)
-        .values("estado_admision", "estado_legales", "enviado_legales")
-        .first()
-    )
-    if prev_data:
-        instance._prev_estado_admision = prev_data[  # pylint: disable=protected-access
-            "estado_admision"
-        ]
-        instance._prev_estado_legales = prev_data[  # pylint: disable=protected-access
-            "estado_legales"
-        ]
-        instance._prev_enviado_legales = prev_data[  # pylint: disable=protected-access
-            "enviado_legales"
-        ]
-
-
 @receiver(post_save, sender=Admision)
 def guardar_historial_estado_admision(sender, instance, created, **kwargs):
     if created:
@@ -97,8 +74,9 @@ def guardar_historial_estado_admision(sender, instance, created, **kwargs):
 
     usuario = get_current_user()
 
+    # Estado previo desde FieldTrackingMixin (sin releer la fila en pre_save).
     # Trackear cambios en estado_admision (solo si no está enviado a legales)
-    estado_anterior = getattr(instance, "_prev_estado_admision", None)
+    estado_anterior = instance.previous_value("estado_admision")
     if estado_anterior != instance.estado_admision and not instance.enviado_legales:
 
         def _crear_historial_admision():
@@ -121,7 +99,7 @@ def guardar_historial_estado_admision(sender, instance, created, **kwargs):
         transaction.on_commit(_crear_historial_admision)
 
     # Trackear cambios en estado_legales
-    estado_legales_anterior = getattr(instance, "_prev_estado_legales", None)
+    estado_legales_anterior = instance.previous_value("estado_legales")
     if estado_legales_anterior != instance.estado_legales:
 
         def _crear_historial_legales():
@@ -150,7 +128,7 @@ def guardar_historial_estado_admision(sender, instance, created, **kwargs):
         transaction.on_commit(_crear_historial_legales)
 
     # Caso especial: cuando se envía a legales por primera vez
-    enviado_legales_anterior = getattr(instance, "_prev_enviado_legales", False)
+    enviado_legales_anterior = instance.previous_value("enviado_legales", False)
     if not enviado_legales_anterior and instance.enviado_legales:
 
         def _crear_historial_envio_legales():
@@ -0,0 +1,87 @@
+"""
+Índices para el listado global y las exportaciones de auditoría.
+
+El listado filtra por ``content_type_id IN (...)`` y rango de ``timestamp`` y
+ordena por ``(-timestamp, -id)``; la paginación keyset busca desde el último
+``(timestamp, id)``. Como en 0001, los índices se crean sólo en MySQL sobre la
+tabla de django-auditlog.
+"""
+
+from django.db import migrations
+
+AUDITLOG_TABLE = "auditlog_logentry"
+INDEX_DEFINITIONS = (
+    (
+        "atl_le_ts_id_idx",
+        "CREATE INDEX atl_le_ts_id_idx ON auditlog_logentry (timestamp, id)",
+    ),
+    (
+        "atl_le_ct_ts_id_idx",
+        "CREATE INDEX atl_le_ct_ts_id_idx "
+        "ON auditlog_logentry (content_type_id, timestamp, id)",
+    ),
+)
+
+
+def _is_mysql(schema_editor):
+    return getattr(schema_editor.connection, "vendor", "") == "mysql"
+
+
+def _table_exists(schema_editor, table_name):
+    with schema_editor.connection.cursor() as cursor:
+        existing_tables = schema_editor.connection.introspection.table_names(cursor)
+    return table_name in existing_tables
+
+
+def _index_exists(schema_editor, index_name):
+    db_name = schema_editor.connection.settings_dict.get("NAME")
+    if not db_name:
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1
+            FROM information_schema.statistics
+            WHERE table_schema = %s
+              AND table_name = %s
+              AND index_name = %s
+            LIMIT 1
+            """,
+            [db_name, AUDITLOG_TABLE, index_name],
+        )
+        return cursor.fetchone() is not None
+
+
+def add_keyset_indexes(apps, schema_editor):
+    if not _is_mysql(schema_editor):
+        return
+    if not _table_exists(schema_editor, AUDITLOG_TABLE):
+        return
+
+    for index_name, sql in INDEX_DEFINITIONS:
+        if not _index_exists(schema_editor, index_name):
+            schema_editor.execute(sql)
+
+
+def remove_keyset_indexes(apps, schema_editor):
+    if not _is_mysql(schema_editor):
+        return
+    if not _table_exists(schema_editor, AUDITLOG_TABLE):
+        return
+
+    for index_name, _sql in INDEX_DEFINITIONS:
+        if _index_exists(schema_editor, index_name):
+            schema_editor.execute(f"DROP INDEX {index_name} ON {AUDITLOG_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("audittrail", "0001_squashed_0003"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_keyset_indexes, remove_keyset_indexes),
+    ]
@@ -2,8 +2,11 @@
 
 from .impl import (
     BULK_METADATA_KEYS,
+    EXPORT_CHUNK_SIZE,
+    EXPORT_JSON_MAX_ROWS,
     EXPORT_MAX_ROWS,
     GROUPING_WINDOW_SECONDS,
+    LIST_ORDERING,
     SYSTEM_ACTOR_LABEL,
     _build_mysql_boolean_fulltext_query,
     apply_batch_key_filter,
@@ -27,6 +30,7 @@ from .impl import (
     get_entry_source,
     get_instance_queryset,
     get_keyword_terms,
+    get_tracked_content_type_ids,
     get_tracked_content_type_or_404,
     should_group_entries,
     source_label,
@@ -35,8 +39,11 @@ from .impl import (
 
 __all__ = [
     "BULK_METADATA_KEYS",
+    "EXPORT_CHUNK_SIZE",
+    "EXPORT_JSON_MAX_ROWS",
     "EXPORT_MAX_ROWS",
     "GROUPING_WINDOW_SECONDS",
+    "LIST_ORDERING",
     "SYSTEM_ACTOR_LABEL",
     "_build_mysql_boolean_fulltext_query",
     "apply_batch_key_filter",
@@ -60,6 +67,7 @@ __all__ = [
     "get_entry_source",
     "get_instance_queryset",
     "get_keyword_terms",
+    "get_tracked_content_type_ids",
     "get_tracked_content_type_or_404",
     "should_group_entries",
     "source_label",
@@ -1,24 +1,30 @@
 """Servicios de consulta y presentación para vistas de audittrail."""
 
 from collections import Counter
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 import json
 import re
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import connections
 from django.db.models import Q
 from django.db.models.expressions import RawSQL
 from django.http import Http404
+from django.utils import timezone
 
 from auditlog.models import LogEntry
-from audittrail.constants import get_tracked_models, is_tracked_model
+from audittrail.constants import get_tracked_model_definitions, is_tracked_model
 from audittrail.forms import MAX_EXPORT_RANGE_DAYS
 
 
 GROUPING_WINDOW_SECONDS = 2
 SYSTEM_ACTOR_LABEL = "Sistema/Proceso"
-EXPORT_MAX_ROWS = 5000
+# CSV y XLSX se escriben por bloques; JSON se arma completo en memoria.
+EXPORT_MAX_ROWS = getattr(settings, "AUDITTRAIL_EXPORT_MAX_ROWS", 500000)
+EXPORT_JSON_MAX_ROWS = 5000
+EXPORT_CHUNK_SIZE = 2000
+LIST_ORDERING = ("-timestamp", "-id")
 BULK_METADATA_KEYS = (
     "audittrail_batch_key",
     "batch_id",
@@ -43,21 +49,32 @@ def get_base_queryset():
     return apply_tracked_models_allowlist(qs)
 
 
+def get_tracked_content_type_ids() -> frozenset[int]:
+    """
+    Ids de ContentType de los modelos auditables.
+
+    Usa el cache de ``ContentTypeManager``: una sola consulta por proceso.
+    """
+    models = [definition.get_model() for definition in get_tracked_model_definitions()]
+    if not models:
+        return frozenset()
+    content_types = ContentType.objects.get_for_models(
+        *models, for_concrete_models=False
+    )
+    return frozenset(content_type.pk for content_type in content_types.values())
+
+
 def apply_tracked_models_allowlist(qs):
     """
     Restringe consultas a modelos auditables definidos en la fuente única.
+
+    Filtra por ``content_type_id IN (...)`` sin join a ``django_content_type``,
+    lo que permite usar los índices que empiezan por ``content_type_id``.
     """
-    allowed_models = get_tracked_models()
-    if not allowed_models:
+    content_type_ids = get_tracked_content_type_ids()
+    if not content_type_ids:
         return qs.none()
-
-    allowlist_query = Q()
-    for app_label, model_name, _label in allowed_models:
-        allowlist_query |= Q(
-            content_type__app_label=app_label,
-            content_type__model=model_name,
-        )
-    return qs.filter(allowlist_query)
+    return qs.filter(content_type_id__in=sorted(content_type_ids))
 
 
 def get_instance_queryset(*, app_label: str, model_name: str, object_pk):
@@ -80,13 +97,11 @@ def get_tracked_content_type_or_404(*, app_label: str, model_name: str):
     if not is_tracked_model(app_label, model_name):
         raise Http404("Modelo no auditable")
 
-    content_type = ContentType.objects.filter(
-        app_label=app_label,
-        model=model_name,
-    ).first()
-    if content_type is None:
-        raise Http404("Modelo no encontrado")
-    return content_type
+    try:
+        # Cacheado por ContentTypeManager.
+        return ContentType.objects.get_by_natural_key(app_label, model_name)
+    except ContentType.DoesNotExist as exc:
+        raise Http404("Modelo no encontrado") from exc
 
 
 def get_keyword_terms(keyword: str | None):
@@ -404,19 +419,28 @@ def apply_filters(qs, cleaned_data: dict):
     if action not in (None, ""):
         qs = qs.filter(action=action)
 
+    # Rangos sobre la columna (sin ``__date``) para que usen los índices
+    # ``(..., timestamp, id)``.
     start_date = data.get("start_date")
     if start_date:
-        qs = qs.filter(timestamp__date__gte=start_date)
+        qs = qs.filter(timestamp__gte=_start_of_day(start_date))
 
     end_date = data.get("end_date")
     if end_date:
         # incluir el día completo
-        qs = qs.filter(timestamp__lt=end_date + timedelta(days=1))
+        qs = qs.filter(timestamp__lt=_start_of_day(end_date + timedelta(days=1)))
 
     qs = apply_optimized_keyword_filter(qs, data.get("keyword"))
     return qs
 
 
+def _start_of_day(day):
+    value = datetime.combine(day, time.min)
+    if settings.USE_TZ:
+        value = timezone.make_aware(value)
+    return value
+
+
 def apply_keyword_filter(qs, keyword: str | None):
     """
     Filtro AND por palabras en `changes`.
@@ -6,7 +6,7 @@ organizaciones.
 import json
 
 from django.db import OperationalError, ProgrammingError, transaction
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from auditlog.models import LogEntry
@@ -23,7 +23,7 @@ from audittrail.models import AuditEntryMeta
 from config.middlewares.threadlocals import get_current_user
 from core.soft_delete.signals import post_soft_delete
 from intervenciones.models.intervenciones import Intervencion
-from organizaciones.models import Aval, Firmante, Organizacion
+from organizaciones.models import Aval, Firmante, Organizacion, RolFirmante
 from relevamientos.models import Relevamiento
 
 
@@ -455,19 +455,6 @@ def log_relevamiento_creation(sender, instance: Relevamiento, created: bool, **k
 REFERENTE_FIELDS = ["nombre", "apellido", "mail", "celular", "documento", "funcion"]
 
 
-@receiver(pre_save, sender=Referente)
-def cache_referente_state(sender, instance: Referente, **kwargs):
-    """
-    Guarda el estado previo del referente para detectar cambios.
-    """
-    if not instance.pk:
-        return
-    try:
-        instance._previous_state = sender.objects.get(pk=instance.pk)  # type: ignore[attr-defined]  # pylint: disable=protected-access
-    except sender.DoesNotExist:
-        instance._previous_state = None  # type: ignore[attr-defined]  # pylint: disable=protected-access
-
-
 @receiver(post_save, sender=Referente)
 def log_referente_update(sender, instance: Referente, created: bool, **kwargs):
     """
@@ -476,24 +463,16 @@ def log_referente_update(sender, instance: Referente, created: bool, **kwargs):
     if created:
         return
 
-    previous = getattr(
-        instance, "_previous_state", None
-    )  # pylint: disable=protected-access
+    # Estado previo desde FieldTrackingMixin (la foto se renueva tras el save).
     changes = {}
-
-    if previous:
-        for field_name in REFERENTE_FIELDS:
-            old = getattr(previous, field_name, None)
-            new = getattr(instance, field_name, None)
-            if old != new:
-                verbose = sender._meta.get_field(
-                    field_name
-                ).verbose_name  # pylint: disable=protected-access
-                changes[f"Referente: {verbose}"] = [old, new]
-
-    # Limpiar referencia al estado previo para evitar fugas
-    if hasattr(instance, "_previous_state"):  # pylint: disable=protected-access
-        delattr(instance, "_previous_state")  # pylint: disable=protected-access
+    for field_name in instance.changed_fields(REFERENTE_FIELDS):
+        verbose = sender._meta.get_field(
+            field_name
+        ).verbose_name  # pylint: disable=protected-access
+        changes[f"Referente: {verbose}"] = [
+            instance.previous_value(field_name),
+            getattr(instance, field_name, None),
+        ]
 
     if not changes:
         return
@@ -502,25 +481,6 @@ def log_referente_update(sender, instance: Referente, created: bool, **kwargs):
         _log_comedor_event(comedor, changes, LogEntry.Action.UPDATE)
 
 
-@receiver(pre_save, sender=ImagenComedor)
-def cache_imagen_comedor_state(sender, instance: ImagenComedor, **kwargs):
-    """
-    Almacena el estado previo de la imagen para comparar cambios.
-    """
-    if not instance.pk:
-        return
-    try:
-        previous = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
-        previous = None
-
-    if previous:
-        instance._previous_imagen = {  # type: ignore[attr-defined]  # pylint: disable=protected-access
-            "imagen": previous.imagen.name if previous.imagen else "",
-            "comedor_id": previous.comedor_id,
-        }
-
-
 @receiver(post_save, sender=ImagenComedor)
 def log_imagen_comedor_change(sender, instance: ImagenComedor, created: bool, **kwargs):
     """
@@ -536,25 +496,18 @@ def log_imagen_comedor_change(sender, instance: ImagenComedor, created: bool, **
         )
         return
 
-    previous = getattr(
-        instance, "_previous_imagen", None
-    )  # pylint: disable=protected-access
     changes = {}
-
-    if previous:
-        if previous.get("imagen") != imagen_nombre:
-            changes["Imagen"] = [
-                previous.get("imagen") or "Sin imagen",
-                imagen_nombre or "Sin imagen",
-            ]
-        if previous.get("comedor_id") != instance.comedor_id:
-            changes["Imagen: Comedor"] = [
-                previous.get("comedor_id"),
-                instance.comedor_id,
-            ]
-
-    if hasattr(instance, "_previous_imagen"):  # pylint: disable=protected-access
-        delattr(instance, "_previous_imagen")  # pylint: disable=protected-access
+    changed = instance.changed_fields(["imagen", "comedor"])
+    if "imagen" in changed:
+        changes["Imagen"] = [
+            instance.previous_value("imagen") or "Sin imagen",
+            imagen_nombre or "Sin imagen",
+        ]
+    if "comedor" in changed:
+        changes["Imagen: Comedor"] = [
+            instance.previous_value("comedor"),
+            instance.comedor_id,
+        ]
 
     if changes:
         _log_comedor_event(instance.comedor, changes, LogEntry.Action.UPDATE)
@@ -573,23 +526,6 @@ def log_imagen_comedor_deletion(sender, instance: ImagenComedor, **kwargs):
     )
 
 
-@receiver(pre_save, sender=Firmante)
-def cache_firmante_state(sender, instance: Firmante, **kwargs):
-    """
-    Guarda el estado previo del firmante para detectar cambios.
-    """
-    if not instance.pk:
-        return
-    try:
-        instance._previous_state = sender.objects.select_related(  # type: ignore[attr-defined]  # pylint: disable=protected-access
-            "rol", "organizacion"
-        ).get(
-            pk=instance.pk
-        )
-    except sender.DoesNotExist:
-        instance._previous_state = None  # type: ignore[attr-defined]  # pylint: disable=protected-access
-
-
 @receiver(post_save, sender=Firmante)
 def log_firmante_changes(sender, instance: Firmante, created: bool, **kwargs):
     """
@@ -607,46 +543,29 @@ def log_firmante_changes(sender, instance: Firmante, created: bool, **kwargs):
         )
         return
 
-    previous = getattr(
-        instance, "_previous_state", None
-    )  # pylint: disable=protected-access
     changes = {}
-
-    if previous:
-        if previous.nombre != instance.nombre:
-            changes["Firmante: Nombre"] = [previous.nombre, instance.nombre]
-        if previous.cuit != instance.cuit:
-            changes["Firmante: CUIT"] = [previous.cuit, instance.cuit]
-        if previous.rol_id != instance.rol_id:
-            changes["Firmante: Rol"] = [
-                str(previous.rol) if previous.rol else None,
-                str(instance.rol) if instance.rol else None,
-            ]
-
-    if hasattr(instance, "_previous_state"):  # pylint: disable=protected-access
-        delattr(instance, "_previous_state")  # pylint: disable=protected-access
+    changed = instance.changed_fields(["nombre", "cuit", "rol"])
+    if "nombre" in changed:
+        changes["Firmante: Nombre"] = [
+            instance.previous_value("nombre"),
+            instance.nombre,
+        ]
+    if "cuit" in changed:
+        changes["Firmante: CUIT"] = [instance.previous_value("cuit"), instance.cuit]
+    if "rol" in changed:
+        # El rol previo solo se lee cuando cambio (antes: select_related siempre).
+        previous_rol = RolFirmante.objects.filter(
+            pk=instance.previous_value("rol")
+        ).first()
+        changes["Firmante: Rol"] = [
+            str(previous_rol) if previous_rol else None,
+            str(instance.rol) if instance.rol else None,
+        ]
 
     if changes:
         _log_organizacion_event(instance.organizacion, changes, LogEntry.Action.UPDATE)
 
 
-@receiver(pre_save, sender=Aval)
-def cache_aval_state(sender, instance: Aval, **kwargs):
-    """
-    Guarda el estado previo del aval para detectar cambios.
-    """
-    if not instance.pk:
-        return
-    try:
-        instance._previous_state = sender.objects.select_related(  # type: ignore[attr-defined]  # pylint: disable=protected-access
-            "organizacion"
-        ).get(
-            pk=instance.pk
-        )
-    except sender.DoesNotExist:
-        instance._previous_state = None  # type: ignore[attr-defined]  # pylint: disable=protected-access
-
-
 @receiver(post_save, sender=Aval)
 def log_aval_changes(sender, instance: Aval, created: bool, **kwargs):
     """
@@ -663,19 +582,12 @@ def log_aval_changes(sender, instance: Aval, created: bool, **kwargs):
         )
         return
 
-    previous = getattr(
-        instance, "_previous_state", None
-    )  # pylint: disable=protected-access
     changes = {}
-
-    if previous:
-        if previous.nombre != instance.nombre:
-            changes["Aval: Nombre"] = [previous.nombre, instance.nombre]
-        if previous.cuit != instance.cuit:
-            changes["Aval: CUIT"] = [previous.cuit, instance.cuit]
-
-    if hasattr(instance, "_previous_state"):  # pylint: disable=protected-access
-        delattr(instance, "_previous_state")  # pylint: disable=protected-access
+    changed = instance.changed_fields(["nombre", "cuit"])
+    if "nombre" in changed:
+        changes["Aval: Nombre"] = [instance.previous_value("nombre"), instance.nombre]
+    if "cuit" in changed:
+        changes["Aval: CUIT"] = [instance.previous_value("cuit"), instance.cuit]
 
     if changes:
         _log_organizacion_event(instance.organizacion, changes, LogEntry.Action.UPDATE)
@@ -1,4 +1,5 @@
 import csv
+import itertools
 import json
 import logging
 import re
@@ -6,7 +7,7 @@ import re
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.db import models
-from django.http import HttpResponse, JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.http import url_has_allowed_host_and_scheme
@@ -17,9 +18,36 @@ from auditlog.models import LogEntry
 from audittrail.constants import TRACKED_MODELS, tracked_model_choices
 from audittrail.forms import AuditLogFilterForm
 from audittrail.services import query_service
+from core.pagination import KEYSET_CURSOR_PARAM, NoCountPaginator, iter_keyset
+from core.services.xlsx_export import XlsxSheet, xlsx_response
 
 
 AUDITTRAIL_ACCESS_LOGGER = logging.getLogger("audittrail.access")
+EXPORT_FORMATS = {"csv", "json", "xlsx"}
+EXPORT_COLUMNS = (
+    "event_id",
+    "timestamp",
+    "action",
+    "app_label",
+    "model",
+    "object_pk",
+    "user",
+    "user_detail",
+    "source",
+    "batch_key",
+    "remote_addr",
+    "changes",
+    "changes_resolved",
+)
+# Tope de FKs resueltas que se guardan durante una exportación larga.
+EXPORT_FK_CACHE_MAX = 10000
+
+
+class _Echo:
+    """Pseudo-buffer para que csv.writer devuelva cada línea en vez de acumularla."""
+
+    def write(self, value):
+        return value
 
 
 class AuditLogResolveMixin:
@@ -259,7 +287,7 @@ class BaseAuditLogListView(
 
     def get(self, request, *args, **kwargs):
         export_format = (request.GET.get("export") or "").strip().lower()
-        if export_format not in {"csv", "json"}:
+        if export_format not in EXPORT_FORMATS:
             return super().get(request, *args, **kwargs)
 
         self.object_list = self.get_queryset()
@@ -283,12 +311,17 @@ class BaseAuditLogListView(
             return self.render_to_response(self.get_context_data())
 
         total_rows = self.object_list.count()
-        if total_rows > query_service.EXPORT_MAX_ROWS:
+        max_rows = (
+            query_service.EXPORT_JSON_MAX_ROWS
+            if export_format == "json"
+            else query_service.EXPORT_MAX_ROWS
+        )
+        if total_rows > max_rows:
             filter_form.add_error(
                 None,
                 (
                     "La exportación excede el máximo permitido "
-                    f"({query_service.EXPORT_MAX_ROWS} filas). Refiná los filtros."
+                    f"({max_rows} filas). Refiná los filtros."
                 ),
             )
             self._log_export_event(
@@ -312,6 +345,18 @@ class BaseAuditLogListView(
         self.filter_form = self.get_form()
         return self._apply_filters(qs, self.filter_form)
 
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset sobre (-timestamp, -id): "siguiente" busca desde el último
+        # evento mostrado en lugar de OFFSET, y no hay COUNT(*) por página.
+        paginator = NoCountPaginator(
+            queryset, page_size, ordering=query_service.LIST_ORDERING
+        )
+        page_obj = paginator.get_page(
+            self.request.GET.get(self.page_kwarg),
+            cursor=self.request.GET.get(KEYSET_CURSOR_PARAM),
+        )
+        return paginator, page_obj, page_obj.object_list, page_obj.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         entries = context.get("entries") or []
@@ -323,6 +368,7 @@ class BaseAuditLogListView(
         context["tracked_models"] = TRACKED_MODELS
         params = self.request.GET.copy()
         params.pop("page", None)
+        params.pop(KEYSET_CURSOR_PARAM, None)
         params.pop("export", None)
         context["querystring"] = params.urlencode()
         context["active_filters"] = self._build_active_filter_chips(
@@ -366,9 +412,27 @@ class BaseAuditLogListView(
         }
 
     def _iter_export_rows(self):
-        for entry in self.object_list.iterator():
+        # Bloques keyset: en MySQL iterator() traería el resultado completo.
+        entries = iter_keyset(
+            self.object_list,
+            query_service.LIST_ORDERING,
+            chunk_size=query_service.EXPORT_CHUNK_SIZE,
+        )
+        for entry in entries:
+            fk_cache = getattr(self, "_audit_fk_cache", None)
+            if fk_cache and len(fk_cache) > EXPORT_FK_CACHE_MAX:
+                fk_cache.clear()
             yield self._serialize_entry_for_export(entry)
 
+    @staticmethod
+    def _export_row_cells(row):
+        cells = [row[column] for column in EXPORT_COLUMNS[:-2]]
+        cells.append(json.dumps(row["changes"], ensure_ascii=False, default=str))
+        # Las claves pueden ser verbose_name perezosos, que json no acepta.
+        resolved = {str(key): value for key, value in row["changes_resolved"].items()}
+        cells.append(json.dumps(resolved, ensure_ascii=False, default=str))
+        return cells
+
     def _build_export_filename(self, export_format):
         suffix = timezone.now().strftime("%Y%m%d_%H%M%S")
         is_instance = bool(getattr(self, "kwargs", {}).get("object_pk"))
@@ -390,48 +454,35 @@ class BaseAuditLogListView(
             )
             return response
 
-        response = HttpResponse(content_type="text/csv; charset=utf-8")
+        if export_format == "xlsx":
+            return xlsx_response(
+                self._build_export_filename("xlsx"),
+                [
+                    XlsxSheet(
+                        title="Auditoria",
+                        headers=EXPORT_COLUMNS,
+                        rows=(
+                            self._export_row_cells(row)
+                            for row in self._iter_export_rows()
+                        ),
+                        bold_headers=True,
+                        freeze_headers=True,
+                    )
+                ],
+            )
+
+        writer = csv.writer(_Echo())
+        lines = (
+            writer.writerow(cells)
+            for cells in itertools.chain(
+                [EXPORT_COLUMNS],
+                (self._export_row_cells(row) for row in self._iter_export_rows()),
+            )
+        )
+        response = StreamingHttpResponse(lines, content_type="text/csv; charset=utf-8")
         response["Content-Disposition"] = (
             f'attachment; filename="{self._build_export_filename("csv")}"'
         )
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "event_id",
-                "timestamp",
-                "action",
-                "app_label",
-                "model",
-                "object_pk",
-                "user",
-                "user_detail",
-                "source",
-                "batch_key",
-                "remote_addr",
-                "changes",
-                "changes_resolved",
-            ]
-        )
-        for row in self._iter_export_rows():
-            writer.writerow(
-                [
-                    row["event_id"],
-                    row["timestamp"],
-                    row["action"],
-                    row["app_label"],
-                    row["model"],
-                    row["object_pk"],
-                    row["user"],
-                    row["user_detail"],
-                    row["source"],
-                    row["batch_key"],
-                    row["remote_addr"],
-                    json.dumps(row["changes"], ensure_ascii=False, default=str),
-                    json.dumps(
-                        row["changes_resolved"], ensure_ascii=False, default=str
-                    ),
-                ]
-            )
         return response
 
     def _build_access_log_payload(self):
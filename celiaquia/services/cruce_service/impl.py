@@ -45,6 +45,7 @@ from celiaquia.services.cupo_service import (
     CupoService,
     CupoNoConfigurado,
 )
+from core.services.xlsx_export import XlsxSheet, build_xlsx_bytes, iter_values
 
 logger = logging.getLogger("django")
 
@@ -94,7 +95,13 @@ class CruceService:
 
     @staticmethod
     def normalizar_sexo_para_exportacion(ciudadano) -> str:
-        sexo_raw = (getattr(getattr(ciudadano, "sexo", None), "sexo", "") or "").strip()
+        return CruceService.normalizar_sexo_texto(
+            getattr(getattr(ciudadano, "sexo", None), "sexo", "")
+        )
+
+    @staticmethod
+    def normalizar_sexo_texto(sexo) -> str:
+        sexo_raw = (sexo or "").strip()
         sexo_map = {
             "M": "Masculino",
             "F": "Femenino",
@@ -148,10 +155,7 @@ class CruceService:
         """
         from celiaquia.services.familia_service import FamiliaService
 
-        rows = []
-        qs = expediente.expediente_ciudadanos.select_related(
-            "ciudadano", "ciudadano__sexo"
-        )
+        qs = expediente.expediente_ciudadanos.all()
 
         ciudadanos_ids = list(qs.values_list("ciudadano_id", flat=True))
         responsables_ids = FamiliaService.obtener_ids_responsables(ciudadanos_ids)
@@ -159,54 +163,38 @@ class CruceService:
             ciudadanos_ids
         )
 
-        for legajo in qs:
-            ciudadano = legajo.ciudadano
-            es_responsable = ciudadano.id in responsables_ids
-            sexo = CruceService.normalizar_sexo_para_exportacion(ciudadano)
-
-            # Solo exportar responsables o beneficiarios sin responsable
-            if es_responsable:
-                # Es responsable, exportar
-                rows.append(
-                    {
-                        "numero_cuil": CruceService.normalize_dni_str(
-                            getattr(ciudadano, "documento", "")
-                        ),
-                        "nombre": getattr(ciudadano, "nombre", "") or "",
-                        "apellido": getattr(ciudadano, "apellido", "") or "",
-                        "sexo": sexo,
-                    }
+        def filas():
+            for fila in iter_values(
+                qs,
+                "ciudadano_id",
+                "ciudadano__documento",
+                "ciudadano__nombre",
+                "ciudadano__apellido",
+                "ciudadano__sexo__sexo",
+            ):
+                ciudadano_id = fila["ciudadano_id"]
+                # Solo responsables o beneficiarios sin responsable
+                if ciudadano_id not in responsables_ids and responsables_por_hijo.get(
+                    ciudadano_id
+                ):
+                    continue
+                yield [
+                    CruceService.normalize_dni_str(fila["ciudadano__documento"]),
+                    fila["ciudadano__nombre"] or "",
+                    fila["ciudadano__apellido"] or "",
+                    CruceService.normalizar_sexo_texto(fila["ciudadano__sexo__sexo"]),
+                ]
+
+        return build_xlsx_bytes(
+            [
+                XlsxSheet(
+                    title="nomina",
+                    headers=["numero_cuil", "nombre", "apellido", "sexo"],
+                    rows=filas(),
+                    bold_headers=True,
                 )
-            else:
-                # Es beneficiario, verificar si tiene responsable
-                responsables = responsables_por_hijo.get(ciudadano.id, [])
-                if not responsables:
-                    # No tiene responsable, exportar
-                    rows.append(
-                        {
-                            "numero_cuil": CruceService.normalize_dni_str(
-                                getattr(ciudadano, "documento", "")
-                            ),
-                            "nombre": getattr(ciudadano, "nombre", "") or "",
-                            "apellido": getattr(ciudadano, "apellido", "") or "",
-                            "sexo": sexo,
-                        }
-                    )
-
-        out = io.BytesIO()
-        df = pd.DataFrame(
-            rows,
-            columns=[
-                "numero_cuil",
-                "nombre",
-                "apellido",
-                "sexo",
-            ],
+            ]
         )
-        with pd.ExcelWriter(out, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="nomina")
-        out.seek(0)
-        return out.getvalue()
 
     @staticmethod
     def _read_file_bytes(archivo_fileobj) -> bytes:
@@ -3,6 +3,7 @@ import re
 import logging
 import unicodedata
 from functools import lru_cache
+from itertools import product
 from io import BytesIO
 from pathlib import Path
 
@@ -13,7 +14,8 @@ from django.db import transaction
 from django.db.models import Q
 
 from ciudadanos.models import Ciudadano
-from core.models import Provincia, Municipio, Localidad, Sexo
+from core.models import Sexo
+from core.services.gazetteer import get_gazetteer
 from celiaquia.models import (
     EstadoCupo,
     EstadoLegajo,
@@ -171,6 +173,14 @@ IMPORTACION_EDITABLE_FIELDS = (
     *IMPORTACION_OPTIONAL_FIELDS,
 )
 
+IMPORTACION_TEXTOS_NULOS = ("nan", "nat", "none")
+# Todas las variantes de mayusculas, para comparar por hash sin ``str.lower()``.
+_IMPORTACION_TEXTOS_NULOS_VARIANTES = frozenset(
+    "".join(letras)
+    for texto in IMPORTACION_TEXTOS_NULOS
+    for letras in product(*((c.lower(), c.upper()) for c in texto))
+)
+
 
 def validar_edad_responsable(fecha_nac_responsable, fecha_nac_beneficiario):
     """Valida edad del responsable vs beneficiario. Retorna (ok, warnings, error)."""
@@ -311,65 +321,69 @@ def _validar_provincia_permitida_importacion(payload, provincias_permitidas_ids)
         )
 
 
-def _colectar_ids_y_nombres_importacion(df: pd.DataFrame):
-    municipio_ids = set()
-    localidad_ids = set()
-    sexos_nombres = set()
-    nacionalidades_nombres = set()
-
-    for _, row in df.iterrows():
-        if row.get("municipio"):
-            mun_str = str(row["municipio"]).strip()
-            if mun_str and mun_str != "nan" and mun_str.replace(".0", "").isdigit():
-                municipio_ids.add(int(float(mun_str)))
-        if row.get("localidad"):
-            loc_str = str(row["localidad"]).strip()
-            if loc_str and loc_str != "nan" and loc_str.replace(".0", "").isdigit():
-                localidad_ids.add(int(float(loc_str)))
-        if row.get("sexo"):
-            sexos_nombres.add(str(row["sexo"]).strip().lower())
-        if row.get("nacionalidad"):
-            nacionalidades_nombres.add(str(row["nacionalidad"]).strip().lower())
+def _valores_distintos_columna_importacion(df: pd.DataFrame, field):
+    """Valores distintos y no vacios de la columna (vacio si la columna falta)."""
+    if field not in df.columns:
+        return []
+    return [value for value in df[field].unique() if value]
+
+
+def _colectar_lookup_ids_importacion(df: pd.DataFrame, field):
+    ids = set()
+    for value in _valores_distintos_columna_importacion(df, field):
+        value_str = str(value).strip()
+        if value_str and value_str != "nan" and value_str.replace(".0", "").isdigit():
+            ids.add(int(float(value_str)))
+    return ids
 
+
+def _colectar_ids_y_nombres_importacion(df: pd.DataFrame):
     return {
-        "municipio_ids": municipio_ids,
-        "localidad_ids": localidad_ids,
-        "sexos_nombres": sexos_nombres,
-        "nacionalidades_nombres": nacionalidades_nombres,
+        "municipio_ids": _colectar_lookup_ids_importacion(df, "municipio"),
+        "localidad_ids": _colectar_lookup_ids_importacion(df, "localidad"),
+        "sexos_nombres": {
+            str(value).strip().lower()
+            for value in _valores_distintos_columna_importacion(df, "sexo")
+        },
+        "nacionalidades_nombres": {
+            str(value).strip().lower()
+            for value in _valores_distintos_columna_importacion(df, "nacionalidad")
+        },
     }
 
 
-def _cargar_municipios_cache(municipio_ids, provincia_usuario_id):
+def _cargar_municipios_cache(municipio_ids, provincia_usuario_id, gazetteer=None):
     municipios_cache = {}
     if not municipio_ids:
         return municipios_cache
 
-    municipios_qs = Municipio.objects.filter(pk__in=municipio_ids)
-    if provincia_usuario_id:
-        municipios_qs = municipios_qs.filter(provincia_id=provincia_usuario_id)
-    for municipio in municipios_qs:
-        municipios_cache[municipio.pk] = municipio.pk
+    gazetteer = gazetteer or get_gazetteer()
+    for municipio_id in municipio_ids:
+        if gazetteer.has_municipio(municipio_id, provincia_id=provincia_usuario_id):
+            municipios_cache[municipio_id] = municipio_id
     return municipios_cache
 
 
-def _cargar_municipio_provincia_map(municipio_ids):
+def _cargar_municipio_provincia_map(municipio_ids, gazetteer=None):
     if not municipio_ids:
         return {}
+    gazetteer = gazetteer or get_gazetteer()
     return {
-        m.pk: m.provincia_id
-        for m in Municipio.objects.filter(pk__in=municipio_ids).only(
-            "pk", "provincia_id"
-        )
+        municipio_id: gazetteer.municipio_provincia_id(municipio_id)
+        for municipio_id in municipio_ids
+        if gazetteer.has_municipio(municipio_id)
     }
 
 
-def _cargar_localidades_cache(localidad_ids):
+def _cargar_localidades_cache(localidad_ids, gazetteer=None):
     localidades_cache = {}
     if not localidad_ids:
         return localidades_cache
 
-    for localidad in Localidad.objects.filter(pk__in=localidad_ids):
-        localidades_cache[localidad.pk] = localidad.pk
+    gazetteer = gazetteer or get_gazetteer()
+    for localidad_id in localidad_ids:
+        if gazetteer.has_localidad(localidad_id):
+            localidades_cache[localidad_id] = localidad_id
     return localidades_cache
 
 
@@ -426,14 +440,17 @@ def _cargar_nacionalidades_cache():
 
 def _precargar_datos_importacion(df: pd.DataFrame, provincia_usuario_id):
     lookup_values = _colectar_ids_y_nombres_importacion(df)
+    gazetteer = get_gazetteer()
     return {
         "municipios_cache": _cargar_municipios_cache(
-            lookup_values["municipio_ids"], provincia_usuario_id
+            lookup_values["municipio_ids"], provincia_usuario_id, gazetteer
         ),
         "municipio_provincia_map": _cargar_municipio_provincia_map(
-            lookup_values["municipio_ids"]
+            lookup_values["municipio_ids"], gazetteer
+        ),
+        "localidades_cache": _cargar_localidades_cache(
+            lookup_values["localidad_ids"], gazetteer
         ),
-        "localidades_cache": _cargar_localidades_cache(lookup_values["localidad_ids"]),
         "sexos_cache": _cargar_sexos_cache(),
         "nacionalidades_cache": _cargar_nacionalidades_cache(),
         "paises_a_nacionalidad": _cargar_paises_a_nacionalidad_importacion(),
@@ -716,7 +733,7 @@ def _parse_numeric_field_importacion(
 
 
 def _parse_scalar_field_importacion(value_str):
-    if value_str.lower() in {"nan", "nat", "none"}:
+    if value_str.lower() in IMPORTACION_TEXTOS_NULOS:
         return None
     return value_str or None
 
@@ -795,11 +812,7 @@ def _inferir_provincia_desde_municipio_importacion(
     if municipio_provincia_map is not None:
         provincia_id = municipio_provincia_map.get(municipio_id)
     else:
-        provincia_id = (
-            Municipio.objects.filter(pk=municipio_id)
-            .values_list("provincia_id", flat=True)
-            .first()
-        )
+        provincia_id = get_gazetteer().municipio_provincia_id(municipio_id)
     if provincia_id:
         payload["provincia"] = provincia_id
 
@@ -1261,32 +1274,37 @@ def _resolver_localidad_responsable_payload_importacion(
             localidad_resp_str = str(localidad_resp).strip()
             if "(" in localidad_resp_str:
                 localidad_resp_str = localidad_resp_str.split("(", 1)[0].strip()
-            localidades_qs = Localidad.objects.select_related("municipio")
-            if provincia_usuario_id:
-                localidades_qs = localidades_qs.filter(
-                    municipio__provincia_id=provincia_usuario_id
-                )
+            gazetteer = get_gazetteer()
             if localidad_resp_str.isdigit():
-                coincidencias = list(
-                    localidades_qs.filter(pk=int(localidad_resp_str))[:2]
-                )
+                localidad_id = int(localidad_resp_str)
+                coincidencias = []
+                if gazetteer.has_localidad(localidad_id) and (
+                    not provincia_usuario_id
+                    or gazetteer.municipio_provincia_id(
+                        gazetteer.localidad_municipio_id(localidad_id)
+                    )
+                    == provincia_usuario_id
+                ):
+                    coincidencias = [localidad_id]
             else:
-                coincidencias = list(
-                    localidades_qs.filter(nombre__iexact=localidad_resp_str)[:2]
-                )
+                coincidencias = gazetteer.localidad_candidates(
+                    localidad_resp_str, provincia_id=provincia_usuario_id or None
+                )[:2]
                 if len(coincidencias) != 1 and localidad_resp_str:
-                    coincidencias = list(
-                        localidades_qs.filter(nombre__icontains=localidad_resp_str)[:2]
+                    coincidencias = gazetteer.search_localidades(
+                        localidad_resp_str,
+                        provincia_id=provincia_usuario_id or None,
+                        limit=2,
                     )
 
             if len(coincidencias) == 1:
-                localidad_obj = coincidencias[0]
-                responsable_payload["localidad"] = localidad_obj.pk
-                responsable_payload["municipio"] = localidad_obj.municipio.pk
-                if localidad_obj.municipio.provincia_id:
-                    responsable_payload["provincia"] = (
-                        localidad_obj.municipio.provincia_id
-                    )
+                localidad_id = coincidencias[0]
+                municipio_id = gazetteer.localidad_municipio_id(localidad_id)
+                provincia_id = gazetteer.municipio_provincia_id(municipio_id)
+                responsable_payload["localidad"] = localidad_id
+                responsable_payload["municipio"] = municipio_id
+                if provincia_id:
+                    responsable_payload["provincia"] = provincia_id
                 return
             if len(coincidencias) > 1:
                 raise ValidationError(
@@ -1784,7 +1802,11 @@ def _construir_payload_fila_importacion(
     normalizar_sexo,
     nacionalidades_cache,
     paises_a_nacionalidad,
+    payload_validado=None,
 ):
+    if payload_validado is not None:
+        # Ya validado y normalizado por _validar_dataframe_importacion.
+        return dict(payload_validado)
     payload = _build_payload_importacion_from_row(
         row=row,
         numeric_fields=numeric_fields,
@@ -1975,25 +1997,29 @@ def _build_callbacks_importacion(warnings):
     return add_warning, add_error
 
 
-def _validar_documento_importacion(doc_str, campo_nombre, _fila):
-    """Valida formato y longitud de documento."""
-    if not doc_str or not doc_str.isdigit():
-        raise ValidationError(f"{campo_nombre} debe contener solo dígitos")
+IMPORTACION_DOCUMENTO_LONGITUDES = (10, 11)
 
-    doc_len = len(doc_str)
 
+def _es_campo_documento_importacion(campo_nombre):
+    """Campos numericos a los que se exige longitud de documento/CUIT."""
     if campo_nombre == "documento":
-        if doc_len in (10, 11):
-            return doc_str
-        raise ValidationError(f"{campo_nombre} debe tener entre 10 y 11 dígitos")
-
-    if (
+        return True
+    return (
         "responsable" in campo_nombre
         and "telefono" not in campo_nombre
         and "contacto" not in campo_nombre
+    )
+
+
+def _validar_documento_importacion(doc_str, campo_nombre, _fila):
+    """Valida formato y longitud de documento."""
+    if not doc_str or not doc_str.isdigit():
+        raise ValidationError(f"{campo_nombre} debe contener solo dígitos")
+
+    if (
+        _es_campo_documento_importacion(campo_nombre)
+        and len(doc_str) not in IMPORTACION_DOCUMENTO_LONGITUDES
     ):
-        if doc_len in (10, 11):
-            return doc_str
         raise ValidationError(f"{campo_nombre} debe tener entre 10 y 11 dígitos")
 
     return doc_str
@@ -2047,6 +2073,7 @@ def _procesar_beneficiario_desde_row_importacion(
     excluidos,
     legajos_crear,
     doble_rol_docs,
+    payload_validado=None,
 ):
     payload = _construir_payload_fila_importacion(
         row=row,
@@ -2063,6 +2090,7 @@ def _procesar_beneficiario_desde_row_importacion(
         normalizar_sexo=normalizar_sexo,
         nacionalidades_cache=nacionalidades_cache,
         paises_a_nacionalidad=paises_a_nacionalidad,
+        payload_validado=payload_validado,
     )
 
     responsable_payload = None
@@ -2198,6 +2226,7 @@ def _procesar_fila_legajo_importacion(
     relaciones_familiares,
     doble_rol_docs,
     warnings,
+    payload_validado=None,
 ):
     cid = None
     cid_resp = None
@@ -2241,6 +2270,7 @@ def _procesar_fila_legajo_importacion(
                 excluidos=excluidos,
                 legajos_crear=legajos_crear,
                 doble_rol_docs=doble_rol_docs,
+                payload_validado=payload_validado,
             )
             if resultado_beneficiario == "error":
                 del warnings[warnings_len:]
@@ -2288,20 +2318,208 @@ def _procesar_fila_legajo_importacion(
         return 0, 1
 
 
-def _identificar_documentos_con_doble_rol(df):  # pylint: disable=invalid-name
-    """Identifica qué documentos de beneficiarios también son responsables de otros."""
-    documentos_beneficiarios = set()
-    documentos_responsables = set()
+def _texto_columna_importacion(df, field):
+    """``str(valor).strip()`` de toda la columna; vacia si la columna falta."""
+    if field not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[field].astype(str).str.strip()
+
+
+def _documentos_columna_importacion(df, field):
+    return {
+        documento
+        for documento in _texto_columna_importacion(df, field).unique()
+        if documento not in ("", "nan", "None")
+    }
 
-    for _, row in df.iterrows():
-        doc_benef = str(row.get("documento", "")).strip()
-        doc_resp = str(row.get("documento_responsable", "")).strip()
 
-        if doc_benef and doc_benef not in ("", "nan", "None"):
-            documentos_beneficiarios.add(doc_benef)
+def _resolver_valores_distintos_importacion(serie, field, resolver):
+    """
+    Aplica ``resolver`` (helper de payload de una fila) una vez por valor
+    distinto de ``serie``. Devuelve ``{valor: resuelto}`` solo con los valores
+    que resolvieron con contenido; las filas con los demas quedan para el
+    camino fila a fila.
+    """
+    resueltos = {}
+    for value in serie.unique():
+        payload = {field: value}
+        try:
+            resolver(payload)
+        except Exception:  # pylint: disable=broad-exception-caught
+            continue
+        if _valor_tiene_contenido_importacion(payload.get(field)):
+            resueltos[value] = payload[field]
+    return resueltos
+
+
+def _convertir_fechas_columnar_importacion(serie, to_date):
+    """
+    ``AAAA-MM-DD`` y ``DD-MM-AAAA`` (con ``-`` o ``/``) se convierten en bloque;
+    el resto (ISO con hora, fechas fuera del rango de pandas) pasa por
+    ``to_date`` una vez por valor distinto. Devuelve ``{texto: fecha}``.
+    """
+    base = serie.str.split(" ", n=1).str[0].str.replace("/", "-", regex=False)
+    fechas = pd.to_datetime(base, format="%Y-%m-%d", errors="coerce").fillna(
+        pd.to_datetime(base, format="%d-%m-%Y", errors="coerce")
+    )
+    convertidas = dict(zip(serie[fechas.notna()], fechas[fechas.notna()].dt.date))
+    for value in serie[fechas.isna()].unique():
+        try:
+            fecha = to_date(value)
+        except Exception:  # pylint: disable=broad-exception-caught
+            continue
+        if fecha:
+            convertidas[value] = fecha
+    return convertidas
 
-        if doc_resp and doc_resp not in ("", "nan", "None"):
-            documentos_responsables.add(doc_resp)
+
+def _emails_validos_columnar_importacion(emails):
+    """
+    Mismas expresiones que ``EmailValidator`` aplicadas a toda la columna. Es
+    conservador: lo que no pasa (literales IP, por ejemplo) se valida fila a
+    fila. Devuelve una mascara ``bool`` para asignarla sobre ``ok`` sin
+    cambiarle el dtype.
+    """
+    partes = emails.str.rpartition("@")
+    usuario_regex = EmailValidator.user_regex
+    dominio_regex = EmailValidator.domain_regex
+    return (
+        partes[1].eq("@")
+        & emails.str.len().le(320)
+        & partes[0].str.match(usuario_regex.pattern, flags=usuario_regex.flags)
+        & (
+            partes[2].isin(EmailValidator.domain_allowlist)
+            | partes[2].str.match(dominio_regex.pattern, flags=dominio_regex.flags)
+        )
+    ).astype(bool)
+
+
+def _validar_dataframe_importacion(df, contexto_filas):
+    """
+    Etapa columnar de validacion del beneficiario, previa al loop de filas.
+
+    Normaliza documentos, fechas, sexo, contacto y los ids de municipio,
+    localidad y nacionalidad con operaciones sobre columnas y resolviendo cada
+    valor distinto una sola vez contra las precargas. Devuelve una lista
+    alineada con las filas: el payload que armaria
+    ``_construir_payload_fila_importacion`` o ``None`` si la fila no paso algun
+    control. Esas filas siguen el camino fila a fila, que es el que arma el
+    mensaje exacto que se guarda en ``RegistroErroneo``.
+    """
+    if df.empty:
+        return []
+
+    columnas = list(df.columns)
+    valores = {}
+    ok = pd.Series(True, index=df.index)
+    for field in columnas:
+        texto = _texto_columna_importacion(df, field)
+        if field in IMPORTACION_NUMERIC_FIELDS:
+            # ``\D`` solo cambia los valores que no son todos digitos.
+            limpio = texto.copy()
+            con_separadores = ~texto.str.isdecimal()
+            limpio[con_separadores] = texto[con_separadores].str.replace(
+                r"\D", "", regex=True
+            )
+            ok &= limpio.ne("") | texto.eq("")
+            if _es_campo_documento_importacion(field):
+                ok &= limpio.eq("") | limpio.str.len().isin(
+                    IMPORTACION_DOCUMENTO_LONGITUDES
+                )
+            valores[field] = limpio
+        else:
+            valores[field] = texto.mask(
+                texto.isin(_IMPORTACION_TEXTOS_NULOS_VARIANTES), ""
+            )
+
+    vacia = pd.Series("", index=df.index, dtype=object)
+    for field in IMPORTACION_BENEFICIARIO_REQUIRED_FIELDS:
+        ok &= valores.get(field, vacia).ne("")
+    if not ok.any():
+        return [None] * len(df)
+
+    fechas = _convertir_fechas_columnar_importacion(
+        valores["fecha_nacimiento"][ok], contexto_filas["to_date"]
+    )
+    ok &= valores["fecha_nacimiento"].isin(list(fechas))
+
+    resolvers = {
+        "municipio": lambda payload: _resolver_campo_lookup_importacion(
+            payload, "municipio", contexto_filas["municipios_cache"], None, None
+        ),
+        "localidad": lambda payload: _resolver_campo_lookup_importacion(
+            payload, "localidad", contexto_filas["localidades_cache"], None, None
+        ),
+        "sexo": lambda payload: _resolver_sexo_payload_importacion(
+            payload, contexto_filas["normalizar_sexo"]
+        ),
+        "nacionalidad": lambda payload: _resolver_nacionalidad_payload_importacion(
+            payload,
+            nacionalidades_cache=contexto_filas["nacionalidades_cache"],
+            paises_a_nacionalidad=contexto_filas["paises_a_nacionalidad"],
+        ),
+    }
+    resueltos = {}
+    for field, resolver in resolvers.items():
+        resueltos[field] = _resolver_valores_distintos_importacion(
+            valores[field][ok], field, resolver
+        )
+        ok &= valores[field].isin(list(resueltos[field]))
+
+    email = valores.get("email", vacia)
+    con_email = ok & email.ne("")
+    if con_email.any():
+        ok.loc[con_email] = _emails_validos_columnar_importacion(email[con_email])
+    telefono = valores.get("telefono", vacia)
+    ok &= telefono.eq("") | telefono.str.len().ge(8)
+
+    municipio_provincia_map = contexto_filas["municipio_provincia_map"]
+    provincias = {
+        municipio: municipio_provincia_map.get(resuelto)
+        for municipio, resuelto in resueltos["municipio"].items()
+    }
+    provincias_permitidas_ids = contexto_filas["provincias_permitidas_ids"]
+    if provincias_permitidas_ids is not None:
+        fuera_de_alcance = {
+            municipio
+            for municipio, provincia_id in provincias.items()
+            if provincia_id and provincia_id not in provincias_permitidas_ids
+        }
+        ok &= ~valores["municipio"].isin(fuera_de_alcance)
+
+    tiene_responsable = pd.Series(False, index=df.index)
+    for field in IMPORTACION_RESPONSABLE_FIELDS:
+        tiene_responsable |= valores.get(field, vacia).ne("")
+    edades = {
+        texto: ValidacionEdadService.calcular_edad(fecha)
+        for texto, fecha in fechas.items()
+    }
+    menores = {
+        texto for texto, edad in edades.items() if edad is not None and edad < 18
+    }
+    ok &= tiene_responsable | ~valores["fecha_nacimiento"].isin(menores)
+
+    listas = {field: serie.tolist() for field, serie in valores.items()}
+    payloads = [None] * len(df)
+    for posicion in ok.to_numpy().nonzero()[0]:
+        payload = {field: listas[field][posicion] or None for field in columnas}
+        payload["tipo_documento"] = _get_tipo_documento(payload.get("documento", ""))
+        payload["fecha_nacimiento"] = fechas[payload["fecha_nacimiento"]]
+        municipio = payload["municipio"]
+        for field, resueltos_campo in resueltos.items():
+            payload[field] = resueltos_campo[payload[field]]
+        if provincias.get(municipio):
+            payload["provincia"] = provincias[municipio]
+        payloads[posicion] = payload
+    return payloads
+
+
+def _identificar_documentos_con_doble_rol(df):  # pylint: disable=invalid-name
+    """Identifica qué documentos de beneficiarios también son responsables de otros."""
+    documentos_beneficiarios = _documentos_columna_importacion(df, "documento")
+    documentos_responsables = _documentos_columna_importacion(
+        df, "documento_responsable"
+    )
 
     # Documentos que son tanto beneficiarios como responsables
     doble_rol_docs = documentos_beneficiarios & documentos_responsables
@@ -2377,10 +2595,13 @@ def _build_contexto_filas_importacion_legajos(
 def _procesar_dataframe_importacion_legajos(df, contexto_filas):
     validos = 0
     errores = 0
-    for offset, row in enumerate(df.to_dict(orient="records"), start=2):
+    payloads = _validar_dataframe_importacion(df, contexto_filas)
+    filas = df.to_dict(orient="records")
+    for offset, (row, payload) in enumerate(zip(filas, payloads), start=2):
         inc_validos, inc_errores = _procesar_fila_legajo_importacion(
             row=row,
             offset=offset,
+            payload_validado=payload,
             **contexto_filas,
         )
         validos += inc_validos
@@ -2595,6 +2816,7 @@ class ImportacionService:
         # Agregar columna ID al inicio y convertir IDs a nombres
         headers = ["ID"] + list(df.columns)
         rows_with_id = []
+        gazetteer = get_gazetteer()
         for i, row in enumerate(sample, start=1):
             row_with_id = {"ID": i}
 
@@ -2606,12 +2828,9 @@ class ImportacionService:
                     and municipio_str != "nan"
                     and municipio_str.replace(".0", "").isdigit()
                 ):
-                    try:
-                        municipio_id = int(float(municipio_str))
-                        municipio = Municipio.objects.get(pk=municipio_id)
-                        row["municipio"] = municipio.nombre
-                    except:
-                        pass
+                    municipio = gazetteer.municipios.get(int(float(municipio_str)))
+                    if municipio:
+                        row["municipio"] = municipio[0]
 
             if "localidad" in row and row["localidad"]:
                 localidad_str = str(row["localidad"]).strip()
@@ -2620,12 +2839,9 @@ class ImportacionService:
                     and localidad_str != "nan"
                     and localidad_str.replace(".0", "").isdigit()
                 ):
-                    try:
-                        localidad_id = int(float(localidad_str))
-                        localidad = Localidad.objects.get(pk=localidad_id)
-                        row["localidad"] = localidad.nombre
-                    except:
-                        pass
+                    nombre = gazetteer.localidad_nombre(int(float(localidad_str)))
+                    if nombre:
+                        row["localidad"] = nombre
 
             row_with_id.update(row)
             rows_with_id.append(row_with_id)
@@ -8,12 +8,8 @@ los ciudadanos pueden corregirse despues de la importacion; la base es la
 fuente de verdad.
 """
 
-from datetime import date, datetime
-from io import BytesIO
 import logging
 
-from openpyxl import Workbook
-
 from celiaquia.models import (
     EstadoCupo,
     ExpedienteCiudadano,
@@ -21,6 +17,11 @@ from celiaquia.models import (
     RevisionTecnico,
 )
 from celiaquia.services.cruce_service import CruceService
+from core.services.xlsx_export import (
+    DEFAULT_CHUNK_SIZE,
+    XlsxSheet,
+    build_xlsx_bytes,
+)
 
 logger = logging.getLogger("django")
 
@@ -53,8 +54,6 @@ NOMINA_HEADERS = [
 
 FECHA_COLUMNS = {"fecha_nacimiento", "FECHA_DE_NACIMIENTO_RESPONSABLE"}
 
-FECHA_NUMBER_FORMAT = "DD/MM/YYYY"
-
 
 class PadronFinalService:
     """Genera nomina final aprobada en Excel para expediente de celiaquia."""
@@ -76,31 +75,40 @@ class PadronFinalService:
         """
         from celiaquia.services.familia_service import FamiliaService
 
-        legajos = list(PadronFinalService._legajos_aprobados(expediente))
+        ciudadano_ids = list(
+            PadronFinalService._legajos_aprobados_qs(expediente).values_list(
+                "ciudadano_id", flat=True
+            )
+        )
         responsables_por_hijo = FamiliaService.obtener_responsables_por_hijo(
-            [legajo.ciudadano_id for legajo in legajos]
+            ciudadano_ids
         )
 
-        rows = []
         sin_documento = []
-        for legajo in legajos:
-            responsables = responsables_por_hijo.get(legajo.ciudadano_id, [])
-            if len(responsables) > 1:
-                logger.warning(
-                    "padron_final.responsable_ambiguo",
-                    extra={
-                        "data": {
-                            "expediente_id": getattr(expediente, "id", None),
-                            "ciudadano_id": legajo.ciudadano_id,
-                            "candidatos": len(responsables),
-                        }
-                    },
-                )
-            responsable = responsables[0] if responsables else None
-            fila = PadronFinalService._fila_beneficiario(legajo, responsable)
-            if not fila[NOMINA_HEADERS.index("documento")]:
-                sin_documento.append(legajo.ciudadano_id)
-            rows.append(fila)
+
+        def filas():
+            for legajo in PadronFinalService._legajos_aprobados(expediente):
+                responsables = responsables_por_hijo.get(legajo.ciudadano_id, [])
+                if len(responsables) > 1:
+                    logger.warning(
+                        "padron_final.responsable_ambiguo",
+                        extra={
+                            "data": {
+                                "expediente_id": getattr(expediente, "id", None),
+                                "ciudadano_id": legajo.ciudadano_id,
+                                "candidatos": len(responsables),
+                            }
+                        },
+                    )
+                responsable = responsables[0] if responsables else None
+                fila = PadronFinalService._fila_beneficiario(legajo, responsable)
+                if not fila[NOMINA_HEADERS.index("documento")]:
+                    sin_documento.append(legajo.ciudadano_id)
+                yield fila
+
+        content = PadronFinalService._build_excel(
+            [*NOMINA_HEADERS, ESTADO_CUPO_HEADER], filas()
+        )
 
         if sin_documento:
             logger.warning(
@@ -113,9 +121,7 @@ class PadronFinalService:
                 },
             )
 
-        return PadronFinalService._build_excel(
-            [*NOMINA_HEADERS, ESTADO_CUPO_HEADER], rows
-        )
+        return content
 
     @staticmethod
     def _legajos_aprobados_qs(expediente):
@@ -146,11 +152,11 @@ class PadronFinalService:
             )
             .order_by("ciudadano__apellido", "ciudadano__nombre")
         )
-        return [
+        return (
             legajo
-            for legajo in qs
+            for legajo in qs.iterator(chunk_size=DEFAULT_CHUNK_SIZE)
             if not ExpedienteCiudadano.es_rol_responsable_puro(legajo.rol)
-        ]
+        )
 
     @staticmethod
     def hay_aprobados(expediente) -> bool:
@@ -236,32 +242,16 @@ class PadronFinalService:
 
     @staticmethod
     def _build_excel(headers, rows) -> bytes:
-        fecha_indices = {
+        fecha_indices = frozenset(
             index for index, header in enumerate(headers) if header in FECHA_COLUMNS
-        }
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "nomina_aprobados"
-        ws.append(headers)
-        for row in rows:
-            ws.append(row)
-            if fecha_indices:
-                PadronFinalService._formatear_fechas_fila(ws[ws.max_row], fecha_indices)
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return output.getvalue()
-
-    @staticmethod
-    def _formatear_fechas_fila(cells, fecha_indices) -> None:
-        """Muestra las fechas de nacimiento como fecha sin hora (DD/MM/AAAA)."""
-        for index in fecha_indices:
-            if index >= len(cells):
-                continue
-            cell = cells[index]
-            value = cell.value
-            if isinstance(value, datetime):
-                cell.value = value.date()
-            if isinstance(cell.value, date):
-                cell.number_format = FECHA_NUMBER_FORMAT
+        )
+        return build_xlsx_bytes(
+            [
+                XlsxSheet(
+                    title="nomina_aprobados",
+                    headers=headers,
+                    rows=rows,
+                    date_columns=fecha_indices,
+                )
+            ]
+        )
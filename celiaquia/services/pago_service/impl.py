@@ -6,7 +6,7 @@ import logging
 
 import pandas as pd
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
+from django.core.files import File
 from django.db import transaction
 from django.utils import timezone
 
@@ -20,9 +20,17 @@ from celiaquia.models import (
     EstadoCupo,
 )
 from celiaquia.services.cupo_service import CupoService
+from core.services.xlsx_export import (
+    XlsxSheet,
+    build_xlsx_bytes,
+    build_xlsx_file,
+    iter_values,
+)
 
 logger = logging.getLogger("django")
 
+NOMINA_PAGO_HEADERS = ["dni", "cuit", "nombre", "apellido", "expediente"]
+
 
 def _norm_digits(s: str) -> str:
     return "".join(ch for ch in str(s or "").strip() if ch.isdigit())
@@ -71,6 +79,38 @@ class PagoService:
             resultado_sintys="MATCH",
         )
 
+    @staticmethod
+    def _hoja_nomina(provincia, titulo: str) -> XlsxSheet:
+        """
+        Hoja DNI/CUIT/nombre/apellido/expediente leida por lotes con ``values()``.
+
+        La columna ``cuit`` sale vacia, como en la nomina original (que leia
+        atributos ``cuil``/``cuit`` inexistentes en ``Ciudadano``): completarla
+        cambia el archivo que recibe el circuito de pago.
+        """
+        filas = iter_values(
+            PagoService._qs_consolidado_activo(provincia),
+            "ciudadano__documento",
+            "ciudadano__nombre",
+            "ciudadano__apellido",
+            "expediente_id",
+        )
+        return XlsxSheet(
+            title=titulo,
+            headers=NOMINA_PAGO_HEADERS,
+            rows=(
+                [
+                    _norm_digits(fila["ciudadano__documento"]),
+                    "",
+                    fila["ciudadano__nombre"] or "",
+                    fila["ciudadano__apellido"] or "",
+                    str(fila["expediente_id"]),
+                ]
+                for fila in filas
+            ),
+            bold_headers=True,
+        )
+
     @staticmethod
     @transaction.atomic
     def crear_expediente_pago(
@@ -88,35 +128,12 @@ class PagoService:
         )
 
         # Generar Excel de envío (DNI, CUIT/CUIL, nombre, apellido, expediente)
-        df_rows = []
-        qs = PagoService._qs_consolidado_activo(provincia)
-        for leg in qs:
-            ciu = leg.ciudadano
-            df_rows.append(
-                {
-                    "dni": _norm_digits(getattr(ciu, "documento", "")),
-                    "cuit": _norm_digits(
-                        getattr(ciu, "cuil", "") or getattr(ciu, "cuit", "")
-                    ),
-                    "nombre": getattr(ciu, "nombre", "") or "",
-                    "apellido": getattr(ciu, "apellido", "") or "",
-                    # FIX: usar str() en lugar de getattr con ""
-                    "expediente": str(leg.expediente_id),
-                }
-            )
-
-        pago.total_candidatos = len(df_rows)
-
-        if df_rows:
-            df = pd.DataFrame(
-                df_rows, columns=["dni", "cuit", "nombre", "apellido", "expediente"]
-            )
-            out = io.BytesIO()
-            with pd.ExcelWriter(out, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False, sheet_name="nomina_pago")
-            out.seek(0)
-            nombre = f"pago_{provincia.id}_{periodo}.xlsx"
-            pago.archivo_envio.save(nombre, ContentFile(out.getvalue()), save=False)
+        sheet = PagoService._hoja_nomina(provincia, "nomina_pago")
+        with build_xlsx_file([sheet]) as archivo:
+            pago.total_candidatos = sheet.rows_written
+            if sheet.rows_written:
+                nombre = f"pago_{provincia.id}_{periodo}.xlsx"
+                pago.archivo_envio.save(nombre, File(archivo), save=False)
 
         pago.estado = PagoEstado.ENVIADO  # queda marcado como enviado (generado)
         pago.save(update_fields=["archivo_envio", "estado", "total_candidatos"])
@@ -236,32 +253,4 @@ class PagoService:
         - resultado_sintys = MATCH
         (No incluye suspendidos)
         """
-        qs = PagoService._qs_consolidado_activo(provincia)
-
-        rows = []
-        for leg in qs:
-            ciu = leg.ciudadano
-            rows.append(
-                {
-                    "dni": _norm_digits(getattr(ciu, "documento", "")),
-                    "cuit": _norm_digits(
-                        getattr(ciu, "cuil", "") or getattr(ciu, "cuit", "")
-                    ),
-                    "nombre": getattr(ciu, "nombre", "") or "",
-                    "apellido": getattr(ciu, "apellido", "") or "",
-                    # FIX
-                    "expediente": str(leg.expediente_id),
-                }
-            )
-
-        import io as _io
-        import pandas as _pd
-
-        out = _io.BytesIO()
-        df = _pd.DataFrame(
-            rows, columns=["dni", "cuit", "nombre", "apellido", "expediente"]
-        )
-        with _pd.ExcelWriter(out, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="nomina_actual")
-        out.seek(0)
-        return out.getvalue()
+        return build_xlsx_bytes([PagoService._hoja_nomina(provincia, "nomina_actual")])
@@ -5,12 +5,15 @@ from django.contrib.postgres.indexes import GinIndex
 from django.utils import timezone
 from ciudadanos.models import Ciudadano
 from core.constants import UserGroups
+from core.field_tracking import FieldTrackingMixin
 from core.models import Dia, Localidad, Municipio, Provincia, Sexo
 from core.soft_delete import SoftDeleteModelMixin
 from organizaciones.models import Organizacion
 
 
-class Centro(SoftDeleteModelMixin, models.Model):
+class Centro(FieldTrackingMixin, SoftDeleteModelMixin, models.Model):
+    # El dashboard cuenta centros por tipo (dashboard.rollups).
+    tracked_fields = ("tipo",)
     SOFT_DELETE_OPERATIONAL_UPDATES = {"activo": False}
     SOFT_RESTORE_OPERATIONAL_UPDATES = {"activo": True}
 
@@ -188,7 +191,10 @@ class ActividadCentro(SoftDeleteModelMixin, models.Model):
         ]
 
 
-class ParticipanteActividad(SoftDeleteModelMixin, models.Model):
+class ParticipanteActividad(FieldTrackingMixin, SoftDeleteModelMixin, models.Model):
+    # El dashboard cuenta participantes inscriptos (dashboard.rollups).
+    tracked_fields = ("estado",)
+
     ESTADO_INSCRIPCION = [
         ("inscrito", "Inscrito"),
         ("lista_espera", "Lista de Espera"),
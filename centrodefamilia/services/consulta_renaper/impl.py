@@ -7,6 +7,7 @@ import requests
 
 from ciudadanos.models import Ciudadano
 from core.models import Sexo
+from core.services.renaper_cache import consultar_renaper_con_cache
 
 logger = logging.getLogger("django")
 
@@ -230,7 +231,7 @@ def _build_consulta_result(response):
 def consultar_datos_renaper(dni, sexo):
     try:
         client = APIClient()
-        response = client.consultar_ciudadano(dni, sexo)
+        response = consultar_renaper_con_cache(dni, sexo, client.consultar_ciudadano)
 
         if not response["success"]:
             return _build_error_result(
@@ -8,6 +8,7 @@ from centrodefamilia.models import (
     ParticipanteActividadHistorial,
 )
 from ciudadanos.models import Ciudadano
+from dashboard.rollups import recalcular_rollups
 
 logger = logging.getLogger("django")
 
@@ -88,6 +89,9 @@ class ParticipanteService:
             if c.documento not in existing
         ]
         ParticipanteActividad.objects.bulk_create(nuevos, ignore_conflicts=True)
+        # bulk_create no dispara senales y con ignore_conflicts no se sabe
+        # cuantas filas entraron: se recalcula el indicador.
+        recalcular_rollups("participantes_total")
         return len(nuevos)
 
     @staticmethod
@@ -209,4 +213,4 @@ class ParticipanteService:
 
     @staticmethod
     def buscar_ciudadanos_por_documento(query, max_results=10):
-        return list(Ciudadano.buscar_por_documento(query, max_results=max_results))
+        return list(Ciudadano.buscar(query, max_results=max_results))
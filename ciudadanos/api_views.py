@@ -1,7 +1,7 @@
-from django.db.models import Q
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 from ciudadanos.models import Ciudadano
+from ciudadanos.services_busqueda import buscar_ciudadanos_por_nombre
 
 
 @require_GET
@@ -19,16 +19,7 @@ def buscar_ciudadanos(request):
         )
     else:
         # Búsqueda por nombre/apellido o identificador_interno (para SIN_DNI)
-        qs = Ciudadano.objects.filter(
-            Q(apellido__icontains=query)
-            | Q(nombre__icontains=query)
-            | Q(identificador_interno__icontains=query)
-        )
-        if exclude_id:
-            qs = qs.exclude(pk=exclude_id)
-        qs = qs.only(
-            "id", "nombre", "apellido", "documento", "tipo_registro_identidad"
-        ).order_by("apellido", "nombre")[:10]
+        qs = buscar_ciudadanos_por_nombre(query, max_results=10, exclude_id=exclude_id)
 
     results = []
     for c in qs.values(
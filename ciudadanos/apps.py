@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CiudadanoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ciudadanos"
+
+    def ready(self):
+        import ciudadanos.signals  # pylint: disable=unused-import, import-outside-toplevel
+        from ciudadanos.services_importacion_masiva_jobs import (  # pylint: disable=import-outside-toplevel
+            CIUDADANOS_IMPORT_JOB_QUEUE,
+        )
+        from core.jobs import (  # pylint: disable=import-outside-toplevel
+            registrar_cola_jobs,
+        )
+
+        registrar_cola_jobs(CIUDADANOS_IMPORT_JOB_QUEUE)
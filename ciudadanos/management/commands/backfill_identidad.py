@@ -35,6 +35,7 @@ from django.db import transaction
 from django.db.models import Count
 
 from ciudadanos.models import Ciudadano
+from ciudadanos.services_busqueda import reindexar_ciudadanos
 
 logger = logging.getLogger("django")
 
@@ -119,6 +120,14 @@ class Command(BaseCommand):
         self.stdout.write(f"  Ya tienen identificador:     {ya_procesados}")
         self.stdout.write("")
 
+    @staticmethod
+    def _reindexar_lote(pendientes, batch_size, final=False):
+        # QuerySet.update() no dispara post_save y identificador_interno es un
+        # campo de la busqueda indexada: se reindexa por lote.
+        if pendientes and (final or len(pendientes) >= batch_size):
+            reindexar_ciudadanos(pendientes)
+            pendientes.clear()
+
     def _backfill_sin_documento(self, dry_run, batch_size):
         """Ciudadanos sin documento → SIN_DNI."""
         qs = Ciudadano.all_objects.filter(
@@ -129,6 +138,7 @@ class Command(BaseCommand):
         self.stdout.write(f"Procesando {total} ciudadanos sin documento...")
 
         procesados = 0
+        pendientes = []
         for ciudadano in qs.iterator(chunk_size=batch_size):
             identificador = f"CIU-{ciudadano.pk}"
             if not dry_run:
@@ -139,7 +149,10 @@ class Command(BaseCommand):
                         documento_unico_key=None,
                         requiere_revision_manual=True,
                     )
+                pendientes.append(ciudadano.pk)
+                self._reindexar_lote(pendientes, batch_size)
             procesados += 1
+        self._reindexar_lote(pendientes, batch_size, final=True)
 
         self.stdout.write(
             self.style.SUCCESS(f"  Sin documento: {procesados} procesados.")
@@ -171,6 +184,7 @@ class Command(BaseCommand):
 
         procesados_unicos = 0
         procesados_duplicados = 0
+        pendientes = []
 
         for ciudadano in qs.iterator(chunk_size=batch_size):
             identificador = f"CIU-{ciudadano.pk}"
@@ -188,6 +202,7 @@ class Command(BaseCommand):
                             documento_unico_key=None,
                             requiere_revision_manual=True,
                         )
+                    pendientes.append(ciudadano.pk)
                 procesados_duplicados += 1
             else:
                 doc_key = f"{ciudadano.tipo_documento}_{ciudadano.documento}"
@@ -199,7 +214,10 @@ class Command(BaseCommand):
                             documento_unico_key=doc_key,
                             requiere_revision_manual=False,
                         )
+                    pendientes.append(ciudadano.pk)
                 procesados_unicos += 1
+            self._reindexar_lote(pendientes, batch_size)
+        self._reindexar_lote(pendientes, batch_size, final=True)
 
         self.stdout.write(
             self.style.SUCCESS(f"  ESTANDAR (únicos):         {procesados_unicos}")
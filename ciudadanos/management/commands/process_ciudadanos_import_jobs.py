@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
 
 from ciudadanos.services_importacion_masiva_jobs import (
-    run_ciudadanos_import_jobs_worker,
+    CIUDADANOS_IMPORT_JOB_QUEUE,
 )
+from core.jobs import run_job_worker
 
 
 class Command(BaseCommand):
@@ -16,4 +17,6 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        run_ciudadanos_import_jobs_worker(once=options["once"])
+        run_job_worker(
+            queue_names=[CIUDADANOS_IMPORT_JOB_QUEUE.name], once=options["once"]
+        )
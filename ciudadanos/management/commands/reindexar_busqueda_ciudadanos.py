@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from ciudadanos.models import Ciudadano
+from ciudadanos.services_busqueda import REINDEX_BATCH_SIZE, reindexar_ciudadanos
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los terminos de busqueda por nombre de los ciudadanos "
+        "(incluye los dados de baja logica). Es idempotente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REINDEX_BATCH_SIZE,
+            dest="batch_size",
+            help=f"Ciudadanos por lote (default: {REINDEX_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--desde-id",
+            type=int,
+            default=0,
+            dest="desde_id",
+            help="Retoma desde este id (exclusivo).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        ultimo_id = options["desde_id"]
+        procesados = 0
+        terminos = 0
+        while True:
+            ids = list(
+                Ciudadano.all_objects.filter(pk__gt=ultimo_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            terminos += reindexar_ciudadanos(ids)
+            procesados += len(ids)
+            ultimo_id = ids[-1]
+            self.stdout.write(f"ultimo_id: {ultimo_id}")
+        self.stdout.write(f"procesados: {procesados}")
+        self.stdout.write(f"terminos: {terminos}")
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.16 on 2026-10-18 03:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "ciudadanos",
+            "0029_ciudadano_estado_revision_manual_squashed_0030_ciudadanos_import_jobs",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CiudadanoTerminoBusqueda",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("termino", models.CharField(max_length=64)),
+                (
+                    "ciudadano",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terminos_busqueda",
+                        to="ciudadanos.ciudadano",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Término de búsqueda de ciudadano",
+                "verbose_name_plural": "Términos de búsqueda de ciudadanos",
+                "indexes": [
+                    models.Index(
+                        fields=["termino", "ciudadano"], name="ciud_term_busq_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ciudadano", "termino"), name="ciud_term_busq_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
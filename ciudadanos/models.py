@@ -6,6 +6,7 @@ from django.urls import reverse
 from django.utils import timezone
 from django.core.validators import MaxValueValidator as MaxValidator
 
+from core.field_tracking import FieldTrackingMixin
 from core.models import Localidad, Municipio, Nacionalidad, Programa, Provincia, Sexo
 from core.soft_delete import SoftDeleteModelMixin
 
@@ -16,9 +17,12 @@ def ciudadanos_import_job_upload_to(instance, filename):
     return f"ciudadanos/import_jobs/{instance.requested_by_id}/{filename}"
 
 
-class Ciudadano(SoftDeleteModelMixin, models.Model):
+class Ciudadano(FieldTrackingMixin, SoftDeleteModelMixin, models.Model):
     """Datos básicos del ciudadano/a."""
 
+    # Solo los campos de la busqueda indexada (ciudadanos.services_busqueda).
+    tracked_fields = ("apellido", "nombre", "identificador_interno")
+
     SOFT_DELETE_OPERATIONAL_UPDATES = {"activo": False}
     SOFT_RESTORE_OPERATIONAL_UPDATES = {"activo": True}
 
@@ -426,6 +430,26 @@ class Ciudadano(SoftDeleteModelMixin, models.Model):
             "requiere_revision_manual",
         ).order_by("documento")[:max_results]
 
+    @classmethod
+    def buscar(cls, query, max_results=10, exclude_id=None):
+        """
+        Picker por DNI o por nombre: los digitos van por prefijo de documento y
+        el resto por la busqueda indexada, si esta habilitada.
+        """
+        from ciudadanos.services_busqueda import (  # pylint: disable=import-outside-toplevel
+            buscar_ciudadanos_por_nombre,
+            is_busqueda_indexada_enabled,
+        )
+
+        cleaned = (query or "").strip()
+        if cleaned.isdigit() or not is_busqueda_indexada_enabled() or len(cleaned) < 3:
+            return cls.buscar_por_documento(
+                cleaned, max_results=max_results, exclude_id=exclude_id
+            )
+        return buscar_ciudadanos_por_nombre(
+            cleaned, max_results=max_results, exclude_id=exclude_id
+        )
+
     @property
     def edad(self) -> int:
         """Calcula la edad del ciudadano."""
@@ -455,6 +479,33 @@ class Ciudadano(SoftDeleteModelMixin, models.Model):
         return reverse("ciudadanos_ver", kwargs={"pk": self.pk})
 
 
+class CiudadanoTerminoBusqueda(models.Model):
+    """Termino normalizado de nombre/apellido/identificador para la busqueda."""
+
+    ciudadano = models.ForeignKey(
+        Ciudadano,
+        on_delete=models.CASCADE,
+        related_name="terminos_busqueda",
+    )
+    termino = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = "Término de búsqueda de ciudadano"
+        verbose_name_plural = "Términos de búsqueda de ciudadanos"
+        indexes = [
+            # Cubre la busqueda por prefijo: termino LIKE 'x%' -> ciudadano_id.
+            models.Index(fields=["termino", "ciudadano"], name="ciud_term_busq_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ciudadano", "termino"], name="ciud_term_busq_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ciudadano_id}: {self.termino}"
+
+
 class CiudadanosImportJob(models.Model):
     class Status(models.TextChoices):
         PENDING = "pending", "Pendiente"
@@ -495,6 +546,8 @@ class CiudadanosImportJob(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
     last_activity_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    available_at = models.DateTimeField(null=True, blank=True)
+    retry_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-requested_at", "-id"]
@@ -0,0 +1,234 @@
+"""
+Busqueda indexada de ciudadanos por nombre, apellido e identificador interno.
+
+``apellido__icontains | nombre__icontains`` no puede usar indices y recorre la
+tabla completa. Cada ciudadano guarda sus terminos normalizados (minusculas,
+sin acentos ni puntuacion) en ``CiudadanoTerminoBusqueda`` y la busqueda se
+resuelve con prefijos sobre el indice ``(termino, ciudadano)``:
+
+    "garcia ju"  ->  termino LIKE 'garcia%' AND termino LIKE 'ju%'
+
+Cada palabra buscada tiene que ser prefijo de algun termino del ciudadano
+(el orden no importa). Funciona igual en MySQL y en SQLite.
+
+Los terminos se actualizan en ``post_save`` cuando cambia alguno de los campos
+indexados (ver ``ciudadanos.signals``). Las altas por ``bulk_create`` o los
+cambios por ``QuerySet.update()`` tienen que llamar a ``reindexar_ciudadanos``;
+el comando ``reindexar_busqueda_ciudadanos`` recorre la tabla completa.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.services.gazetteer import normalize_text
+
+CAMPOS_INDEXADOS = ("apellido", "nombre", "identificador_interno")
+TERMINO_MAX_LENGTH = 64
+REINDEX_BATCH_SIZE = 1000
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def is_busqueda_indexada_enabled() -> bool:
+    return bool(getattr(settings, "CIUDADANOS_BUSQUEDA_INDEXADA_ENABLED", False))
+
+
+def tokenizar(texto) -> list[str]:
+    """
+    Terminos normalizados de un texto, sin repetir y en orden de aparicion.
+
+    Las palabras con puntuacion interna se indexan partidas y unidas
+    ("D'Angelo" -> "d", "angelo", "dangelo"; "CIU-12" -> "ciu", "12", "ciu12").
+    """
+    terminos = []
+    for palabra in normalize_text(texto).split():
+        partes = [p for p in _NO_ALFANUMERICO.split(palabra) if p]
+        candidatos = partes + (["".join(partes)] if len(partes) > 1 else [])
+        for termino in candidatos:
+            termino = termino[:TERMINO_MAX_LENGTH]
+            if termino not in terminos:
+                terminos.append(termino)
+    return terminos
+
+
+def terminos_de_consulta(texto) -> list[str]:
+    """Prefijos a buscar; las letras sueltas se ignoran si hay otras palabras."""
+    terminos = []
+    for palabra in normalize_text(texto).split():
+        termino = "".join(_NO_ALFANUMERICO.split(palabra))[:TERMINO_MAX_LENGTH]
+        if termino and termino not in terminos:
+            terminos.append(termino)
+    largos = [t for t in terminos if len(t) > 1]
+    return largos or terminos
+
+
+def terminos_de_ciudadano(apellido, nombre, identificador_interno) -> list[str]:
+    terminos = []
+    for valor in (apellido, nombre, identificador_interno):
+        for termino in tokenizar(valor):
+            if termino not in terminos:
+                terminos.append(termino)
+    return terminos
+
+
+def filtro_busqueda_nombre(texto, relacion=None) -> Q:
+    """
+    ``Q`` que exige que cada palabra sea prefijo de algun termino del
+    ciudadano. ``relacion`` ("ciudadano", "inscripcion__ciudadano") permite
+    usarlo desde modelos que apuntan a ``Ciudadano``. Un texto sin palabras no
+    filtra nada.
+    """
+    from ciudadanos.models import (  # pylint: disable=import-outside-toplevel
+        CiudadanoTerminoBusqueda,
+    )
+
+    lookup = f"{relacion}_id__in" if relacion else "pk__in"
+    filtro = Q()
+    for termino in terminos_de_consulta(texto):
+        # istartswith: en MySQL ``startswith`` es ``LIKE BINARY`` y no usa el
+        # indice; los terminos ya estan en minusculas.
+        filtro &= Q(
+            **{
+                lookup: CiudadanoTerminoBusqueda.objects.filter(
+                    termino__istartswith=termino
+                ).values("ciudadano_id")
+            }
+        )
+    return filtro
+
+
+def filtro_busqueda_legacy(texto, relacion=None) -> Q:
+    if relacion:
+        return Q(**{f"{relacion}__apellido__icontains": texto}) | Q(
+            **{f"{relacion}__nombre__icontains": texto}
+        )
+    return (
+        Q(apellido__icontains=texto)
+        | Q(nombre__icontains=texto)
+        | Q(identificador_interno__icontains=texto)
+    )
+
+
+def filtro_nombre_ciudadano(texto, relacion=None) -> Q:
+    """Filtro por nombre con el indice si esta habilitado; si no, ``icontains``."""
+    if is_busqueda_indexada_enabled():
+        return filtro_busqueda_nombre(texto, relacion=relacion)
+    return filtro_busqueda_legacy(texto, relacion=relacion)
+
+
+def filtrar_por_nombre(queryset, texto):
+    return queryset.filter(filtro_nombre_ciudadano(texto))
+
+
+def ordenar_por_relevancia(queryset, texto):
+    """
+    Ordena primero a quienes tienen mas palabras coincidentes completas
+    ("perez" antes que "pereyra" al buscar "perez"), despues por apellido y
+    nombre.
+    """
+    from ciudadanos.models import (  # pylint: disable=import-outside-toplevel
+        CiudadanoTerminoBusqueda,
+    )
+
+    terminos = terminos_de_consulta(texto)
+    if not terminos or not is_busqueda_indexada_enabled():
+        return queryset.order_by("apellido", "nombre", "pk")
+    exactos = (
+        CiudadanoTerminoBusqueda.objects.filter(
+            ciudadano_id=OuterRef("pk"), termino__in=terminos
+        )
+        .order_by()
+        .values("ciudadano_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return queryset.annotate(
+        relevancia=Coalesce(
+            Subquery(exactos, output_field=IntegerField()),
+            Value(0),
+        )
+    ).order_by("-relevancia", "apellido", "nombre", "pk")
+
+
+def buscar_ciudadanos_por_nombre(texto, max_results=10, exclude_id=None):
+    """Picker de ciudadanos: filtro por terminos y orden por relevancia."""
+    from ciudadanos.models import Ciudadano  # pylint: disable=import-outside-toplevel
+
+    if not terminos_de_consulta(texto):
+        return Ciudadano.objects.none()
+    qs = filtrar_por_nombre(Ciudadano.objects.all(), texto)
+    if exclude_id:
+        qs = qs.exclude(pk=exclude_id)
+    qs = qs.only(
+        "id",
+        "nombre",
+        "apellido",
+        "documento",
+        "tipo_registro_identidad",
+        "requiere_revision_manual",
+    )
+    return ordenar_por_relevancia(qs, texto)[:max_results]
+
+
+def reindexar_ciudadanos(ciudadano_ids, using=None) -> int:
+    """Reemplaza los terminos de los ciudadanos indicados. Devuelve cuantos escribio."""
+    from ciudadanos.models import (  # pylint: disable=import-outside-toplevel
+        Ciudadano,
+        CiudadanoTerminoBusqueda,
+    )
+
+    ids = sorted({pk for pk in ciudadano_ids if pk is not None})
+    if not ids:
+        return 0
+    using = using or "default"
+    escritos = 0
+    for inicio in range(0, len(ids), REINDEX_BATCH_SIZE):
+        lote = ids[inicio : inicio + REINDEX_BATCH_SIZE]
+        filas = (
+            Ciudadano.all_objects.using(using)
+            .filter(pk__in=lote)
+            .values_list("pk", *CAMPOS_INDEXADOS)
+        )
+        nuevos = [
+            CiudadanoTerminoBusqueda(ciudadano_id=pk, termino=termino)
+            for pk, apellido, nombre, identificador in filas
+            for termino in terminos_de_ciudadano(apellido, nombre, identificador)
+        ]
+        with transaction.atomic(using=using):
+            CiudadanoTerminoBusqueda.objects.using(using).filter(
+                ciudadano_id__in=lote
+            ).delete()
+            CiudadanoTerminoBusqueda.objects.using(using).bulk_create(
+                nuevos, batch_size=REINDEX_BATCH_SIZE
+            )
+        escritos += len(nuevos)
+    return escritos
+
+
+def reindexar_ciudadano(ciudadano, nuevo=False) -> int:
+    """Reescribe los terminos de una instancia ya guardada sin releerla."""
+    from ciudadanos.models import (  # pylint: disable=import-outside-toplevel
+        CiudadanoTerminoBusqueda,
+    )
+
+    using = ciudadano._state.db or "default"
+    nuevos = [
+        CiudadanoTerminoBusqueda(ciudadano_id=ciudadano.pk, termino=termino)
+        for termino in terminos_de_ciudadano(
+            *(getattr(ciudadano, campo) for campo in CAMPOS_INDEXADOS)
+        )
+    ]
+    terminos = CiudadanoTerminoBusqueda.objects.using(using)
+    if nuevo:
+        # Alta: no hay terminos previos que borrar.
+        terminos.bulk_create(nuevos)
+        return len(nuevos)
+    with transaction.atomic(using=using):
+        terminos.filter(ciudadano_id=ciudadano.pk).delete()
+        terminos.bulk_create(nuevos)
+    return len(nuevos)
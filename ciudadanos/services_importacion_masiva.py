@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from collections.abc import Callable
 from dataclasses import dataclass
 from io import BytesIO
 
@@ -373,6 +374,25 @@ def _get_existing_estandar_by_dni(dni: str) -> Ciudadano | None:
     )
 
 
+def get_existing_estandar_documentos(dnis) -> set[int]:
+    """Documentos (de ``dnis``) que ya tienen ciudadano estandar, en una consulta."""
+    documentos = set()
+    for dni in dnis:
+        try:
+            documentos.add(int(dni))
+        except (TypeError, ValueError):
+            continue
+    if not documentos:
+        return set()
+    return set(
+        Ciudadano.objects.filter(
+            tipo_registro_identidad=Ciudadano.TIPO_REGISTRO_ESTANDAR,
+            tipo_documento=Ciudadano.DOCUMENTO_DNI,
+            documento__in=documentos,
+        ).values_list("documento", flat=True)
+    )
+
+
 def _extract_renaper_cuil(result: dict[str, object]) -> str:
     data = result.get("data") or {}
     datos_api = result.get("datos_api") or {}
@@ -437,15 +457,25 @@ def _normalize_ciudadano_payload_foreign_keys(
             ciudadano_data[f"{field_name}_id"] = value
 
 
-def _lookup_renaper_for_row(
+def lookup_renaper_for_import_row(
     row: ParsedCiudadanosImportRow,
+    *,
+    before_request: Callable[[], None] | None = None,
 ) -> dict[str, object]:
+    """
+    Consulta RENAPER para la fila probando los sexos posibles.
+
+    ``before_request`` se invoca antes de cada llamada al servicio externo (lo usa
+    el presupuesto global de consultas por segundo del lote).
+    """
     sexos = (row.sexo,) if row.sexo else RENAPER_SEXOS
     attempted: list[str] = []
     last_result: dict[str, object] | None = None
 
     for sexo in sexos:
         attempted.append(sexo)
+        if before_request is not None:
+            before_request()
         result = consultar_datos_renaper(row.dni, sexo)
         result["sexo_consultado"] = sexo
         result["sexos_intentados"] = attempted.copy()
@@ -536,7 +566,14 @@ def process_ciudadanos_import_row(
     *,
     row: ParsedCiudadanosImportRow,
     requested_by,
+    renaper_result: dict[str, object] | None = None,
 ) -> dict[str, object]:
+    """
+    Procesa una fila del lote.
+
+    ``renaper_result`` permite reutilizar una consulta RENAPER precargada en
+    paralelo; si no viene, la consulta se hace en el momento.
+    """
     if row.parse_error:
         return {
             "status": "failed",
@@ -560,7 +597,7 @@ def process_ciudadanos_import_row(
             "contacted_renaper": False,
         }
 
-    result = _lookup_renaper_for_row(row)
+    result = renaper_result or lookup_renaper_for_import_row(row)
     sexos_intentados = ",".join(result.get("sexos_intentados") or [])
     if not result.get("success"):
         error_type = str(result.get("error_type") or "renaper_error")
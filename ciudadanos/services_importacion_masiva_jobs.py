@@ -2,12 +2,9 @@ from __future__ import annotations
 
 import logging
 import os
-import time
-from datetime import timedelta
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import OperationalError, models
 from django.http import Http404
 from django.utils import timezone
 
@@ -18,15 +15,17 @@ from ciudadanos.services_importacion_masiva import (
     process_ciudadanos_import_row,
     validate_ciudadanos_import_workbook,
 )
+from ciudadanos.services_importacion_masiva_renaper import (
+    RenaperLookupPipeline,
+    RenaperRequestBudget,
+)
+from core.jobs import JobQueue, claim_next_job
 
 logger = logging.getLogger("django")
 DEFAULT_CIUDADANOS_IMPORT_JOB_POLL_SECONDS = 5
 DEFAULT_CIUDADANOS_IMPORT_JOB_STALE_SECONDS = 900
-DEFAULT_CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS = 1.0
-STALE_JOB_ERROR_MESSAGE = (
-    "El lote se interrumpio antes de finalizar. "
-    "Puede reanudarlo desde la ultima fila pendiente."
-)
+DEFAULT_CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT = 4
+DEFAULT_CIUDADANOS_IMPORT_RENAPER_MAX_RPS = 5
 
 
 def _setting_or_env(name: str):
@@ -44,9 +43,9 @@ def _safe_positive_int(value, default: int) -> int:
     return parsed if parsed > 0 else default
 
 
-def _safe_non_negative_float(value, default: float) -> float:
+def _safe_non_negative_int(value, default: int) -> int:
     try:
-        parsed = float(str(value).strip())
+        parsed = int(str(value).strip())
     except (TypeError, ValueError):
         return default
     return parsed if parsed >= 0 else default
@@ -66,10 +65,18 @@ def get_ciudadanos_import_job_stale_seconds() -> int:
     )
 
 
-def get_ciudadanos_import_renaper_sleep_seconds() -> float:
-    return _safe_non_negative_float(
-        _setting_or_env("CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS"),
-        DEFAULT_CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS,
+def get_ciudadanos_import_renaper_max_in_flight() -> int:
+    return _safe_positive_int(
+        _setting_or_env("CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT"),
+        DEFAULT_CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT,
+    )
+
+
+def get_ciudadanos_import_renaper_max_rps() -> int:
+    """Consultas RENAPER por segundo entre todos los workers (0 = sin tope)."""
+    return _safe_non_negative_int(
+        _setting_or_env("CIUDADANOS_IMPORT_RENAPER_MAX_RPS"),
+        DEFAULT_CIUDADANOS_IMPORT_RENAPER_MAX_RPS,
     )
 
 
@@ -133,64 +140,9 @@ def request_resume_ciudadanos_import_job(
     return job
 
 
-def mark_stale_ciudadanos_import_jobs_as_failed() -> int:
-    stale_threshold = timezone.now() - timedelta(
-        seconds=get_ciudadanos_import_job_stale_seconds()
-    )
-    stale_jobs = CiudadanosImportJob.objects.filter(
-        status=CiudadanosImportJob.Status.PROCESSING,
-    ).filter(
-        models.Q(last_activity_at__isnull=True)
-        | models.Q(last_activity_at__lt=stale_threshold)
-    )
-    updated_count = 0
-    for job in stale_jobs.iterator():
-        now = timezone.now()
-        job.status = CiudadanosImportJob.Status.FAILED
-        job.last_error_message = STALE_JOB_ERROR_MESSAGE
-        job.last_error_type = "stale_job"
-        job.last_error_at = now
-        job.finished_at = now
-        job.last_activity_at = now
-        job.save(
-            update_fields=[
-                "status",
-                "last_error_message",
-                "last_error_type",
-                "last_error_at",
-                "finished_at",
-                "last_activity_at",
-            ]
-        )
-        updated_count += 1
-    return updated_count
-
-
 def claim_next_ciudadanos_import_job() -> CiudadanosImportJob | None:
-    candidate_ids = list(
-        CiudadanosImportJob.objects.filter(status=CiudadanosImportJob.Status.PENDING)
-        .order_by("requested_at", "id")
-        .values_list("id", flat=True)[:20]
-    )
-    now = timezone.now()
-    for job_id in candidate_ids:
-        updated = CiudadanosImportJob.objects.filter(
-            pk=job_id,
-            status=CiudadanosImportJob.Status.PENDING,
-        ).update(
-            status=CiudadanosImportJob.Status.PROCESSING,
-            finished_at=None,
-            last_activity_at=now,
-        )
-        if not updated:
-            continue
-
-        job = CiudadanosImportJob.objects.get(pk=job_id)
-        if not job.started_at:
-            job.started_at = now
-            job.save(update_fields=["started_at"])
-        return job
-    return None
+    """Reclama el próximo lote pendiente con el motor compartido de jobs."""
+    return claim_next_job(CIUDADANOS_IMPORT_JOB_QUEUE)
 
 
 def _recalculate_job_counters(job: CiudadanosImportJob) -> None:
@@ -477,96 +429,77 @@ def process_ciudadanos_import_job(
     if job.next_row_index >= total_rows:
         return _mark_job_completed(job)
 
-    renaper_sleep_seconds = get_ciudadanos_import_renaper_sleep_seconds()
-    for row_index in range(job.next_row_index, total_rows):
-        row = rows[row_index]
-        _start_job_row_attempt(job=job, row_index=row_index, row=row)
-        row_log = _get_job_row_log(job=job, row=row)
-
-        try:
-            result = process_ciudadanos_import_row(
-                row=row,
-                requested_by=job.requested_by,
-            )
-        except Exception as exc:
-            logger.exception(
-                (
-                    "Fallo inesperado procesando lote de ciudadanos. "
-                    "job_id=%s fila=%s documento=%s"
-                ),
-                job.id,
-                row.fila,
-                row.documento_raw,
-            )
-            error_detail = str(exc).strip()
-            message = "Ocurrio un error inesperado al procesar la fila."
-            if error_detail:
-                message = f"{message} Detalle: {error_detail}"
-            result = {
-                "status": "failed",
-                "mensaje": message,
-                "error_type": "unexpected_row_error",
-                "sexos_intentados": "",
-                "ciudadano": None,
-                "systemic": False,
-                "contacted_renaper": False,
-            }
-
-        if result.get("systemic"):
-            return _save_row_pending_after_systemic_error(
+    pipeline = RenaperLookupPipeline(
+        rows,
+        start_index=job.next_row_index,
+        max_in_flight=get_ciudadanos_import_renaper_max_in_flight(),
+        budget=RenaperRequestBudget(get_ciudadanos_import_renaper_max_rps()),
+    )
+    with pipeline:
+        for row_index in range(job.next_row_index, total_rows):
+            row = rows[row_index]
+            _start_job_row_attempt(job=job, row_index=row_index, row=row)
+            row_log = _get_job_row_log(job=job, row=row)
+
+            try:
+                result = process_ciudadanos_import_row(
+                    row=row,
+                    requested_by=job.requested_by,
+                    renaper_result=pipeline.result_for(row_index),
+                )
+            except Exception as exc:
+                logger.exception(
+                    (
+                        "Fallo inesperado procesando lote de ciudadanos. "
+                        "job_id=%s fila=%s documento=%s"
+                    ),
+                    job.id,
+                    row.fila,
+                    row.documento_raw,
+                )
+                error_detail = str(exc).strip()
+                message = "Ocurrio un error inesperado al procesar la fila."
+                if error_detail:
+                    message = f"{message} Detalle: {error_detail}"
+                result = {
+                    "status": "failed",
+                    "mensaje": message,
+                    "error_type": "unexpected_row_error",
+                    "sexos_intentados": "",
+                    "ciudadano": None,
+                    "systemic": False,
+                    "contacted_renaper": False,
+                }
+
+            if result.get("systemic"):
+                return _save_row_pending_after_systemic_error(
+                    job=job,
+                    row_log=row_log,
+                    row=row,
+                    result=result,
+                )
+
+            job = _save_row_processed(
                 job=job,
                 row_log=row_log,
                 row=row,
                 result=result,
+                next_row_index=row_index + 1,
             )
 
-        job = _save_row_processed(
-            job=job,
-            row_log=row_log,
-            row=row,
-            result=result,
-            next_row_index=row_index + 1,
-        )
-        if (
-            result.get("contacted_renaper")
-            and renaper_sleep_seconds > 0
-            and row_index + 1 < total_rows
-        ):
-            time.sleep(renaper_sleep_seconds)
-
     return _mark_job_completed(job)
 
 
-def process_next_ciudadanos_import_job() -> bool:
-    try:
-        mark_stale_ciudadanos_import_jobs_as_failed()
-        job = claim_next_ciudadanos_import_job()
-    except OperationalError:
-        logger.exception(
-            "No se pudieron consultar lotes pendientes de importacion de ciudadanos."
-        )
-        return False
-
-    if not job:
-        return False
+def _fail_ciudadanos_import_job(job: CiudadanosImportJob, message: str) -> None:
+    _record_job_level_failure(job=job, message=message, error_type="unexpected")
 
-    process_ciudadanos_import_job(job)
-    return True
 
-
-def run_ciudadanos_import_jobs_worker(*, once: bool = False) -> None:
-    poll_seconds = get_ciudadanos_import_job_poll_seconds()
-    while True:
-        try:
-            processed_job = process_next_ciudadanos_import_job()
-        except Exception:
-            logger.exception("Fallo inesperado en el worker de importacion ciudadanos.")
-            if once:
-                raise
-            time.sleep(poll_seconds)
-            continue
-        if once:
-            return
-        if processed_job:
-            continue
-        time.sleep(poll_seconds)
+CIUDADANOS_IMPORT_JOB_QUEUE = JobQueue(
+    name="ciudadanos_import",
+    model=CiudadanosImportJob,
+    process=process_ciudadanos_import_job,
+    fail=_fail_ciudadanos_import_job,
+    get_stale_seconds=get_ciudadanos_import_job_stale_seconds,
+    stale_updates={"last_error_type": "stale_job"},
+    get_poll_seconds=get_ciudadanos_import_job_poll_seconds,
+)
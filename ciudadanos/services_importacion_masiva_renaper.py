@@ -0,0 +1,129 @@
+"""
+Consultas RENAPER concurrentes para la importacion masiva de ciudadanos.
+
+Mientras el worker persiste una fila, un pool acotado de hilos ya consulta
+RENAPER para las siguientes. Todas las llamadas al servicio externo pasan por
+un presupuesto global de consultas por segundo compartido entre workers (via
+``users.rate_limits``), asi subir la concurrencia no satura al proveedor.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.db import connection
+
+from ciudadanos.services_importacion_masiva import (
+    ParsedCiudadanosImportRow,
+    get_existing_estandar_documentos,
+    lookup_renaper_for_import_row,
+)
+from users.rate_limits import hit_rate_limit
+
+logger = logging.getLogger("django")
+
+RENAPER_BUDGET_SCOPE = "ciudadanos_import_renaper"
+
+
+class RenaperRequestBudget:
+    """Limita las consultas RENAPER por segundo entre todos los workers."""
+
+    def __init__(self, requests_per_second: int):
+        self.requests_per_second = max(0, int(requests_per_second))
+
+    def acquire(self) -> None:
+        """Bloquea hasta que haya cupo en la ventana del segundo actual."""
+        if not self.requests_per_second:
+            return
+        wait_seconds = 1 / self.requests_per_second
+        while hit_rate_limit(
+            scope=RENAPER_BUDGET_SCOPE,
+            identity="global",
+            limit=self.requests_per_second,
+            window_seconds=1,
+        ):
+            time.sleep(wait_seconds)
+
+
+class RenaperLookupPipeline:
+    """
+    Precarga consultas RENAPER de las proximas filas con concurrencia acotada.
+
+    Se consulta solo lo que el procesamiento secuencial consultaria: filas sin
+    error de parseo y sin ciudadano estandar existente. El resultado se consume
+    por indice de fila y la persistencia (y el checkpoint) sigue siendo
+    secuencial en el worker.
+    """
+
+    def __init__(
+        self,
+        rows: list[ParsedCiudadanosImportRow],
+        *,
+        start_index: int,
+        max_in_flight: int,
+        budget: RenaperRequestBudget,
+    ):
+        self.rows = rows
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.lookahead = self.max_in_flight * 2
+        self.budget = budget
+        self._cursor = start_index
+        self._futures: dict[int, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight,
+            thread_name_prefix="renaper-import",
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _lookup(self, row: ParsedCiudadanosImportRow) -> dict[str, object]:
+        try:
+            return lookup_renaper_for_import_row(
+                row, before_request=self.budget.acquire
+            )
+        finally:
+            # Cada hilo abre su propia conexion (p. ej. el proveedor resuelve Sexo).
+            connection.close()
+
+    def _prefetch_until(self, end_index: int) -> None:
+        end_index = min(end_index, len(self.rows))
+        if self._cursor >= end_index:
+            return
+        chunk = range(self._cursor, end_index)
+        existentes = get_existing_estandar_documentos(
+            self.rows[index].dni for index in chunk if not self.rows[index].parse_error
+        )
+        for index in chunk:
+            row = self.rows[index]
+            if row.parse_error or int(row.dni) in existentes:
+                continue
+            self._futures[index] = self._executor.submit(self._lookup, row)
+        self._cursor = end_index
+
+    def result_for(self, row_index: int) -> dict[str, object] | None:
+        """
+        Resultado RENAPER precargado para la fila, o None si no correspondia
+        consultar (el procesamiento de la fila decide en ese caso).
+        """
+        if self._cursor - row_index < self.max_in_flight:
+            self._prefetch_until(row_index + self.lookahead)
+        future = self._futures.pop(row_index, None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "Fallo la consulta RENAPER precargada; se reintenta en linea. fila=%s",
+                self.rows[row_index].fila,
+            )
+            return None
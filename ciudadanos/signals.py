@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from ciudadanos.models import Ciudadano
+from ciudadanos.services_busqueda import CAMPOS_INDEXADOS, reindexar_ciudadano
+
+
+@receiver(post_save, sender=Ciudadano)
+def actualizar_terminos_busqueda(sender, instance, created, **kwargs):
+    """Reescribe los terminos de busqueda si cambio nombre, apellido o identificador."""
+    if kwargs.get("raw"):
+        return
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not set(update_fields) & set(CAMPOS_INDEXADOS):
+        return
+    if created:
+        reindexar_ciudadano(instance, nuevo=True)
+    elif instance.changed_fields(CAMPOS_INDEXADOS):
+        reindexar_ciudadano(instance)
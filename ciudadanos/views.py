@@ -29,10 +29,15 @@ from ciudadanos.ciudadanos_filter_config import (
 from ciudadanos.forms import CiudadanoFiltroForm, CiudadanoForm, GrupoFamiliarForm
 from ciudadanos.detail_contributions import obtener_contexto_contribucion
 from ciudadanos.models import Ciudadano, GrupoFamiliar
+from ciudadanos.services_busqueda import filtrar_por_nombre
 from comedores.services.comedor_service import ComedorService
 from core.models import Localidad, Municipio
 from core.services.advanced_filters.engine import AdvancedFilterEngine
-from core.pagination import NoCountPaginator, build_no_count_page_range
+from core.pagination import (
+    KEYSET_CURSOR_PARAM,
+    NoCountPaginator,
+    build_no_count_page_range,
+)
 from core.security import safe_redirect
 from core.soft_delete.view_helpers import SoftDeleteDeleteViewMixin
 
@@ -55,7 +60,7 @@ LIST_ONLY_FIELDS = (
 
 
 def apply_ciudadanos_filters(queryset, cleaned_data):
-    """Aplica filtros indexables cuando el término es numérico."""
+    """Aplica filtros indexables: prefijo de documento o términos de nombre."""
 
     term = (cleaned_data.get("q") or "").strip()
     provincia = cleaned_data.get("provincia")
@@ -71,11 +76,7 @@ def apply_ciudadanos_filters(queryset, cleaned_data):
                 return queryset.none()
             queryset = queryset.filter(Ciudadano.documento_prefix_filter(term))
         else:
-            queryset = queryset.filter(
-                Q(apellido__icontains=term)
-                | Q(nombre__icontains=term)
-                | Q(identificador_interno__icontains=term)
-            )
+            queryset = filtrar_por_nombre(queryset, term)
 
     if provincia:
         queryset = queryset.filter(provincia=provincia)
@@ -155,7 +156,7 @@ class CiudadanosListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
 
     def get_filter_form_data(self):
         data = self.request.GET
-        if not data or set(data.keys()) <= {self.page_kwarg}:
+        if not data or set(data.keys()) <= {self.page_kwarg, KEYSET_CURSOR_PARAM}:
             data = data.copy()
             data["filters_mode"] = CiudadanoFiltroForm.FILTERS_MODE_UI
         return data
@@ -170,8 +171,14 @@ class CiudadanosListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         return CIUDADANOS_ADVANCED_FILTER.filter_queryset(queryset, self.request)
 
     def paginate_queryset(self, queryset, page_size):
-        paginator = NoCountPaginator(queryset.values_list("pk", flat=True), page_size)
-        page_obj = paginator.get_page(self.request.GET.get(self.page_kwarg))
+        # Keyset sobre pk: "Continuar" busca desde el ultimo id en vez de OFFSET.
+        paginator = NoCountPaginator(
+            queryset.values_list("pk", flat=True), page_size, ordering=("pk",)
+        )
+        page_obj = paginator.get_page(
+            self.request.GET.get(self.page_kwarg),
+            cursor=self.request.GET.get(KEYSET_CURSOR_PARAM),
+        )
         object_list = hydrate_ciudadanos_page(page_obj.object_list)
         page_obj.object_list = object_list
         return paginator, page_obj, object_list, page_obj.has_other_pages()
@@ -7,6 +7,15 @@ class ComedoresConfig(AppConfig):
 
     def ready(self):
         import comedores.signals  # pylint: disable=unused-import, import-outside-toplevel
+        from comedores.tasks import (  # pylint: disable=import-outside-toplevel
+            GESTIONAR_OUTBOX_KINDS,
+        )
+        from core.gestionar_outbox import (  # pylint: disable=import-outside-toplevel
+            registrar_tipo_outbox,
+        )
+
+        for kind in GESTIONAR_OUTBOX_KINDS:
+            registrar_tipo_outbox(kind)
         from comedores.favorite_filters import (  # pylint: disable=import-outside-toplevel
             registrar_filtros_favoritos,
         )
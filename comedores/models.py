@@ -11,6 +11,7 @@ from PIL import Image, ImageOps
 
 from core.models import Municipio, Provincia
 from core.models import Localidad
+from core.field_tracking import FieldTrackingMixin
 from core.fields import UnicodeEmailField
 from core.soft_delete import SoftDeleteModelMixin
 from organizaciones.models import Organizacion
@@ -34,7 +35,7 @@ class TipoDeComedor(models.Model):
         verbose_name_plural = "Tipos de comedor"
 
 
-class Referente(models.Model):
+class Referente(FieldTrackingMixin, models.Model):
     """
     Modelo que representa a un referente, en algun futuro se migrara a Ciudadano.
 
@@ -215,7 +216,7 @@ class EstadoHistorial(models.Model):
         verbose_name_plural = "Historiales de Estado de Comedor"
 
 
-class Comedor(SoftDeleteModelMixin, models.Model):
+class Comedor(FieldTrackingMixin, SoftDeleteModelMixin, models.Model):
     """
     Representa una Comedor/Merendero.
 
@@ -1242,7 +1243,7 @@ class AuditColaboradorEspacio(models.Model):
         )
 
 
-class ImagenComedor(models.Model):
+class ImagenComedor(FieldTrackingMixin, models.Model):
     ORIGEN_WEB = "web"
     ORIGEN_MOBILE = "mobile"
     ORIGEN_CHOICES = (
@@ -1,5 +1,4 @@
 import copy
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
@@ -8,6 +7,7 @@ from django.conf import settings
 from lxml import etree
 
 from comedores.utils import is_abordaje_comunitario_linea_tradicional_program
+from core.services.office_pdf import convertir_plantilla_docx_a_pdf
 
 
 W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
@@ -115,8 +115,6 @@ def generar_certificacion_prestaciones_pdf(*, comedor, periodo, usuario, source)
     with tempfile.TemporaryDirectory(prefix="certificacion-prestaciones-") as temp_dir:
         temp_path = Path(temp_dir)
         docx_path = temp_path / "certificacion.docx"
-        pdf_path = temp_path / "certificacion.pdf"
-        profile_uri = (temp_path / "libreoffice-profile").resolve().as_uri()
         _completar_plantilla(
             template_path,
             docx_path,
@@ -125,25 +123,8 @@ def generar_certificacion_prestaciones_pdf(*, comedor, periodo, usuario, source)
             usuario=usuario,
             source=source,
         )
-        result = subprocess.run(
-            [
-                "libreoffice",
-                "--headless",
-                "--nologo",
-                "--nodefault",
-                "--nofirststartwizard",
-                f"-env:UserInstallation={profile_uri}",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                str(temp_path),
-                str(docx_path),
-            ],
-            capture_output=True,
-            check=False,
-            timeout=120,
+        return convertir_plantilla_docx_a_pdf(
+            template_path,
+            docx_path,
+            error_message="No se pudo generar la certificación PDF.",
         )
-        if result.returncode != 0 or not pdf_path.exists():
-            detail = result.stderr.decode("utf-8", errors="replace").strip()
-            raise RuntimeError(detail or "No se pudo generar la certificación PDF.")
-        return pdf_path.read_bytes()
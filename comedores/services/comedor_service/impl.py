@@ -2,7 +2,6 @@ import logging
 import re
 from datetime import date, datetime
 from typing import Any
-import unicodedata
 
 from django.db.models import (
     Case,
@@ -51,7 +50,7 @@ from comedores.utils import (
     usa_datos_convenio_pnud,
 )
 from centrodefamilia.services.consulta_renaper import consultar_datos_renaper
-from core.models import Provincia, Municipio, Localidad, Nacionalidad
+from core.models import Provincia, Municipio, Localidad
 from admisiones.models.admisiones import (
     Admision,
     InformeComplementario,
@@ -67,6 +66,13 @@ logger = logging.getLogger("django")
 
 from core.security import safe_redirect
 from core.services.advanced_filters import AdvancedFilterEngine
+from core.services.gazetteer import (
+    apply_geo_alias,
+    get_gazetteer,
+    normalize_geo_name,
+    normalize_text,
+    replace_number_words,
+)
 from comedores.services.filter_config import (
     BOOL_OPS,
     CHOICE_OPS,
@@ -1165,7 +1171,7 @@ class ComedorService:
 
     @staticmethod
     def buscar_ciudadanos_por_documento(query, max_results=10):
-        return list(Ciudadano.buscar_por_documento(query, max_results=max_results))
+        return list(Ciudadano.buscar(query, max_results=max_results))
 
     @staticmethod
     def _parse_fecha_renaper(fecha_raw):
@@ -1194,49 +1200,7 @@ class ComedorService:
     @staticmethod
     def _replace_number_words(text):
         """Convierte palabras de números al comienzo del string a dígitos."""
-        if not text:
-            return ""
-        numbers = {
-            "uno": "1",
-            "una": "1",
-            "dos": "2",
-            "tres": "3",
-            "cuatro": "4",
-            "cinco": "5",
-            "seis": "6",
-            "siete": "7",
-            "ocho": "8",
-            "nueve": "9",
-            "diez": "10",
-            "once": "11",
-            "doce": "12",
-            "trece": "13",
-            "catorce": "14",
-            "quince": "15",
-            "dieciseis": "16",
-            "dieciséis": "16",
-            "diecisiete": "17",
-            "dieciocho": "18",
-            "diecinueve": "19",
-            "veinte": "20",
-            "veintiuno": "21",
-            "veintidos": "22",
-            "veintidós": "22",
-            "veintitres": "23",
-            "veintitrés": "23",
-            "veinticuatro": "24",
-            "veinticinco": "25",
-            "veintiseis": "26",
-            "veintiséis": "26",
-            "veintisiete": "27",
-            "veintiocho": "28",
-            "veintinueve": "29",
-            "treinta": "30",
-        }
-        parts = text.split()
-        if parts and parts[0] in numbers:
-            parts[0] = numbers[parts[0]]
-        return " ".join(parts)
+        return replace_number_words(text)
 
     @staticmethod
     def _to_camel_case(value):
@@ -1249,116 +1213,55 @@ class ComedorService:
     @staticmethod
     def _apply_geo_alias(value):
         """Reemplaza alias conocidos de nombres geográficos."""
-        if not value:
-            return ""
-        alias_map = {
-            "ciudad de buenos aires": "ciudad autonoma de buenos aires",
-            "ciudad autonoma de buenos aires": "ciudad autonoma de buenos aires",
-            "caba": "ciudad autonoma de buenos aires",
-            "capital federal": "ciudad autonoma de buenos aires",
-        }
-        text = str(value).replace("_", " ").replace("-", " ").lower()
-        text = " ".join(text.split())
-        return alias_map.get(text, value)
+        return apply_geo_alias(value)
 
     @staticmethod
     def _normalize_geo_value(value):
         """Normaliza nombres geográficos para comparación contra base local."""
-        if not value:
-            return ""
-        text = ComedorService._apply_geo_alias(value)
-        text = str(text)
-        text = text.replace("_", " ").replace("-", " ").lower()
-        text = (
-            unicodedata.normalize("NFKD", text)
-            .encode("ascii", "ignore")
-            .decode("utf-8")
-        )
-        text = " ".join(text.split())
-        return ComedorService._replace_number_words(text)
+        return normalize_geo_name(value)
 
     @staticmethod
     def _normalize_text(value):
-        if not value:
-            return ""
-        text = str(value)
-        text = text.replace("_", " ").replace("-", " ").lower()
-        text = (
-            unicodedata.normalize("NFKD", text)
-            .encode("ascii", "ignore")
-            .decode("utf-8")
-        )
-        return " ".join(text.split())
-
-    @staticmethod
-    def _match_geo_by_name(queryset, valor_api):
-        """
-        Busca coincidencia exacta por nombre normalizado en un queryset pequeño
-        (provincias/municipios/localidades).
-        """
-        objetivo = ComedorService._normalize_geo_value(valor_api)
-        if not objetivo:
-            return None
-        for obj in queryset:
-            if (
-                ComedorService._normalize_geo_value(getattr(obj, "nombre", ""))
-                == objetivo
-            ):
-                return obj
-        return None
+        return normalize_text(value)
 
     @staticmethod
     def _mapear_ubicacion_desde_renaper(datos):
         """
         Mapea provincia, municipio y localidad devolviendo instancias locales.
-        Usa coincidencia por nombre normalizado y un reemplazo básico de números.
+        Resuelve contra el nomenclador en memoria (sin queries por consulta).
         """
         provincia_api = datos.get("provincia_api")
         municipio_api = datos.get("municipio_api")
         localidad_api = datos.get("localidad_api")
+        gazetteer = get_gazetteer()
 
-        provincia_obj = None
-        municipio_obj = None
-        localidad_obj = None
+        provincia_id = None
+        municipio_id = None
+        localidad_id = None
 
         if provincia_api:
-            provincia_obj = ComedorService._match_geo_by_name(
-                Provincia.objects.all(), provincia_api
-            )
+            provincia_id = gazetteer.resolve_provincia(provincia_api)
 
         if municipio_api:
-            municipio_qs = Municipio.objects.all()
-            if provincia_obj:
-                municipio_qs = municipio_qs.filter(provincia=provincia_obj)
-            municipio_obj = ComedorService._match_geo_by_name(
-                municipio_qs, municipio_api
+            municipio_id = gazetteer.resolve_municipio(
+                municipio_api, provincia_id=provincia_id
             )
 
         if localidad_api:
-            localidad_qs = Localidad.objects.all()
-            if municipio_obj:
-                localidad_qs = localidad_qs.filter(municipio=municipio_obj)
-            elif provincia_obj:
-                localidad_qs = localidad_qs.filter(municipio__provincia=provincia_obj)
-            localidad_obj = ComedorService._match_geo_by_name(
-                localidad_qs, localidad_api
+            localidad_id = gazetteer.resolve_localidad(
+                localidad_api, municipio_id=municipio_id, provincia_id=provincia_id
             )
 
         return {
-            "provincia": provincia_obj,
-            "municipio": municipio_obj,
-            "localidad": localidad_obj,
+            "provincia": gazetteer.get_provincia(provincia_id),
+            "municipio": gazetteer.get_municipio(municipio_id),
+            "localidad": gazetteer.get_localidad(localidad_id),
         }
 
     @staticmethod
     def _match_nacionalidad(valor_api):
-        objetivo = ComedorService._normalize_text(valor_api)
-        if not objetivo:
-            return None
-        for nacionalidad in Nacionalidad.objects.all():
-            if ComedorService._normalize_text(nacionalidad.nacionalidad) == objetivo:
-                return nacionalidad
-        return None
+        gazetteer = get_gazetteer()
+        return gazetteer.get_nacionalidad(gazetteer.resolve_nacionalidad(valor_api))
 
     @staticmethod
     def _consultar_renaper_por_dni(dni):
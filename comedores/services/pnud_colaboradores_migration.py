@@ -10,6 +10,8 @@ from datetime import date
 from django.db import DEFAULT_DB_ALIAS, transaction
 from django.utils import timezone
 
+from ciudadanos.services_busqueda import reindexar_ciudadanos
+
 
 PNUD_PROGRAMA_IDS = frozenset((3, 4))
 BATCH_SIZE = 1000
@@ -99,6 +101,20 @@ def _write_audit_best_effort(audit_model, entries, database, logger):
         logger.exception("No se pudo registrar la auditoría PNUD de colaboradores.")
 
 
+def _reindexar_ciudadanos_creados(apps, ciudadano_ids, database):
+    """
+    bulk_create no dispara post_save: los terminos de busqueda se escriben aca
+    (en MySQL bulk_create no devuelve los pk, por eso se pasan los releidos).
+    Si la migracion corre antes de que exista la tabla de terminos, los llena
+    despues ``reindexar_busqueda_ciudadanos``.
+    """
+    try:
+        apps.get_model("ciudadanos", "CiudadanoTerminoBusqueda")
+    except LookupError:
+        return
+    reindexar_ciudadanos(ciudadano_ids, using=database)
+
+
 def replace_pnud_colaboradores(
     *, apps, csv_path, schema_editor=None, run_date=None, logger=None
 ):
@@ -185,12 +201,15 @@ def replace_pnud_colaboradores(
         for batch in _chunks(new_ciudadanos):
             Ciudadano.objects.using(database).bulk_create(batch, batch_size=BATCH_SIZE)
         if missing_dnis:
+            creados = []
             for ciudadano in (
                 Ciudadano.objects.using(database)
                 .filter(tipo_documento="DNI", documento__in=missing_dnis)
                 .order_by("documento", "id")
             ):
+                creados.append(ciudadano.pk)
                 ciudadano_by_dni.setdefault(ciudadano.documento, ciudadano)
+            _reindexar_ciudadanos_creados(apps, creados, database)
 
         activity_by_name = {
             activity.nombre: activity.id
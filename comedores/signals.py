@@ -40,13 +40,14 @@ def send_comedor_to_gestionar(sender, instance, created, **kwargs):
 
 @receiver(pre_save, sender=Comedor)
 def update_comedor_in_gestionar(sender, instance, **kwargs):
-    if not instance.pk:
+    if not instance.pk or not instance.has_previous_state():
         return
-    previous = sender.objects.get(pk=instance.pk)
 
-    programa_changed = previous.programa_id != instance.programa_id
-    if programa_changed:
-        previous_programa_id = previous.programa_id
+    # Estado previo desde FieldTrackingMixin: sin releer la fila.
+    changed_fields = set(instance.changed_fields())
+
+    if "programa" in changed_fields:
+        previous_programa_id = instance.previous_value("programa")
         new_programa_id = instance.programa_id
         current_user = get_current_user()
         current_user_id = getattr(current_user, "pk", None)
@@ -60,12 +61,7 @@ def update_comedor_in_gestionar(sender, instance, **kwargs):
             )
         )
 
-    changed = any(
-        f.name not in {"foto_legajo"}
-        and getattr(instance, f.name) != getattr(previous, f.name)
-        for f in instance._meta.fields
-    )
-    if not changed:
+    if not changed_fields - {"foto_legajo"}:
         return
 
     payload = build_comedor_payload(
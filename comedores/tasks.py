@@ -8,6 +8,11 @@ from django.conf import settings
 from django.db import close_old_connections
 
 from comedores.models import Observacion, Referente
+from core.gestionar_outbox import (
+    GestionarOutboxKind,
+    enqueue_gestionar,
+    is_gestionar_outbox_enabled,
+)
 
 TIMEOUT = 360  # Segundos máximos de espera por respuesta
 MAX_WORKERS = int(
@@ -71,6 +76,14 @@ def build_comedor_payload(comedor, action="Add"):
     }
 
 
+def build_comedor_delete_payload(comedor_id):
+    return {
+        "Action": "Delete",
+        "Properties": {"Locale": "es-ES"},
+        "Rows": [{"ComedorID": f"{comedor_id}"}],
+    }
+
+
 def build_referente_payload(referente):
     return {
         "Action": "Add",
@@ -114,6 +127,10 @@ class AsyncSendComedorToGestionar(threading.Thread):
                 "Integración con GESTIONAR deshabilitada: se omite sync de comedor"
             )
             return None
+        if is_gestionar_outbox_enabled():
+            comedor_id = ((self.payload or {}).get("Rows") or [{}])[0].get("ComedorID")
+            enqueue_gestionar(COMEDOR_OUTBOX_KIND.name, comedor_id, self.payload)
+            return None
         _EXECUTOR.submit(self.run)
         return None
 
@@ -195,6 +212,13 @@ class AsyncRemoveComedorToGestionar(threading.Thread):
                 "Integración con GESTIONAR deshabilitada: se omite baja de comedor"
             )
             return None
+        if is_gestionar_outbox_enabled():
+            enqueue_gestionar(
+                COMEDOR_OUTBOX_KIND.name,
+                self.comedor_id,
+                build_comedor_delete_payload(self.comedor_id),
+            )
+            return None
         _EXECUTOR.submit(self.run)
         return None
 
@@ -202,11 +226,7 @@ class AsyncRemoveComedorToGestionar(threading.Thread):
         if not _is_gestionar_integration_enabled():
             return
         close_old_connections()
-        data = {
-            "Action": "Delete",
-            "Properties": {"Locale": "es-ES"},
-            "Rows": [{"ComedorID": f"{self.comedor_id}"}],
-        }
+        data = build_comedor_delete_payload(self.comedor_id)
         try:
             headers = {
                 "applicationAccessKey": os.getenv("GESTIONAR_API_KEY"),
@@ -243,6 +263,14 @@ class AsyncSendReferenteToGestionar(threading.Thread):
                 "Integración con GESTIONAR deshabilitada: se omite sync de referente"
             )
             return None
+        if is_gestionar_outbox_enabled():
+            rows = (self.payload or {}).get("Rows") or [{}]
+            # Igual que run(): sin documento GESTIONAR no puede identificarlo.
+            if self.payload is None or rows[0].get("documento"):
+                enqueue_gestionar(
+                    REFERENTE_OUTBOX_KIND.name, self.referente_id, self.payload
+                )
+            return None
         _EXECUTOR.submit(self.run)
         return None
 
@@ -296,6 +324,11 @@ class AsyncSendObservacionToGestionar(threading.Thread):
                 "Integración con GESTIONAR deshabilitada: se omite sync de observación"
             )
             return None
+        if is_gestionar_outbox_enabled():
+            enqueue_gestionar(
+                OBSERVACION_OUTBOX_KIND.name, self.observacion_id, self.payload
+            )
+            return None
         _EXECUTOR.submit(self.run)
         return None
 
@@ -328,3 +361,39 @@ class AsyncSendObservacionToGestionar(threading.Thread):
             )
         finally:
             close_old_connections()
+
+
+def _build_referente_outbox_payload(referente_id):
+    referente = Referente.objects.filter(id=referente_id).first()
+    if referente is None or not referente.documento:
+        return None
+    return build_referente_payload(referente)
+
+
+def _build_observacion_outbox_payload(observacion_id):
+    observacion = Observacion.objects.filter(id=observacion_id).first()
+    return build_observacion_payload(observacion) if observacion else None
+
+
+# Tipos del outbox de GESTIONAR (se registran en ComedoresConfig.ready()).
+COMEDOR_OUTBOX_KIND = GestionarOutboxKind(
+    name="comedor",
+    url_env="GESTIONAR_API_CREAR_COMEDOR",
+    delete_url_env="GESTIONAR_API_BORRAR_COMEDOR",
+    retry_flipped_action=True,
+)
+REFERENTE_OUTBOX_KIND = GestionarOutboxKind(
+    name="referente",
+    url_env="GESTIONAR_API_CREAR_REFERENTE",
+    build_payload=_build_referente_outbox_payload,
+)
+OBSERVACION_OUTBOX_KIND = GestionarOutboxKind(
+    name="observacion",
+    url_env="GESTIONAR_API_CREAR_OBSERVACION",
+    build_payload=_build_observacion_outbox_payload,
+)
+GESTIONAR_OUTBOX_KINDS = (
+    COMEDOR_OUTBOX_KIND,
+    REFERENTE_OUTBOX_KIND,
+    OBSERVACION_OUTBOX_KIND,
+)
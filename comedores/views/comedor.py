@@ -58,6 +58,7 @@ from comedores.utils import (
     is_pnud_comedor,
     usa_datos_convenio_pnud,
 )
+from core.cache_utils import comedor_cache_namespace, namespaced_key
 from core.pagination import NoCountPaginator, build_no_count_page_range
 from core.services.column_preferences import build_columns_context_from_fields
 from core.services.favorite_filters import SeccionesFiltrosFavoritos
@@ -1189,7 +1190,9 @@ class ComedorDetailView(LoginRequiredMixin, DetailView):
             hasattr(self.object, "relevamientos_optimized")
             and self.object.relevamientos_optimized
         ):
-            cache_key = f"presupuestos_comedor_{self.object.id}_v2"
+            cache_key = namespaced_key(
+                comedor_cache_namespace(self.object.id), "presupuestos"
+            )
             cached_presupuestos = cache.get(cache_key)
 
             if cached_presupuestos:
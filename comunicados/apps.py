@@ -5,3 +5,13 @@ class ComunicadosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "comunicados"
     verbose_name = "Comunicados"
+
+    def ready(self):
+        from comunicados.services_mailing_jobs import (  # pylint: disable=import-outside-toplevel
+            MAILING_JOB_QUEUE,
+        )
+        from core.jobs import (  # pylint: disable=import-outside-toplevel
+            registrar_cola_jobs,
+        )
+
+        registrar_cola_jobs(MAILING_JOB_QUEUE)
@@ -1,7 +1,8 @@
 import logging
 
 from django.core.management.base import BaseCommand
-from comunicados.services_mailing_jobs import run_mailing_jobs_worker
+from comunicados.services_mailing_jobs import MAILING_JOB_QUEUE
+from core.jobs import run_job_worker
 
 logger = logging.getLogger("django")
 
@@ -19,7 +20,9 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS("Iniciando worker de mailing masivo..."))
         try:
-            run_mailing_jobs_worker(once=bool(options["once"]))
+            run_job_worker(
+                queue_names=[MAILING_JOB_QUEUE.name], once=bool(options["once"])
+            )
         except KeyboardInterrupt:
             self.stdout.write(self.style.WARNING("Worker interrumpido por el usuario."))
         except Exception as exc:
@@ -135,35 +135,53 @@ def validate_mailing_workbook(uploaded_file):
         workbook.close()
 
 
-def process_mailing_row(
+def build_mailing_message(
     row: ParsedMailingRow,
     asunto: str,
     cuerpo: str,
-    attachments: list[tuple[str, bytes, str]] | None = None,
-) -> dict[str, object]:
+    attachments: list | None = None,
+) -> EmailMessage:
+    """
+    Valida el mail de la fila y arma el mensaje sin enviarlo.
+
+    ``attachments`` acepta tuplas ``(nombre, contenido, mimetype)`` o partes MIME
+    ya codificadas, que se comparten entre todos los mensajes del lote.
+    """
     mail_destino = row.mail
     try:
         validate_email(mail_destino)
     except ValidationError as exc:
         raise ValidationError(f"El mail '{mail_destino}' no es valido.") from exc
 
+    email = EmailMessage(
+        subject=asunto,
+        body=cuerpo,
+        from_email=None,  # Use default
+        to=[mail_destino],
+    )
+    for attachment in attachments or ():
+        if isinstance(attachment, tuple):
+            email.attach(*attachment)
+        else:
+            email.attach(attachment)
+    return email
+
+
+def process_mailing_row(
+    row: ParsedMailingRow,
+    asunto: str,
+    cuerpo: str,
+    attachments: list | None = None,
+) -> dict[str, object]:
+    email = build_mailing_message(row, asunto, cuerpo, attachments)
     try:
-        email = EmailMessage(
-            subject=asunto,
-            body=cuerpo,
-            from_email=None,  # Use default
-            to=[mail_destino],
-        )
-        if attachments:
-            for filename, content, mimetype in attachments:
-                email.attach(filename, content, mimetype)
         email.send(fail_silently=False)
     except Exception as exc:
-        logger.exception("Error enviando mail masivo a %s", mail_destino)
+        logger.exception("Error enviando mail masivo a %s", row.mail)
         raise ValidationError(f"Error enviando mail: {str(exc)}") from exc
 
     return {
-        "mail_destino": mail_destino,
+        "mail_destino": row.mail,
         "mensaje": "Enviado correctamente",
     }
 
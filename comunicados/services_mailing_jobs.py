@@ -3,11 +3,8 @@ from __future__ import annotations
 import logging
 import mimetypes
 import os
-import time
-from datetime import timedelta
 
 from django.core.exceptions import ValidationError
-from django.db import OperationalError, models
 from django.http import Http404
 from django.utils import timezone
 
@@ -15,17 +12,22 @@ from comunicados.models import MailingJob, MailingJobRow, MailingJobAttachment
 from comunicados.services_mailing import (
     _load_mailing_workbook_rows,
     build_mailing_error_message,
-    process_mailing_row,
+    build_mailing_message,
     validate_mailing_workbook,
 )
+from core.jobs import JobQueue, claim_next_job
+from core.services.mail_delivery import (
+    MailDeliveryAborted,
+    deliver_messages,
+    encode_attachment,
+)
 
 logger = logging.getLogger("django")
 DEFAULT_MAILING_JOB_POLL_SECONDS = 2
 DEFAULT_MAILING_JOB_STALE_SECONDS = 900
-STALE_JOB_ERROR_MESSAGE = (
-    "El lote se interrumpio antes de finalizar. "
-    "Puede reanudarlo desde la ultima fila pendiente."
-)
+
+
+SENT_ROW_MESSAGE = "Enviado correctamente"
 
 
 def _safe_positive_int(value, default: int) -> int:
@@ -121,59 +123,9 @@ def request_resume_mailing_job(*, job: MailingJob) -> MailingJob:
     return job
 
 
-def mark_stale_mailing_jobs_as_failed() -> int:
-    stale_threshold = timezone.now() - timedelta(
-        seconds=get_mailing_job_stale_seconds()
-    )
-    stale_jobs = MailingJob.objects.filter(
-        status=MailingJob.Status.PROCESSING,
-    ).filter(
-        models.Q(last_activity_at__isnull=True)
-        | models.Q(last_activity_at__lt=stale_threshold)
-    )
-    updated_count = 0
-    for job in stale_jobs.iterator():
-        job.status = MailingJob.Status.FAILED
-        job.last_error_message = STALE_JOB_ERROR_MESSAGE
-        job.last_error_at = timezone.now()
-        job.finished_at = timezone.now()
-        job.save(
-            update_fields=[
-                "status",
-                "last_error_message",
-                "last_error_at",
-                "finished_at",
-            ]
-        )
-        updated_count += 1
-    return updated_count
-
-
 def claim_next_mailing_job() -> MailingJob | None:
-    candidate_ids = list(
-        MailingJob.objects.filter(status=MailingJob.Status.PENDING)
-        .order_by("requested_at", "id")
-        .values_list("id", flat=True)[:20]
-    )
-    now = timezone.now()
-    for job_id in candidate_ids:
-        updated = MailingJob.objects.filter(
-            pk=job_id,
-            status=MailingJob.Status.PENDING,
-        ).update(
-            status=MailingJob.Status.PROCESSING,
-            finished_at=None,
-            last_activity_at=now,
-        )
-        if not updated:
-            continue
-
-        job = MailingJob.objects.get(pk=job_id)
-        if not job.started_at:
-            job.started_at = now
-            job.save(update_fields=["started_at"])
-        return job
-    return None
+    """Reclama el próximo lote pendiente con el motor compartido de jobs."""
+    return claim_next_job(MAILING_JOB_QUEUE)
 
 
 def _row_contribution(status: str | None) -> dict[str, int]:
@@ -206,15 +158,6 @@ def _apply_row_outcome(
         setattr(job, field_name, max(0, updated_value))
 
 
-def _build_row_log_defaults(row) -> dict[str, object]:
-    return {
-        "mail_destino": row.mail,
-        "status": MailingJobRow.Status.FAILED,
-        "mensaje": "",
-        "attempts": 0,
-    }
-
-
 def _sync_job_total_rows(*, job: MailingJob, total_rows: int) -> None:
     if job.total_rows == total_rows:
         return
@@ -241,149 +184,6 @@ def _mark_job_completed(*, job: MailingJob) -> MailingJob:
     return job
 
 
-def _start_job_row_attempt(*, job: MailingJob, row_index: int, row) -> None:
-    now = timezone.now()
-    job.status = MailingJob.Status.PROCESSING
-    job.next_row_index = row_index
-    job.last_attempted_row = row.fila
-    job.last_attempted_mail = row.mail
-    job.last_activity_at = now
-    job.save(
-        update_fields=[
-            "status",
-            "next_row_index",
-            "last_attempted_row",
-            "last_attempted_mail",
-            "last_activity_at",
-        ]
-    )
-
-
-def _get_job_row_log(*, job: MailingJob, row):
-    row_log, created = MailingJobRow.objects.get_or_create(
-        job=job,
-        fila=row.fila,
-        defaults=_build_row_log_defaults(row),
-    )
-    return (
-        row_log,
-        (None if created else row_log.status),
-    )
-
-
-def _build_row_processing_state(*, row_log, old_status):
-    return {
-        "row_log": row_log,
-        "old_status": old_status,
-    }
-
-
-def _build_row_progress(*, row_index: int, total_rows: int):
-    next_row_index = row_index + 1
-    return {
-        "next_row_index": next_row_index,
-        "is_last_row": next_row_index >= total_rows,
-    }
-
-
-def _save_failed_row_log(*, row_log: MailingJobRow, row, message: str) -> None:
-    row_log.mail_destino = row.mail
-    row_log.status = MailingJobRow.Status.FAILED
-    row_log.mensaje = message
-    row_log.attempts += 1
-    row_log.processed_at = timezone.now()
-    row_log.save()
-
-
-def _record_row_failure(
-    *,
-    job: MailingJob,
-    row,
-    row_state,
-    message: str,
-) -> MailingJob:
-    row_log = row_state["row_log"]
-    _save_failed_row_log(row_log=row_log, row=row, message=message)
-    _apply_row_outcome(
-        job=job,
-        old_status=row_state["old_status"],
-        new_status=row_log.status,
-    )
-
-    now = timezone.now()
-    job.status = MailingJob.Status.FAILED
-    job.last_error_message = message
-    job.last_error_at = now
-    job.finished_at = now
-    job.last_activity_at = now
-    job.save(
-        update_fields=[
-            "processed_rows",
-            "sent_rows",
-            "rejected_rows",
-            "status",
-            "last_error_message",
-            "last_error_at",
-            "finished_at",
-            "last_activity_at",
-        ]
-    )
-    return job
-
-
-def _record_row_success(
-    *,
-    job: MailingJob,
-    row,
-    row_state,
-    result: dict[str, object],
-    progress,
-) -> MailingJob:
-    row_log = row_state["row_log"]
-    row_log.mail_destino = str(result["mail_destino"])
-    row_log.status = MailingJobRow.Status.SENT
-    row_log.mensaje = str(result["mensaje"])
-    row_log.attempts += 1
-    row_log.processed_at = timezone.now()
-    row_log.save()
-
-    _apply_row_outcome(
-        job=job,
-        old_status=row_state["old_status"],
-        new_status=row_log.status,
-    )
-
-    now = timezone.now()
-    job.next_row_index = progress["next_row_index"]
-    job.last_successful_row = row.fila
-    job.last_successful_mail = row.mail
-    job.last_activity_at = now
-    update_fields = [
-        "processed_rows",
-        "sent_rows",
-        "rejected_rows",
-        "next_row_index",
-        "last_successful_row",
-        "last_successful_mail",
-        "last_activity_at",
-    ]
-    if progress["is_last_row"]:
-        job.status = MailingJob.Status.COMPLETED
-        job.finished_at = now
-        job.last_error_message = ""
-        job.last_error_at = None
-        update_fields.extend(
-            [
-                "status",
-                "finished_at",
-                "last_error_message",
-                "last_error_at",
-            ]
-        )
-    job.save(update_fields=update_fields)
-    return job
-
-
 def _record_job_level_failure(
     *,
     job: MailingJob,
@@ -433,113 +233,200 @@ def _load_job_rows(job: MailingJob):
     return None
 
 
-def process_mailing_job(job: MailingJob) -> MailingJob:
-    rows = _load_job_rows(job=job)
-    if rows is None:
-        return job
-
-    # Cache attachments in memory
-    cached_attachments = []
+def _encode_job_attachments(job: MailingJob) -> list:
+    """Lee y codifica los adjuntos una sola vez para todo el lote."""
+    encoded = []
     for attachment in job.attachments.all():
         try:
             attachment.archivo.open("rb")
             content = attachment.archivo.read()
-            mimetype, _ = mimetypes.guess_type(attachment.nombre_original)
-            cached_attachments.append(
-                (
-                    attachment.nombre_original,
-                    content,
-                    mimetype or "application/octet-stream",
-                )
-            )
         finally:
             attachment.archivo.close()
+        mimetype, _ = mimetypes.guess_type(attachment.nombre_original)
+        encoded.append(
+            encode_attachment(
+                attachment.nombre_original,
+                content,
+                mimetype or "application/octet-stream",
+            )
+        )
+    return encoded
+
+
+class _MailingJobProgress:
+    """
+    Escribe los resultados de cada lote de envio con un upsert de filas y un
+    solo UPDATE del job. ``next_row_index`` avanza hasta la primera fila sin
+    resultado: los lotes terminan fuera de orden al enviar en paralelo.
+    """
+
+    def __init__(self, *, job: MailingJob, rows):
+        self.job = job
+        self.rows = rows
+        self.done: set[int] = set()
+        self.previous = {
+            fila: (status, attempts)
+            for fila, status, attempts in MailingJobRow.objects.filter(
+                job=job
+            ).values_list("fila", "status", "attempts")
+        }
+
+    def already_sent(self, row) -> bool:
+        status, _ = self.previous.get(row.fila, (None, 0))
+        return status == MailingJobRow.Status.SENT
+
+    def skip(self, row_index: int) -> None:
+        self.done.add(row_index)
+
+    def record(self, outcomes: list[tuple[int, str, str]]) -> None:
+        job = self.job
+        now = timezone.now()
+        row_logs = []
+        for row_index, status, mensaje in sorted(outcomes):
+            row = self.rows[row_index]
+            old_status, attempts = self.previous.get(row.fila, (None, 0))
+            row_logs.append(
+                MailingJobRow(
+                    job=job,
+                    fila=row.fila,
+                    mail_destino=row.mail,
+                    status=status,
+                    mensaje=mensaje,
+                    attempts=attempts + 1,
+                    processed_at=now,
+                )
+            )
+            self.previous[row.fila] = (status, attempts + 1)
+            _apply_row_outcome(job=job, old_status=old_status, new_status=status)
+            self.done.add(row_index)
+            job.last_attempted_row = row.fila
+            job.last_attempted_mail = row.mail
+            if status == MailingJobRow.Status.SENT:
+                job.last_successful_row = row.fila
+                job.last_successful_mail = row.mail
+
+        if row_logs:
+            MailingJobRow.objects.bulk_create(
+                row_logs,
+                update_conflicts=True,
+                unique_fields=["job", "fila"],
+                update_fields=[
+                    "mail_destino",
+                    "status",
+                    "mensaje",
+                    "attempts",
+                    "processed_at",
+                ],
+            )
+        while job.next_row_index in self.done:
+            job.next_row_index += 1
+        job.last_activity_at = now
+        job.save(
+            update_fields=[
+                "processed_rows",
+                "sent_rows",
+                "rejected_rows",
+                "next_row_index",
+                "last_attempted_row",
+                "last_attempted_mail",
+                "last_successful_row",
+                "last_successful_mail",
+                "last_activity_at",
+            ]
+        )
+
+
+def _delivery_outcome(result) -> tuple[int, str, str]:
+    if result.sent:
+        return result.key, MailingJobRow.Status.SENT, SENT_ROW_MESSAGE
+    return (
+        result.key,
+        MailingJobRow.Status.FAILED,
+        f"Error enviando mail: {result.error}",
+    )
+
+
+def process_mailing_job(job: MailingJob) -> MailingJob:
+    """
+    Envia el lote con el motor de ``core.services.mail_delivery``.
+
+    Un mail invalido o rechazado queda como fila fallida y el lote sigue; si el
+    servidor deja de aceptar envios el job queda FAILED y al reanudarlo solo se
+    envian las filas que todavia no salieron.
+    """
+    rows = _load_job_rows(job=job)
+    if rows is None:
+        return job
 
     total_rows = len(rows)
     _sync_job_total_rows(job=job, total_rows=total_rows)
     if job.next_row_index >= total_rows:
         return _mark_job_completed(job=job)
 
-    for row_index in range(job.next_row_index, total_rows):
-        row = rows[row_index]
-        _start_job_row_attempt(job=job, row_index=row_index, row=row)
-        row_log, old_status = _get_job_row_log(job=job, row=row)
-        row_state = _build_row_processing_state(
-            row_log=row_log,
-            old_status=old_status,
-        )
-
-        try:
-            result = process_mailing_row(
-                row=row,
-                asunto=job.asunto,
-                cuerpo=job.cuerpo,
-                attachments=cached_attachments,
-            )
-        except ValidationError as exc:
-            return _record_row_failure(
-                job=job,
-                row=row,
-                row_state=row_state,
-                message=build_mailing_error_message(exc),
-            )
-        except Exception as exc:
-            logger.exception(
-                (
-                    "Fallo inesperado procesando lote de mailing. "
-                    "job_id=%s fila=%s mail=%s"
-                ),
-                job.id,
-                row.fila,
-                row.mail,
-            )
-            return _record_row_failure(
-                job=job,
-                row=row,
-                row_state=row_state,
-                message=build_mailing_error_message(exc),
-            )
-        job = _record_row_success(
-            job=job,
-            row=row,
-            row_state=row_state,
-            result=result,
-            progress=_build_row_progress(row_index=row_index, total_rows=total_rows),
-        )
-        if job.status == MailingJob.Status.COMPLETED:
-            return job
-
-    return job
+    attachments = _encode_job_attachments(job)
+    progress = _MailingJobProgress(job=job, rows=rows)
+    rejected = []
+
+    def _job_messages():
+        # Se arman a medida que el motor pide cada lote; los mails invalidos se
+        # registran junto con el siguiente lote enviado.
+        for row_index in range(job.next_row_index, total_rows):
+            row = rows[row_index]
+            if progress.already_sent(row):
+                progress.skip(row_index)
+                continue
+            try:
+                message = build_mailing_message(
+                    row=row,
+                    asunto=job.asunto,
+                    cuerpo=job.cuerpo,
+                    attachments=attachments,
+                )
+            except ValidationError as exc:
+                rejected.append(
+                    (
+                        row_index,
+                        MailingJobRow.Status.FAILED,
+                        build_mailing_error_message(exc),
+                    )
+                )
+                continue
+            yield row_index, message
 
+    def _record_batch(results):
+        outcomes = [_delivery_outcome(result) for result in results] + rejected
+        rejected.clear()
+        progress.record(outcomes)
 
-def process_next_mailing_job() -> bool:
     try:
-        mark_stale_mailing_jobs_as_failed()
-        job = claim_next_mailing_job()
-    except OperationalError:
-        logger.exception("No se pudieron consultar lotes pendientes de mailing.")
-        return False
+        deliver_messages(_job_messages(), on_batch=_record_batch)
+    except MailDeliveryAborted as exc:
+        progress.record(rejected)
+        logger.error(
+            "Se corto el envio del lote de mailing. job_id=%s error=%s",
+            job.id,
+            exc.error,
+        )
+        return _record_job_level_failure(
+            job=job,
+            message=f"Error enviando mail: {exc.error}",
+        )
+    progress.record(rejected)
+    return _mark_job_completed(job=job)
 
-    if not job:
-        return False
 
-    process_mailing_job(job)
-    return True
+def _fail_mailing_job(job: MailingJob, message: str) -> None:
+    _record_job_level_failure(job=job, message=message)
 
 
-def run_mailing_jobs_worker(*, once: bool = False) -> None:
-    poll_seconds = get_mailing_job_poll_seconds()
-    while True:
-        try:
-            processed_job = process_next_mailing_job()
-        except Exception:
-            logger.exception("Fallo inesperado en el worker de mailing.")
-            if once:
-                raise
-            time.sleep(poll_seconds)
-            continue
-        if once:
-            return
-        if processed_job:
-            continue
-        time.sleep(poll_seconds)
+MAILING_JOB_QUEUE = JobQueue(
+    name="mailing",
+    model=MailingJob,
+    process=process_mailing_job,
+    fail=_fail_mailing_job,
+    get_stale_seconds=get_mailing_job_stale_seconds,
+    get_poll_seconds=get_mailing_job_poll_seconds,
+    # El reintento automatico arrancaria sin revisar que filas ya salieron:
+    # el lote queda FAILED y se reanuda a mano desde las filas pendientes.
+    max_retries=0,
+)
@@ -0,0 +1,127 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core.metrics import (
+    end_request_stats,
+    is_metrics_enabled,
+    registry,
+    start_request_stats,
+)
+
+logger = logging.getLogger("django")
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    # Patron de la URL (``comedores/<int:pk>/``), no el path: cardinalidad acotada.
+    return match.route or match.view_name or UNMATCHED_ROUTE
+
+
+def _response_size(response):
+    if getattr(response, "streaming", False):
+        length = response.get("Content-Length")
+        return int(length) if length and length.isdigit() else 0
+    return len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """
+    Mide latencia, consultas SQL, lecturas de cache y tamaño de cada respuesta
+    y las acumula en ``core.metrics.registry`` (expuestas en ``/metrics/``).
+    """
+
+    def __init__(self, get_response):
+        if not is_metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = start_request_stats(
+            getattr(settings, "METRICS_SLOW_QUERY_SAMPLE_SIZE", 5)
+        )
+
+        def _query_wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats.add_query(sql, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_query_wrapper))
+                response = self.get_response(request)
+        finally:
+            end_request_stats()
+        elapsed = time.perf_counter() - start
+
+        try:
+            self._record(request, response, stats, elapsed)
+        except Exception:
+            logger.warning("No se pudieron registrar las metricas", exc_info=True)
+        return response
+
+    def _record(self, request, response, stats, elapsed):
+        route = _route_label(request)
+        method = request.method
+        registry.inc(
+            "sisoc_http_requests_total",
+            (("method", method), ("route", route), ("status", response.status_code)),
+        )
+        registry.observe(
+            "sisoc_http_request_duration_seconds",
+            (("method", method), ("route", route)),
+            elapsed,
+        )
+        labels = (("route", route),)
+        registry.inc("sisoc_http_db_queries_total", labels, stats.query_count)
+        registry.inc(
+            "sisoc_http_db_query_duration_seconds_total", labels, stats.query_seconds
+        )
+        registry.inc(
+            "sisoc_http_response_size_bytes_total", labels, _response_size(response)
+        )
+        if stats.cache_hits:
+            registry.inc(
+                "sisoc_cache_requests_total",
+                (*labels, ("result", "hit")),
+                stats.cache_hits,
+            )
+        if stats.cache_misses:
+            registry.inc(
+                "sisoc_cache_requests_total",
+                (*labels, ("result", "miss")),
+                stats.cache_misses,
+            )
+
+        threshold = getattr(settings, "METRICS_SLOW_REQUEST_SECONDS", 2.0)
+        if threshold and elapsed >= threshold:
+            registry.inc("sisoc_http_slow_requests_total", labels)
+            logger.warning(
+                "Request lenta: %s %s (%s) %.3fs, %d consultas en %.3fs",
+                method,
+                request.path,
+                route,
+                elapsed,
+                stats.query_count,
+                stats.query_seconds,
+                extra={
+                    "data": {
+                        "route": route,
+                        "status": response.status_code,
+                        "slowest_queries": stats.slowest_queries(),
+                    }
+                },
+            )
+        registry.flush()
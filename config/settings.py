@@ -199,6 +199,8 @@ INSTALLED_APPS = [
 
 # Middleware (orden CORS correcto)
 MIDDLEWARE = [
+    # Primero: mide la request completa, incluidos los demas middlewares.
+    "config.middlewares.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -378,12 +380,34 @@ if RUNNING_TESTS and (USE_SQLITE_FOR_TESTS or not os.environ.get("DATABASE_HOST"
     }
 
 # Cache
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-snowflake",
+# Con CACHE_REDIS_URL definido, todos los workers de gunicorn comparten el mismo
+# cache (contadores de dashboard, rate limits, versiones de namespaces). Sin esa
+# variable se mantiene LocMemCache, que es por proceso.
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "").strip()
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "sisoc").strip()
+if CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache_backends.InstrumentedRedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+            "OPTIONS": {
+                "socket_connect_timeout": _safe_float_env(
+                    "CACHE_REDIS_CONNECT_TIMEOUT_SECONDS", 1.0
+                ),
+                "socket_timeout": _safe_float_env(
+                    "CACHE_REDIS_SOCKET_TIMEOUT_SECONDS", 1.0
+                ),
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache_backends.InstrumentedLocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
     }
-}
 
 # TTLs (segundos)
 DEFAULT_CACHE_TIMEOUT = 300
@@ -393,6 +417,11 @@ CIUDADANO_CACHE_TIMEOUT = 300
 INTERVENCIONES_CACHE_TIMEOUT = 1800
 CENTROFAMILIA_CACHE_TIMEOUT = 300
 
+# Rate limits (users.rate_limits): overrides por scope de limit, window_seconds
+# y algorithm ("sliding_window" | "token_bucket"). Sin entrada se usan los
+# valores definidos en cada endpoint.
+RATE_LIMIT_SCOPES = {}
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = CSRF_TRUSTED_ORIGINS
@@ -484,6 +513,78 @@ RENAPER_VALIDACION_BACKOFF_SECONDS = _safe_float_env(
     "RENAPER_VALIDACION_BACKOFF_SECONDS",
     0.0,
 )
+# Cache compartido de respuestas RENAPER por DNI+sexo (core.services.renaper_cache).
+# Deshabilitado en tests para que los mocks de cada caso no se pisen entre si.
+RENAPER_CACHE_ENABLED = _safe_bool_env("RENAPER_CACHE_ENABLED", not RUNNING_TESTS)
+RENAPER_CACHE_TTL_SECONDS = _safe_int_env("RENAPER_CACHE_TTL_SECONDS", 86400)
+RENAPER_CACHE_NEGATIVE_TTL_SECONDS = _safe_int_env(
+    "RENAPER_CACHE_NEGATIVE_TTL_SECONDS", 3600
+)
+# Nomenclador territorial en memoria (core.services.gazetteer). Cada proceso
+# revisa la version del catalogo cada GAZETTEER_VERSION_CHECK_SECONDS; apagado
+# en tests, donde cada caso carga su propio catalogo y el indice se rearma.
+GAZETTEER_CACHE_ENABLED = _safe_bool_env("GAZETTEER_CACHE_ENABLED", not RUNNING_TESTS)
+GAZETTEER_VERSION_CHECK_SECONDS = _safe_float_env(
+    "GAZETTEER_VERSION_CHECK_SECONDS", 5.0
+)
+GAZETTEER_FUZZY_CUTOFF = _safe_float_env("GAZETTEER_FUZZY_CUTOFF", 0.88)
+# Permisos compilados por usuario en el cache compartido (iam.services). Los
+# cambios de grupos y permisos bumpean la version al confirmar la transaccion;
+# en tests se compilan en cada request porque TestCase nunca llega a confirmar.
+IAM_PERMISSION_CACHE_ENABLED = _safe_bool_env(
+    "IAM_PERMISSION_CACHE_ENABLED", not RUNNING_TESTS
+)
+IAM_PERMISSION_CACHE_TTL_SECONDS = _safe_int_env(
+    "IAM_PERMISSION_CACHE_TTL_SECONDS", 3600
+)
+# Busqueda de ciudadanos por terminos indexados (ciudadanos.services_busqueda).
+# Habilitar despues de correr `reindexar_busqueda_ciudadanos`.
+CIUDADANOS_BUSQUEDA_INDEXADA_ENABLED = _safe_bool_env(
+    "CIUDADANOS_BUSQUEDA_INDEXADA_ENABLED", False
+)
+# Tope de filas de las exportaciones CSV/XLSX de auditoria (se escriben por bloques).
+AUDITTRAIL_EXPORT_MAX_ROWS = _safe_int_env("AUDITTRAIL_EXPORT_MAX_ROWS", 500000)
+# Metricas por request en /metrics/ (core.metrics). Sin token solo las ve un
+# superusuario logueado. Con varios workers de gunicorn, METRICS_MULTIPROC_DIR
+# tiene que apuntar a un directorio compartido que se vacie al reiniciar.
+METRICS_ENABLED = _safe_bool_env("METRICS_ENABLED", not RUNNING_TESTS)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "").strip()
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "").strip()
+METRICS_FLUSH_INTERVAL_SECONDS = _safe_float_env("METRICS_FLUSH_INTERVAL_SECONDS", 5.0)
+METRICS_SLOW_REQUEST_SECONDS = _safe_float_env("METRICS_SLOW_REQUEST_SECONDS", 2.0)
+METRICS_SLOW_QUERY_SAMPLE_SIZE = _safe_int_env("METRICS_SLOW_QUERY_SAMPLE_SIZE", 5)
+# Derivados WebP de imagenes (core.services.image_service): se generan en la
+# cola de jobs "imagenes" al subir cada imagen y los template tags solo leen el
+# manifiesto (core.ImagenDerivada). Backfill: generate_webp_images --workers N.
+IMAGE_DERIVATIVES_ENABLED = _safe_bool_env(
+    "IMAGE_DERIVATIVES_ENABLED", not RUNNING_TESTS
+)
+IMAGE_DERIVATIVE_WIDTHS = tuple(
+    int(width)
+    for width in os.getenv("IMAGE_DERIVATIVE_WIDTHS", "320,640,1280").split(",")
+    if width.strip().isdigit()
+)
+IMAGE_DERIVATIVE_QUALITY = _safe_int_env("IMAGE_DERIVATIVE_QUALITY", 85)
+IMAGE_DERIVATIVE_CACHE_SECONDS = _safe_int_env("IMAGE_DERIVATIVE_CACHE_SECONDS", 86400)
+# Conversion DOCX->PDF con LibreOffice (core.services.office_pdf): slots con
+# perfil persistente por host (tope de conversiones concurrentes, cola con
+# espera maxima y timeout por conversion) y cache del PDF por hash de plantilla
+# + document.xml renderizado. Chequeo y calentamiento: office_pdf_pool.
+OFFICE_PDF_POOL_SIZE = _safe_int_env("OFFICE_PDF_POOL_SIZE", 2)
+OFFICE_PDF_PROFILE_DIR = os.getenv("OFFICE_PDF_PROFILE_DIR", "/tmp/sisoc-office-pdf")
+OFFICE_PDF_QUEUE_TIMEOUT_SECONDS = _safe_float_env(
+    "OFFICE_PDF_QUEUE_TIMEOUT_SECONDS", 60.0
+)
+OFFICE_PDF_TIMEOUT_SECONDS = _safe_int_env("OFFICE_PDF_TIMEOUT_SECONDS", 120)
+OFFICE_PDF_CACHE_ENABLED = _safe_bool_env("OFFICE_PDF_CACHE_ENABLED", not RUNNING_TESTS)
+OFFICE_PDF_CACHE_TTL_SECONDS = _safe_int_env("OFFICE_PDF_CACHE_TTL_SECONDS", 604800)
+# Envio masivo de correos (core.services.mail_delivery): conexiones SMTP
+# reutilizadas, lotes de MAIL_DELIVERY_BATCH_SIZE mensajes repartidos entre
+# MAIL_DELIVERY_CONNECTIONS conexiones en paralelo y tope de mensajes por
+# minuto para todo el proceso (0 = sin tope).
+MAIL_DELIVERY_BATCH_SIZE = _safe_int_env("MAIL_DELIVERY_BATCH_SIZE", 50)
+MAIL_DELIVERY_CONNECTIONS = _safe_int_env("MAIL_DELIVERY_CONNECTIONS", 2)
+MAIL_DELIVERY_RATE_PER_MINUTE = _safe_int_env("MAIL_DELIVERY_RATE_PER_MINUTE", 0)
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 
 # Changelog
@@ -726,6 +827,40 @@ VOUCHER_CONFIG = {
     "DIAS_ANTES_VENCIMIENTO_NOTIFICACION": 7,  # Days before expiration to notify
 }
 
+# ============================================================================
+# JOBS EN BACKGROUND
+# ============================================================================
+
+# Motor unificado (core.jobs): cantidad de procesos del pool, heartbeat sobre
+# last_activity_at y tope de jobs en proceso por cola ({"ocr": 2, ...}).
+JOB_WORKERS = _safe_int_env("JOB_WORKERS", 1)
+JOB_POLL_SECONDS = _safe_int_env("JOB_POLL_SECONDS", 2)
+JOB_HEARTBEAT_SECONDS = _safe_int_env("JOB_HEARTBEAT_SECONDS", 30)
+JOB_STALE_CHECK_SECONDS = _safe_int_env("JOB_STALE_CHECK_SECONDS", 60)
+JOB_QUEUE_CONCURRENCY = {}
+
+# ============================================================================
+# GESTIONAR (outbox)
+# ============================================================================
+
+# Con el outbox activo los signals encolan en GestionarOutbox (on_commit) en
+# lugar de lanzar hilos; el rol gestionar_outbox_worker (drain_gestionar_outbox)
+# envia payloads de hasta GESTIONAR_OUTBOX_BATCH_SIZE Rows con
+# GESTIONAR_OUTBOX_WORKERS hilos y reintenta con backoff exponencial.
+GESTIONAR_OUTBOX_ENABLED = _safe_bool_env("GESTIONAR_OUTBOX_ENABLED", False)
+GESTIONAR_OUTBOX_BATCH_SIZE = _safe_int_env("GESTIONAR_OUTBOX_BATCH_SIZE", 100)
+GESTIONAR_OUTBOX_CLAIM_SIZE = _safe_int_env("GESTIONAR_OUTBOX_CLAIM_SIZE", 500)
+GESTIONAR_OUTBOX_WORKERS = _safe_int_env("GESTIONAR_OUTBOX_WORKERS", 4)
+GESTIONAR_OUTBOX_TIMEOUT_SECONDS = _safe_int_env("GESTIONAR_OUTBOX_TIMEOUT_SECONDS", 60)
+GESTIONAR_OUTBOX_MAX_ATTEMPTS = _safe_int_env("GESTIONAR_OUTBOX_MAX_ATTEMPTS", 8)
+GESTIONAR_OUTBOX_BACKOFF_SECONDS = _safe_int_env("GESTIONAR_OUTBOX_BACKOFF_SECONDS", 30)
+GESTIONAR_OUTBOX_BACKOFF_MAX_SECONDS = _safe_int_env(
+    "GESTIONAR_OUTBOX_BACKOFF_MAX_SECONDS", 3600
+)
+GESTIONAR_OUTBOX_POLL_SECONDS = _safe_int_env("GESTIONAR_OUTBOX_POLL_SECONDS", 5)
+GESTIONAR_OUTBOX_STALE_SECONDS = _safe_int_env("GESTIONAR_OUTBOX_STALE_SECONDS", 600)
+GESTIONAR_OUTBOX_RETENTION_DAYS = _safe_int_env("GESTIONAR_OUTBOX_RETENTION_DAYS", 7)
+
 # ============================================================================
 # OCR
 # ============================================================================
@@ -736,6 +871,9 @@ OCR_MAX_FILE_SIZE_MB = _safe_int_env("OCR_MAX_FILE_SIZE_MB", 20)
 OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "spa")
 OCR_ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "pdf"}
 OCR_PREPROCESS = _safe_bool_env("OCR_PREPROCESS", True)
+# Tope (MB) de los buffers de preprocesado que cada hilo retiene entre paginas;
+# se liberan al terminar cada documento. Una A4 a 300 DPI usa unos 70 MB.
+OCR_PREPROCESS_BUFFERS_MAX_MB = _safe_int_env("OCR_PREPROCESS_BUFFERS_MAX_MB", 128)
 
 # Hibrido: usar la capa de texto embebida del PDF en paginas born-digital y
 # OCR en las escaneadas. El guardrail nunca usa la capa embebida si tendria
@@ -746,6 +884,18 @@ OCR_PDF_TEXT_LAYER_MIN_WORDS = _safe_int_env("OCR_PDF_TEXT_LAYER_MIN_WORDS", 8)
 # Lado mayor (px) de un raster a partir del cual se asume escaneo de pagina.
 OCR_PDF_TEXT_LAYER_IMG_MAXSIDE = _safe_int_env("OCR_PDF_TEXT_LAYER_IMG_MAXSIDE", 1000)
 
+# OCR de PDF en paralelo: procesos que rasterizan y reconocen paginas a la vez
+# (1 = secuencial). OCR_PDF_PAGES_IN_FLIGHT acota las paginas rasterizadas en
+# memoria al mismo tiempo (0 = el doble de workers).
+OCR_PDF_PAGE_WORKERS = _safe_int_env("OCR_PDF_PAGE_WORKERS", 1)
+OCR_PDF_PAGES_IN_FLIGHT = _safe_int_env("OCR_PDF_PAGES_IN_FLIGHT", 0)
+
+# Cache de resultados OCR por pagina, direccionado por hash de contenido +
+# opciones. Eviccion: TTL sin uso y tope de entradas (LRU). Ver docs/ocr.md.
+OCR_CACHE_ENABLED = _safe_bool_env("OCR_CACHE_ENABLED", not RUNNING_TESTS)
+OCR_CACHE_TTL_DAYS = _safe_int_env("OCR_CACHE_TTL_DAYS", 90)
+OCR_CACHE_MAX_ENTRIES = _safe_int_env("OCR_CACHE_MAX_ENTRIES", 50000)
+
 # Directorio de modelos Tesseract (tessdata). Vacio = usar el del sistema.
 # Permite apuntar a tessdata_best (mas preciso) sin romper el fallback al
 # estandar: si el dir o el modelo no existen, Tesseract usa el del sistema.
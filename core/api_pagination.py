@@ -0,0 +1,78 @@
+"""
+Paginacion DRF con modo keyset opcional.
+
+``PageNumberPagination`` resuelve cada pagina con ``OFFSET`` y un ``COUNT(*)``:
+las paginas profundas se vuelven cada vez mas lentas. Con ``?cursor=`` (o
+``?pagination=cursor`` para pedir la primera pagina) la respuesta pasa a
+``CursorPagination`` de DRF: busca desde el ultimo valor de orden
+(``WHERE id > x``), no cuenta filas y devuelve ``next``/``previous`` opacos.
+Sin esos parametros la respuesta no cambia.
+"""
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from core.pagination import KEYSET_CURSOR_PARAM
+
+
+class KeysetCursorPagination(CursorPagination):
+    ordering = "pk"
+    cursor_query_param = KEYSET_CURSOR_PARAM
+
+
+class KeysetOptionalPageNumberPagination(PageNumberPagination):
+    keyset_class = KeysetCursorPagination
+    pagination_mode_query_param = "pagination"
+    keyset_mode = "cursor"
+
+    def _wants_keyset(self, request):
+        params = request.query_params
+        return (
+            KEYSET_CURSOR_PARAM in params
+            or params.get(self.pagination_mode_query_param) == self.keyset_mode
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if not self._wants_keyset(request):
+            return super().paginate_queryset(queryset, request, view)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.keyset = self.keyset_class()
+        self.keyset.page_size = page_size
+        self.keyset.page_size_query_param = None
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if getattr(self, "keyset", None) is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if getattr(self, "keyset", None) is not None:
+            return self.keyset.get_html_context()
+        return super().get_html_context()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.extend(
+            [
+                {
+                    "name": KEYSET_CURSOR_PARAM,
+                    "required": False,
+                    "in": "query",
+                    "description": "Cursor opaco de paginacion keyset.",
+                    "schema": {"type": "string"},
+                },
+                {
+                    "name": self.pagination_mode_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": (
+                        f"'{self.keyset_mode}' pide la primera pagina en modo keyset."
+                    ),
+                    "schema": {"type": "string", "enum": [self.keyset_mode]},
+                },
+            ]
+        )
+        return parameters
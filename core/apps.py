@@ -1,4 +1,4 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 
 
 class CoreConfig(AppConfig):
@@ -6,5 +6,15 @@ class CoreConfig(AppConfig):
     name = "core"
 
     def ready(self):
-        """Importa las señales de cache cuando la app está lista."""
+        """Importa las señales de cache y registra la cola de imagenes."""
         import core.cache_utils  # noqa: F401, pylint: disable=import-outside-toplevel,unused-import
+        from core.jobs import (  # pylint: disable=import-outside-toplevel
+            registrar_cola_jobs,
+        )
+        from core.services.image_service import (  # pylint: disable=import-outside-toplevel
+            IMAGE_DERIVATIVE_JOB_QUEUE,
+            connect_image_derivative_signals,
+        )
+
+        registrar_cola_jobs(IMAGE_DERIVATIVE_JOB_QUEUE)
+        connect_image_derivative_signals(apps.get_models())
@@ -0,0 +1,439 @@
+"""Modo carga de benchmarks: concurrencia sostenida con percentiles de latencia.
+
+Cada escenario HTTP se ejecuta desde N hilos (o procesos) durante una ventana
+fija. Cada worker usa su propio ``Client`` y su propia conexión a la base, así
+aparecen la contención de locks y los límites del pool de conexiones que la
+corrida secuencial de ``BenchmarkRunner`` no muestra.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client
+
+from core.benchmarks.bootstrap import BenchmarkSeedState
+from core.benchmarks.runner import load_baseline, request_scenario, write_json
+from core.benchmarks.scenarios import BenchmarkScenario, ScenarioSkip
+
+LOAD_MODE_THREAD = "thread"
+LOAD_MODE_PROCESS = "process"
+LOAD_MODES = (LOAD_MODE_THREAD, LOAD_MODE_PROCESS)
+
+
+class LoadModeUnavailable(Exception):
+    """El modo de carga pedido no puede ejecutarse con la base configurada."""
+
+
+@dataclass(frozen=True)
+class LoadRegressionThresholds:
+    """Umbrales de regresión basados en percentiles para el modo carga."""
+
+    p95_regression_pct: float = 25.0
+    p99_regression_pct: float = 50.0
+    latency_regression_ms: float = 25.0
+    throughput_regression_pct: float = 20.0
+    error_rate_regression: float = 0.01
+
+
+@dataclass
+class WorkerResult:
+    """Latencias y errores de un worker durante la ventana medida."""
+
+    latencies_ms: list[float]
+    errors: int
+    error_samples: list[str]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil con interpolación lineal (mismo criterio que numpy)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _run_worker(
+    scenario: BenchmarkScenario,
+    seed_state: BenchmarkSeedState,
+    *,
+    warmups: int,
+    duration_seconds: float,
+    start_barrier,
+) -> WorkerResult:
+    try:
+        client = Client()
+        if scenario.requires_auth:
+            client.force_login(
+                get_user_model().objects.get(username=seed_state.benchmark_username)
+            )
+        for _ in range(warmups):
+            try:
+                request_scenario(client, scenario, seed_state)
+            except Exception:  # noqa: BLE001 — el warmup no se contabiliza
+                pass
+    except BaseException:
+        # Libera al resto de los workers que esperan en la barrera.
+        start_barrier.abort()
+        raise
+
+    start_barrier.wait()
+    latencies: list[float] = []
+    errors = 0
+    error_samples: list[str] = []
+    deadline = time.monotonic() + duration_seconds
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            request_scenario(client, scenario, seed_state)
+        except ScenarioSkip:
+            raise
+        except Exception as exc:  # noqa: BLE001 — se contabiliza como error
+            errors += 1
+            if len(error_samples) < 3:
+                error_samples.append(str(exc))
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    return WorkerResult(latencies, errors, error_samples)
+
+
+def _thread_target(results, index, **kwargs) -> None:
+    try:
+        results[index] = _run_worker(**kwargs)
+    except BaseException as exc:  # noqa: BLE001 — se reporta desde el hilo padre
+        results[index] = exc
+    finally:
+        connection.close()
+
+
+def _process_target(queue, **kwargs) -> None:
+    try:
+        queue.put(_run_worker(**kwargs))
+    except BaseException as exc:  # noqa: BLE001 — se reporta al proceso padre
+        queue.put(exc)
+    finally:
+        connections.close_all()
+
+
+def _ensure_process_mode_available() -> None:
+    settings_dict = connection.settings_dict
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        raise LoadModeUnavailable(
+            "El modo process necesita una base servidor (DATABASE_HOST y "
+            f"USE_SQLITE_FOR_TESTS=0); la actual es {settings_dict['NAME']!r}."
+        )
+
+
+def summarize_load(
+    worker_results: list[WorkerResult],
+    *,
+    duration_seconds: float,
+) -> dict[str, Any]:
+    """Agrega los resultados de los workers en percentiles y tasas."""
+    latencies = [value for result in worker_results for value in result.latencies_ms]
+    errors = sum(result.errors for result in worker_results)
+    total = len(latencies) + errors
+    error_samples = [
+        sample for result in worker_results for sample in result.error_samples
+    ][:3]
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(len(latencies) / duration_seconds, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "error_samples": error_samples,
+    }
+
+
+class LoadBenchmarkRunner:
+    """Ejecuta escenarios HTTP con concurrencia sostenida y compara percentiles."""
+
+    def __init__(
+        self,
+        *,
+        scenarios: list[BenchmarkScenario],
+        seed_state: BenchmarkSeedState,
+        thresholds: LoadRegressionThresholds,
+        concurrency: int = 8,
+        duration_seconds: float = 10.0,
+        mode: str = LOAD_MODE_THREAD,
+        warmups: int = 1,
+    ) -> None:
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Modo de carga inválido: {mode}")
+        self.scenarios = scenarios
+        self.seed_state = seed_state
+        self.thresholds = thresholds
+        self.concurrency = max(1, concurrency)
+        self.duration_seconds = max(0.1, duration_seconds)
+        self.mode = mode
+        self.warmups = warmups
+
+    def run(
+        self,
+        *,
+        baseline_path: Path,
+        output_path: Path,
+        rebuild_baseline: bool = False,
+    ) -> dict[str, Any]:
+        """Ejecuta la carga y deja resultados serializados."""
+        if self.mode == LOAD_MODE_PROCESS:
+            _ensure_process_mode_available()
+
+        baseline_data = load_baseline(baseline_path)
+        results: list[dict[str, Any]] = []
+        for scenario in self.scenarios:
+            result = self._run_scenario(scenario)
+            result["comparison"] = compare_load_with_baseline(
+                baseline_entry=baseline_data.get("load", {}).get(scenario.scenario_id),
+                result=result,
+                thresholds=self.thresholds,
+            )
+            results.append(result)
+
+        payload = build_load_payload(
+            results=results,
+            thresholds=self.thresholds,
+            concurrency=self.concurrency,
+            duration_seconds=self.duration_seconds,
+            mode=self.mode,
+            baseline_path=baseline_path,
+        )
+        write_json(output_path, payload)
+
+        if rebuild_baseline:
+            baseline_data["load"] = build_load_baseline_entries(payload)
+            write_json(baseline_path, baseline_data)
+
+        return payload
+
+    def _run_scenario(self, scenario: BenchmarkScenario) -> dict[str, Any]:
+        base = {
+            "scenario_id": scenario.scenario_id,
+            "module": scenario.module,
+            "label": scenario.label,
+        }
+        if not scenario.route_name:
+            return {
+                **base,
+                "status": "skipped",
+                "reason": "El modo carga solo ejecuta escenarios HTTP.",
+            }
+        try:
+            if scenario.kwargs_factory:
+                # Falta de semilla: se marca skip antes de lanzar workers.
+                scenario.kwargs_factory(self.seed_state)
+            worker_results = self._drive(scenario)
+        except ScenarioSkip as exc:
+            return {**base, "status": "skipped", "reason": str(exc)}
+        except Exception as exc:  # pragma: no cover - defensivo para el runner
+            return {**base, "status": "failed", "reason": str(exc)}
+
+        return {
+            **base,
+            "status": "measured",
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "duration_seconds": self.duration_seconds,
+            **summarize_load(worker_results, duration_seconds=self.duration_seconds),
+        }
+
+    def _worker_kwargs(self, scenario: BenchmarkScenario, start_barrier):
+        return {
+            "scenario": scenario,
+            "seed_state": self.seed_state,
+            "warmups": self.warmups,
+            "duration_seconds": self.duration_seconds,
+            "start_barrier": start_barrier,
+        }
+
+    def _drive(self, scenario: BenchmarkScenario) -> list[WorkerResult]:
+        if self.mode == LOAD_MODE_PROCESS:
+            outcomes = self._drive_processes(scenario)
+        else:
+            outcomes = self._drive_threads(scenario)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return outcomes
+
+    def _drive_threads(self, scenario: BenchmarkScenario) -> list[Any]:
+        start_barrier = threading.Barrier(self.concurrency)
+        outcomes: list[Any] = [None] * self.concurrency
+        threads = [
+            threading.Thread(
+                target=_thread_target,
+                args=(outcomes, index),
+                kwargs=self._worker_kwargs(scenario, start_barrier),
+                name=f"benchmark-load-{index}",
+            )
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def _drive_processes(self, scenario: BenchmarkScenario) -> list[Any]:
+        # Igual que los workers de jobs: conexiones cerradas antes del fork.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        start_barrier = context.Barrier(self.concurrency)
+        queue = context.Queue()
+        processes = [
+            context.Process(
+                target=_process_target,
+                args=(queue,),
+                kwargs=self._worker_kwargs(scenario, start_barrier),
+            )
+            for _ in range(self.concurrency)
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+        return outcomes
+
+
+def _regressed(current: float, base: float, pct: float, min_ms: float) -> bool:
+    delta = current - base
+    if delta <= 0 or delta < min_ms:
+        return False
+    return (delta / base) * 100 >= pct if base else True
+
+
+def compare_load_with_baseline(
+    *,
+    baseline_entry: dict[str, Any] | None,
+    result: dict[str, Any],
+    thresholds: LoadRegressionThresholds,
+) -> dict[str, Any]:
+    """Compara percentiles, throughput y errores contra el baseline de carga."""
+    if result["status"] != "measured":
+        return {"status": "not-compared"}
+    if not baseline_entry:
+        return {"status": "new"}
+    if (
+        baseline_entry.get("concurrency") != result["concurrency"]
+        or baseline_entry.get("mode") != result["mode"]
+    ):
+        return {
+            "status": "not-compared",
+            "reason": "El baseline se midió con otra concurrencia o modo.",
+        }
+
+    p95_regression = _regressed(
+        result["p95_ms"],
+        float(baseline_entry["p95_ms"]),
+        thresholds.p95_regression_pct,
+        thresholds.latency_regression_ms,
+    )
+    p99_regression = _regressed(
+        result["p99_ms"],
+        float(baseline_entry["p99_ms"]),
+        thresholds.p99_regression_pct,
+        thresholds.latency_regression_ms,
+    )
+    base_throughput = float(baseline_entry["throughput_rps"] or 0)
+    throughput_delta_pct = (
+        round((result["throughput_rps"] - base_throughput) / base_throughput * 100, 2)
+        if base_throughput
+        else 0.0
+    )
+    throughput_regression = (
+        -throughput_delta_pct >= thresholds.throughput_regression_pct
+    )
+    error_rate_delta = round(
+        result["error_rate"] - float(baseline_entry.get("error_rate", 0.0)), 4
+    )
+    error_regression = error_rate_delta >= thresholds.error_rate_regression
+
+    regression = (
+        p95_regression or p99_regression or throughput_regression or error_regression
+    )
+    return {
+        "status": "regression" if regression else "ok",
+        "p95_delta_ms": round(result["p95_ms"] - baseline_entry["p95_ms"], 2),
+        "p99_delta_ms": round(result["p99_ms"] - baseline_entry["p99_ms"], 2),
+        "throughput_delta_pct": throughput_delta_pct,
+        "error_rate_delta": error_rate_delta,
+        "p95_regression": p95_regression,
+        "p99_regression": p99_regression,
+        "throughput_regression": throughput_regression,
+        "error_regression": error_regression,
+    }
+
+
+def build_load_payload(
+    *,
+    results: list[dict[str, Any]],
+    thresholds: LoadRegressionThresholds,
+    concurrency: int,
+    duration_seconds: float,
+    mode: str,
+    baseline_path: Path,
+) -> dict[str, Any]:
+    """Compone el artefacto de una corrida en modo carga."""
+    counts = {"measured": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    regressions = sum(
+        1
+        for result in results
+        if result["status"] == "measured"
+        and result["comparison"]["status"] == "regression"
+    )
+    return {
+        "meta": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "kind": "load",
+            "mode": mode,
+            "concurrency": concurrency,
+            "duration_seconds": duration_seconds,
+            "baseline_path": str(baseline_path),
+            "thresholds": asdict(thresholds),
+        },
+        "summary": {**counts, "regressions": regressions},
+        "results": results,
+    }
+
+
+def build_load_baseline_entries(payload: dict[str, Any]) -> dict[str, Any]:
+    """Versión compacta de la corrida de carga para el baseline versionado."""
+    keys = (
+        "module",
+        "label",
+        "mode",
+        "concurrency",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+        "throughput_rps",
+        "error_rate",
+    )
+    return {
+        result["scenario_id"]: {key: result[key] for key in keys}
+        for result in payload["results"]
+        if result["status"] == "measured"
+    }
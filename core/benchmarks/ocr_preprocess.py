@@ -0,0 +1,148 @@
+"""Micro-benchmark del preprocesado OCR: pipeline vectorizado vs. anterior.
+
+Cada variante corre en un proceso hijo (fork) para que la memoria pico de una
+no contamine a la otra. Se reporta la latencia por página y el pico de RSS por
+encima del RSS con que arrancó el hijo. La variante ``vectorized_batch`` usa
+``preprocess_batch_for_ocr`` sobre todas las páginas (latencia = total/páginas).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import resource
+import statistics
+import time
+from typing import Any, Callable
+
+import cv2
+import numpy as np
+from django.conf import settings
+from PIL import Image
+
+# A4 a 300 DPI, el tamaño que produce pdf2image para los expedientes.
+DEFAULT_PAGE_SIZE = (2480, 3508)
+DEFAULT_PAGES = 12
+
+
+def legacy_preprocess_for_ocr(pil_image: Image.Image) -> Image.Image:
+    """Réplica del pipeline previo (PIL <-> NumPy y arrays nuevos por paso)."""
+    rgb = np.array(pil_image.convert("RGB"))
+    if getattr(settings, "OCR_REMOVE_COLOR_STAMPS", False):
+        threshold = getattr(settings, "OCR_COLOR_SAT_THRESHOLD", 90)
+        hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+        color_mask = hsv[:, :, 1] > threshold
+        rgb = rgb.copy()
+        rgb[color_mask] = (255, 255, 255)
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    height, width = gray.shape[:2]
+    long_side = max(height, width)
+    if 0 < long_side < 1500:
+        scale = 1500 / long_side
+        new_size = (int(round(width * scale)), int(round(height * scale)))
+        gray = cv2.resize(gray, new_size, interpolation=cv2.INTER_CUBIC)
+    binary = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10
+    )
+    return Image.fromarray(binary)
+
+
+def build_synthetic_pages(
+    pages: int, size: tuple[int, int] = DEFAULT_PAGE_SIZE
+) -> list[Image.Image]:
+    """Páginas RGB con fondo gris, "texto" negro y un sello azul."""
+    rng = np.random.default_rng(seed=42)
+    width, height = size
+    images = []
+    for _ in range(pages):
+        page = np.full((height, width, 3), 225, dtype=np.uint8)
+        noise = rng.integers(0, 20, size=(height, width), dtype=np.uint8)
+        page -= noise[:, :, None]
+        for row in range(200, height - 200, 60):
+            page[row : row + 18, 150 : width - 150] = 20
+        page[400:900, width - 900 : width - 300] = (40, 60, 200)
+        images.append(Image.fromarray(page))
+    return images
+
+
+def _current_rss_kb() -> int:
+    with open("/proc/self/statm", encoding="ascii") as handle:
+        resident_pages = int(handle.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _measure(
+    preprocess: Callable[[list[Image.Image]], list[Image.Image]],
+    pages: int,
+    size: tuple[int, int],
+    batch: bool,
+    queue,
+) -> None:
+    images = build_synthetic_pages(pages, size)
+    start_rss_kb = _current_rss_kb()
+    latencies: list[float] = []
+    start = time.perf_counter()
+    if batch:
+        preprocess(images)
+    else:
+        for image in images:
+            page_start = time.perf_counter()
+            preprocess([image])
+            latencies.append((time.perf_counter() - page_start) * 1000)
+    total_ms = (time.perf_counter() - start) * 1000
+    latencies = latencies or [total_ms / pages]
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put(
+        {
+            "pages": pages,
+            "page_p50_ms": round(statistics.median(latencies), 2),
+            "page_max_ms": round(max(latencies), 2),
+            "total_ms": round(total_ms, 2),
+            "peak_rss_delta_mb": round(max(0, peak_kb - start_rss_kb) / 1024, 1),
+        }
+    )
+
+
+def _run_isolated(
+    preprocess: Callable[[list[Image.Image]], list[Image.Image]],
+    pages: int,
+    size: tuple[int, int],
+    *,
+    batch: bool = False,
+) -> dict[str, Any]:
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(
+        target=_measure, args=(preprocess, pages, size, batch, queue)
+    )
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _legacy_pages(images: list[Image.Image]) -> list[Image.Image]:
+    return [legacy_preprocess_for_ocr(image) for image in images]
+
+
+def _vectorized_pages(images: list[Image.Image]) -> list[Image.Image]:
+    from ocr.services_preprocess import preprocess_for_ocr
+
+    return [preprocess_for_ocr(image) for image in images]
+
+
+def _vectorized_batch(images: list[Image.Image]) -> list[Image.Image]:
+    from ocr.services_preprocess import preprocess_batch_for_ocr
+
+    return preprocess_batch_for_ocr(images)
+
+
+def run_ocr_preprocess_benchmark(
+    *, pages: int = DEFAULT_PAGES, size: tuple[int, int] = DEFAULT_PAGE_SIZE
+) -> dict[str, dict[str, Any]]:
+    """Compara latencia por página y RSS pico del pipeline anterior y el nuevo."""
+    return {
+        "legacy": _run_isolated(_legacy_pages, pages, size),
+        "vectorized": _run_isolated(_vectorized_pages, pages, size),
+        "vectorized_batch": _run_isolated(_vectorized_batch, pages, size, batch=True),
+    }
@@ -0,0 +1,450 @@
+"""Modo plan de consultas: EXPLAIN por escenario y asesor de índices.
+
+Cada escenario HTTP del catálogo se ejecuta una vez (después de los warmups)
+capturando sus SELECT. Cada consulta distinta se pasa por ``EXPLAIN`` y se
+marcan scans completos, ordenamientos con archivo temporal (filesort) y
+tablas temporales. Sobre los seeds de benchmark esas marcas son orientativas:
+con pocas filas el optimizador prefiere scans que en producción no elegiría.
+
+El chequeo que gatea es estático. Para los escenarios con
+``filter_engine``, cada campo del ``field_map`` de ``AdvancedFilterEngine`` se
+resuelve a su columna y se verifica que encabece algún índice. Las columnas
+sin índice se reportan como ``index_gaps`` con una sugerencia de índice
+(compuesto con la columna de orden del listado cuando se la puede deducir).
+Los huecos aceptados se versionan en la sección ``index_gaps`` del baseline;
+uno nuevo cuenta como regresión.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DatabaseError, connection
+from django.db.models import Index
+from django.test import Client
+
+from core.benchmarks.bootstrap import BenchmarkSeedState
+from core.benchmarks.runner import load_baseline, request_scenario, write_json
+from core.benchmarks.scenarios import BenchmarkScenario, ScenarioSkip
+
+# Operadores cuyo lookup puede resolverse con un índice B-tree. ``contains``
+# (LIKE '%x%') y las negaciones no lo usan.
+INDEXABLE_OPS = frozenset({"eq", "gt", "lt", "gte", "lte", "empty"})
+# Con dos valores posibles un índice propio casi nunca se elige.
+LOW_SELECTIVITY_TYPES = frozenset({"boolean"})
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\S+)(.*)$")
+_FROM_TABLE = re.compile(r'FROM\s+[`"]?(\w+)[`"]?', re.IGNORECASE)
+_ORDER_END = re.compile(r"\s+(?:LIMIT|OFFSET|FOR UPDATE)\b", re.IGNORECASE)
+_QUALIFIED_COLUMN = re.compile(r'[`"]?(\w+)[`"]?\.[`"]?(\w+)[`"]?')
+
+
+def capture_selects(run) -> list[dict[str, Any]]:
+    """Ejecuta ``run`` y devuelve sus SELECT distintos con cantidad de ejecuciones."""
+    captured: dict[str, dict[str, Any]] = {}
+
+    def _wrapper(execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() == "SELECT":
+            entry = captured.setdefault(
+                sql, {"sql": sql, "params": params, "executions": 0}
+            )
+            entry["executions"] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(_wrapper):
+        run()
+    return list(captured.values())
+
+
+def _sqlite_findings(rows) -> tuple[list[str], list[dict[str, str]]]:
+    plan, findings = [], []
+    for row in rows:
+        detail = str(row[-1])
+        plan.append(detail)
+        scan = _SQLITE_SCAN.match(detail)
+        if scan and "USING" not in scan.group(2):
+            findings.append({"kind": "full_scan", "table": scan.group(1)})
+        elif "TEMP B-TREE FOR" in detail and "ORDER BY" in detail:
+            findings.append({"kind": "filesort", "table": ""})
+        elif "TEMP B-TREE FOR" in detail:
+            findings.append({"kind": "temporary", "table": ""})
+    return plan, findings
+
+
+def _mysql_findings(rows, columns) -> tuple[list[dict], list[dict[str, str]]]:
+    plan, findings = [], []
+    for row in rows:
+        entry = dict(zip(columns, row))
+        plan.append({key: entry.get(key) for key in ("table", "type", "key", "Extra")})
+        table = str(entry.get("table") or "")
+        extra = str(entry.get("Extra") or "")
+        if entry.get("type") == "ALL":
+            findings.append({"kind": "full_scan", "table": table})
+        if "Using filesort" in extra:
+            findings.append({"kind": "filesort", "table": table})
+        if "Using temporary" in extra:
+            findings.append({"kind": "temporary", "table": table})
+    return plan, findings
+
+
+def explain_statement(statement: dict[str, Any]) -> dict[str, Any]:
+    """Plan y hallazgos de una consulta capturada según el motor en uso."""
+    result = {"sql": statement["sql"], "executions": statement["executions"]}
+    vendor = connection.vendor
+    if vendor not in {"sqlite", "mysql"}:
+        return {
+            **result,
+            "plan": [],
+            "findings": [],
+            "error": f"EXPLAIN no soportado en {vendor}",
+        }
+
+    prefix = "EXPLAIN QUERY PLAN " if vendor == "sqlite" else "EXPLAIN "
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + statement["sql"], statement["params"])
+            rows = cursor.fetchall()
+            columns = [column[0] for column in cursor.description or []]
+    except DatabaseError as exc:
+        return {**result, "plan": [], "findings": [], "error": str(exc)}
+
+    if vendor == "sqlite":
+        plan, findings = _sqlite_findings(rows)
+        # SQLite no nombra la tabla de los B-tree temporales: es la principal.
+        _, main_table = select_parts(statement["sql"])
+        for finding in findings:
+            finding["table"] = finding["table"] or main_table or ""
+    else:
+        plan, findings = _mysql_findings(rows, columns)
+    return {**result, "plan": plan, "findings": findings}
+
+
+def resolve_filter_column(model, lookup: str):
+    """``(modelo, campo)`` sobre el que filtra ``lookup``; ``None`` si no es un campo."""
+    resolved = None
+    current = model
+    for part in lookup.split("__"):
+        if resolved is not None:
+            field = resolved[1]
+            if not field.is_relation or field.related_model is None:
+                break  # Transform sobre un campo concreto (``__year``, etc.).
+            current = field.related_model
+        try:
+            field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            if resolved is None:
+                return None  # Anotación del queryset, no una columna.
+            break
+        resolved = (current, field)
+    return resolved
+
+
+def _leading_index_fields(model) -> set[str]:
+    """Campos que encabezan algún índice, restricción única o ``unique_together``."""
+    meta = model._meta
+    leading = set()
+    for index in meta.indexes:
+        if index.fields:
+            leading.add(index.fields[0].lstrip("-"))
+    for constraint in meta.constraints:
+        fields = getattr(constraint, "fields", ())
+        if fields:
+            leading.add(fields[0])
+    for fields in meta.unique_together:
+        if fields:
+            leading.add(fields[0])
+    return leading
+
+
+def is_indexed(model, field) -> bool:
+    if not field.concrete or field.many_to_many:
+        # Relación inversa o M2M: el join usa la FK del otro lado, indexada.
+        return True
+    if field.primary_key or field.unique or field.db_index:
+        return True
+    return field.name in _leading_index_fields(model)
+
+
+def _uses_indexable_ops(engine, field_type: str) -> bool:
+    allowed = engine.allowed_ops.get(field_type)
+    return allowed is None or bool(set(allowed) & INDEXABLE_OPS)
+
+
+def analyze_filter_engine(model_label: str, engine) -> list[dict[str, Any]]:
+    """Clasifica cada campo filtrable del motor según el índice que lo respalda."""
+    base_model = apps.get_model(model_label)
+    fields = []
+    for name, field_type in sorted(engine.field_types.items()):
+        lookup = engine.field_map[name]
+        entry = {"field": name, "lookup": lookup, "type": field_type}
+        resolved = resolve_filter_column(base_model, lookup)
+        if resolved is None:
+            fields.append({**entry, "status": "annotation"})
+            continue
+        model, field = resolved
+        entry.update(
+            model=model._meta.label,
+            table=model._meta.db_table,
+            column=getattr(field, "column", None) or field.name,
+            model_field=field.name,
+        )
+        if is_indexed(model, field):
+            status = "indexed"
+        elif field_type in LOW_SELECTIVITY_TYPES:
+            status = "low_selectivity"
+        elif not _uses_indexable_ops(engine, field_type):
+            status = "not_indexable"
+        else:
+            status = "index_gap"
+        fields.append({**entry, "status": status})
+    return fields
+
+
+def select_parts(sql: str) -> tuple[list[str], str | None]:
+    """Columnas del SELECT y tabla principal, salteando subconsultas."""
+    upper = sql.upper()
+    start = upper.find("SELECT") + len("SELECT")
+    items, depth = [], 0
+    for position in range(start, len(sql)):
+        char = sql[position]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and char == ",":
+            items.append(sql[start:position].strip())
+            start = position + 1
+        elif depth == 0 and upper.startswith(" FROM ", position):
+            items.append(sql[start:position].strip())
+            table = _FROM_TABLE.match(sql, position + 1)
+            return items, table.group(1) if table else None
+    return items, None
+
+
+def order_column(sql: str) -> tuple[str, str] | None:
+    """``(tabla, columna)`` del primer término del ``ORDER BY`` principal."""
+    position = sql.upper().rfind(" ORDER BY ")
+    if position < 0 or sql.count("(", 0, position) != sql.count(")", 0, position):
+        return None
+    clause = _ORDER_END.split(sql[position + len(" ORDER BY ") :], maxsplit=1)[0]
+    term = clause.split(",")[0].strip()
+    first_word = term.split()[0] if term else ""
+    if first_word.isdigit():
+        # ``ORDER BY 1``: Django ordena por posición al usar ``values()``.
+        items, _ = select_parts(sql)
+        index = int(first_word) - 1
+        if index >= len(items):
+            return None
+        term = items[index]
+    column = _QUALIFIED_COLUMN.match(term)
+    return (column.group(1), column.group(2)) if column else None
+
+
+def _order_field_for(table: str, statements: list[dict[str, Any]], model):
+    columns = {
+        field.column: field.name
+        for field in model._meta.concrete_fields
+        # InnoDB ya agrega la PK al final de cada índice secundario.
+        if not field.primary_key
+    }
+    for statement in statements:
+        _, main_table = select_parts(statement["sql"])
+        order = order_column(statement["sql"])
+        if order and main_table == table == order[0] and order[1] in columns:
+            return columns[order[1]]
+    return None
+
+
+def suggest_index(gap: dict[str, Any], statements: list[dict[str, Any]]) -> dict:
+    """Índice sugerido para un hueco: la columna filtrada y, si hay, la de orden."""
+    model = apps.get_model(gap["model"])
+    fields = [gap["model_field"]]
+    order_field = _order_field_for(gap["table"], statements, model)
+    if order_field and order_field != gap["model_field"]:
+        fields.append(order_field)
+    index = Index(fields=fields, name="")
+    index.set_name_with_model(model)
+    return {
+        "model": gap["model"],
+        "table": gap["table"],
+        "fields": fields,
+        "name": index.name,
+        "definition": f"models.Index(fields={fields!r}, name={index.name!r})",
+    }
+
+
+def gap_key(gap: dict[str, Any]) -> str:
+    return f"{gap['model']}.{gap['model_field']}"
+
+
+class QueryPlanRunner:
+    """Captura y explica las consultas de cada escenario y busca huecos de índice."""
+
+    def __init__(
+        self,
+        *,
+        scenarios: list[BenchmarkScenario],
+        seed_state: BenchmarkSeedState,
+        warmups: int = 1,
+    ) -> None:
+        self.scenarios = scenarios
+        self.seed_state = seed_state
+        self.warmups = warmups
+
+    def run(
+        self,
+        *,
+        baseline_path: Path,
+        output_path: Path,
+        rebuild_baseline: bool = False,
+    ) -> dict[str, Any]:
+        """Ejecuta el análisis y deja el reporte serializado."""
+        baseline_data = load_baseline(baseline_path)
+        accepted = set(baseline_data.get("index_gaps", []))
+        client = Client()
+        benchmark_user = get_user_model().objects.get(
+            username=self.seed_state.benchmark_username
+        )
+
+        results = [
+            self._run_scenario(client, benchmark_user, scenario)
+            for scenario in self.scenarios
+        ]
+        payload = build_query_plan_payload(
+            results=results, accepted_gaps=accepted, baseline_path=baseline_path
+        )
+        write_json(output_path, payload)
+
+        if rebuild_baseline:
+            baseline_data["index_gaps"] = sorted(
+                {item["key"] for item in payload["index_gaps"]}
+            )
+            write_json(baseline_path, baseline_data)
+
+        return payload
+
+    def _run_scenario(
+        self, client: Client, benchmark_user, scenario: BenchmarkScenario
+    ) -> dict[str, Any]:
+        base = {
+            "scenario_id": scenario.scenario_id,
+            "module": scenario.module,
+            "label": scenario.label,
+        }
+        if not scenario.route_name:
+            return {
+                **base,
+                "status": "skipped",
+                "reason": "El modo plan solo analiza escenarios HTTP.",
+            }
+        try:
+            if scenario.requires_auth:
+                client.force_login(benchmark_user)
+            else:
+                client.logout()
+            for _ in range(self.warmups):
+                request_scenario(client, scenario, self.seed_state)
+            statements = capture_selects(
+                lambda: request_scenario(client, scenario, self.seed_state)
+            )
+            explained = [explain_statement(statement) for statement in statements]
+            filter_fields = (
+                analyze_filter_engine(
+                    scenario.filter_engine.model, scenario.filter_engine.load()
+                )
+                if scenario.filter_engine
+                else []
+            )
+        except ScenarioSkip as exc:
+            return {**base, "status": "skipped", "reason": str(exc)}
+        except Exception as exc:  # pragma: no cover - defensivo para el runner
+            return {**base, "status": "failed", "reason": str(exc)}
+
+        gaps = [
+            {**field, "suggestion": suggest_index(field, statements)}
+            for field in filter_fields
+            if field["status"] == "index_gap"
+        ]
+        return {
+            **base,
+            "status": "measured",
+            "statements": explained,
+            "filter_fields": filter_fields,
+            "index_gaps": gaps,
+        }
+
+
+def _count_findings(results, kind: str) -> int:
+    return sum(
+        1
+        for result in results
+        for statement in result.get("statements", [])
+        for finding in statement["findings"]
+        if finding["kind"] == kind
+    )
+
+
+def build_query_plan_payload(
+    *,
+    results: list[dict[str, Any]],
+    accepted_gaps: set[str],
+    baseline_path: Path,
+) -> dict[str, Any]:
+    """Compone el reporte: resultados por escenario e índices sugeridos."""
+    counts = {"measured": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        counts[result["status"]] += 1
+
+    gaps: dict[str, dict[str, Any]] = {}
+    suggestions: dict[str, dict[str, Any]] = {}
+    for result in results:
+        for gap in result.get("index_gaps", []):
+            key = gap_key(gap)
+            gap["new"] = key not in accepted_gaps
+            entry = gaps.setdefault(
+                key,
+                {
+                    "key": key,
+                    "model": gap["model"],
+                    "column": gap["column"],
+                    "new": gap["new"],
+                    "scenarios": [],
+                },
+            )
+            entry["scenarios"].append(result["scenario_id"])
+            suggestion = suggestions.setdefault(
+                gap["suggestion"]["name"],
+                {**gap["suggestion"], "new": gap["new"], "gaps": []},
+            )
+            if key not in suggestion["gaps"]:
+                suggestion["gaps"].append(key)
+    new_gaps = [gap for gap in gaps.values() if gap["new"]]
+
+    return {
+        "meta": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "kind": "explain",
+            "vendor": connection.vendor,
+            "baseline_path": str(baseline_path),
+        },
+        "summary": {
+            **counts,
+            "regressions": len(new_gaps),
+            "statements": sum(len(r.get("statements", [])) for r in results),
+            "full_scans": _count_findings(results, "full_scan"),
+            "filesorts": _count_findings(results, "filesort"),
+            "temporaries": _count_findings(results, "temporary"),
+            "index_gaps": len(gaps),
+        },
+        "index_gaps": sorted(gaps.values(), key=lambda gap: gap["key"]),
+        "suggested_indexes": sorted(
+            suggestions.values(), key=lambda item: (not item["new"], item["name"])
+        ),
+        "results": results,
+    }
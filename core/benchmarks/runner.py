@@ -94,6 +94,11 @@ class BenchmarkRunner:
 
         if rebuild_baseline:
             baseline_payload = build_baseline_payload(payload)
+            # Las secciones de carga y de huecos de índice se reconstruyen solo
+            # desde sus modos (``--load`` y ``--explain``).
+            for section in ("load", "index_gaps"):
+                if section in baseline_data:
+                    baseline_payload[section] = baseline_data[section]
             write_json(baseline_path, baseline_payload)
 
         return payload
@@ -146,24 +151,7 @@ class BenchmarkRunner:
 
         try:
             start = time.perf_counter()
-            if scenario.route_name:
-                kwargs = (
-                    scenario.kwargs_factory(self.seed_state)
-                    if scenario.kwargs_factory
-                    else {}
-                )
-                path = reverse(scenario.route_name, kwargs=kwargs)
-                response = getattr(client, scenario.method.lower())(path)
-                status_code = response.status_code
-                if status_code not in scenario.expected_statuses:
-                    raise RuntimeError(
-                        f"{scenario.scenario_id} devolvió {status_code} en {path}"
-                    )
-            elif scenario.callable_runner:
-                scenario.callable_runner(self.seed_state)
-                status_code = 200
-            else:  # pragma: no cover - contrato inválido
-                raise RuntimeError(f"Escenario inválido: {scenario.scenario_id}")
+            status_code = request_scenario(client, scenario, self.seed_state)
             elapsed_ms = (time.perf_counter() - start) * 1000
 
             db_time_ms = (
@@ -179,6 +167,30 @@ class BenchmarkRunner:
             connection.force_debug_cursor = False
 
 
+def request_scenario(
+    client: Client,
+    scenario: BenchmarkScenario,
+    seed_state: BenchmarkSeedState,
+) -> int:
+    """Ejecuta una vez el escenario y devuelve el status code obtenido."""
+    if scenario.route_name:
+        kwargs = scenario.kwargs_factory(seed_state) if scenario.kwargs_factory else {}
+        path = reverse(scenario.route_name, kwargs=kwargs)
+        response = getattr(client, scenario.method.lower())(path)
+        status_code = response.status_code
+        if status_code not in scenario.expected_statuses:
+            raise RuntimeError(
+                f"{scenario.scenario_id} devolvió {status_code} en {path}"
+            )
+        return status_code
+    if scenario.callable_runner:
+        scenario.callable_runner(seed_state)
+        return 200
+    raise RuntimeError(  # pragma: no cover - contrato inválido
+        f"Escenario inválido: {scenario.scenario_id}"
+    )
+
+
 def serialize_measured_scenario(
     scenario: BenchmarkScenario,
     samples: list[SampleMeasurement],
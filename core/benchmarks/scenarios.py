@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
+from importlib import import_module
 from typing import Any, Callable
 from unittest import mock
 
@@ -18,6 +20,19 @@ class ScenarioSkip(Exception):
     """Señala que un escenario no puede medirse con el dataset actual."""
 
 
+@dataclass(frozen=True)
+class FilterEngineRef:
+    """``AdvancedFilterEngine`` de un listado y el modelo que filtra."""
+
+    model: str
+    engine: str
+
+    def load(self):
+        """Importa el motor declarado como ``"modulo:ATRIBUTO"``."""
+        module_path, attribute = self.engine.split(":")
+        return getattr(import_module(module_path), attribute)
+
+
 @dataclass(frozen=True)
 class BenchmarkScenario:
     """Describe un escenario medible por URL o callable."""
@@ -31,6 +46,7 @@ class BenchmarkScenario:
     callable_runner: Callable[[BenchmarkSeedState], None] | None = None
     requires_auth: bool = True
     expected_statuses: tuple[int, ...] = (200,)
+    filter_engine: FilterEngineRef | None = None
 
 
 def seeded_pk(
@@ -48,7 +64,15 @@ def seeded_pk(
 def all_scenarios() -> list[BenchmarkScenario]:
     """Devuelve la matriz base de escenarios profundos por módulo."""
     return [
-        BenchmarkScenario("users:list", "users", "Listado de usuarios", "usuarios"),
+        BenchmarkScenario(
+            "users:list",
+            "users",
+            "Listado de usuarios",
+            "usuarios",
+            filter_engine=FilterEngineRef(
+                "auth.User", "users.services:BENEFICIARIO_ADVANCED_FILTER"
+            ),
+        ),
         BenchmarkScenario("users:groups", "users", "Listado de grupos", "grupos"),
         BenchmarkScenario("core:inicio", "core", "Inicio", "inicio"),
         BenchmarkScenario(
@@ -71,7 +95,14 @@ def all_scenarios() -> list[BenchmarkScenario]:
             kwargs_factory=lambda seed: {"slug": "tablero-benchmark"},
         ),
         BenchmarkScenario(
-            "comedores:list", "comedores", "Listado de comedores", "comedores"
+            "comedores:list",
+            "comedores",
+            "Listado de comedores",
+            "comedores",
+            filter_engine=FilterEngineRef(
+                "comedores.Comedor",
+                "comedores.services.comedor_service.impl:COMEDOR_ADVANCED_FILTER",
+            ),
         ),
         BenchmarkScenario(
             "comedores:detail",
@@ -86,7 +117,15 @@ def all_scenarios() -> list[BenchmarkScenario]:
             "Listado de organizaciones",
             "organizaciones",
         ),
-        BenchmarkScenario("duplas:list", "duplas", "Listado de duplas", "dupla_list"),
+        BenchmarkScenario(
+            "duplas:list",
+            "duplas",
+            "Listado de duplas",
+            "dupla_list",
+            filter_engine=FilterEngineRef(
+                "duplas.Dupla", "duplas.views:DUPLA_ADVANCED_FILTER"
+            ),
+        ),
         BenchmarkScenario(
             "audittrail:list",
             "audittrail",
@@ -98,6 +137,9 @@ def all_scenarios() -> list[BenchmarkScenario]:
             "ciudadanos",
             "Listado de ciudadanos",
             "ciudadanos",
+            filter_engine=FilterEngineRef(
+                "ciudadanos.Ciudadano", "ciudadanos.views:CIUDADANOS_ADVANCED_FILTER"
+            ),
         ),
         BenchmarkScenario(
             "ciudadanos:detail",
@@ -111,12 +153,20 @@ def all_scenarios() -> list[BenchmarkScenario]:
             "admisiones",
             "Listado de admisiones técnicas",
             "admisiones_tecnicos_listar",
+            filter_engine=FilterEngineRef(
+                "admisiones.Admision",
+                "admisiones.services.admisiones_service.impl:ADMISION_ADVANCED_FILTER",
+            ),
         ),
         BenchmarkScenario(
             "admisiones:legales",
             "admisiones",
             "Listado de admisiones legales",
             "admisiones_legales_listar",
+            filter_engine=FilterEngineRef(
+                "admisiones.Admision",
+                "admisiones.services.legales_service.impl:LEGALES_ADVANCED_FILTER",
+            ),
         ),
         BenchmarkScenario(
             "intervenciones:create",
@@ -130,9 +180,19 @@ def all_scenarios() -> list[BenchmarkScenario]:
             "centrodefamilia",
             "Listado de centros de familia",
             "centro_list",
+            filter_engine=FilterEngineRef(
+                "centrodefamilia.Centro",
+                "centrodefamilia.views.centro:BOOL_ADVANCED_FILTER",
+            ),
         ),
         BenchmarkScenario(
-            "VAT:list", "VAT", "Listado de centros VAT", "vat_centro_list"
+            "VAT:list",
+            "VAT",
+            "Listado de centros VAT",
+            "vat_centro_list",
+            filter_engine=FilterEngineRef(
+                "VAT.Centro", "VAT.views.centro:BOOL_ADVANCED_FILTER"
+            ),
         ),
         BenchmarkScenario(
             "centrodeinfancia:list",
@@ -152,6 +212,10 @@ def all_scenarios() -> list[BenchmarkScenario]:
             "acompanamientos",
             "Listado de acompañamientos",
             "lista_comedores_acompanamiento",
+            filter_engine=FilterEngineRef(
+                "comedores.Comedor",
+                "acompanamientos.acompanamiento_service:ACOMPANAMIENTO_ADVANCED_FILTER",
+            ),
         ),
         BenchmarkScenario(
             "expedientespagos:list",
@@ -230,6 +294,32 @@ def all_scenarios() -> list[BenchmarkScenario]:
             "Registro de historial serializado",
             callable_runner=run_historial_service_benchmark,
         ),
+        BenchmarkScenario(
+            "users:rate_limit",
+            "users",
+            "Rate limit concurrente (8 hilos x 500 chequeos)",
+            callable_runner=run_rate_limit_benchmark,
+        ),
+        BenchmarkScenario(
+            "core:soft_delete_cascade",
+            "core",
+            "Soft-delete y restore en cascada (10k descendientes)",
+            callable_runner=run_soft_delete_cascade_benchmark,
+        ),
+        BenchmarkScenario(
+            "ocr:preprocess",
+            "ocr",
+            "Preprocesado OCR vectorizado (4 páginas A4 a 300 DPI)",
+            callable_runner=run_ocr_preprocess_benchmark,
+            requires_auth=False,
+        ),
+        BenchmarkScenario(
+            "core:xlsx_export",
+            "core",
+            "Exportación XLSX write-only (5000 filas)",
+            callable_runner=run_xlsx_export_benchmark,
+            requires_auth=False,
+        ),
     ]
 
 
@@ -273,3 +363,81 @@ def run_historial_service_benchmark(seed_state: BenchmarkSeedState) -> None:
             instancia=monto,
             diferencias=payload,
         )
+
+
+RATE_LIMIT_BENCHMARK_THREADS = 8
+RATE_LIMIT_BENCHMARK_CHECKS_PER_THREAD = 500
+
+
+def run_rate_limit_benchmark(seed_state: BenchmarkSeedState) -> None:
+    """Ejecuta chequeos de rate limit concurrentes sobre identidades rotativas."""
+    from users.rate_limits import hit_rate_limit
+
+    def _run_thread(thread_index: int) -> None:
+        for check_index in range(RATE_LIMIT_BENCHMARK_CHECKS_PER_THREAD):
+            hit_rate_limit(
+                scope="benchmark_login",
+                identity=f"10.0.0.{thread_index}:usuario{check_index % 50}",
+                limit=10,
+                window_seconds=60,
+            )
+
+    with ThreadPoolExecutor(max_workers=RATE_LIMIT_BENCHMARK_THREADS) as executor:
+        list(executor.map(_run_thread, range(RATE_LIMIT_BENCHMARK_THREADS)))
+
+
+SOFT_DELETE_BENCHMARK_DESCENDANTS = 10_000
+
+
+def run_soft_delete_cascade_benchmark(seed_state: BenchmarkSeedState) -> None:
+    """Da de baja y restaura una categoría con 10k actividades en cascada."""
+    del seed_state
+    categoria_model = apps.get_model("centrodefamilia", "Categoria")
+    actividad_model = apps.get_model("centrodefamilia", "Actividad")
+
+    categoria = categoria_model.objects.create(nombre="Benchmark cascada")
+    actividad_model.objects.bulk_create(
+        [
+            actividad_model(nombre=f"Actividad {index}", categoria=categoria)
+            for index in range(SOFT_DELETE_BENCHMARK_DESCENDANTS)
+        ],
+        batch_size=1000,
+    )
+    try:
+        categoria.delete(cascade=True)
+        categoria_model.all_objects.filter(pk=categoria.pk).restore(cascade=True)
+    finally:
+        actividad_model.all_objects.filter(categoria=categoria).hard_delete()
+        categoria_model.all_objects.filter(pk=categoria.pk).hard_delete()
+
+
+OCR_PREPROCESS_BENCHMARK_PAGES = 4
+
+
+def run_ocr_preprocess_benchmark(seed_state: BenchmarkSeedState) -> None:
+    """Preprocesa un lote de páginas sintéticas con el pipeline vectorizado."""
+    del seed_state
+    from core.benchmarks.ocr_preprocess import build_synthetic_pages
+    from ocr.services_preprocess import preprocess_batch_for_ocr
+
+    preprocess_batch_for_ocr(build_synthetic_pages(OCR_PREPROCESS_BENCHMARK_PAGES))
+
+
+XLSX_EXPORT_BENCHMARK_ROWS = 5000
+
+
+def run_xlsx_export_benchmark(seed_state: BenchmarkSeedState) -> None:
+    """Exporta un padrón sintético con el motor XLSX write-only."""
+    del seed_state
+    from core.benchmarks.xlsx_export import BENCHMARK_HEADERS, iter_synthetic_rows
+    from core.services.xlsx_export import XlsxSheet, build_xlsx_bytes
+
+    build_xlsx_bytes(
+        [
+            XlsxSheet(
+                title="benchmark",
+                headers=BENCHMARK_HEADERS,
+                rows=iter_synthetic_rows(XLSX_EXPORT_BENCHMARK_ROWS),
+            )
+        ]
+    )
@@ -0,0 +1,129 @@
+"""Benchmark de memoria del motor XLSX write-only contra el armado en memoria.
+
+Cada variante corre en un proceso hijo (fork) para que la memoria pico de una
+no contamine a la otra. La variante ``legacy`` reproduce lo que hacian los
+exportadores: materializar todas las filas y usar un ``Workbook`` normal. La
+variante ``streaming`` usa ``core.services.xlsx_export`` con un generador de
+filas, como cuando se lee de ``values().iterator()``.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Iterator
+
+from openpyxl import Workbook
+
+DEFAULT_ROWS = 100_000
+BENCHMARK_HEADERS = [
+    "apellido",
+    "nombre",
+    "documento",
+    "fecha_nacimiento",
+    "sexo",
+    "nacionalidad",
+    "municipio",
+    "localidad",
+    "calle",
+    "altura",
+    "codigo_postal",
+    "telefono",
+    "email",
+    "estado",
+]
+
+
+def iter_synthetic_rows(rows: int) -> Iterator[list[Any]]:
+    """Filas con la forma de un padron de celiaquia."""
+    base = date(1980, 1, 1)
+    for index in range(rows):
+        yield [
+            f"Apellido{index % 5000}",
+            f"Nombre{index % 700}",
+            str(20_000_000 + index),
+            base + timedelta(days=index % 15_000),
+            "Femenino" if index % 2 else "Masculino",
+            "Argentina",
+            f"Municipio {index % 135}",
+            f"Localidad {index % 2300}",
+            f"Calle {index % 900}",
+            str(index % 5000),
+            str(1000 + index % 8000),
+            f"11{index:08d}",
+            f"persona{index}@example.com",
+            "Con cupo asignado",
+        ]
+
+
+def _current_rss_kb() -> int:
+    with open("/proc/self/statm", encoding="ascii") as handle:
+        resident_pages = int(handle.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _legacy_export(rows: int, fileobj) -> None:
+    data = list(iter_synthetic_rows(rows))
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append(BENCHMARK_HEADERS)
+    for row in data:
+        worksheet.append(row)
+    workbook.save(fileobj)
+
+
+def _streaming_export(rows: int, fileobj) -> None:
+    from core.services.xlsx_export import XlsxSheet, write_xlsx
+
+    write_xlsx(
+        fileobj,
+        [
+            XlsxSheet(
+                title="benchmark",
+                headers=BENCHMARK_HEADERS,
+                rows=iter_synthetic_rows(rows),
+                date_columns=frozenset({3}),
+            )
+        ],
+    )
+
+
+def _measure(export: Callable[[int, Any], None], rows: int, queue) -> None:
+    start_rss_kb = _current_rss_kb()
+    start = time.perf_counter()
+    with tempfile.TemporaryFile() as output:
+        export(rows, output)
+        size = output.tell()
+    total_ms = (time.perf_counter() - start) * 1000
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put(
+        {
+            "rows": rows,
+            "total_ms": round(total_ms, 2),
+            "rows_per_second": round(rows / (total_ms / 1000), 1) if total_ms else 0,
+            "file_mb": round(size / (1024 * 1024), 2),
+            "peak_rss_delta_mb": round(max(0, peak_kb - start_rss_kb) / 1024, 1),
+        }
+    )
+
+
+def _run_isolated(export: Callable[[int, Any], None], rows: int) -> dict[str, Any]:
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(export, rows, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def run_xlsx_export_benchmark(*, rows: int = DEFAULT_ROWS) -> dict[str, dict[str, Any]]:
+    """Compara tiempo y RSS pico del armado en memoria y del motor write-only."""
+    return {
+        "legacy": _run_isolated(_legacy_export, rows),
+        "streaming": _run_isolated(_streaming_export, rows),
+    }
@@ -0,0 +1,56 @@
+"""
+Backends de cache que cuentan hits/miss para ``core.metrics``.
+
+Solo registran cuando hay una request medida en curso (ver
+``config.middlewares.metrics``); fuera de una request se comportan igual que
+el backend de Django.
+
+El backend Redis expone ademas ``run_script`` para operaciones atomicas que
+la API de cache no cubre (rate limits de ``users.rate_limits``).
+"""
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from core.metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            record_cache_lookup(misses=1)
+            return default
+        record_cache_lookup(hits=1)
+        return value
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    """``get_many`` de ``BaseCache`` ya pasa por ``get``."""
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self._scripts = {}
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        record_cache_lookup(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def run_script(self, source, key, args, version=None):
+        """
+        Ejecuta el script Lua ``source`` sobre ``key`` (con el prefijo y la
+        version del cache) y devuelve su resultado. Redis lo corre de forma
+        atomica; el script se registra una vez por instancia.
+        """
+        redis_key = self.make_and_validate_key(key, version=version)
+        client = self._cache.get_client(redis_key, write=True)
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts.setdefault(source, client.register_script(source))
+        return script(keys=[redis_key], args=args, client=client)
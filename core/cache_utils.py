@@ -5,9 +5,11 @@ Este módulo proporciona funciones para invalidar cache cuando se actualizan los
 """
 
 import logging
+import time
 
 from django.core.cache import cache
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
 from core.soft_delete.signals import post_soft_delete, post_restore
 
@@ -25,21 +27,81 @@ def invalidate_cache_keys(*cache_keys):
         cache.delete(key)
 
 
+CACHE_NAMESPACE_VERSION_KEY = "cache_namespace_version:{namespace}"
+
+DASHBOARD_CACHE_NAMESPACE = "dashboard"
+IAM_PERMISSIONS_CACHE_NAMESPACE = "iam_permissions"
+
+
+def comedor_cache_namespace(comedor_id):
+    """Namespace con las entradas de cache propias de un comedor."""
+    return f"comedor:{comedor_id}"
+
+
+def _namespace_version_key(namespace):
+    return CACHE_NAMESPACE_VERSION_KEY.format(namespace=namespace)
+
+
+def _initial_namespace_version():
+    # Se parte de un valor basado en el reloj para que, si la clave de version
+    # se pierde (reinicio o eviction del backend), no se reutilice una version
+    # vieja cuyas entradas podrian seguir vivas.
+    return time.time_ns() // 1_000_000
+
+
+def get_namespace_version(namespace):
+    """Devuelve la version vigente de un namespace, inicializandola si falta."""
+    version_key = _namespace_version_key(namespace)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, _initial_namespace_version(), None)
+        version = cache.get(version_key, 0)
+    return int(version)
+
+
+def bump_namespace_version(namespace):
+    """
+    Incrementa atómicamente la versión de un namespace.
+
+    Todas las claves construidas con ``namespaced_key`` para ese namespace dejan
+    de ser alcanzables y expiran solas por TTL, en todos los workers que
+    compartan el backend de cache.
+    """
+    version_key = _namespace_version_key(namespace)
+    try:
+        return cache.incr(version_key)
+    except ValueError:
+        # La clave no existe todavía: otro proceso puede crearla en paralelo,
+        # por eso se usa add() y se reintenta el incremento si pierde la carrera.
+        cache.add(version_key, _initial_namespace_version(), None)
+        return cache.incr(version_key)
+
+
+def namespaced_key(namespace, key):
+    """Construye una clave de cache versionada dentro de ``namespace``."""
+    return f"{namespace}:v{get_namespace_version(namespace)}:{key}"
+
+
 def invalidate_cache_pattern(pattern):
     """
     Invalida claves de cache que coincidan con un patrón.
 
     Args:
-        pattern: Patrón de clave de cache (ej: "comedor_*")
+        pattern: Patrón de clave de cache (ej: "comedor:15*" o "dashboard:*")
+
+    Returns:
+        La nueva versión del namespace, o ``None`` si el patrón no define uno.
 
     Note:
-        Actualmente no implementado para backend locmem.
-        Se implementará cuando se migre a Redis.
+        El patrón se resuelve a un namespace (el prefijo anterior al ``*``) y se
+        bumpea su versión, sin recorrer claves. Solo alcanza a las claves
+        construidas con ``namespaced_key``.
     """
-    # Nota: Django cache no soporta wildcard deletion por defecto
-    # Para implementación completa necesitaríamos usar Redis con scan
-    # Por ahora, usaremos claves específicas
-    logger.warning(f"Invalidación por patrón no implementada para el patrón: {pattern}")
+    namespace = pattern.split("*", 1)[0].rstrip(":_")
+    if not namespace:
+        logger.warning("Patrón de invalidación sin namespace: %s", pattern)
+        return None
+    return bump_namespace_version(namespace)
 
 
 # Funciones específicas para invalidar cache por modelo
@@ -50,12 +112,10 @@ def invalidate_comedor_cache(comedor_id=None):
     ]
 
     if comedor_id:
-        keys_to_invalidate.extend(
-            [
-                f"presupuestos_comedor_{comedor_id}",
-                "valores_comida_map",  # Este cache depende de datos de comedores
-            ]
+        keys_to_invalidate.append(
+            "valores_comida_map",  # Este cache depende de datos de comedores
         )
+        bump_namespace_version(comedor_cache_namespace(comedor_id))
 
     invalidate_cache_keys(*keys_to_invalidate)
 
@@ -82,15 +142,7 @@ def invalidate_ciudadano_cache(ciudadano_id=None):
 
 def invalidate_dashboard_cache():
     """Invalida cache del dashboard."""
-    keys_to_invalidate = [
-        "contar_comedores_activos",
-        "contar_relevamientos_activos",
-        "contar_ciudadanos_activos",
-        "contar_beneficiarios_activos",
-        "contar_alertas_activas",
-    ]
-
-    invalidate_cache_keys(*keys_to_invalidate)
+    bump_namespace_version(DASHBOARD_CACHE_NAMESPACE)
 
 
 def invalidate_intervenciones_cache():
@@ -182,6 +234,7 @@ def invalidate_destinatario_cache_on_change(sender, instance, **kwargs):
 def invalidate_valor_comida_cache_on_change(sender, **kwargs):
     """Invalida cache cuando cambian valores de comida."""
     invalidate_cache_keys("valores_comida_map")
+    invalidate_dashboard_cache()
 
 
 @receiver([post_save, post_delete], sender="comedores.TerritorialCache")
@@ -198,6 +251,41 @@ def invalidate_territorial_cache_on_change(sender, instance, **kwargs):
         invalidate_territoriales_cache_provincia()
 
 
+@receiver([post_save, post_delete], sender="core.Provincia")
+@receiver([post_save, post_delete], sender="core.Municipio")
+@receiver([post_save, post_delete], sender="core.Localidad")
+@receiver([post_save, post_delete], sender="core.Nacionalidad")
+def invalidate_gazetteer_on_change(sender, **kwargs):
+    """Invalida el nomenclador territorial al confirmar la transaccion."""
+    from core.services.gazetteer import (  # pylint: disable=import-outside-toplevel
+        invalidate_gazetteer,
+    )
+
+    # Invalidar antes del commit dejaria que otro proceso reconstruya con la
+    # fila todavia invisible y quede con esa version.
+    transaction.on_commit(invalidate_gazetteer)
+
+
+def _bump_iam_permissions():
+    bump_namespace_version(IAM_PERMISSIONS_CACHE_NAMESPACE)
+
+
+@receiver(m2m_changed, sender="auth.Group_permissions")
+@receiver(m2m_changed, sender="auth.User_groups")
+@receiver(m2m_changed, sender="auth.User_user_permissions")
+@receiver([post_save, post_delete], sender="auth.Permission")
+@receiver(post_delete, sender="auth.Group")
+def invalidate_iam_permissions_on_change(sender, **kwargs):
+    """
+    Invalida los permisos compilados de todos los usuarios (ver
+    ``iam.services``). Son cambios de administracion poco frecuentes: un bump
+    global es mas simple que rastrear que usuarios alcanza cada cambio.
+    """
+    if kwargs.get("action", "post_").startswith("pre_"):
+        return
+    transaction.on_commit(_bump_iam_permissions)
+
+
 # Funciones helper para uso en vistas
 def get_or_set_cache_with_invalidation(
     cache_key, fetch_function, timeout, invalidation_keys=None
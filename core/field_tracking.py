@@ -0,0 +1,185 @@
+"""
+Seguimiento de cambios por campo sin releer la fila en ``pre_save``.
+
+``FieldTrackingMixin`` guarda una foto de los valores con que la instancia se
+cargo de la base (``from_db``) y la renueva despues de cada ``save()`` y
+``refresh_from_db()``. Los signals pueden preguntar ``changed_fields()`` y
+``previous_value()`` durante ``pre_save``/``post_save`` sin el
+``sender.objects.get(pk=...)`` extra: un save pasa de dos queries a una.
+
+La foto solo refleja lo que paso por la instancia. Una instancia armada a mano
+con ``pk`` (sin venir de la base) lee la fila una vez antes de guardar, igual
+que antes. Las escrituras por ``QuerySet.update()`` no la actualizan: en ese
+caso hay que llamar a ``refresh_from_db()`` o ``mark_fields_persisted()``.
+"""
+
+from __future__ import annotations
+
+import copy
+
+from django.db.models.fields.files import FieldFile
+
+_STATE_ATTR = "_tracked_state"
+_UNLOADED = object()
+
+
+def _snapshot_value(value):
+    if isinstance(value, FieldFile):
+        return value.name or ""
+    if isinstance(value, (dict, list)):
+        # JSONField: la instancia puede mutarlo en el lugar.
+        return copy.deepcopy(value)
+    return value
+
+
+class FieldTrackingMixin:
+    """
+    Mixin de modelo con ``changed_fields()`` y ``previous_value()``.
+
+    ``tracked_fields`` acota los campos seguidos (por nombre); ``None`` sigue
+    todos los campos concretos salvo la PK. Los FK se comparan por ``<fk>_id``
+    y se pueden pedir por nombre (``"programa"``) o attname (``"programa_id"``).
+    """
+
+    tracked_fields: tuple[str, ...] | None = None
+
+    @classmethod
+    def _tracked_attnames(cls) -> dict[str, str]:
+        cached = cls.__dict__.get("_tracked_attnames_cache")
+        if cached is None:
+            fields = [f for f in cls._meta.concrete_fields if not f.primary_key]
+            if cls.tracked_fields is not None:
+                wanted = set(cls.tracked_fields)
+                fields = [f for f in fields if {f.name, f.attname} & wanted]
+            cached = {f.name: f.attname for f in fields}
+            cls._tracked_attnames_cache = cached
+        return cached
+
+    @classmethod
+    def _resolve_attname(cls, name: str) -> str:
+        attnames = cls._tracked_attnames()
+        if name in attnames:
+            return attnames[name]
+        if name in attnames.values():
+            return name
+        raise KeyError(f"{cls.__name__}.{name} no es un campo con seguimiento.")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_state()
+        return instance
+
+    def _snapshot_tracked_state(self, attnames=None) -> None:
+        state = self.__dict__.get(_STATE_ATTR)
+        if state is None:
+            state = self.__dict__[_STATE_ATTR] = {}
+        for attname in attnames or self._tracked_attnames().values():
+            # Los campos diferidos no estan en __dict__ y no se siguen.
+            if attname in self.__dict__:
+                state[attname] = _snapshot_value(self.__dict__[attname])
+
+    def _load_tracked_state(self) -> dict | None:
+        attnames = list(self._tracked_attnames().values())
+        row = (
+            type(self)
+            ._base_manager.using(self._state.db or "default")
+            .filter(pk=self.pk)
+            .values(*attnames)
+            .first()
+        )
+        # None queda guardado: la fila no existe y no se vuelve a consultar.
+        state = None
+        if row is not None:
+            state = {attname: _snapshot_value(value) for attname, value in row.items()}
+        self.__dict__[_STATE_ATTR] = state
+        return state
+
+    def _fill_assigned_deferred(self, state: dict) -> None:
+        # Campo diferido al cargar y asignado despues: su valor previo no esta
+        # en la foto, se lee solo esa columna.
+        missing = [
+            attname
+            for attname in self._tracked_attnames().values()
+            if attname in self.__dict__ and attname not in state
+        ]
+        if not missing or self.pk is None:
+            return
+        row = (
+            type(self)
+            ._base_manager.using(self._state.db or "default")
+            .filter(pk=self.pk)
+            .values(*missing)
+            .first()
+        )
+        if row is not None:
+            state.update({k: _snapshot_value(v) for k, v in row.items()})
+
+    def _get_tracked_state(self) -> dict | None:
+        state = self.__dict__.get(_STATE_ATTR, _UNLOADED)
+        if state is _UNLOADED:
+            state = self._load_tracked_state() if self.pk is not None else None
+        elif state is not None:
+            self._fill_assigned_deferred(state)
+        return state
+
+    def has_previous_state(self) -> bool:
+        """True si la instancia corresponde a una fila ya guardada."""
+        return self._get_tracked_state() is not None
+
+    def previous_value(self, field_name: str, default=None):
+        """Valor del campo en la base antes de los cambios en memoria."""
+        state = self._get_tracked_state()
+        if state is None:
+            return default
+        return state.get(self._resolve_attname(field_name), default)
+
+    def changed_fields(self, fields=None) -> list[str]:
+        """Nombres de los campos cuyo valor en memoria difiere de la base."""
+        state = self._get_tracked_state()
+        if state is None:
+            return []
+        attnames = self._tracked_attnames()
+        names = fields if fields is not None else attnames
+        changed = []
+        for name in names:
+            attname = self._resolve_attname(name)
+            if attname not in state or attname not in self.__dict__:
+                continue
+            if _snapshot_value(self.__dict__[attname]) != state[attname]:
+                changed.append(name)
+        return changed
+
+    def mark_fields_persisted(self, *field_names: str) -> None:
+        """Toma como guardados los valores actuales (p. ej. tras un update())."""
+        if not self.__dict__.get(_STATE_ATTR):
+            return
+        attnames = [
+            self._resolve_attname(name)
+            for name in field_names
+            if name in self._tracked_attnames()
+            or name in self._tracked_attnames().values()
+        ]
+        if attnames:
+            self._snapshot_tracked_state(attnames)
+
+    def save(self, *args, **kwargs):
+        # Instancias armadas con pk (no cargadas de la base): se lee la fila
+        # antes de guardar para que pre_save/post_save vean el estado previo.
+        if self.pk is not None:
+            self._get_tracked_state()
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or not self.__dict__.get(_STATE_ATTR):
+            self._snapshot_tracked_state()
+        else:
+            self.mark_fields_persisted(*update_fields)
+
+    save.alters_data = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None:
+            self._snapshot_tracked_state()
+        else:
+            self.mark_fields_persisted(*fields)
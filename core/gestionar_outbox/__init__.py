@@ -0,0 +1,21 @@
+"""Outbox transaccional y drenado por lotes de la sincronizacion con GESTIONAR."""
+
+from .engine import (
+    drain_gestionar_outbox,
+    enqueue_gestionar,
+    get_outbox_stats,
+    is_gestionar_outbox_enabled,
+    run_gestionar_outbox_worker,
+)
+from .registry import GestionarOutboxKind, obtener_tipo_outbox, registrar_tipo_outbox
+
+__all__ = [
+    "GestionarOutboxKind",
+    "drain_gestionar_outbox",
+    "enqueue_gestionar",
+    "get_outbox_stats",
+    "is_gestionar_outbox_enabled",
+    "obtener_tipo_outbox",
+    "registrar_tipo_outbox",
+    "run_gestionar_outbox_worker",
+]
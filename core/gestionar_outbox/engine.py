@@ -0,0 +1,496 @@
+"""
+Outbox transaccional para la sincronizacion con GESTIONAR.
+
+Los signals encolan en ``transaction.on_commit`` una fila por entidad en
+``GestionarOutbox`` en lugar de lanzar un hilo por cambio: lo encolado
+sobrevive al reciclado de los workers de gunicorn y un rollback no envia nada.
+Mientras la fila esta pendiente, un nuevo cambio sobre la misma entidad se
+combina con ella (coalescing), asi una edicion masiva no multiplica los envios.
+
+El drenado reclama un lote de filas vencidas, las agrupa por tipo y accion en
+payloads de varias ``Rows`` y los envia en paralelo con un pool de hilos (los
+hilos solo hacen HTTP; la base se actualiza desde el hilo que drena). Los
+errores se reintentan con backoff exponencial acotado hasta
+``GESTIONAR_OUTBOX_MAX_ATTEMPTS``; despues la fila queda ``failed``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from core.gestionar_outbox.registry import (
+    DELETE_ACTION,
+    GestionarOutboxKind,
+    obtener_tipo_outbox,
+)
+from core.models import GestionarOutbox
+
+logger = logging.getLogger("django")
+
+ADD_ACTION = "Add"
+UPDATE_ACTION = "Update"
+_FLIPPED_ACTION = {ADD_ACTION: UPDATE_ACTION, UPDATE_ACTION: ADD_ACTION}
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_CLAIM_SIZE = 500
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT_SECONDS = 60
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_BACKOFF_SECONDS = 30
+DEFAULT_BACKOFF_MAX_SECONDS = 3600
+DEFAULT_POLL_SECONDS = 5
+DEFAULT_STALE_SECONDS = 600
+DEFAULT_RETENTION_DAYS = 7
+_UPSERT_ATTEMPTS = 3
+
+
+def _setting_positive_int(name: str, default: int) -> int:
+    try:
+        value = int(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def is_gestionar_outbox_enabled() -> bool:
+    return bool(getattr(settings, "GESTIONAR_OUTBOX_ENABLED", False))
+
+
+def coalesce_key(kind: str, entity_id) -> str:
+    return f"{kind}:{entity_id}"
+
+
+def coalesce_action(previous: str, new: str) -> str:
+    """Accion resultante de dos cambios pendientes sobre la misma entidad.
+
+    Una baja siempre gana; una modificacion sobre un alta aun no enviada sigue
+    siendo un alta (GESTIONAR todavia no conoce la entidad).
+    """
+    if new == DELETE_ACTION:
+        return DELETE_ACTION
+    if previous == ADD_ACTION and new == UPDATE_ACTION:
+        return ADD_ACTION
+    return new
+
+
+def _coalesced_row(previous: GestionarOutbox, action: str, row: dict) -> dict:
+    """Contenido de la fila pendiente tras sumarle un cambio nuevo.
+
+    Una baja reemplaza el contenido (solo lleva el id); entre altas y
+    modificaciones se combinan los campos y gana el valor mas reciente.
+    """
+    if DELETE_ACTION in (action, previous.action):
+        return row
+    return {**(previous.row or {}), **row}
+
+
+def _drops_unsent_add(pending: GestionarOutbox, action: str) -> bool:
+    """Una baja anula un alta pendiente si GESTIONAR nunca conocio la entidad.
+
+    Todos los tipos envian ``Add`` tambien para modificaciones, asi que solo se
+    descarta cuando el tipo confirma con ``never_synced`` que la entidad no se
+    sincronizo y el alta no tuvo intentos (uno fallido pudo haber llegado).
+    """
+    if action != DELETE_ACTION or pending.action != ADD_ACTION or pending.attempts:
+        return False
+    never_synced = obtener_tipo_outbox(pending.kind).never_synced
+    return never_synced is not None and never_synced(pending.entity_id)
+
+
+def _upsert_pending(kind: str, action: str, entity_id: str, row: dict) -> None:
+    key = coalesce_key(kind, entity_id)
+    for _ in range(_UPSERT_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                pending = (
+                    GestionarOutbox.objects.select_for_update()
+                    .filter(coalesce_key=key)
+                    .first()
+                )
+                if pending is not None:
+                    if _drops_unsent_add(pending, action):
+                        pending.delete()
+                        return
+                    pending.row = _coalesced_row(pending, action, row)
+                    pending.action = coalesce_action(pending.action, action)
+                    pending.save(update_fields=["action", "row"])
+                    return
+                GestionarOutbox.objects.create(
+                    kind=kind,
+                    action=action,
+                    entity_id=entity_id,
+                    row=row,
+                    coalesce_key=key,
+                )
+                return
+        except IntegrityError:
+            # Otro proceso inserto la misma clave entre el SELECT y el INSERT.
+            continue
+    raise IntegrityError(f"No se pudo encolar {key} en el outbox de GESTIONAR.")
+
+
+def write_outbox_entry(kind: str, entity_id, payload: dict | None = None) -> None:
+    """Escribe (o coalesce) el payload en el outbox como una fila por entidad.
+
+    Las ``Rows`` de un payload describen la misma entidad y se combinan en una
+    sola fila. Sin id no hay clave de coalescing: la fila se encola tal cual.
+    """
+    entity_id = "" if entity_id is None else str(entity_id).strip()
+    if payload is None:
+        builder = obtener_tipo_outbox(kind).build_payload
+        payload = builder(entity_id) if builder and entity_id else None
+        if payload is None:
+            return
+    rows = payload.get("Rows") or []
+    if not rows:
+        return
+    action = payload.get("Action") or ADD_ACTION
+    row = {}
+    for payload_row in rows:
+        row.update(payload_row)
+    if not entity_id:
+        logger.warning(
+            "[gestionar-outbox] Payload sin id de entidad; se encola sin coalescing. tipo=%s",
+            kind,
+        )
+        GestionarOutbox.objects.create(kind=kind, action=action, entity_id="", row=row)
+        return
+    _upsert_pending(kind, action, entity_id, row)
+
+
+def enqueue_gestionar(kind: str, entity_id, payload: dict | None = None) -> None:
+    """Encola el envio a GESTIONAR al confirmarse la transaccion en curso."""
+    transaction.on_commit(lambda: write_outbox_entry(kind, entity_id, payload))
+
+
+def claim_outbox_entries(limit: int | None = None) -> list[GestionarOutbox]:
+    """Reclama las filas pendientes vencidas y libera su clave de coalescing."""
+    limit = limit or _setting_positive_int(
+        "GESTIONAR_OUTBOX_CLAIM_SIZE", DEFAULT_CLAIM_SIZE
+    )
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            GestionarOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=GestionarOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        GestionarOutbox.objects.filter(
+            id__in=ids, status=GestionarOutbox.Status.PENDING
+        ).update(
+            status=GestionarOutbox.Status.PROCESSING,
+            coalesce_key=None,
+            claimed_at=now,
+        )
+    return list(
+        GestionarOutbox.objects.filter(
+            id__in=ids,
+            status=GestionarOutbox.Status.PROCESSING,
+            claimed_at=now,
+        ).order_by("id")
+    )
+
+
+def retry_backoff_seconds(attempt: int) -> float:
+    """Backoff exponencial acotado: base, 2*base, 4*base... hasta el maximo."""
+    base = _setting_positive_int(
+        "GESTIONAR_OUTBOX_BACKOFF_SECONDS", DEFAULT_BACKOFF_SECONDS
+    )
+    ceiling = _setting_positive_int(
+        "GESTIONAR_OUTBOX_BACKOFF_MAX_SECONDS", DEFAULT_BACKOFF_MAX_SECONDS
+    )
+    return min(ceiling, base * (2 ** max(0, attempt - 1)))
+
+
+def _reschedule(entry: GestionarOutbox, error: str) -> str:
+    """Vuelve a encolar una fila fallida o la marca ``failed``; retorna el estado."""
+    attempts = entry.attempts + 1
+    max_attempts = _setting_positive_int(
+        "GESTIONAR_OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS
+    )
+    if attempts >= max_attempts:
+        GestionarOutbox.objects.filter(pk=entry.pk).update(
+            status=GestionarOutbox.Status.FAILED,
+            attempts=attempts,
+            last_error=error,
+        )
+        logger.error(
+            "[gestionar-outbox] Envio descartado tras %s intentos. tipo=%s id=%s error=%s",
+            attempts,
+            entry.kind,
+            entry.entity_id,
+            error,
+        )
+        return GestionarOutbox.Status.FAILED
+
+    key = coalesce_key(entry.kind, entry.entity_id)
+    for _ in range(_UPSERT_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                newer = (
+                    GestionarOutbox.objects.select_for_update()
+                    .filter(coalesce_key=key)
+                    .first()
+                )
+                if newer is not None:
+                    # Llego un cambio posterior mientras se enviaba: se conserva
+                    # el contenido nuevo y la accion combinada.
+                    newer.action = coalesce_action(entry.action, newer.action)
+                    newer.save(update_fields=["action"])
+                    GestionarOutbox.objects.filter(pk=entry.pk).delete()
+                    return GestionarOutbox.Status.PENDING
+                GestionarOutbox.objects.filter(pk=entry.pk).update(
+                    status=GestionarOutbox.Status.PENDING,
+                    coalesce_key=key,
+                    attempts=attempts,
+                    last_error=error,
+                    next_attempt_at=timezone.now()
+                    + timedelta(seconds=retry_backoff_seconds(attempts)),
+                )
+                return GestionarOutbox.Status.PENDING
+        except IntegrityError:
+            continue
+    raise IntegrityError(f"No se pudo reencolar {key} en el outbox de GESTIONAR.")
+
+
+@dataclass
+class _Outcome:
+    entries: list[GestionarOutbox]
+    action: str
+    error: str | None = None
+    response_rows: list[dict] = field(default_factory=list)
+
+
+def _build_payload(action: str, entries: list[GestionarOutbox]) -> dict:
+    return {
+        "Action": action,
+        "Properties": {"Locale": "es-ES"},
+        "Rows": [entry.row for entry in entries],
+    }
+
+
+def _post(url: str, payload: dict, timeout: float) -> dict:
+    headers = {"applicationAccessKey": os.getenv("GESTIONAR_API_KEY")}
+    response = requests.post(url, json=payload, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    if not response.content:
+        return {}
+    try:
+        data = response.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _deliver(
+    kind: GestionarOutboxKind,
+    action: str,
+    entries: list[GestionarOutbox],
+    timeout: float,
+    *,
+    allow_flip: bool = True,
+) -> list[_Outcome]:
+    """Envia un payload con varias ``Rows``; no toca la base (corre en hilos)."""
+    url = kind.url_for(action)
+    if not url:
+        return [_Outcome(entries, action, error=f"Endpoint no configurado ({action})")]
+    try:
+        data = _post(url, _build_payload(action, entries), timeout)
+    except requests.HTTPError as exc:
+        status_code = getattr(exc.response, "status_code", None)
+        if status_code is not None and 400 <= status_code < 500 and len(entries) > 1:
+            # Un rechazo del lote suele venir de una fila: se aisla de a una
+            # para que el resto se envie y solo la fila mala se reintente.
+            outcomes = []
+            for entry in entries:
+                outcomes.extend(_deliver(kind, action, [entry], timeout))
+            return outcomes
+        if (
+            status_code == 400
+            and allow_flip
+            and kind.retry_flipped_action
+            and action in _FLIPPED_ACTION
+        ):
+            return _deliver(
+                kind, _FLIPPED_ACTION[action], entries, timeout, allow_flip=False
+            )
+        return [_Outcome(entries, action, error=str(exc))]
+    except requests.RequestException as exc:
+        return [_Outcome(entries, action, error=str(exc))]
+    return [_Outcome(entries, action, response_rows=data.get("Rows") or [])]
+
+
+def _chunks(entries: list[GestionarOutbox], size: int) -> Iterable[list]:
+    for start in range(0, len(entries), size):
+        yield entries[start : start + size]
+
+
+def _group_batches(
+    entries: list[GestionarOutbox], default_size: int
+) -> list[tuple[GestionarOutboxKind, str, list[GestionarOutbox]]]:
+    groups: dict[tuple[str, str], list[GestionarOutbox]] = {}
+    for entry in entries:
+        groups.setdefault((entry.kind, entry.action), []).append(entry)
+
+    batches = []
+    for (kind_name, action), grouped in groups.items():
+        kind = obtener_tipo_outbox(kind_name)
+        size = kind.batch_size or default_size
+        batches.extend((kind, action, chunk) for chunk in _chunks(grouped, size))
+    return batches
+
+
+def _apply_outcome(kind: GestionarOutboxKind, outcome: _Outcome, stats: dict) -> None:
+    if outcome.error is not None:
+        for entry in outcome.entries:
+            status = _reschedule(entry, outcome.error)
+            stats[
+                "failed" if status == GestionarOutbox.Status.FAILED else "retried"
+            ] += 1
+        logger.warning(
+            "[gestionar-outbox] Error enviando a GESTIONAR. tipo=%s accion=%s filas=%s error=%s",
+            kind.name,
+            outcome.action,
+            len(outcome.entries),
+            outcome.error,
+        )
+        return
+
+    GestionarOutbox.objects.filter(pk__in=[e.pk for e in outcome.entries]).update(
+        status=GestionarOutbox.Status.SENT,
+        sent_at=timezone.now(),
+        last_error="",
+    )
+    stats["sent"] += len(outcome.entries)
+    if kind.on_sent is None:
+        return
+    try:
+        kind.on_sent(outcome.action, outcome.entries, outcome.response_rows)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception(
+            "[gestionar-outbox] Error procesando la respuesta de GESTIONAR. tipo=%s",
+            kind.name,
+        )
+
+
+def drain_gestionar_outbox(
+    *,
+    limit: int | None = None,
+    batch_size: int | None = None,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Reclama un lote de filas pendientes y las envia agrupadas y en paralelo."""
+    stats = {"claimed": 0, "requests": 0, "sent": 0, "retried": 0, "failed": 0}
+    entries = claim_outbox_entries(limit)
+    if not entries:
+        return stats
+    stats["claimed"] = len(entries)
+
+    batch_size = batch_size or _setting_positive_int(
+        "GESTIONAR_OUTBOX_BATCH_SIZE", DEFAULT_BATCH_SIZE
+    )
+    workers = workers or _setting_positive_int(
+        "GESTIONAR_OUTBOX_WORKERS", DEFAULT_WORKERS
+    )
+    timeout = _setting_positive_int(
+        "GESTIONAR_OUTBOX_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS
+    )
+    batches = _group_batches(entries, batch_size)
+    stats["requests"] = len(batches)
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+        futures = [
+            (kind, executor.submit(_deliver, kind, action, chunk, timeout))
+            for kind, action, chunk in batches
+        ]
+        for kind, future in futures:
+            for outcome in future.result():
+                _apply_outcome(kind, outcome, stats)
+    return stats
+
+
+def release_stale_outbox_entries() -> int:
+    """Reencola filas que quedaron ``processing`` por un drenador caido."""
+    stale_seconds = _setting_positive_int(
+        "GESTIONAR_OUTBOX_STALE_SECONDS", DEFAULT_STALE_SECONDS
+    )
+    cutoff = timezone.now() - timedelta(seconds=stale_seconds)
+    stale = GestionarOutbox.objects.filter(
+        status=GestionarOutbox.Status.PROCESSING, claimed_at__lt=cutoff
+    )
+    released = 0
+    for entry in stale:
+        _reschedule(entry, "Envio interrumpido (drenador inactivo)")
+        released += 1
+    return released
+
+
+def prune_sent_outbox_entries() -> int:
+    retention_days = _setting_positive_int(
+        "GESTIONAR_OUTBOX_RETENTION_DAYS", DEFAULT_RETENTION_DAYS
+    )
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    return GestionarOutbox.objects.filter(
+        status=GestionarOutbox.Status.SENT, sent_at__lt=cutoff
+    ).delete()[0]
+
+
+def get_outbox_stats() -> dict[str, int]:
+    counts = {status: 0 for status in GestionarOutbox.Status.values}
+    rows = GestionarOutbox.objects.values("status").annotate(total=Count("id"))
+    for row in rows:
+        counts[row["status"]] = row["total"]
+    return counts
+
+
+def run_gestionar_outbox_worker(*, once: bool = False) -> None:
+    """
+    Loop del drenador. Con ``once`` drena hasta vaciar lo vencido y termina.
+    """
+    poll_seconds = _setting_positive_int(
+        "GESTIONAR_OUTBOX_POLL_SECONDS", DEFAULT_POLL_SECONDS
+    )
+    stale_check_seconds = _setting_positive_int(
+        "GESTIONAR_OUTBOX_STALE_SECONDS", DEFAULT_STALE_SECONDS
+    )
+    last_maintenance = None
+    while True:
+        now = time.monotonic()
+        if last_maintenance is None or now - last_maintenance >= stale_check_seconds:
+            try:
+                release_stale_outbox_entries()
+                prune_sent_outbox_entries()
+            except OperationalError:
+                logger.exception(
+                    "[gestionar-outbox] Fallo el mantenimiento del outbox."
+                )
+            last_maintenance = now
+
+        try:
+            stats = drain_gestionar_outbox()
+        except OperationalError:
+            logger.exception("[gestionar-outbox] No se pudo drenar el outbox.")
+            if once:
+                raise
+            stats = {"claimed": 0}
+        if stats["claimed"]:
+            logger.info("[gestionar-outbox] Lote drenado: %s", stats)
+            continue
+        if once:
+            return
+        time.sleep(poll_seconds)
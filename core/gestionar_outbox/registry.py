@@ -0,0 +1,58 @@
+"""Registro de tipos de entidad que se sincronizan con GESTIONAR por el outbox."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+DELETE_ACTION = "Delete"
+
+
+@dataclass(frozen=True)
+class GestionarOutboxKind:
+    """
+    Describe como enviar a GESTIONAR las filas de un tipo de entidad.
+
+    ``url_env``/``delete_url_env`` nombran las variables de entorno con el
+    endpoint de alta/modificacion y de baja. ``build_payload`` arma el payload
+    desde la base cuando quien encola no lo trae; ``on_sent`` recibe las filas
+    confirmadas y las ``Rows`` de la respuesta (p. ej. para marcar
+    ``sincronizado_gestionar``). ``batch_size=1`` fuerza envios de a una fila
+    cuando la respuesta no permite asociar cada fila devuelta a su entidad.
+    ``never_synced`` confirma que una entidad nunca llego a GESTIONAR: con eso
+    una baja descarta el alta pendiente en lugar de enviar ambas.
+    """
+
+    name: str
+    url_env: str
+    delete_url_env: str | None = None
+    build_payload: Callable[[str], dict | None] | None = None
+    on_sent: Callable[[str, list[Any], list[dict]], None] | None = None
+    batch_size: int | None = None
+    retry_flipped_action: bool = False
+    never_synced: Callable[[str], bool] | None = None
+
+    def url_for(self, action: str) -> str | None:
+        env_name = self.delete_url_env if action == DELETE_ACTION else self.url_env
+        return os.getenv(env_name) if env_name else None
+
+
+_OUTBOX_KINDS: dict[str, GestionarOutboxKind] = {}
+
+
+def registrar_tipo_outbox(kind: GestionarOutboxKind) -> None:
+    """Registra un tipo; volver a registrar la misma definicion es idempotente."""
+    existente = _OUTBOX_KINDS.get(kind.name)
+    if existente is None or existente == kind:
+        _OUTBOX_KINDS[kind.name] = kind
+        return
+    raise ValueError(f"Ya existe un tipo de outbox registrado como '{kind.name}'.")
+
+
+def obtener_tipo_outbox(name: str) -> GestionarOutboxKind:
+    try:
+        return _OUTBOX_KINDS[name]
+    except KeyError as exc:
+        raise KeyError(f"Tipo de outbox GESTIONAR desconocido: {name}") from exc
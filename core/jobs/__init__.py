@@ -0,0 +1,14 @@
+"""Motor compartido de jobs en background."""
+
+from .engine import claim_next_job, process_job, run_job_worker, run_job_workers
+from .registry import JobQueue, obtener_colas_jobs, registrar_cola_jobs
+
+__all__ = [
+    "JobQueue",
+    "claim_next_job",
+    "obtener_colas_jobs",
+    "process_job",
+    "registrar_cola_jobs",
+    "run_job_worker",
+    "run_job_workers",
+]
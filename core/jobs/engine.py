@@ -0,0 +1,392 @@
+"""
+Motor compartido de jobs en background.
+
+Reclama jobs con ``SELECT ... FOR UPDATE SKIP LOCKED`` (en SQLite el lock se
+omite y la guarda ``status=PENDING`` del UPDATE evita dobles reclamos), mantiene
+un heartbeat sobre ``last_activity_at`` mientras el job corre, marca como
+fallidos los jobs sin actividad y reparte el trabajo de todas las colas en un
+pool de procesos.
+
+Un error inesperado no se reintenta en el mismo worker: el job vuelve a
+pendiente con ``available_at`` (backoff exponencial) y cualquier worker lo
+reclama cuando vence, sin bloquear al resto de la cola mientras tanto.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.jobs.registry import JobQueue, obtener_colas_jobs
+
+logger = logging.getLogger("django")
+
+DEFAULT_JOB_POLL_SECONDS = 2
+DEFAULT_JOB_HEARTBEAT_SECONDS = 30
+DEFAULT_JOB_STALE_CHECK_SECONDS = 60
+CLAIM_ATTEMPTS = 3
+
+
+def _setting_positive_float(name: str, default: float) -> float:
+    try:
+        value = float(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def get_job_poll_seconds() -> float:
+    return _setting_positive_float("JOB_POLL_SECONDS", DEFAULT_JOB_POLL_SECONDS)
+
+
+def get_job_heartbeat_seconds() -> float:
+    return _setting_positive_float(
+        "JOB_HEARTBEAT_SECONDS", DEFAULT_JOB_HEARTBEAT_SECONDS
+    )
+
+
+def get_job_stale_check_seconds() -> float:
+    return _setting_positive_float(
+        "JOB_STALE_CHECK_SECONDS", DEFAULT_JOB_STALE_CHECK_SECONDS
+    )
+
+
+def count_processing_jobs(queue: JobQueue) -> int:
+    return queue.model.objects.filter(status=queue.model.Status.PROCESSING).count()
+
+
+def _lock_queue(queue: JobQueue) -> None:
+    """
+    Toma el lock de la cola hasta el fin de la transacción.
+
+    Es un UPDATE (y no ``select_for_update``) para que también serialice en
+    SQLite, donde toma el lock de escritura de la base.
+    """
+    from core.models import JobQueueLock  # pylint: disable=import-outside-toplevel
+
+    now = timezone.now()
+    if not JobQueueLock.objects.filter(name=queue.name).update(acquired_at=now):
+        JobQueueLock.objects.get_or_create(name=queue.name)
+        JobQueueLock.objects.filter(name=queue.name).update(acquired_at=now)
+
+
+def claim_next_job(queue: JobQueue):
+    """
+    Reclama atómicamente el job pendiente más antiguo de la cola.
+
+    Retorna None si no hay pendientes o si la cola ya alcanzó su concurrencia
+    máxima (contando jobs en proceso de todos los workers). Con concurrencia
+    máxima, el conteo y el reclamo corren bajo el lock de la cola: sin él, varios
+    workers podrían leer "límite - 1" a la vez y reclamar cada uno un job.
+    """
+    model = queue.model
+    max_concurrency = queue.get_max_concurrency()
+
+    for _ in range(CLAIM_ATTEMPTS):
+        with transaction.atomic():
+            if max_concurrency:
+                _lock_queue(queue)
+                if count_processing_jobs(queue) >= max_concurrency:
+                    return None
+
+            candidate = (
+                model.objects.select_for_update(skip_locked=True)
+                .filter(status=model.Status.PENDING)
+                .filter(
+                    Q(available_at__isnull=True) | Q(available_at__lte=timezone.now())
+                )
+                .order_by("requested_at", "id")
+                .only("pk", "started_at")
+                .first()
+            )
+            if candidate is None:
+                return None
+
+            now = timezone.now()
+            changes = {
+                "status": model.Status.PROCESSING,
+                "finished_at": None,
+                "available_at": None,
+                "last_activity_at": now,
+            }
+            if not candidate.started_at:
+                changes["started_at"] = now
+            updated = model.objects.filter(
+                pk=candidate.pk,
+                status=model.Status.PENDING,
+            ).update(**changes)
+        if updated:
+            return model.objects.get(pk=candidate.pk)
+    return None
+
+
+class _Heartbeat(threading.Thread):
+    """Refresca ``last_activity_at`` mientras el job sigue en proceso."""
+
+    def __init__(self, queue: JobQueue, job_pk, interval: float):
+        super().__init__(name=f"heartbeat-{queue.name}-{job_pk}", daemon=True)
+        self.queue = queue
+        self.job_pk = job_pk
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        model = self.queue.model
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    model.objects.filter(
+                        pk=self.job_pk,
+                        status=model.Status.PROCESSING,
+                    ).update(last_activity_at=timezone.now())
+                except OperationalError:
+                    logger.warning(
+                        "[jobs] No se pudo registrar heartbeat. cola=%s job_id=%s",
+                        self.queue.name,
+                        self.job_pk,
+                    )
+        finally:
+            connection.close()
+
+
+@contextmanager
+def job_heartbeat(queue: JobQueue, job_pk):
+    heartbeat = _Heartbeat(queue, job_pk, get_job_heartbeat_seconds())
+    heartbeat.start()
+    try:
+        yield heartbeat
+    finally:
+        heartbeat.stopped.set()
+        heartbeat.join(timeout=5)
+
+
+def retry_backoff_seconds(queue: JobQueue, attempt: int) -> float:
+    """Backoff exponencial acotado: base, 2*base, 4*base... hasta el máximo."""
+    return min(
+        queue.retry_backoff_max_seconds,
+        queue.retry_backoff_seconds * (2**attempt),
+    )
+
+
+def _schedule_retry(queue: JobQueue, job, delay: float) -> bool:
+    """Devuelve el job a pendiente hasta ``now + delay``."""
+    model = queue.model
+    now = timezone.now()
+    return bool(
+        model.objects.filter(pk=job.pk, status=model.Status.PROCESSING).update(
+            status=model.Status.PENDING,
+            available_at=now + timedelta(seconds=delay),
+            retry_count=F("retry_count") + 1,
+            last_activity_at=now,
+        )
+    )
+
+
+def _reset_retries(queue: JobQueue, job) -> None:
+    # Un lote fallido se reanuda a mano con todos sus reintentos disponibles.
+    queue.model.objects.filter(pk=job.pk).update(retry_count=0, available_at=None)
+
+
+def process_job(queue: JobQueue, job) -> bool:
+    """
+    Procesa un job reclamado con heartbeat.
+
+    Ante un error inesperado, si quedan reintentos el job vuelve a pendiente
+    con ``available_at`` y el worker sigue con otro trabajo. Los procesadores
+    de cada dominio son reanudables (checkpoint por fila o por documento), por
+    eso el reintento retoma donde quedó el intento anterior. Retorna True solo
+    si el procesador terminó sin error.
+    """
+    try:
+        with job_heartbeat(queue, job.pk):
+            queue.process(job)
+        return True
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        attempt = job.retry_count
+        if attempt >= queue.max_retries:
+            logger.exception(
+                "[jobs] Job fallido tras %s intento(s). cola=%s job_id=%s",
+                attempt + 1,
+                queue.name,
+                job.pk,
+            )
+            queue.fail(job, f"Error inesperado procesando el lote: {exc}")
+            _reset_retries(queue, job)
+            return False
+
+        delay = retry_backoff_seconds(queue, attempt)
+        if _schedule_retry(queue, job, delay):
+            logger.warning(
+                "[jobs] Error procesando job; reintento en %.1fs. "
+                "cola=%s job_id=%s intento=%s error=%s",
+                delay,
+                queue.name,
+                job.pk,
+                attempt + 1,
+                exc,
+            )
+        return False
+
+
+def process_next_job(queues: list[JobQueue]) -> bool:
+    """Reclama y procesa a lo sumo un job por cola. Retorna True si hubo trabajo."""
+    did_work = False
+    for queue in queues:
+        try:
+            job = claim_next_job(queue)
+        except OperationalError:
+            logger.exception(
+                "[jobs] No se pudieron consultar jobs pendientes. cola=%s",
+                queue.name,
+            )
+            continue
+        if job is None:
+            continue
+        logger.info("[jobs] Procesando job. cola=%s job_id=%s", queue.name, job.pk)
+        process_job(queue, job)
+        did_work = True
+    return did_work
+
+
+def mark_stale_processing_jobs(queue: JobQueue) -> int:
+    """
+    Marca como fallidos los jobs en proceso sin heartbeat dentro de
+    ``queue.get_stale_seconds()`` (el worker que los tenía se cayó).
+    """
+    model = queue.model
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=queue.get_stale_seconds())
+    changes = {
+        "status": model.Status.FAILED,
+        "last_error_message": queue.stale_error_message,
+        "finished_at": now,
+        "last_activity_at": now,
+        "retry_count": 0,
+        "available_at": None,
+        **dict(queue.stale_updates),
+    }
+    if any(field.name == "last_error_at" for field in model._meta.fields):
+        changes["last_error_at"] = now
+    updated = (
+        model.objects.filter(status=model.Status.PROCESSING)
+        .filter(Q(last_activity_at__isnull=True) | Q(last_activity_at__lt=cutoff))
+        .update(**changes)
+    )
+    if updated:
+        logger.warning(
+            "[jobs] %s job(s) marcados como fallidos por inactividad. cola=%s",
+            updated,
+            queue.name,
+        )
+    return updated
+
+
+def mark_stale_jobs(queues: list[JobQueue]) -> int:
+    updated = 0
+    for queue in queues:
+        mark_stale = queue.mark_stale or (
+            lambda queue=queue: mark_stale_processing_jobs(queue)
+        )
+        try:
+            updated += mark_stale() or 0
+        except OperationalError:
+            logger.exception(
+                "[jobs] No se pudieron marcar jobs inactivos. cola=%s", queue.name
+            )
+    return updated
+
+
+def run_job_worker(*, queue_names: list[str] | None = None, once: bool = False):
+    """
+    Loop de un worker sobre todas las colas pedidas.
+
+    Con ``once`` procesa hasta que ninguna cola tenga pendientes y termina.
+    """
+    queues = obtener_colas_jobs(queue_names)
+    poll_seconds = min(
+        (queue.get_poll_seconds() or get_job_poll_seconds() for queue in queues),
+        default=get_job_poll_seconds(),
+    )
+    stale_check_seconds = get_job_stale_check_seconds()
+    last_stale_check = None
+    offset = 0
+
+    while True:
+        now = time.monotonic()
+        if last_stale_check is None or now - last_stale_check >= stale_check_seconds:
+            mark_stale_jobs(queues)
+            last_stale_check = now
+
+        # Rotar el orden evita que una cola con backlog grande monopolice el worker.
+        rotated = queues[offset:] + queues[:offset]
+        offset = (offset + 1) % len(queues) if queues else 0
+        try:
+            did_work = process_next_job(rotated)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("[jobs] Fallo inesperado en el worker de jobs.")
+            if once:
+                raise
+            did_work = False
+
+        if once and not did_work:
+            return
+        if not did_work:
+            time.sleep(poll_seconds)
+
+
+def _worker_process_main(queue_names, once):
+    logger.info("[jobs] Worker iniciado. pid=%s", os.getpid())
+    try:
+        run_job_worker(queue_names=queue_names, once=once)
+    finally:
+        connections.close_all()
+
+
+def run_job_workers(
+    *,
+    workers: int = 1,
+    queue_names: list[str] | None = None,
+    once: bool = False,
+) -> None:
+    """Ejecuta ``workers`` procesos que drenan las colas en paralelo."""
+    obtener_colas_jobs(queue_names)
+    if workers <= 1:
+        run_job_worker(queue_names=queue_names, once=once)
+        return
+
+    # Las conexiones abiertas no pueden compartirse entre procesos forkeados.
+    connections.close_all()
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(
+            target=_worker_process_main,
+            args=(queue_names, once),
+            name=f"jobs-worker-{index}",
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        raise
+
+    failed = [process.name for process in processes if process.exitcode]
+    if failed:
+        raise RuntimeError(f"Workers de jobs terminaron con error: {failed}")
@@ -0,0 +1,83 @@
+"""Registro de colas de jobs en background provistas por cada dominio."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+
+DEFAULT_STALE_JOB_SECONDS = 15 * 60
+STALE_JOB_ERROR_MESSAGE = (
+    "El lote se interrumpio antes de finalizar. "
+    "Puede reanudarlo desde la ultima fila pendiente."
+)
+
+
+def _default_stale_seconds() -> int:
+    return DEFAULT_STALE_JOB_SECONDS
+
+
+def _default_poll_seconds() -> int | None:
+    return None
+
+
+@dataclass(frozen=True)
+class JobQueue:
+    """
+    Describe una cola de jobs persistidos en un modelo del dominio.
+
+    El modelo debe exponer ``Status.PENDING``/``Status.PROCESSING``/
+    ``Status.FAILED`` y los campos ``status``, ``requested_at``, ``started_at``,
+    ``finished_at``, ``last_activity_at``, ``last_error_message``,
+    ``available_at`` y ``retry_count``, que es el contrato que cumplen los
+    lotes de ciudadanos, usuarios, credenciales, mailing, OCR e imágenes.
+
+    ``mark_stale`` solo hace falta cuando la cola no marca como fallidos los
+    jobs sin actividad (el caso genérico lo resuelve el motor con
+    ``get_stale_seconds``, ``stale_error_message`` y ``stale_updates``).
+    """
+
+    name: str
+    model: Any
+    process: Callable[[Any], Any]
+    fail: Callable[[Any, str], Any]
+    mark_stale: Callable[[], int] | None = None
+    get_stale_seconds: Callable[[], int] = _default_stale_seconds
+    stale_error_message: str = STALE_JOB_ERROR_MESSAGE
+    stale_updates: dict[str, Any] = field(default_factory=dict)
+    get_poll_seconds: Callable[[], int | None] = _default_poll_seconds
+    max_concurrency: int | None = None
+    max_retries: int = 2
+    retry_backoff_seconds: float = 5.0
+    retry_backoff_max_seconds: float = 120.0
+
+    def get_max_concurrency(self) -> int | None:
+        """Concurrencia efectiva; ``settings.JOB_QUEUE_CONCURRENCY`` la pisa."""
+        overrides = getattr(settings, "JOB_QUEUE_CONCURRENCY", None) or {}
+        value = overrides.get(self.name, self.max_concurrency)
+        return int(value) if value else None
+
+
+_JOB_QUEUES: dict[str, JobQueue] = {}
+
+
+def registrar_cola_jobs(queue: JobQueue) -> None:
+    """Registra una cola; volver a registrar la misma definición es idempotente."""
+    existente = _JOB_QUEUES.get(queue.name)
+    if existente is None or existente == queue:
+        _JOB_QUEUES[queue.name] = queue
+        return
+    raise ValueError(f"Ya existe una cola de jobs registrada como '{queue.name}'.")
+
+
+def obtener_colas_jobs(nombres: list[str] | None = None) -> list[JobQueue]:
+    """Devuelve las colas registradas (todas o las pedidas, en orden estable)."""
+    if not nombres:
+        return [_JOB_QUEUES[name] for name in sorted(_JOB_QUEUES)]
+
+    faltantes = [name for name in nombres if name not in _JOB_QUEUES]
+    if faltantes:
+        raise KeyError(f"Colas de jobs desconocidas: {', '.join(faltantes)}")
+    return [_JOB_QUEUES[name] for name in nombres]
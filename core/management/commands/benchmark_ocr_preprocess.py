@@ -0,0 +1,30 @@
+"""Compara el preprocesado OCR vectorizado contra el pipeline anterior."""
+
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks.ocr_preprocess import DEFAULT_PAGES, run_ocr_preprocess_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide latencia por página y RSS pico del preprocesado OCR (anterior, "
+        "vectorizado y por lote) sobre páginas sintéticas A4 a 300 DPI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=DEFAULT_PAGES,
+            help="Cantidad de páginas sintéticas por variante.",
+        )
+
+    def handle(self, *args, **options):
+        if options["pages"] < 1:
+            raise CommandError("--pages debe ser mayor a 0.")
+        results = run_ocr_preprocess_benchmark(pages=options["pages"])
+        self.stdout.write(json.dumps(results, indent=2))
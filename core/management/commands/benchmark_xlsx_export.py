@@ -0,0 +1,30 @@
+"""Compara el motor XLSX write-only contra el armado del libro en memoria."""
+
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks.xlsx_export import DEFAULT_ROWS, run_xlsx_export_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide tiempo y RSS pico de exportar un padrón sintético a XLSX con un "
+        "Workbook en memoria y con el motor write-only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=DEFAULT_ROWS,
+            help="Cantidad de filas sintéticas por variante.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1:
+            raise CommandError("--rows debe ser mayor a 0.")
+        results = run_xlsx_export_benchmark(rows=options["rows"])
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.gestionar_outbox import get_outbox_stats, run_gestionar_outbox_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Drena el outbox de GESTIONAR: agrupa las filas pendientes en payloads "
+        "de varias Rows y las envia en paralelo con reintentos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Envia lo pendiente y termina (util para cron, tests y CI).",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Solo muestra la cantidad de filas por estado.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["stats"]:
+            run_gestionar_outbox_worker(once=options["once"])
+        for status, total in get_outbox_stats().items():
+            self.stdout.write(f"{status}: {total}")
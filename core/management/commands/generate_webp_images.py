@@ -1,17 +1,48 @@
-"""Management command para pre-generar archivos WebP."""
+"""
+Management command para pre-generar los derivados WebP de las imágenes.
+
+Backfill incremental y en paralelo: omite las imágenes cuyo manifiesto
+(``ImagenDerivada``) ya está completo para el ``mtime`` actual del original y
+reparte la conversión en ``--workers`` procesos. Las imágenes nuevas las
+procesa la cola ``imagenes`` de ``process_jobs``.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from django.core.management.base import BaseCommand, CommandError
 from django.apps import apps
+from django.db import connections
 from django.db.models import ImageField
-from django.conf import settings
-import os
 from tqdm import tqdm
 
-from core.services.image_service import get_or_create_webp, get_image_info
+from core.models import ImagenDerivada
+from core.services.image_service import (
+    _get_absolute_path,
+    generate_derivatives,
+    get_derivative_quality,
+    get_derivative_widths,
+    get_storage_name,
+    save_image_derivatives,
+)
+
+SAVE_BATCH_SIZE = 200
+
+
+def _generate_one(name, quality, widths):
+    """Corre en el worker: solo trabajo de archivos, sin tocar la base."""
+    try:
+        manifest = generate_derivatives(name, quality=quality, widths=widths)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        return name, None, None, str(exc)
+    webp_path = _get_absolute_path(manifest["variantes"]["webp"])
+    sizes = (os.path.getsize(_get_absolute_path(name)), os.path.getsize(webp_path))
+    return name, manifest, sizes, None
 
 
 class Command(BaseCommand):
-    help = "Genera archivos WebP para todas las imágenes existentes en la aplicación"
+    help = "Genera los derivados WebP (y anchos responsivos) de las imágenes existentes"
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -35,8 +66,11 @@ class Command(BaseCommand):
         parser.add_argument(
             "--quality",
             type=int,
-            default=85,
-            help="Calidad de compresión WebP (1-100, default: 85)",
+            default=None,
+            help=(
+                "Calidad de compresión WebP (1-100, default: "
+                "settings.IMAGE_DERIVATIVE_QUALITY)"
+            ),
         )
 
         parser.add_argument(
@@ -45,6 +79,19 @@ class Command(BaseCommand):
             help="Simular sin generar archivos reales",
         )
 
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Procesos de conversión en paralelo (default: cantidad de CPUs)",
+        )
+
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerar aunque el manifiesto esté al día",
+        )
+
         parser.add_argument(
             "--stats",
             action="store_true",
@@ -55,12 +102,15 @@ class Command(BaseCommand):
         app_name = options.get("app")
         model_name = options.get("model")
         limit = options.get("limit")
-        quality = options.get("quality")
+        quality = options.get("quality") or get_derivative_quality()
+        workers = options.get("workers")
         dry_run = options.get("dry_run")
         show_stats = options.get("stats")
 
         if not 1 <= quality <= 100:
             raise CommandError("La calidad debe estar entre 1 y 100")
+        if workers < 1:
+            raise CommandError("--workers debe ser mayor o igual a 1")
 
         if dry_run:
             self.stdout.write(
@@ -77,76 +127,54 @@ class Command(BaseCommand):
         for app_label, model_class, field_name in image_fields:
             self.stdout.write(f"  - {app_label}.{model_class.__name__}.{field_name}")
 
-        total_processed = 0
+        names = self._collect_names(image_fields)
+        if limit:
+            names = names[:limit]
+        pending, up_to_date, missing = self._split_pending(names, options["force"])
+
+        self.stdout.write(f"\nImágenes encontradas: {len(names)}")
+        self.stdout.write(f"Al día (se omiten): {up_to_date}")
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Sin archivo original: {missing}"))
+        self.stdout.write(f"A procesar: {len(pending)} con {workers} worker(s)")
+
+        if dry_run or not pending:
+            return
+
         total_success = 0
         total_errors = 0
-        total_skipped = 0
         total_original_size = 0
         total_webp_size = 0
-
-        for app_label, model_class, field_name in image_fields:
-            self.stdout.write(f"\n{'='*70}")
-            self.stdout.write(
-                f"Procesando: {app_label}.{model_class.__name__}.{field_name}"
-            )
-            self.stdout.write("=" * 70)
-
-            queryset = model_class.objects.exclude(**{field_name: ""}).exclude(
-                **{f"{field_name}__isnull": True}
-            )
-
-            if limit:
-                queryset = queryset[:limit]
-
-            count = queryset.count()
-            self.stdout.write(f"Imágenes a procesar: {count}")
-
-            if count == 0:
-                self.stdout.write(self.style.WARNING("⚠️  Sin imágenes, saltando..."))
+        manifests = {}
+
+        for name, manifest, sizes, error in tqdm(
+            self._run(pending, quality, workers),
+            total=len(pending),
+            desc="Generando derivados",
+        ):
+            if error:
+                total_errors += 1
+                self.stdout.write(self.style.ERROR(f"❌ Error en {name}: {error}"))
                 continue
-
-            for instance in tqdm(queryset, desc=f"Convirtiendo {model_class.__name__}"):
-                image_field = getattr(instance, field_name)
-
-                if not image_field:
-                    continue
-
-                try:
-                    if show_stats:
-                        info_before = get_image_info(image_field.url)
-
-                    if not dry_run:
-                        webp_url = get_or_create_webp(image_field.url, quality=quality)
-
-                        if webp_url.endswith(".webp"):
-                            total_success += 1
-
-                            if show_stats and info_before:
-                                info_after = get_image_info(image_field.url)
-                                if info_after and info_after["has_webp"]:
-                                    total_original_size += info_before["file_size"]
-                                    total_webp_size += info_after["webp_size"]
-                        else:
-                            total_skipped += 1
-
-                    total_processed += 1
-
-                except Exception as e:
-                    total_errors += 1
-                    self.stdout.write(self.style.ERROR(f"❌ Error en {instance}: {e}"))
+            total_success += 1
+            total_original_size += sizes[0]
+            total_webp_size += sizes[1]
+            manifests[name] = manifest
+            if len(manifests) >= SAVE_BATCH_SIZE:
+                save_image_derivatives(manifests)
+                manifests = {}
+        if manifests:
+            save_image_derivatives(manifests)
 
         self.stdout.write("\n" + "=" * 70)
         self.stdout.write(self.style.SUCCESS("✅ RESUMEN FINAL"))
         self.stdout.write("=" * 70)
-        self.stdout.write(f"Total procesadas: {total_processed}")
+        self.stdout.write(f"Total procesadas: {total_success + total_errors}")
         self.stdout.write(self.style.SUCCESS(f"Exitosas: {total_success}"))
 
         if total_errors > 0:
             self.stdout.write(self.style.ERROR(f"Errores: {total_errors}"))
 
-        if total_skipped > 0:
-            self.stdout.write(self.style.WARNING(f"Omitidas: {total_skipped}"))
-
         if show_stats and total_original_size > 0:
             savings_bytes = total_original_size - total_webp_size
             savings_percent = (savings_bytes / total_original_size) * 100
@@ -164,6 +192,61 @@ class Command(BaseCommand):
                 )
             )
 
+    def _collect_names(self, image_fields):
+        """Nombres de storage distintos, leídos sin instanciar los modelos."""
+        names = set()
+        for _, model_class, field_name in image_fields:
+            queryset = model_class.objects.exclude(**{field_name: ""}).exclude(
+                **{f"{field_name}__isnull": True}
+            )
+            for value in queryset.values_list(field_name, flat=True).iterator():
+                names.add(get_storage_name(value))
+        names.discard("")
+        return sorted(names)
+
+    def _split_pending(self, names, force):
+        """
+        Separa las imágenes a procesar de las que ya tienen un manifiesto
+        completo para el ``mtime`` actual del original.
+        """
+        completed = dict(
+            ImagenDerivada.objects.filter(
+                status=ImagenDerivada.Status.COMPLETED
+            ).values_list("original", "original_mtime")
+        )
+        pending = []
+        up_to_date = 0
+        missing = 0
+        for name in names:
+            try:
+                mtime = os.path.getmtime(_get_absolute_path(name))
+            except OSError:
+                missing += 1
+                continue
+            if not force and completed.get(name) == mtime:
+                up_to_date += 1
+                continue
+            pending.append(name)
+        return pending, up_to_date, missing
+
+    def _run(self, names, quality, workers):
+        widths = get_derivative_widths()
+        if workers == 1:
+            for name in names:
+                yield _generate_one(name, quality, widths)
+            return
+
+        # Igual que los workers de jobs: fork hereda settings y modulos
+        # cargados, pero no puede compartir las conexiones abiertas.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_generate_one, name, quality, widths) for name in names
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
     def _find_image_fields(self, app_name=None, model_name=None):
         """
         Encuentra todos los ImageFields en los modelos de Django.
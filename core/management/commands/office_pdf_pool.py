@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.office_pdf import get_profile_dir, verificar_slots
+
+
+class Command(BaseCommand):
+    help = (
+        "Chequea y calienta los slots de conversión DOCX→PDF: convierte un "
+        "documento mínimo en cada slot libre y deja su perfil de LibreOffice creado."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Perfiles en {get_profile_dir()}")
+        resultados = verificar_slots()
+        errores = 0
+        for resultado in resultados:
+            slot = resultado["slot"]
+            if resultado["status"] == "ok":
+                estado = "caliente" if resultado["warm"] else "perfil creado"
+                self.stdout.write(
+                    f"slot {slot}: ok en {resultado['seconds']}s ({estado})"
+                )
+            elif resultado["status"] == "busy":
+                self.stdout.write(f"slot {slot}: ocupado (conversión en curso)")
+            else:
+                errores += 1
+                self.stdout.write(
+                    self.style.ERROR(f"slot {slot}: error: {resultado['error']}")
+                )
+        if errores:
+            raise CommandError(f"{errores} slot(s) de conversión con error.")
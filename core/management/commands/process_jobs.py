@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.jobs import obtener_colas_jobs, run_job_workers
+
+
+class Command(BaseCommand):
+    help = (
+        "Procesa los jobs en background de todas las colas registradas "
+        "(ciudadanos, usuarios, credenciales, mailing, OCR e imágenes) con un pool "
+        "de workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Cantidad de procesos worker (default: settings.JOB_WORKERS).",
+        )
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            default=None,
+            help="Limita el procesamiento a la cola indicada (repetible).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Procesa hasta vaciar las colas y termina (útil para tests y CI).",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"] or getattr(settings, "JOB_WORKERS", 1)
+        if workers < 1:
+            raise CommandError("--workers debe ser mayor o igual a 1.")
+        queue_names = options["queues"]
+        try:
+            queues = obtener_colas_jobs(queue_names)
+        except KeyError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            f"Workers: {workers} | Colas: {', '.join(q.name for q in queues)}"
+        )
+        run_job_workers(workers=workers, queue_names=queue_names, once=options["once"])
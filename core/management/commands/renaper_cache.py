@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.services.renaper_cache import invalidate_renaper_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Administra el cache de consultas RENAPER. Los hits y misses se leen "
+        "en /metrics/ (sisoc_renaper_cache_lookups_total)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--invalidate",
+            action="store_true",
+            help="Descarta todas las respuestas cacheadas.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["invalidate"]:
+            self.stdout.write(
+                "Sin cambios. Usar --invalidate para descartar las respuestas "
+                "cacheadas; los contadores estan en /metrics/."
+            )
+            return
+        invalidate_renaper_cache()
+        self.stdout.write("Respuestas cacheadas invalidadas.")
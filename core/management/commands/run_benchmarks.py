@@ -15,6 +15,15 @@ from core.benchmarks.bootstrap import (
     default_baseline_path,
     default_output_path,
 )
+from core.benchmarks.load import (
+    LOAD_MODE_PROCESS,
+    LOAD_MODE_THREAD,
+    LOAD_MODES,
+    LoadBenchmarkRunner,
+    LoadModeUnavailable,
+    LoadRegressionThresholds,
+)
+from core.benchmarks.query_plans import QueryPlanRunner
 from core.benchmarks.runner import BenchmarkRunner, RegressionThresholds
 from core.benchmarks.scenarios import all_scenarios
 
@@ -83,6 +92,64 @@ class Command(BaseCommand):
             default=3,
             help="Umbral de regresión por cantidad de queries.",
         )
+        parser.add_argument(
+            "--load",
+            action="store_true",
+            help=(
+                "Modo carga: cada escenario HTTP corre desde N workers "
+                "concurrentes y se reportan p50/p95/p99, throughput y errores."
+            ),
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Workers concurrentes por escenario en modo carga.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10.0,
+            help="Segundos medidos por escenario en modo carga.",
+        )
+        parser.add_argument(
+            "--load-mode",
+            choices=LOAD_MODES,
+            default=LOAD_MODE_THREAD,
+            help="Workers como hilos o procesos (process requiere DATABASE_HOST).",
+        )
+        parser.add_argument(
+            "--p95-threshold-pct",
+            type=float,
+            default=25.0,
+            help="Umbral porcentual de regresión de p95 en modo carga.",
+        )
+        parser.add_argument(
+            "--p99-threshold-pct",
+            type=float,
+            default=50.0,
+            help="Umbral porcentual de regresión de p99 en modo carga.",
+        )
+        parser.add_argument(
+            "--throughput-threshold-pct",
+            type=float,
+            default=20.0,
+            help="Caída porcentual de throughput considerada regresión.",
+        )
+        parser.add_argument(
+            "--error-rate-threshold",
+            type=float,
+            default=0.01,
+            help="Aumento absoluto de tasa de error considerado regresión.",
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help=(
+                "Modo plan: captura los SELECT de cada escenario HTTP, los pasa "
+                "por EXPLAIN y reporta huecos de índice en los filtros avanzados."
+            ),
+        )
         parser.add_argument(
             "--internal",
             action="store_true",
@@ -121,10 +188,35 @@ class Command(BaseCommand):
             command.extend(["--scenario", scenario_id])
         if options["rebuild_baseline"]:
             command.append("--rebuild-baseline")
+        if options["explain"]:
+            command.append("--explain")
+        if options["load"]:
+            command.extend(
+                [
+                    "--load",
+                    "--concurrency",
+                    str(options["concurrency"]),
+                    "--duration",
+                    str(options["duration"]),
+                    "--load-mode",
+                    options["load_mode"],
+                    "--p95-threshold-pct",
+                    str(options["p95_threshold_pct"]),
+                    "--p99-threshold-pct",
+                    str(options["p99_threshold_pct"]),
+                    "--throughput-threshold-pct",
+                    str(options["throughput_threshold_pct"]),
+                    "--error-rate-threshold",
+                    str(options["error_rate_threshold"]),
+                ]
+            )
 
         env = os.environ.copy()
         env["PYTEST_RUNNING"] = "1"
-        env["USE_SQLITE_FOR_TESTS"] = "1"
+        # Los procesos forkeados no comparten una SQLite en memoria: el modo
+        # carga por procesos corre contra la base de DATABASE_HOST.
+        use_server_db = options["load"] and options["load_mode"] == LOAD_MODE_PROCESS
+        env["USE_SQLITE_FOR_TESTS"] = "0" if use_server_db else "1"
         env["DJANGO_DEBUG"] = "True"
         completed = subprocess.run(command, env=env, check=False)
         if completed.returncode != 0:
@@ -155,21 +247,55 @@ class Command(BaseCommand):
         ]
         if not scenarios:
             raise CommandError("No quedaron escenarios luego de aplicar filtros.")
+        if options["load"] and options["explain"]:
+            raise CommandError("--load y --explain no se pueden combinar.")
 
         self.stdout.write("Preparando DB efímera y datos reproducibles...")
         seed_state = build_seed_state()
-        runner = BenchmarkRunner(
-            scenarios=scenarios,
-            seed_state=seed_state,
-            thresholds=thresholds,
-            samples=options["samples"],
-            warmups=options["warmups"],
-        )
-        payload = runner.run(
-            baseline_path=baseline_path,
-            output_path=output_path,
-            rebuild_baseline=options["rebuild_baseline"],
-        )
+        if options["explain"]:
+            runner = QueryPlanRunner(
+                scenarios=scenarios,
+                seed_state=seed_state,
+                warmups=options["warmups"],
+            )
+        elif options["load"]:
+            runner = LoadBenchmarkRunner(
+                scenarios=scenarios,
+                seed_state=seed_state,
+                thresholds=LoadRegressionThresholds(
+                    p95_regression_pct=options["p95_threshold_pct"],
+                    p99_regression_pct=options["p99_threshold_pct"],
+                    latency_regression_ms=options["time_threshold_ms"],
+                    throughput_regression_pct=options["throughput_threshold_pct"],
+                    error_rate_regression=options["error_rate_threshold"],
+                ),
+                concurrency=options["concurrency"],
+                duration_seconds=options["duration"],
+                mode=options["load_mode"],
+                warmups=options["warmups"],
+            )
+        else:
+            runner = BenchmarkRunner(
+                scenarios=scenarios,
+                seed_state=seed_state,
+                thresholds=thresholds,
+                samples=options["samples"],
+                warmups=options["warmups"],
+            )
+        try:
+            payload = runner.run(
+                baseline_path=baseline_path,
+                output_path=output_path,
+                rebuild_baseline=options["rebuild_baseline"],
+            )
+        except LoadModeUnavailable as exc:
+            close_connections()
+            raise CommandError(str(exc)) from exc
+
+        if options["load"]:
+            self._write_load_results(payload)
+        if options["explain"]:
+            self._write_query_plan_results(payload)
         self.stdout.write(
             self.style.SUCCESS(
                 "Benchmarks completados: "
@@ -189,3 +315,35 @@ class Command(BaseCommand):
             raise CommandError(
                 "Se detectaron fallos o regresiones. Revisá el JSON generado."
             )
+
+    def _write_load_results(self, payload):
+        for result in payload["results"]:
+            if result["status"] != "measured":
+                continue
+            self.stdout.write(
+                f"{result['scenario_id']}: p50={result['p50_ms']}ms "
+                f"p95={result['p95_ms']}ms p99={result['p99_ms']}ms "
+                f"rps={result['throughput_rps']} errores={result['error_rate']} "
+                f"[{result['comparison']['status']}]"
+            )
+
+    def _write_query_plan_results(self, payload):
+        summary = payload["summary"]
+        self.stdout.write(
+            f"Consultas explicadas={summary['statements']} "
+            f"scans_completos={summary['full_scans']} "
+            f"filesorts={summary['filesorts']} "
+            f"temporales={summary['temporaries']} "
+            f"huecos_de_indice={summary['index_gaps']}"
+        )
+        for gap in payload["index_gaps"]:
+            if gap["new"]:
+                self.stdout.write(
+                    f"Hueco de índice nuevo: {gap['key']} "
+                    f"({', '.join(gap['scenarios'])})"
+                )
+        for suggestion in payload["suggested_indexes"]:
+            if suggestion["new"]:
+                self.stdout.write(
+                    f"Sugerido en {suggestion['model']}: {suggestion['definition']}"
+                )
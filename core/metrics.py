@@ -0,0 +1,313 @@
+"""
+Metricas de requests en formato de texto de Prometheus.
+
+``config.middlewares.metrics.RequestMetricsMiddleware`` mide cada request
+(latencia, consultas SQL, lecturas de cache y tamaño de respuesta) y lo
+acumula en ``registry``, que es por proceso. Con ``METRICS_MULTIPROC_DIR``
+cada proceso (workers de gunicorn y de jobs) vuelca su acumulado a
+``metrics-<host>-<pid>.json`` en ese directorio: como mucho cada
+``METRICS_FLUSH_INTERVAL_SECONDS`` desde un hilo propio, y al salir, asi un
+worker ocioso no se queda con su ultimo intervalo. El endpoint suma los
+archivos de todos los procesos. Los archivos de workers reciclados se
+conservan para que los contadores no retrocedan; el directorio se vacia al
+reiniciar el servicio.
+"""
+
+from __future__ import annotations
+
+import atexit
+import heapq
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger("django")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SNAPSHOT_GLOB = "metrics-*.json"
+
+METRIC_DEFINITIONS = {
+    "sisoc_http_requests_total": (
+        "counter",
+        "Requests atendidas por metodo, ruta y estado.",
+    ),
+    "sisoc_http_request_duration_seconds": (
+        "histogram",
+        "Latencia de las requests por metodo y ruta.",
+    ),
+    "sisoc_http_db_queries_total": ("counter", "Consultas SQL ejecutadas por ruta."),
+    "sisoc_http_db_query_duration_seconds_total": (
+        "counter",
+        "Tiempo acumulado en consultas SQL por ruta.",
+    ),
+    "sisoc_http_response_size_bytes_total": (
+        "counter",
+        "Bytes de cuerpo de respuesta por ruta.",
+    ),
+    "sisoc_cache_requests_total": (
+        "counter",
+        "Lecturas del cache por ruta y resultado (hit/miss).",
+    ),
+    "sisoc_http_slow_requests_total": (
+        "counter",
+        "Requests que superaron METRICS_SLOW_REQUEST_SECONDS.",
+    ),
+    "sisoc_renaper_cache_lookups_total": (
+        "counter",
+        "Consultas RENAPER por resultado del cache (hits, negative_hits, "
+        "misses, coalesced).",
+    ),
+}
+
+_request_state = threading.local()
+
+
+def is_metrics_enabled() -> bool:
+    return bool(getattr(settings, "METRICS_ENABLED", False))
+
+
+class MetricsRegistry:
+    """Contadores e histogramas del proceso, indexados por (nombre, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._dirty = False
+        self._flusher_pid = None
+
+    def inc(self, name, labels, value=1.0):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] += value
+            self._dirty = True
+        if self._flusher_pid != os.getpid():
+            self._start_flusher()
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        key = (name, tuple(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Un contador por bucket mas +Inf, y luego suma y cantidad.
+                histogram = self._histograms[key] = [0] * (len(buckets) + 1) + [
+                    0.0,
+                    0,
+                ]
+            index = next(
+                (i for i, bound in enumerate(buckets) if value <= bound), len(buckets)
+            )
+            histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+            self._dirty = True
+        if self._flusher_pid != os.getpid():
+            self._start_flusher()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": [
+                    [name, [list(pair) for pair in labels], value]
+                    for (name, labels), value in self._counters.items()
+                ],
+                "histograms": [
+                    [name, [list(pair) for pair in labels], list(values)]
+                    for (name, labels), values in self._histograms.items()
+                ],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._last_flush = 0.0
+            self._dirty = False
+
+    def flush(self, force=False):
+        """Vuelca el acumulado del proceso al directorio compartido, si hay uno."""
+        directory = getattr(settings, "METRICS_MULTIPROC_DIR", "")
+        if not directory:
+            return
+        now = time.monotonic()
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL_SECONDS", 5.0)
+        if not force and now - self._last_flush < interval:
+            return
+        self._last_flush = now
+        self._dirty = False
+        try:
+            _write_snapshot(Path(directory), self.snapshot())
+        except OSError:
+            logger.warning("No se pudieron volcar las metricas", exc_info=True)
+
+    def _start_flusher(self):
+        """Un hilo por proceso (se rearma tras un fork) que vuelca lo pendiente."""
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        if not getattr(settings, "METRICS_MULTIPROC_DIR", ""):
+            return
+        threading.Thread(
+            target=self._flush_periodically, name="metrics-flush", daemon=True
+        ).start()
+
+    def _flush_periodically(self):
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL_SECONDS", 5.0)
+        interval = interval if interval > 0 else 5.0
+        while True:
+            time.sleep(interval)
+            if self._dirty:
+                self.flush(force=True)
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush, force=True)
+
+
+def _write_snapshot(directory: Path, snapshot: dict):
+    directory.mkdir(parents=True, exist_ok=True)
+    # El host separa procesos de distintos contenedores con el mismo pid.
+    target = directory / f"metrics-{socket.gethostname()}-{os.getpid()}.json"
+    # Escritura atomica: el endpoint nunca lee un archivo a medio escribir.
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=".metrics-", suffix=".tmp", delete=False
+    ) as tmp:
+        json.dump(snapshot, tmp)
+    os.replace(tmp.name, target)
+
+
+def _merge(snapshots):
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get("counters", []):
+            counters[(name, tuple(map(tuple, labels)))] += value
+        for name, labels, values in snapshot.get("histograms", []):
+            key = (name, tuple(map(tuple, labels)))
+            if key in histograms:
+                histograms[key] = [a + b for a, b in zip(histograms[key], values)]
+            else:
+                histograms[key] = list(values)
+    return counters, histograms
+
+
+def collect():
+    """Acumulado de todos los workers (o solo de este proceso sin directorio)."""
+    directory = getattr(settings, "METRICS_MULTIPROC_DIR", "")
+    if not directory:
+        return _merge([registry.snapshot()])
+    registry.flush(force=True)
+    snapshots = []
+    for path in sorted(Path(directory).glob(SNAPSHOT_GLOB)):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            logger.warning("Archivo de metricas ilegible: %s", path)
+    return _merge(snapshots)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def render_prometheus(counters, histograms) -> str:
+    by_name = defaultdict(list)
+    for (name, labels), value in counters.items():
+        by_name[name].append((labels, value))
+    for (name, labels), values in histograms.items():
+        by_name[name].append((labels, values))
+
+    lines = []
+    for name in sorted(by_name):
+        metric_type, help_text = METRIC_DEFINITIONS.get(name, ("untyped", name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in sorted(by_name[name]):
+            if metric_type != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            bounds = [*map(repr, LATENCY_BUCKETS), "+Inf"]
+            for bound, count in zip(bounds, value[:-2]):
+                cumulative += count
+                bucket_labels = _format_labels((*labels, ("le", bound)))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {repr(value[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """Lo medido durante una request; lo completan el wrapper SQL y el cache."""
+
+    def __init__(self, sample_size):
+        self.sample_size = sample_size
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._slowest = []
+        self._sequence = 0
+
+    def add_query(self, sql, seconds):
+        self.query_count += 1
+        self.query_seconds += seconds
+        if self.sample_size <= 0:
+            return
+        # Heap de minimos con las N consultas mas lentas.
+        self._sequence += 1
+        item = (seconds, self._sequence, sql)
+        if len(self._slowest) < self.sample_size:
+            heapq.heappush(self._slowest, item)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest_queries(self):
+        return [
+            {"ms": round(seconds * 1000, 2), "sql": sql[:1000]}
+            for seconds, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+
+def start_request_stats(sample_size) -> RequestStats:
+    stats = RequestStats(sample_size)
+    _request_state.stats = stats
+    return stats
+
+
+def end_request_stats():
+    _request_state.stats = None
+
+
+def current_request_stats():
+    return getattr(_request_state, "stats", None)
+
+
+def record_cache_lookup(hits=0, misses=0):
+    stats = current_request_stats()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
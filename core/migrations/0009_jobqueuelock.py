@@ -0,0 +1,33 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_programa_organismo_programa_descripcion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobQueueLock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=64, unique=True)),
+                ("acquired_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Lock de cola de jobs",
+                "verbose_name_plural": "Locks de colas de jobs",
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.16 on 2026-10-18 05:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_gestionaroutbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImagenDerivada",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("original", models.CharField(max_length=255, unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendiente"),
+                            ("processing", "Procesando"),
+                            ("completed", "Completado"),
+                            ("failed", "Fallido"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("variantes", models.JSONField(blank=True, default=dict)),
+                ("ancho", models.PositiveIntegerField(blank=True, null=True)),
+                ("alto", models.PositiveIntegerField(blank=True, null=True)),
+                ("original_mtime", models.FloatField(blank=True, null=True)),
+                ("last_error_message", models.TextField(blank=True)),
+                (
+                    "requested_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("last_activity_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Imagen derivada",
+                "verbose_name_plural": "Imagenes derivadas",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "requested_at"],
+                        name="core_imagen_status_47ae4c_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -285,3 +286,112 @@ class PreferenciaColumnas(models.Model):
 
     def __str__(self):
         return f"{self.usuario_id} - {self.listado}"
+
+
+class JobQueueLock(models.Model):
+    """
+    Fila de lock por cola de jobs: serializa el chequeo de concurrencia maxima
+    y el reclamo entre workers (ver ``core.jobs.engine.claim_next_job``).
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    acquired_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Lock de cola de jobs"
+        verbose_name_plural = "Locks de colas de jobs"
+
+    def __str__(self):
+        return self.name
+
+
+class GestionarOutbox(models.Model):
+    """
+    Fila pendiente de sincronizar con GESTIONAR (outbox transaccional).
+
+    Mientras esta pendiente, ``coalesce_key`` (``tipo:entidad``) es unica: un
+    nuevo cambio sobre la misma entidad reemplaza la fila en lugar de sumar
+    otro envio. Al reclamarla para enviar se libera la clave.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pendiente"
+        PROCESSING = "processing", "Procesando"
+        SENT = "sent", "Enviado"
+        FAILED = "failed", "Fallido"
+
+    kind = models.CharField(max_length=40)
+    action = models.CharField(max_length=10)
+    entity_id = models.CharField(max_length=64)
+    row = models.JSONField(default=dict)
+    coalesce_key = models.CharField(max_length=120, null=True, blank=True, unique=True)
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+        verbose_name = "Envio pendiente a GESTIONAR"
+        verbose_name_plural = "Envios pendientes a GESTIONAR"
+
+    def __str__(self):
+        return (
+            f"{self.kind} {self.entity_id} {self.action} ({self.get_status_display()})"
+        )
+
+
+class ImagenDerivada(models.Model):
+    """
+    Manifiesto de los derivados WebP de una imagen subida.
+
+    Cada fila es tambien un job de la cola ``imagenes`` (core.jobs): se crea
+    pendiente al subir la imagen y el worker genera el WebP a tamaño original y
+    los anchos responsivos. ``original`` es el nombre en el storage (relativo a
+    MEDIA_ROOT) y ``variantes`` guarda ``{"webp": nombre, "srcset": [[ancho,
+    nombre], ...]}``, que es lo unico que leen los template tags al renderizar.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pendiente"
+        PROCESSING = "processing", "Procesando"
+        COMPLETED = "completed", "Completado"
+        FAILED = "failed", "Fallido"
+
+    original = models.CharField(max_length=255, unique=True)
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    variantes = models.JSONField(default=dict, blank=True)
+    ancho = models.PositiveIntegerField(null=True, blank=True)
+    alto = models.PositiveIntegerField(null=True, blank=True)
+    original_mtime = models.FloatField(null=True, blank=True)
+    last_error_message = models.TextField(blank=True)
+    requested_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    available_at = models.DateTimeField(null=True, blank=True)
+    retry_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "requested_at"]),
+        ]
+        verbose_name = "Imagen derivada"
+        verbose_name_plural = "Imagenes derivadas"
+
+    def __str__(self):
+        return f"{self.original} ({self.get_status_display()})"
@@ -2,20 +2,67 @@
 
 from __future__ import annotations
 
+import datetime
+import json
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+KEYSET_CURSOR_PARAM = "cursor"
+_KEYSET_CURSOR_SALT = "core.pagination.keyset"
+
+
+class _KeysetCursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder trunca a milisegundos; el cursor tiene que reproducir
+    # el valor exacto o la busqueda saltea/repite filas del mismo milisegundo.
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)) and not (
+            isinstance(o, datetime.time) and o.utcoffset() is not None
+        ):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _KeysetCursorSerializer:
+    """JSON compacto; fechas y decimales viajan como texto."""
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), cls=_KeysetCursorEncoder).encode(
+            "latin-1"
+        )
+
+    def loads(self, data):
+        return json.loads(data.decode("latin-1"))
+
 
 class NoCountPage:
     """Representa una pagina sin requerir un COUNT(*) exacto."""
 
-    def __init__(self, object_list, number, paginator, has_next_page):
+    def __init__(
+        self,
+        object_list,
+        number,
+        paginator,
+        has_next_page,
+        has_previous_page=None,
+        next_cursor=None,
+        previous_cursor=None,
+    ):
         self.object_list = object_list
         self.number = number
         self.paginator = paginator
         self._has_next_page = has_next_page
+        self._has_previous_page = has_previous_page
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
 
     def has_next(self):
         return self._has_next_page
 
     def has_previous(self):
+        if self._has_previous_page is not None:
+            return self._has_previous_page
         return self.number > 1
 
     def has_other_pages(self):
@@ -29,15 +76,45 @@ class NoCountPage:
 
 
 class NoCountPaginator:
-    """Paginar por ventana evita el COUNT(*) sobre tablas grandes."""
+    """
+    Paginar por ventana evita el COUNT(*) sobre tablas grandes.
+
+    Con ``ordering`` (por ejemplo ``("pk",)`` o ``("-fecha", "pk")``) se habilita
+    el modo keyset: cada pagina expone ``next_cursor``/``previous_cursor``
+    opacos y ``get_page(number, cursor=...)`` busca a partir de los valores de
+    orden de la ultima fila (``WHERE pk > x``) en lugar de saltear ``OFFSET``
+    filas, asi que la pagina 5000 cuesta lo mismo que la 2. Los numeros de
+    pagina siguen funcionando por ``OFFSET``.
+
+    Las columnas de ``ordering`` tienen que poder leerse de cada fila de
+    ``object_list`` (instancias, ``values()`` o ``values_list()``) y la ultima
+    tiene que ser unica; si no se incluye ``pk`` se agrega al final. Los
+    ``NULL`` se asumen primeros en orden ascendente, como en MySQL y SQLite.
+    """
 
     count = None
     num_pages = None
     page_range = ()
 
-    def __init__(self, object_list, per_page):
-        self.object_list = object_list
+    def __init__(self, object_list, per_page, ordering=None):
         self.per_page = per_page
+        self.ordering = self._normalize_ordering(ordering) if ordering else None
+        if self.ordering:
+            object_list = object_list.order_by(
+                *(f"-{field}" if desc else field for field, desc in self.ordering)
+            )
+        self.object_list = object_list
+
+    @staticmethod
+    def _normalize_ordering(ordering):
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        normalized = [
+            (field.lstrip("-"), field.startswith("-")) for field in ordering if field
+        ]
+        if not normalized or normalized[-1][0] not in ("pk", "id"):
+            normalized.append(("pk", normalized[-1][1] if normalized else False))
+        return tuple(normalized)
 
     @staticmethod
     def _normalize_number(number):
@@ -76,7 +153,14 @@ class NoCountPaginator:
 
         return best_number, best_items, best_has_next_page
 
-    def get_page(self, number):
+    def get_page(self, number, cursor=None):
+        if cursor and self.ordering:
+            state = self.decode_cursor(cursor)
+            if state is not None:
+                page = self._get_keyset_page(*state)
+                if page is not None:
+                    return page
+
         page_number = self._normalize_number(number)
         items, has_next_page = self._fetch_page(page_number)
 
@@ -85,7 +169,126 @@ class NoCountPaginator:
                 page_number
             )
 
-        return NoCountPage(items, page_number, self, has_next_page)
+        return self._build_page(items, page_number, has_next_page, page_number > 1)
+
+    # Modo keyset
+
+    def encode_cursor(self, number, values, backwards=False):
+        payload = {"n": number, "v": list(values)}
+        if backwards:
+            payload["b"] = 1
+        return signing.dumps(
+            payload,
+            salt=_KEYSET_CURSOR_SALT,
+            serializer=_KeysetCursorSerializer,
+            compress=True,
+        )
+
+    def decode_cursor(self, cursor):
+        """Devuelve ``(numero, valores, hacia_atras)`` o ``None`` si no es valido."""
+        try:
+            payload = signing.loads(
+                cursor, salt=_KEYSET_CURSOR_SALT, serializer=_KeysetCursorSerializer
+            )
+            values = payload["v"]
+            number = self._normalize_number(payload.get("n"))
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            return None
+        return number, values, bool(payload.get("b"))
+
+    def _row_values(self, row):
+        fields = [field for field, _desc in self.ordering]
+        if isinstance(row, dict):
+            return [row[field] for field in fields]
+        if isinstance(row, tuple):
+            row_fields = list(self.object_list._fields)
+            return [row[row_fields.index(field)] for field in fields]
+        if not hasattr(row, "_meta"):
+            # values_list(flat=True): la fila es el unico valor de orden.
+            return [row]
+        values = []
+        for field in fields:
+            value = row
+            for part in field.split("__"):
+                value = getattr(value, part) if value is not None else None
+            values.append(value)
+        return values
+
+    def _seek_filter(self, values, backwards):
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(self.ordering, values):
+            greater = descending == backwards
+            if value is None:
+                step = Q(**{f"{field}__isnull": False}) if greater else Q(pk__in=[])
+                same = Q(**{f"{field}__isnull": True})
+            elif greater:
+                step = Q(**{f"{field}__gt": value})
+                same = Q(**{field: value})
+            else:
+                step = Q(**{f"{field}__lt": value}) | Q(**{f"{field}__isnull": True})
+                same = Q(**{field: value})
+            condition |= equal & step
+            equal &= same
+        return condition
+
+    def _get_keyset_page(self, number, values, backwards):
+        queryset = self.object_list.filter(self._seek_filter(values, backwards))
+        if backwards:
+            queryset = queryset.reverse()
+        items = list(queryset[: self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[: self.per_page]
+        if not items:
+            # Se borraron filas desde que se emitio el cursor.
+            return None
+        if backwards:
+            items.reverse()
+            number = number if has_more else 1
+            return self._build_page(items, number, True, has_more)
+        return self._build_page(items, number, has_more, True)
+
+    def _build_page(self, items, number, has_next_page, has_previous_page):
+        next_cursor = previous_cursor = None
+        if self.ordering and items:
+            if has_next_page:
+                next_cursor = self.encode_cursor(
+                    number + 1, self._row_values(items[-1])
+                )
+            if has_previous_page:
+                previous_cursor = self.encode_cursor(
+                    max(number - 1, 1), self._row_values(items[0]), backwards=True
+                )
+        return NoCountPage(
+            items,
+            number,
+            self,
+            has_next_page,
+            has_previous_page=has_previous_page,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+
+
+def iter_keyset(object_list, ordering, chunk_size=2000):
+    """
+    Recorre ``object_list`` completo en bloques de ``chunk_size`` filas con
+    busqueda keyset sobre ``ordering``: cada consulta arranca despues de la
+    ultima fila leida, sin OFFSET ni un resultado gigante en memoria (en MySQL
+    ``iterator()`` trae el resultado completo al cliente).
+    """
+    paginator = NoCountPaginator(object_list, chunk_size, ordering=ordering)
+    queryset = paginator.object_list
+    while True:
+        rows = list(queryset[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        queryset = paginator.object_list.filter(
+            paginator._seek_filter(paginator._row_values(rows[-1]), False)
+        )
 
 
 def build_no_count_page_range(page_obj, window=2):
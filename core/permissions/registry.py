@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from functools import lru_cache
+from types import MappingProxyType
 
 from django.utils.text import slugify
 
@@ -228,6 +230,11 @@ SIDEBAR_MODULE_PERMISSIONS: dict[str, tuple[str, ...]] = {
 }
 
 
+# Vista de solo lectura para las resoluciones en caliente: nadie puede mutar el
+# mapa despues de importado, asi que los resultados memoizados siguen validos.
+_LEGACY_ALIAS_LOOKUP = MappingProxyType(dict(LEGACY_ALIAS_TO_PERMISSION_CODES))
+
+
 def permission_codes_for_alias(alias: str) -> tuple[str, ...]:
     if not alias:
         return tuple()
@@ -235,17 +242,22 @@ def permission_codes_for_alias(alias: str) -> tuple[str, ...]:
     normalized = str(alias).strip()
     if not normalized:
         return tuple()
+    return _permission_codes_for_normalized_alias(normalized)
 
+
+@lru_cache(maxsize=2048)
+def _permission_codes_for_normalized_alias(normalized: str) -> tuple[str, ...]:
     if "." in normalized:
         return (normalized,)
 
-    mapped = LEGACY_ALIAS_TO_PERMISSION_CODES.get(normalized)
+    mapped = _LEGACY_ALIAS_LOOKUP.get(normalized)
     if mapped:
         return mapped
 
     return (build_legacy_permission_code(normalized),)
 
 
+@lru_cache(maxsize=4096)
 def _normalize_permission_code(value: str) -> str:
     normalized = str(value or "").strip()
     if not normalized:
@@ -265,12 +277,18 @@ def resolve_permission_codes(values: str | Iterable[str]) -> tuple[str, ...]:
     No convierte aliases legacy por nombre de grupo.
     """
     if isinstance(values, str):
-        values = [values]
+        return _resolve_permission_code_tuple((values,))
+    return _resolve_permission_code_tuple(tuple(str(value) for value in values or []))
+
 
+@lru_cache(maxsize=4096)
+def _resolve_permission_code_tuple(values: tuple[str, ...]) -> tuple[str, ...]:
+    # Los templates resuelven los mismos codigos en cada render; el conjunto de
+    # entradas distintas es chico y acotado por el codigo fuente.
     result: list[str] = []
     seen: set[str] = set()
-    for value in values or []:
-        code = _normalize_permission_code(str(value))
+    for value in values:
+        code = _normalize_permission_code(value)
         if code and code not in seen:
             seen.add(code)
             result.append(code)
@@ -0,0 +1,449 @@
+"""
+Nomenclador territorial en memoria para resolver nombres de provincia,
+municipio, localidad y nacionalidad.
+
+El mapeo de RENAPER y los importadores comparaban nombres recorriendo
+querysets completos y normalizando cada fila en Python en cada consulta. El
+``Gazetteer`` se arma una sola vez por proceso (cuatro ``values_list``) con
+indices por nombre normalizado y padre, y resuelve en O(1):
+
+    gaz = get_gazetteer()
+    provincia_id = gaz.resolve_provincia("CABA")
+    localidad_id = gaz.resolve_localidad("Mar del Plata", provincia_id=1)
+
+La normalizacion aplica alias conocidos ("caba", "capital federal"), quita
+acentos y reemplaza la palabra numerica inicial ("Veinticinco de Mayo" ->
+"25 de mayo"). Si no hay coincidencia exacta se prueba una coincidencia
+aproximada (``difflib``) dentro del ambito pedido.
+
+Los cambios en ``Provincia``/``Municipio``/``Localidad``/``Nacionalidad``
+bumpean la version del namespace ``gazetteer`` (ver ``core.cache_utils``); cada
+proceso compara su version como mucho cada ``GAZETTEER_VERSION_CHECK_SECONDS``
+y se reconstruye si quedo vieja.
+"""
+
+from __future__ import annotations
+
+import difflib
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+
+from core.cache_utils import bump_namespace_version, get_namespace_version
+
+GAZETTEER_CACHE_NAMESPACE = "gazetteer"
+DEFAULT_VERSION_CHECK_SECONDS = 5
+DEFAULT_FUZZY_CUTOFF = 0.88
+# Por encima de este tamaño el fallback aproximado no compensa (difflib es
+# lineal sobre los candidatos): localidades sin ambito, por ejemplo.
+FUZZY_MAX_CANDIDATES = 3000
+
+GEO_ALIASES = {
+    "ciudad de buenos aires": "ciudad autonoma de buenos aires",
+    "ciudad autonoma de buenos aires": "ciudad autonoma de buenos aires",
+    "caba": "ciudad autonoma de buenos aires",
+    "capital federal": "ciudad autonoma de buenos aires",
+}
+
+NUMBER_WORDS = {
+    "uno": "1",
+    "una": "1",
+    "dos": "2",
+    "tres": "3",
+    "cuatro": "4",
+    "cinco": "5",
+    "seis": "6",
+    "siete": "7",
+    "ocho": "8",
+    "nueve": "9",
+    "diez": "10",
+    "once": "11",
+    "doce": "12",
+    "trece": "13",
+    "catorce": "14",
+    "quince": "15",
+    "dieciseis": "16",
+    "dieciséis": "16",
+    "diecisiete": "17",
+    "dieciocho": "18",
+    "diecinueve": "19",
+    "veinte": "20",
+    "veintiuno": "21",
+    "veintidos": "22",
+    "veintidós": "22",
+    "veintitres": "23",
+    "veintitrés": "23",
+    "veinticuatro": "24",
+    "veinticinco": "25",
+    "veintiseis": "26",
+    "veintiséis": "26",
+    "veintisiete": "27",
+    "veintiocho": "28",
+    "veintinueve": "29",
+    "treinta": "30",
+}
+
+
+def normalize_text(value) -> str:
+    """Minusculas, sin acentos, sin ``_``/``-`` y con espacios colapsados."""
+    if not value:
+        return ""
+    text = str(value).replace("_", " ").replace("-", " ").lower()
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(text.split())
+
+
+def replace_number_words(text) -> str:
+    """Convierte la palabra numerica al comienzo del texto a digitos."""
+    if not text:
+        return ""
+    parts = text.split()
+    if parts and parts[0] in NUMBER_WORDS:
+        parts[0] = NUMBER_WORDS[parts[0]]
+    return " ".join(parts)
+
+
+def apply_geo_alias(value):
+    """Reemplaza alias conocidos de nombres geograficos."""
+    if not value:
+        return ""
+    text = " ".join(str(value).replace("_", " ").replace("-", " ").lower().split())
+    return GEO_ALIASES.get(text, value)
+
+
+def normalize_geo_name(value) -> str:
+    """Clave de comparacion para nombres de provincia/municipio/localidad."""
+    if not value:
+        return ""
+    return replace_number_words(normalize_text(apply_geo_alias(value)))
+
+
+def _fuzzy_cutoff() -> float:
+    try:
+        cutoff = float(
+            getattr(settings, "GAZETTEER_FUZZY_CUTOFF", DEFAULT_FUZZY_CUTOFF)
+        )
+    except (TypeError, ValueError):
+        return DEFAULT_FUZZY_CUTOFF
+    return cutoff if 0 < cutoff <= 1 else DEFAULT_FUZZY_CUTOFF
+
+
+def _instance(model, field_names, values):
+    # Instancia "cargada" sin query: alcanza para .pk, nombre y asignar FKs.
+    return model.from_db("default", field_names, values)
+
+
+class Gazetteer:
+    """
+    Indices inmutables por nombre normalizado y padre.
+
+    Los ``resolve_*`` devuelven ids (o ``None``). Entre filas equivalentes
+    gana el PK mas bajo, igual que el recorrido por ``id`` que reemplaza.
+    """
+
+    def __init__(self, provincias, municipios, localidades, nacionalidades=()):
+        self.provincias = {}
+        self.municipios = {}
+        self.localidades = {}
+        self.nacionalidades = {}
+        self._provincia_by_key = {}
+        self._municipio_by_key = {}
+        self._municipios_by_name = {}
+        self._municipio_keys_by_provincia = {}
+        self._localidad_by_key = {}
+        self._localidades_by_provincia_key = {}
+        self._localidades_by_name = {}
+        self._localidad_keys_by_municipio = {}
+        self._localidad_keys_by_provincia = {}
+        self._localidad_key_by_pk = {}
+        self._nacionalidad_by_key = {}
+
+        for pk, nombre in sorted(provincias):
+            self.provincias[pk] = nombre
+            self._provincia_by_key.setdefault(normalize_geo_name(nombre), pk)
+
+        for pk, nombre, provincia_id in sorted(municipios):
+            key = normalize_geo_name(nombre)
+            self.municipios[pk] = (nombre, provincia_id)
+            if (key, provincia_id) not in self._municipio_by_key:
+                self._municipio_by_key[(key, provincia_id)] = pk
+                self._municipio_keys_by_provincia.setdefault(provincia_id, []).append(
+                    key
+                )
+            self._municipios_by_name.setdefault(key, []).append(pk)
+
+        for pk, nombre, municipio_id in sorted(localidades):
+            key = normalize_geo_name(nombre)
+            self.localidades[pk] = (nombre, municipio_id)
+            self._localidad_key_by_pk[pk] = key
+            provincia_id = self.municipio_provincia_id(municipio_id)
+            if (key, municipio_id) not in self._localidad_by_key:
+                self._localidad_by_key[(key, municipio_id)] = pk
+                self._localidad_keys_by_municipio.setdefault(municipio_id, []).append(
+                    key
+                )
+            by_provincia = self._localidades_by_provincia_key.setdefault(
+                (key, provincia_id), []
+            )
+            if not by_provincia:
+                self._localidad_keys_by_provincia.setdefault(provincia_id, []).append(
+                    key
+                )
+            by_provincia.append(pk)
+            self._localidades_by_name.setdefault(key, []).append(pk)
+
+        for pk, nombre in sorted(nacionalidades):
+            self.nacionalidades[pk] = nombre
+            key = normalize_text(nombre)
+            if key:
+                self._nacionalidad_by_key.setdefault(key, pk)
+
+    @classmethod
+    def from_db(cls) -> "Gazetteer":
+        from core.models import (  # pylint: disable=import-outside-toplevel
+            Localidad,
+            Municipio,
+            Nacionalidad,
+            Provincia,
+        )
+
+        return cls(
+            provincias=Provincia.objects.values_list("pk", "nombre"),
+            municipios=Municipio.objects.values_list("pk", "nombre", "provincia_id"),
+            localidades=Localidad.objects.values_list("pk", "nombre", "municipio_id"),
+            nacionalidades=Nacionalidad.objects.values_list("pk", "nacionalidad"),
+        )
+
+    @staticmethod
+    def _fuzzy(key, candidates):
+        if not key or not candidates or len(candidates) > FUZZY_MAX_CANDIDATES:
+            return None
+        matches = difflib.get_close_matches(
+            key, candidates, n=1, cutoff=_fuzzy_cutoff()
+        )
+        return matches[0] if matches else None
+
+    # --- Provincias -------------------------------------------------------
+
+    def resolve_provincia(self, nombre, fuzzy=True):
+        key = normalize_geo_name(nombre)
+        if not key:
+            return None
+        pk = self._provincia_by_key.get(key)
+        if pk is None and fuzzy:
+            match = self._fuzzy(key, list(self._provincia_by_key))
+            pk = self._provincia_by_key.get(match)
+        return pk
+
+    # --- Municipios -------------------------------------------------------
+
+    def municipio_provincia_id(self, municipio_id):
+        municipio = self.municipios.get(municipio_id)
+        return municipio[1] if municipio else None
+
+    def has_municipio(self, municipio_id, provincia_id=None):
+        if municipio_id not in self.municipios:
+            return False
+        return provincia_id is None or (
+            self.municipio_provincia_id(municipio_id) == provincia_id
+        )
+
+    def resolve_municipio(self, nombre, provincia_id=None, fuzzy=True):
+        key = normalize_geo_name(nombre)
+        if not key:
+            return None
+        if provincia_id is not None:
+            pk = self._municipio_by_key.get((key, provincia_id))
+            if pk is None and fuzzy:
+                match = self._fuzzy(
+                    key, self._municipio_keys_by_provincia.get(provincia_id)
+                )
+                pk = self._municipio_by_key.get((match, provincia_id))
+            return pk
+        candidates = self._municipios_by_name.get(key)
+        if candidates:
+            return candidates[0]
+        if fuzzy:
+            match = self._fuzzy(key, list(self._municipios_by_name))
+            if match:
+                return self._municipios_by_name[match][0]
+        return None
+
+    # --- Localidades ------------------------------------------------------
+
+    def localidad_municipio_id(self, localidad_id):
+        localidad = self.localidades.get(localidad_id)
+        return localidad[1] if localidad else None
+
+    def localidad_nombre(self, localidad_id):
+        localidad = self.localidades.get(localidad_id)
+        return localidad[0] if localidad else None
+
+    def has_localidad(self, localidad_id):
+        return localidad_id in self.localidades
+
+    def localidad_candidates(self, nombre, provincia_id=None):
+        """Todas las localidades con ese nombre normalizado (para detectar ambiguedad)."""
+        key = normalize_geo_name(nombre)
+        if not key:
+            return []
+        if provincia_id is not None:
+            return list(self._localidades_by_provincia_key.get((key, provincia_id), []))
+        return list(self._localidades_by_name.get(key, []))
+
+    def search_localidades(self, texto, provincia_id=None, limit=None):
+        """Localidades cuyo nombre normalizado contiene ``texto`` (recorrido lineal)."""
+        key = normalize_geo_name(texto)
+        if not key:
+            return []
+        found = []
+        for pk, nombre_key in self._localidad_key_by_pk.items():
+            if key not in nombre_key:
+                continue
+            if provincia_id is not None and (
+                self.municipio_provincia_id(self.localidad_municipio_id(pk))
+                != provincia_id
+            ):
+                continue
+            found.append(pk)
+            if limit and len(found) >= limit:
+                break
+        return found
+
+    def resolve_localidad(
+        self, nombre, municipio_id=None, provincia_id=None, fuzzy=True
+    ):
+        key = normalize_geo_name(nombre)
+        if not key:
+            return None
+        if municipio_id is not None:
+            pk = self._localidad_by_key.get((key, municipio_id))
+            if pk is None and fuzzy:
+                match = self._fuzzy(
+                    key, self._localidad_keys_by_municipio.get(municipio_id)
+                )
+                pk = self._localidad_by_key.get((match, municipio_id))
+            return pk
+        if provincia_id is not None:
+            candidates = self._localidades_by_provincia_key.get((key, provincia_id))
+            if not candidates and fuzzy:
+                match = self._fuzzy(
+                    key, self._localidad_keys_by_provincia.get(provincia_id)
+                )
+                candidates = self._localidades_by_provincia_key.get(
+                    (match, provincia_id)
+                )
+            return candidates[0] if candidates else None
+        candidates = self._localidades_by_name.get(key)
+        return candidates[0] if candidates else None
+
+    # --- Nacionalidades ---------------------------------------------------
+
+    def resolve_nacionalidad(self, valor):
+        return self._nacionalidad_by_key.get(normalize_text(valor))
+
+    # --- Instancias -------------------------------------------------------
+
+    def get_provincia(self, pk):
+        from core.models import Provincia  # pylint: disable=import-outside-toplevel
+
+        if pk not in self.provincias:
+            return None
+        return _instance(Provincia, ["id", "nombre"], [pk, self.provincias[pk]])
+
+    def get_municipio(self, pk):
+        from core.models import Municipio  # pylint: disable=import-outside-toplevel
+
+        if pk not in self.municipios:
+            return None
+        nombre, provincia_id = self.municipios[pk]
+        return _instance(
+            Municipio, ["id", "nombre", "provincia_id"], [pk, nombre, provincia_id]
+        )
+
+    def get_localidad(self, pk):
+        from core.models import Localidad  # pylint: disable=import-outside-toplevel
+
+        if pk not in self.localidades:
+            return None
+        nombre, municipio_id = self.localidades[pk]
+        return _instance(
+            Localidad, ["id", "nombre", "municipio_id"], [pk, nombre, municipio_id]
+        )
+
+    def get_nacionalidad(self, pk):
+        from core.models import Nacionalidad  # pylint: disable=import-outside-toplevel
+
+        if pk not in self.nacionalidades:
+            return None
+        return _instance(
+            Nacionalidad, ["id", "nacionalidad"], [pk, self.nacionalidades[pk]]
+        )
+
+
+class _GazetteerHolder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.gazetteer = None
+        self.version = None
+        self.checked_at = 0.0
+
+
+_holder = _GazetteerHolder()
+
+
+def is_gazetteer_cache_enabled() -> bool:
+    return bool(getattr(settings, "GAZETTEER_CACHE_ENABLED", True))
+
+
+def _check_interval() -> float:
+    try:
+        value = float(
+            getattr(
+                settings,
+                "GAZETTEER_VERSION_CHECK_SECONDS",
+                DEFAULT_VERSION_CHECK_SECONDS,
+            )
+        )
+    except (TypeError, ValueError):
+        return DEFAULT_VERSION_CHECK_SECONDS
+    return max(value, 0.0)
+
+
+def get_gazetteer() -> Gazetteer:
+    """
+    Devuelve el nomenclador del proceso, reconstruyendolo si cambio la version.
+
+    Con ``GAZETTEER_CACHE_ENABLED=False`` (tests) se arma uno nuevo en cada
+    llamada: los rollbacks de ``TestCase`` no disparan signals de invalidacion.
+    """
+    if not is_gazetteer_cache_enabled():
+        return Gazetteer.from_db()
+
+    now = time.monotonic()
+    gazetteer = _holder.gazetteer
+    if gazetteer is not None and now - _holder.checked_at < _check_interval():
+        return gazetteer
+
+    version = get_namespace_version(GAZETTEER_CACHE_NAMESPACE)
+    with _holder.lock:
+        if _holder.gazetteer is None or _holder.version != version:
+            _holder.gazetteer = Gazetteer.from_db()
+            _holder.version = version
+        _holder.checked_at = now
+        return _holder.gazetteer
+
+
+def reset_local_gazetteer() -> None:
+    """Descarta el nomenclador de este proceso (el resto lo hace al ver la version)."""
+    with _holder.lock:
+        _holder.gazetteer = None
+        _holder.version = None
+
+
+def invalidate_gazetteer():
+    """Invalida el nomenclador en todos los procesos que comparten el cache."""
+    reset_local_gazetteer()
+    return bump_namespace_version(GAZETTEER_CACHE_NAMESPACE)
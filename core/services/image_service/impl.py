@@ -1,7 +1,16 @@
-"""Servicio de optimización de imágenes con WebP."""
+"""
+Servicio de optimización de imágenes con WebP.
+
+Los derivados (WebP a tamaño original y anchos responsivos) se generan fuera
+del render: al subir la imagen se encola un ``ImagenDerivada`` que procesa la
+cola ``imagenes`` de ``core.jobs`` (o el backfill ``generate_webp_images``), y
+los template tags solo consultan el manifiesto con ``get_image_derivatives``.
+"""
 
 import logging
 import os
+import threading
+from datetime import timedelta
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
@@ -9,98 +18,35 @@ from urllib.parse import urlparse
 from PIL import Image
 from django.conf import settings
 from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.models import ImageField
+from django.db.models.signals import post_save, pre_save
+from django.utils import timezone
+
+from core.jobs import JobQueue
+from core.models import ImagenDerivada
 
 logger = logging.getLogger(__name__)
 
 WEBP_QUALITY = 85
-WEBP_CACHE_TIMEOUT = 3600
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif"}
 
+DERIVATIVE_CACHE_KEY = "image_derivatives:{name}"
+DERIVATIVE_PENDING_CACHE_TIMEOUT = 300
+DERIVATIVE_STALE_SECONDS = 600
 
-def get_or_create_webp(image_path: str, quality: int = WEBP_QUALITY) -> str:
-    """
-    Obtiene o genera la versión WebP de una imagen.
-    Retorna la ruta WebP si existe/se genera, o la original como fallback.
-    """
-    if not image_path:
-        return ""
-
-    file_ext = Path(image_path).suffix.lower()
-    if file_ext not in SUPPORTED_EXTENSIONS:
-        return image_path
-
-    try:
-        original_abs_path = _get_absolute_path(image_path)
-
-        if not os.path.exists(original_abs_path):
-            logger.warning(f"Imagen original no encontrada: {original_abs_path}")
-            return image_path
-
-        webp_abs_path = _get_webp_path(original_abs_path)
-        webp_relative_path = _get_webp_path(image_path)
-
-        cache_key = f"webp_exists:{webp_abs_path}"
-        if cache.get(cache_key):
-            return webp_relative_path
 
-        if os.path.exists(webp_abs_path):
-            cache.set(cache_key, True, WEBP_CACHE_TIMEOUT)
-            return webp_relative_path
-
-        logger.info(f"Generando WebP para: {original_abs_path}")
-        success = _convert_to_webp(original_abs_path, webp_abs_path, quality)
-
-        if success:
-            cache.set(cache_key, True, WEBP_CACHE_TIMEOUT)
-            return webp_relative_path
-        else:
-            logger.warning(f"Fallo conversión WebP, usando original: {image_path}")
-            return image_path
-
-    except Exception as e:
-        logger.error(
-            f"Error en get_or_create_webp para {image_path}: {e}", exc_info=True
-        )
-        return image_path
-
-
-def _convert_to_webp(input_path: str, output_path: str, quality: int) -> bool:
-    """Convierte una imagen a formato WebP."""
-    try:
-        with Image.open(input_path) as img:
-            if img.mode in ("RGBA", "LA"):
-                pass
-            elif img.mode == "P":
-                img = img.convert("RGBA")
-            elif img.mode == "L":
-                img = img.convert("RGB")
-            elif img.mode not in ("RGB", "RGBA"):
-                img = img.convert("RGB")
-
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-            img.save(
-                output_path,
-                format="WEBP",
-                quality=quality,
-                method=6,
-                lossless=False,
-            )
-
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                return True
-            else:
-                logger.error(f"Archivo WebP creado pero vacío: {output_path}")
-                return False
-
-    except Exception as e:
-        logger.error(f"Error convirtiendo {input_path} a WebP: {e}")
-        if os.path.exists(output_path):
-            try:
-                os.remove(output_path)
-            except Exception as cleanup_error:
-                logger.error(f"Error limpiando archivo parcial: {cleanup_error}")
-        return False
+def _prepare_for_webp(img):
+    """Lleva la imagen a un modo que WebP acepta."""
+    if img.mode in ("RGBA", "LA"):
+        return img
+    if img.mode == "P":
+        return img.convert("RGBA")
+    if img.mode not in ("RGB", "RGBA"):
+        return img.convert("RGB")
+    return img
 
 
 def _get_absolute_path(image_path: str) -> str:
@@ -162,13 +108,295 @@ def get_image_info(image_path: str) -> Optional[dict]:
         return None
 
 
-def clear_webp_cache(image_path: Optional[str] = None) -> None:
-    """Limpia la caché de WebP."""
-    if image_path:
-        abs_path = _get_absolute_path(image_path)
-        webp_path = _get_webp_path(abs_path)
-        cache_key = f"webp_exists:{webp_path}"
-        cache.delete(cache_key)
-    else:
-        cache.clear()
-        logger.warning("Toda la caché de Django ha sido limpiada")
+# ---------------------------------------------------------------------------
+# Derivados fuera del render
+# ---------------------------------------------------------------------------
+
+
+def is_image_derivatives_enabled() -> bool:
+    return bool(getattr(settings, "IMAGE_DERIVATIVES_ENABLED", False))
+
+
+def get_derivative_widths() -> tuple:
+    widths = getattr(settings, "IMAGE_DERIVATIVE_WIDTHS", None) or ()
+    return tuple(sorted({int(width) for width in widths if int(width) > 0}))
+
+
+def get_derivative_quality() -> int:
+    return int(getattr(settings, "IMAGE_DERIVATIVE_QUALITY", WEBP_QUALITY))
+
+
+def _derivative_cache_key(name: str) -> str:
+    return DERIVATIVE_CACHE_KEY.format(name=name)
+
+
+def get_storage_name(image_path: str) -> str:
+    """
+    Normaliza una URL (``/media/...``), ruta absoluta o nombre de storage al
+    nombre relativo a MEDIA_ROOT. Retorna "" si la imagen no vive en MEDIA_ROOT
+    o no tiene un formato convertible. No toca el filesystem.
+    """
+    if not image_path or Path(image_path).suffix.lower() not in SUPPORTED_EXTENSIONS:
+        return ""
+    abs_path = os.path.normpath(_get_absolute_path(image_path))
+    media_root = os.path.normpath(str(settings.MEDIA_ROOT))
+    if os.path.commonpath([abs_path, media_root]) != media_root:
+        return ""
+    return Path(os.path.relpath(abs_path, media_root)).as_posix()
+
+
+def _get_variant_path(image_path: str, width: int) -> str:
+    """Ruta del derivado de un ancho dado (``foto.w640.webp``)."""
+    path = Path(image_path)
+    return str(path.with_name(f"{path.stem}.w{width}.webp"))
+
+
+def _save_webp(img, output_path: str, quality: int) -> None:
+    """Escribe a un temporal y lo renombra: el render nunca ve un WebP a medias."""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    try:
+        img.save(tmp_path, format="WEBP", quality=quality, method=6, lossless=False)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def generate_derivatives(
+    name: str, quality: Optional[int] = None, widths: Optional[tuple] = None
+) -> dict:
+    """
+    Genera el WebP a tamaño original y uno por cada ancho menor al original.
+
+    Abre la imagen una sola vez. Retorna el manifiesto con ``variantes``,
+    dimensiones y ``mtime`` del original; lanza ``FileNotFoundError`` si el
+    original no existe y cualquier error de Pillow si no se puede convertir.
+    """
+    quality = quality or get_derivative_quality()
+    widths = get_derivative_widths() if widths is None else widths
+    abs_path = _get_absolute_path(name)
+    mtime = os.path.getmtime(abs_path)
+
+    with Image.open(abs_path) as img:
+        img = _prepare_for_webp(img)
+        ancho, alto = img.size
+        webp_name = Path(_get_webp_path(name)).as_posix()
+        _save_webp(img, _get_absolute_path(webp_name), quality)
+
+        srcset = []
+        for width in widths:
+            if width >= ancho:
+                continue
+            height = max(1, round(alto * width / ancho))
+            variant_name = Path(_get_variant_path(name, width)).as_posix()
+            resized = img.resize((width, height), Image.Resampling.LANCZOS)
+            _save_webp(resized, _get_absolute_path(variant_name), quality)
+            srcset.append([width, variant_name])
+        srcset.append([ancho, webp_name])
+
+    return {
+        "variantes": {"webp": webp_name, "srcset": srcset},
+        "ancho": ancho,
+        "alto": alto,
+        "original_mtime": mtime,
+    }
+
+
+def request_image_derivatives(names) -> None:
+    """Encola (si no existen) los manifiestos pendientes de las imagenes dadas."""
+    names = {get_storage_name(name) for name in names} - {""}
+    if not names:
+        return
+    ImagenDerivada.objects.bulk_create(
+        [ImagenDerivada(original=name) for name in sorted(names)],
+        ignore_conflicts=True,
+    )
+
+
+_request_state = threading.local()
+
+
+def _defer_derivative_request(name: str) -> None:
+    """Encola un manifiesto faltante sin escribir durante el render.
+
+    Dentro de una request los nombres se juntan y se encolan en un solo INSERT
+    al terminarla (``request_finished``); fuera de una, al confirmarse la
+    transaccion en curso.
+    """
+    pending = getattr(_request_state, "pending", None)
+    if pending is not None:
+        pending.add(name)
+        return
+    transaction.on_commit(lambda: request_image_derivatives([name]))
+
+
+def _start_request_buffer(**kwargs):
+    _request_state.pending = set()
+
+
+def _flush_request_buffer(**kwargs):
+    pending = getattr(_request_state, "pending", None)
+    _request_state.pending = None
+    if not pending:
+        return
+    try:
+        request_image_derivatives(pending)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # La respuesta ya se envio; el proximo miss vuelve a intentarlo.
+        logger.warning("No se pudieron encolar derivados de imagen", exc_info=True)
+
+
+def get_image_derivatives(image_path: str) -> Optional[dict]:
+    """
+    Devuelve ``variantes`` si los derivados estan listos, o None.
+
+    Es la unica consulta que hacen los template tags: cache y, ante un miss,
+    una lectura por indice unico. Una imagen sin manifiesto (anterior al
+    pipeline) se renderiza sin derivados y se encola fuera del render (ver
+    ``_defer_derivative_request``) hasta que el worker la procese. Nunca abre
+    la imagen ni consulta el filesystem.
+    """
+    name = get_storage_name(image_path)
+    if not name:
+        return None
+
+    cache_key = _derivative_cache_key(name)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached or None
+
+    row = (
+        ImagenDerivada.objects.filter(original=name)
+        .values_list("status", "variantes")
+        .first()
+    )
+    if row is None:
+        _defer_derivative_request(name)
+    if row and row[0] == ImagenDerivada.Status.COMPLETED and row[1]:
+        cache.set(
+            cache_key,
+            row[1],
+            getattr(settings, "IMAGE_DERIVATIVE_CACHE_SECONDS", 86400),
+        )
+        return row[1]
+    cache.set(cache_key, {}, DERIVATIVE_PENDING_CACHE_TIMEOUT)
+    return None
+
+
+def derivative_url(name: str) -> str:
+    return default_storage.url(name)
+
+
+def build_srcset(variantes: dict) -> str:
+    """``srcset`` con los anchos disponibles (``/media/a.w320.webp 320w, ...``)."""
+    return ", ".join(
+        f"{derivative_url(name)} {width}w" for width, name in variantes["srcset"]
+    )
+
+
+def save_image_derivatives(manifests: dict) -> None:
+    """Persiste como completados los manifiestos generados (``{nombre: manifiesto}``)."""
+    now = timezone.now()
+    rows = [
+        ImagenDerivada(
+            original=name,
+            status=ImagenDerivada.Status.COMPLETED,
+            last_error_message="",
+            finished_at=now,
+            last_activity_at=now,
+            **manifest,
+        )
+        for name, manifest in manifests.items()
+    ]
+    ImagenDerivada.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["original"],
+        update_fields=[
+            "status",
+            "variantes",
+            "ancho",
+            "alto",
+            "original_mtime",
+            "last_error_message",
+            "finished_at",
+            "last_activity_at",
+        ],
+    )
+    cache.delete_many([_derivative_cache_key(name) for name in manifests])
+
+
+def process_image_derivative_job(job: ImagenDerivada) -> None:
+    """Procesador de la cola ``imagenes``: un job por imagen."""
+    try:
+        manifest = generate_derivatives(job.original)
+    except FileNotFoundError:
+        # Sin original no hay nada que reintentar.
+        fail_image_derivative_job(job, "La imagen original no existe.")
+        return
+    save_image_derivatives({job.original: manifest})
+
+
+def fail_image_derivative_job(job: ImagenDerivada, message: str) -> None:
+    now = timezone.now()
+    ImagenDerivada.objects.filter(pk=job.pk).update(
+        status=ImagenDerivada.Status.FAILED,
+        last_error_message=message,
+        finished_at=now,
+        last_activity_at=now,
+    )
+    cache.delete(_derivative_cache_key(job.original))
+
+
+def mark_stale_image_derivative_jobs() -> int:
+    """Devuelve a pendiente las imagenes en proceso sin actividad (worker caido)."""
+    cutoff = timezone.now() - timedelta(seconds=DERIVATIVE_STALE_SECONDS)
+    return ImagenDerivada.objects.filter(
+        status=ImagenDerivada.Status.PROCESSING,
+        last_activity_at__lt=cutoff,
+    ).update(status=ImagenDerivada.Status.PENDING)
+
+
+IMAGE_DERIVATIVE_JOB_QUEUE = JobQueue(
+    name="imagenes",
+    model=ImagenDerivada,
+    process=process_image_derivative_job,
+    fail=fail_image_derivative_job,
+    mark_stale=mark_stale_image_derivative_jobs,
+)
+
+
+def _mark_uploaded_images(sender, instance, **kwargs):
+    # En pre_save los archivos recien subidos todavia no estan guardados
+    # (``_committed`` False); el nombre definitivo se conoce en post_save.
+    instance._uploaded_image_fields = [  # pylint: disable=protected-access
+        field.attname
+        for field in sender._meta.concrete_fields
+        if isinstance(field, ImageField)
+        and getattr(getattr(instance, field.attname), "_committed", True) is False
+    ]
+
+
+def _enqueue_uploaded_images(sender, instance, **kwargs):
+    attnames = getattr(instance, "_uploaded_image_fields", None)
+    if not attnames or not is_image_derivatives_enabled():
+        return
+    names = [getattr(instance, attname).name for attname in attnames]
+    transaction.on_commit(lambda: request_image_derivatives(names))
+
+
+def connect_image_derivative_signals(models) -> None:
+    """Encola derivados al subir imagenes en los modelos con ``ImageField``.
+
+    Tambien conecta el buffer por request de los manifiestos faltantes que
+    detectan los template tags.
+    """
+    request_started.connect(_start_request_buffer, dispatch_uid="image_derivatives")
+    request_finished.connect(_flush_request_buffer, dispatch_uid="image_derivatives")
+    for model in models:
+        if any(isinstance(f, ImageField) for f in model._meta.concrete_fields):
+            uid = f"image_derivatives:{model._meta.label_lower}"
+            pre_save.connect(_mark_uploaded_images, sender=model, dispatch_uid=uid)
+            post_save.connect(_enqueue_uploaded_images, sender=model, dispatch_uid=uid)
@@ -0,0 +1,300 @@
+"""
+Motor de envio de correos masivos.
+
+Reutiliza conexiones (``get_connection``) en lugar de abrir una por
+destinatario: reparte los mensajes en lotes de ``MAIL_DELIVERY_BATCH_SIZE``
+entre ``MAIL_DELIVERY_CONNECTIONS`` conexiones en paralelo (un hilo por
+conexion) y respeta un presupuesto de ``MAIL_DELIVERY_RATE_PER_MINUTE``
+mensajes por minuto compartido por todas. El timeout de cada operacion es el
+del socket (``EMAIL_TIMEOUT``): desde hilos no se pueden usar alarmas de signal.
+
+Los resultados se entregan por lote al hilo que llamo (``on_batch``), que es
+quien escribe en la base.
+"""
+
+from __future__ import annotations
+
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from email import encoders
+from email.mime.base import MIMEBase
+from itertools import islice
+from queue import SimpleQueue
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger("django")
+
+# Si el servidor rechaza la autenticacion o la conexion, o la conexion se cae y
+# no vuelve despues de reconectar, el envio se corta para no marcar como
+# rechazado a todo el resto del lote.
+FATAL_ERRORS = (smtplib.SMTPAuthenticationError, smtplib.SMTPConnectError)
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """Error de la conexion (no del destinatario ni del mensaje)."""
+    if isinstance(exc, FATAL_ERRORS + (smtplib.SMTPServerDisconnected,)):
+        return True
+    # SMTPException hereda de OSError: los rechazos del servidor no cuentan.
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+class MailDeliveryAborted(Exception):
+    """El servidor de correo dejo de aceptar envios; ``error`` es la causa."""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    key: object
+    error: Exception | None = None
+
+    @property
+    def sent(self) -> bool:
+        return self.error is None
+
+
+def get_batch_size() -> int:
+    return max(1, int(getattr(settings, "MAIL_DELIVERY_BATCH_SIZE", 50)))
+
+
+def get_connection_count() -> int:
+    return max(1, int(getattr(settings, "MAIL_DELIVERY_CONNECTIONS", 2)))
+
+
+def get_rate_per_minute() -> int:
+    return max(0, int(getattr(settings, "MAIL_DELIVERY_RATE_PER_MINUTE", 0)))
+
+
+class RateBudget:
+    """Espacia los envios para no superar ``per_minute`` (0 = sin tope)."""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_process_budget = None
+_process_budget_lock = threading.Lock()
+
+
+def get_rate_budget() -> RateBudget:
+    """Presupuesto compartido por todos los envios del proceso."""
+    global _process_budget  # pylint: disable=global-statement
+    per_minute = get_rate_per_minute()
+    with _process_budget_lock:
+        if _process_budget is None or _process_budget.interval != (
+            60.0 / per_minute if per_minute > 0 else 0.0
+        ):
+            _process_budget = RateBudget(per_minute)
+        return _process_budget
+
+
+def encode_attachment(filename: str, content: bytes, mimetype: str) -> MIMEBase:
+    """
+    Codifica un adjunto una sola vez. ``EmailMessage.attach`` acepta la parte
+    MIME ya armada, asi que todos los mensajes del lote la comparten.
+    """
+    maintype, _, subtype = (mimetype or "application/octet-stream").partition("/")
+    part = MIMEBase(maintype, subtype or "octet-stream")
+    part.set_payload(content)
+    encoders.encode_base64(part)
+    part.add_header("Content-Disposition", "attachment", filename=filename)
+    return part
+
+
+@contextmanager
+def reused_connection():
+    """
+    Conexion para reutilizar en envios secuenciales. Se abre recien en el
+    primer envio y se cierra al salir.
+    """
+    connection = get_connection(fail_silently=False)
+    try:
+        yield connection
+    finally:
+        try:
+            connection.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("No se pudo cerrar una conexion de correo.", exc_info=True)
+
+
+def send_with_connection(connection, message, *, budget: RateBudget | None = None):
+    """
+    Envia un mensaje por una conexion abierta, reconectando una vez si se cayo.
+
+    Los errores del destinatario o del mensaje se propagan tal cual; los de la
+    conexion, despues del reintento.
+    """
+    if budget is not None:
+        budget.acquire()
+    try:
+        connection.send_messages([message])
+    except Exception as exc:
+        if isinstance(exc, FATAL_ERRORS) or not is_connection_error(exc):
+            raise
+        connection.close()
+        connection.open()
+        connection.send_messages([message])
+
+
+class _ConnectionPool:
+    def __init__(self, size: int):
+        self._idle = SimpleQueue()
+        self._all = []
+        for _ in range(size):
+            connection = get_connection(fail_silently=False)
+            self._all.append(connection)
+            self._idle.put(connection)
+
+    def acquire(self):
+        connection = self._idle.get()
+        try:
+            connection.open()
+        except BaseException:
+            self._idle.put(connection)
+            raise
+        return connection
+
+    def release(self, connection) -> None:
+        self._idle.put(connection)
+
+    def close(self) -> None:
+        for connection in self._all:
+            try:
+                connection.close()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "No se pudo cerrar una conexion de correo.", exc_info=True
+                )
+
+
+def _send_batch(batch, pool, budget, abort_event, abort_errors):
+    results = []
+    connection = None
+    if abort_event.is_set():
+        return results
+    try:
+        connection = pool.acquire()
+        for key, message in batch:
+            if abort_event.is_set():
+                break
+            try:
+                send_with_connection(connection, message, budget=budget)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                if is_connection_error(exc):
+                    abort_errors.append(exc)
+                    abort_event.set()
+                    break
+                results.append(DeliveryResult(key, exc))
+                continue
+            results.append(DeliveryResult(key))
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # Fallo al abrir la conexion: ningun mensaje del lote salio.
+        abort_errors.append(exc)
+        abort_event.set()
+    finally:
+        if connection is not None:
+            pool.release(connection)
+    return results
+
+
+def _deliver_batches(first_batches, *, next_batch, submit, on_batch, abort_event):
+    """Reporta cada lote terminado y recien ahi pide el siguiente."""
+    in_flight = {submit(batch) for batch in first_batches}
+    while in_flight:
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            results = future.result()
+            if results:
+                on_batch(results)
+            if abort_event.is_set():
+                continue
+            batch = next_batch()
+            if batch:
+                in_flight.add(submit(batch))
+
+
+def deliver_messages(
+    messages: Iterable[tuple[object, object]],
+    *,
+    on_batch: Callable[[list[DeliveryResult]], None],
+    batch_size: int | None = None,
+    connections: int | None = None,
+) -> None:
+    """
+    Envia ``(clave, EmailMessage)`` por lotes y llama ``on_batch`` con los
+    resultados de cada lote terminado.
+
+    ``messages`` se consume de a ``batch_size`` desde el hilo que llama, con un
+    lote en curso por conexion: un generador nunca queda entero en memoria.
+
+    Un error de un destinatario queda en su ``DeliveryResult`` y el envio
+    sigue. Si la conexion no se recupera o se rechaza la autenticacion, los
+    lotes en curso terminan el mensaje actual, se reportan sus resultados y se
+    lanza ``MailDeliveryAborted``: los mensajes sin resultado no se enviaron.
+    """
+    batch_size = batch_size or get_batch_size()
+    pending = iter(messages)
+
+    def next_batch():
+        return list(islice(pending, batch_size))
+
+    first_batches = []
+    for _ in range(connections or get_connection_count()):
+        batch = next_batch()
+        if not batch:
+            break
+        first_batches.append(batch)
+    if not first_batches:
+        return
+    workers = len(first_batches)
+    budget = get_rate_budget()
+    abort_event = threading.Event()
+    abort_errors: list[Exception] = []
+
+    pool = _ConnectionPool(workers)
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="mail-delivery"
+        ) as executor:
+            try:
+                _deliver_batches(
+                    first_batches,
+                    next_batch=next_batch,
+                    submit=lambda batch: executor.submit(
+                        _send_batch, batch, pool, budget, abort_event, abort_errors
+                    ),
+                    on_batch=on_batch,
+                    abort_event=abort_event,
+                )
+            except BaseException:
+                # Si no se pueden registrar resultados no se sigue enviando.
+                abort_event.set()
+                raise
+    finally:
+        pool.close()
+
+    if abort_errors:
+        raise MailDeliveryAborted(abort_errors[0])
@@ -0,0 +1,292 @@
+"""
+Conversion de documentos Office a PDF con LibreOffice.
+
+Antes cada conversion arrancaba ``libreoffice --headless`` con un perfil de
+usuario nuevo, y crear ese perfil era la mayor parte de los segundos de cada
+request. Ahora las conversiones pasan por un pool de slots por host:
+
+- cada slot tiene un perfil persistente en ``OFFICE_PDF_PROFILE_DIR`` que se
+  crea una vez y se reutiliza (arranque en caliente);
+- el slot se reserva con ``flock`` sobre su archivo de lock, asi el tope de
+  conversiones concurrentes (``OFFICE_PDF_POOL_SIZE``) vale para todos los
+  workers de gunicorn del host y dos conversiones nunca comparten perfil;
+- sin slot libre se espera en cola hasta ``OFFICE_PDF_QUEUE_TIMEOUT_SECONDS``;
+- cada conversion tiene su timeout; ante timeout o fallo se mata el grupo de
+  procesos y se descarta el perfil del slot, que se recrea en el proximo uso.
+
+Los documentos generados desde plantillas DOCX se cachean por hash de la
+plantilla mas hash del ``word/document.xml`` renderizado: regenerar el mismo
+documento del mismo periodo no vuelve a pasar por LibreOffice.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("django")
+
+#: Subir si cambia la forma de convertir de modo que invalide PDFs cacheados.
+OFFICE_PDF_CACHE_VERSION = 1
+OFFICE_PDF_CACHE_KEY = "office_pdf:{version}:{template}:{document}"
+QUEUE_POLL_SECONDS = 0.1
+PROFILE_DIRNAME = "profile"
+LOCK_FILENAME = "slot.lock"
+
+_template_digests: dict[tuple, str] = {}
+
+
+class OfficeConversionError(RuntimeError):
+    """La conversion fallo, vencio su timeout o no habia slot libre."""
+
+
+@dataclass(frozen=True)
+class OfficeSlot:
+    index: int
+    path: Path
+
+    @property
+    def profile_path(self) -> Path:
+        return self.path / PROFILE_DIRNAME
+
+    @property
+    def is_warm(self) -> bool:
+        return self.profile_path.is_dir()
+
+
+def get_pool_size() -> int:
+    return max(1, int(getattr(settings, "OFFICE_PDF_POOL_SIZE", 2)))
+
+
+def get_profile_dir() -> Path:
+    return Path(getattr(settings, "OFFICE_PDF_PROFILE_DIR", "/tmp/sisoc-office-pdf"))
+
+
+def is_office_pdf_cache_enabled() -> bool:
+    return bool(getattr(settings, "OFFICE_PDF_CACHE_ENABLED", False))
+
+
+def get_slots() -> list[OfficeSlot]:
+    base = get_profile_dir()
+    return [
+        OfficeSlot(index, base / f"slot-{index}") for index in range(get_pool_size())
+    ]
+
+
+def _try_lock(slot: OfficeSlot):
+    slot.path.mkdir(parents=True, exist_ok=True)
+    handle = open(slot.path / LOCK_FILENAME, "a+", encoding="utf-8")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        return None
+    return handle
+
+
+@contextmanager
+def reservar_slot(timeout: float | None = None):
+    """Reserva un slot libre, esperando en cola hasta ``timeout`` segundos."""
+    if timeout is None:
+        timeout = float(getattr(settings, "OFFICE_PDF_QUEUE_TIMEOUT_SECONDS", 60))
+    deadline = time.monotonic() + timeout
+    while True:
+        for slot in get_slots():
+            handle = _try_lock(slot)
+            if handle is None:
+                continue
+            try:
+                yield slot
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+            return
+        if time.monotonic() >= deadline:
+            raise OfficeConversionError(
+                "No hay conversores de documentos libres; reintentar en unos minutos."
+            )
+        time.sleep(QUEUE_POLL_SECONDS)
+
+
+def _reset_profile(slot: OfficeSlot) -> None:
+    shutil.rmtree(slot.profile_path, ignore_errors=True)
+
+
+def _check_slot_health(slot: OfficeSlot) -> None:
+    # Con el flock tomado ninguna otra instancia usa este perfil: un lock de
+    # LibreOffice que haya quedado es de un proceso muerto.
+    stale_lock = slot.profile_path / ".lock"
+    if stale_lock.exists():
+        logger.warning("[office_pdf] Lock huerfano en slot %s; se limpia.", slot.index)
+        stale_lock.unlink(missing_ok=True)
+
+
+def _kill_process_group(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.communicate()
+
+
+def _run_libreoffice(slot: OfficeSlot, input_path: Path, timeout: int):
+    process = subprocess.Popen(
+        [
+            "libreoffice",
+            "--headless",
+            "--nologo",
+            "--nodefault",
+            "--nofirststartwizard",
+            "--norestore",
+            f"-env:UserInstallation={slot.profile_path.resolve().as_uri()}",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            str(input_path.parent),
+            str(input_path),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        # Grupo propio: ante un timeout se matan tambien los hijos (soffice.bin).
+        start_new_session=True,
+    )
+    try:
+        _, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(process)
+        raise
+    return process.returncode, stderr
+
+
+def _convert_in_slot(slot: OfficeSlot, input_path: Path, error_message: str) -> bytes:
+    output_path = input_path.with_suffix(".pdf")
+    timeout = int(getattr(settings, "OFFICE_PDF_TIMEOUT_SECONDS", 120))
+    _check_slot_health(slot)
+    warm = slot.is_warm
+    start = time.perf_counter()
+    try:
+        returncode, stderr = _run_libreoffice(slot, input_path, timeout)
+    except subprocess.TimeoutExpired as exc:
+        _reset_profile(slot)
+        raise OfficeConversionError(
+            f"{error_message} La conversión superó {timeout}s."
+        ) from exc
+
+    if returncode != 0 or not output_path.exists():
+        _reset_profile(slot)
+        detail = stderr.decode("utf-8", errors="replace").strip()
+        raise OfficeConversionError(detail or error_message)
+
+    logger.info(
+        "[office_pdf] %s convertido en %.2fs (slot %s, %s).",
+        input_path.name,
+        time.perf_counter() - start,
+        slot.index,
+        "en caliente" if warm else "perfil nuevo",
+    )
+    return output_path.read_bytes()
+
+
+def convertir_a_pdf(input_path, *, error_message: str) -> bytes:
+    """
+    Convierte ``input_path`` a PDF en un slot del pool y retorna los bytes.
+
+    El PDF se escribe junto al archivo de entrada, que debe vivir en un
+    directorio temporal propio del llamador.
+    """
+    with reservar_slot() as slot:
+        return _convert_in_slot(slot, Path(input_path), error_message)
+
+
+def verificar_slots() -> list[dict]:
+    """
+    Chequeo de salud: convierte un documento minimo en cada slot libre.
+
+    De paso deja el perfil de cada slot creado (calentamiento). Los slots
+    ocupados por una conversion en curso se informan sin tocarlos.
+    """
+    resultados = []
+    for slot in get_slots():
+        handle = _try_lock(slot)
+        if handle is None:
+            resultados.append({"slot": slot.index, "status": "busy"})
+            continue
+        probe = slot.path / "probe.txt"
+        try:
+            probe.write_text("SISOC\n", encoding="utf-8")
+            warm = slot.is_warm
+            start = time.perf_counter()
+            _convert_in_slot(slot, probe, "El chequeo de LibreOffice fallo.")
+            resultados.append(
+                {
+                    "slot": slot.index,
+                    "status": "ok",
+                    "warm": warm,
+                    "seconds": round(time.perf_counter() - start, 3),
+                }
+            )
+        except (OfficeConversionError, OSError) as exc:
+            resultados.append(
+                {"slot": slot.index, "status": "error", "error": str(exc)}
+            )
+        finally:
+            probe.unlink(missing_ok=True)
+            probe.with_suffix(".pdf").unlink(missing_ok=True)
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            handle.close()
+    return resultados
+
+
+def _template_digest(template_path: Path) -> str:
+    stat = template_path.stat()
+    memo_key = (str(template_path), stat.st_mtime_ns, stat.st_size)
+    digest = _template_digests.get(memo_key)
+    if digest is None:
+        digest = hashlib.sha256(template_path.read_bytes()).hexdigest()
+        _template_digests[memo_key] = digest
+    return digest
+
+
+def plantilla_cache_key(template_path, docx_path) -> str:
+    """Clave del PDF: hash de la plantilla + hash del document.xml renderizado."""
+    with zipfile.ZipFile(docx_path) as docx:
+        document_digest = hashlib.sha256(docx.read("word/document.xml")).hexdigest()
+    return OFFICE_PDF_CACHE_KEY.format(
+        version=OFFICE_PDF_CACHE_VERSION,
+        template=_template_digest(Path(template_path)),
+        document=document_digest,
+    )
+
+
+def convertir_plantilla_docx_a_pdf(
+    template_path, docx_path, *, error_message: str
+) -> bytes:
+    """Convierte un DOCX renderizado desde ``template_path``, con cache del PDF."""
+    if not is_office_pdf_cache_enabled():
+        return convertir_a_pdf(docx_path, error_message=error_message)
+
+    cache_key = plantilla_cache_key(template_path, docx_path)
+    pdf_bytes = cache.get(cache_key)
+    if pdf_bytes is not None:
+        return pdf_bytes
+
+    pdf_bytes = convertir_a_pdf(docx_path, error_message=error_message)
+    cache.set(
+        cache_key,
+        pdf_bytes,
+        getattr(settings, "OFFICE_PDF_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+    )
+    return pdf_bytes
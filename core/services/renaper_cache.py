@@ -0,0 +1,125 @@
+"""
+Cache compartido de respuestas RENAPER por DNI+sexo.
+
+Ciudadanos, VAT, nomina PWA y celiaquia consultan una y otra vez a las mismas
+personas. Las respuestas exitosas se guardan ``RENAPER_CACHE_TTL_SECONDS`` y
+los "sin coincidencia" ``RENAPER_CACHE_NEGATIVE_TTL_SECONDS``; los errores
+transitorios (timeout, auth, remoto) nunca se cachean.
+
+Consultas concurrentes por la misma clave se colapsan en una sola llamada al
+servicio externo: el primero toma un lock con ``cache.add`` y el resto espera
+su resultado (single-flight entre hilos y workers si el cache es Redis).
+
+Los hits y misses se cuentan en ``sisoc_renaper_cache_lookups_total`` de
+``core.metrics`` y se leen desde ``/metrics/``, no desde el cache: una clave
+de contador en Redis se pierde ante una eviccion o un reinicio.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache_utils import bump_namespace_version, namespaced_key
+from core.metrics import is_metrics_enabled, registry
+
+RENAPER_CACHE_NAMESPACE = "renaper"
+RENAPER_CACHE_METRIC = "sisoc_renaper_cache_lookups_total"
+NEGATIVE_ERROR_TYPES = {"no_match"}
+DEFAULT_TTL_SECONDS = 86400
+DEFAULT_NEGATIVE_TTL_SECONDS = 3600
+LOCK_TTL_SECONDS = 30
+LOCK_POLL_SECONDS = 0.05
+
+ConsultaRenaper = Callable[[str, str], dict[str, Any]]
+
+
+def is_renaper_cache_enabled() -> bool:
+    return bool(getattr(settings, "RENAPER_CACHE_ENABLED", True))
+
+
+def _ttl_setting(name: str, default: int) -> int:
+    try:
+        value = int(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def _build_key(dni, sexo) -> str:
+    dni = str(dni).strip()
+    sexo = str(sexo or "").strip().upper()
+    return namespaced_key(RENAPER_CACHE_NAMESPACE, f"consulta:{dni}:{sexo}")
+
+
+def _incr_stat(result: str) -> None:
+    if is_metrics_enabled():
+        registry.inc(RENAPER_CACHE_METRIC, (("result", result),))
+
+
+def _cache_timeout(response: dict[str, Any]) -> int | None:
+    """TTL para la respuesta, o None si no debe cachearse."""
+    if response.get("success"):
+        return _ttl_setting("RENAPER_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+    if response.get("error_type") in NEGATIVE_ERROR_TYPES:
+        return _ttl_setting(
+            "RENAPER_CACHE_NEGATIVE_TTL_SECONDS", DEFAULT_NEGATIVE_TTL_SECONDS
+        )
+    return None
+
+
+def _from_cache(key: str) -> dict[str, Any] | None:
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    response = cached["response"]
+    _incr_stat("hits" if response.get("success") else "negative_hits")
+    return response
+
+
+def _fetch_and_store(key: str, dni, sexo, fetch: ConsultaRenaper) -> dict[str, Any]:
+    _incr_stat("misses")
+    response = fetch(dni, sexo)
+    timeout = _cache_timeout(response)
+    if timeout:
+        cache.set(key, {"response": response}, timeout=timeout)
+    return response
+
+
+def consultar_renaper_con_cache(dni, sexo, fetch: ConsultaRenaper) -> dict[str, Any]:
+    """Devuelve la respuesta cacheada de ``fetch(dni, sexo)`` o la obtiene una vez."""
+    if not is_renaper_cache_enabled():
+        return fetch(dni, sexo)
+
+    key = _build_key(dni, sexo)
+    cached = _from_cache(key)
+    if cached is not None:
+        return cached
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=LOCK_TTL_SECONDS):
+        try:
+            return _fetch_and_store(key, dni, sexo, fetch)
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + LOCK_TTL_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        cached = cache.get(key)
+        if cached is not None:
+            _incr_stat("coalesced")
+            return cached["response"]
+        if cache.get(lock_key) is None:
+            # La consulta en curso termino sin resultado cacheable (error transitorio).
+            break
+    return _fetch_and_store(key, dni, sexo, fetch)
+
+
+def invalidate_renaper_cache() -> int | None:
+    """Descarta todas las respuestas cacheadas (cambia la version del namespace)."""
+    return bump_namespace_version(RENAPER_CACHE_NAMESPACE)
@@ -15,7 +15,13 @@ FIXTURE_TERRITORIO_PATH = Path("core/fixtures/localidad_municipio_provincia.json
 
 
 def normalizar_nombre(valor):
-    """Aproxima la comparación ai_ci de MySQL para las claves naturales."""
+    """Aproxima la comparación ai_ci de MySQL para las claves naturales.
+
+    No usa ``normalize_geo_name`` del nomenclador: sus alias unifican
+    localidades que el fixture trae por separado ("CABA", "Ciudad de Buenos
+    Aires" y "Ciudad Autónoma de Buenos Aires" en el mismo municipio) y la
+    sincronización dejaría de crearlas.
+    """
     texto = unicodedata.normalize("NFKD", valor or "")
     texto = "".join(char for char in texto if not unicodedata.combining(char))
     return " ".join(texto.casefold().split())
@@ -0,0 +1,131 @@
+"""
+Motor de exportacion XLSX compartido.
+
+En modo normal openpyxl mantiene un objeto por celda hasta ``save()``, y los
+exportadores ademas materializaban el queryset completo: un padron provincial
+subia cientos de MB el RSS del worker. Este modulo escribe con
+``Workbook(write_only=True)``, que serializa cada fila al agregarla, y lee las
+filas con ``values()`` + ``iterator(chunk_size=...)`` para no instanciar
+modelos ni cachear el queryset.
+
+El libro se arma sobre un archivo temporal (en memoria hasta
+``XLSX_SPOOL_MAX_BYTES`` y despues en disco) y se entrega como bytes o como
+``FileResponse``, que lo envia por bloques.
+"""
+
+from __future__ import annotations
+
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Iterable, Sequence
+
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DEFAULT_CHUNK_SIZE = 2000
+XLSX_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+DATE_NUMBER_FORMAT = "DD/MM/YYYY"
+
+
+@dataclass
+class XlsxSheet:
+    """Hoja a exportar; ``rows`` puede ser cualquier iterable (se consume una vez)."""
+
+    title: str
+    headers: Sequence[str]
+    rows: Iterable[Sequence[Any]]
+    bold_headers: bool = False
+    freeze_headers: bool = False
+    # Indices de columnas que se escriben como fecha sin hora (DD/MM/AAAA).
+    date_columns: frozenset[int] = frozenset()
+    rows_written: int = 0
+
+
+def iter_values(queryset, *fields, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Filas como diccionarios, de a ``chunk_size`` por viaje a la base."""
+    return queryset.values(*fields).iterator(chunk_size=chunk_size)
+
+
+def iter_batches(iterable, size=DEFAULT_CHUNK_SIZE):
+    """Listas de hasta ``size`` elementos, para anotar filas por lote."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _date_cell(worksheet, value):
+    if isinstance(value, datetime):
+        value = value.date()
+    cell = WriteOnlyCell(worksheet, value=value)
+    if isinstance(value, date):
+        cell.number_format = DATE_NUMBER_FORMAT
+    return cell
+
+
+def _write_sheet(workbook, sheet: XlsxSheet) -> None:
+    worksheet = workbook.create_sheet(title=sheet.title)
+    if sheet.freeze_headers:
+        worksheet.freeze_panes = "A2"
+    if sheet.bold_headers:
+        bold = Font(bold=True)
+        header_cells = []
+        for header in sheet.headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = bold
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+    else:
+        worksheet.append(list(sheet.headers))
+
+    date_columns = sheet.date_columns
+    written = 0
+    for row in sheet.rows:
+        if date_columns:
+            row = [
+                _date_cell(worksheet, value) if index in date_columns else value
+                for index, value in enumerate(row)
+            ]
+        worksheet.append(row)
+        written += 1
+    sheet.rows_written = written
+
+
+def write_xlsx(fileobj, sheets: Sequence[XlsxSheet]) -> int:
+    """Escribe las hojas en ``fileobj`` y devuelve el total de filas de datos."""
+    workbook = Workbook(write_only=True)
+    for sheet in sheets:
+        _write_sheet(workbook, sheet)
+    workbook.save(fileobj)
+    return sum(sheet.rows_written for sheet in sheets)
+
+
+def build_xlsx_file(sheets: Sequence[XlsxSheet]):
+    """Archivo temporal con el libro, posicionado al inicio. Lo cierra el llamador."""
+    output = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_BYTES)
+    try:
+        write_xlsx(output, sheets)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+
+def build_xlsx_bytes(sheets: Sequence[XlsxSheet]) -> bytes:
+    with build_xlsx_file(sheets) as output:
+        return output.read()
+
+
+def xlsx_response(filename: str, sheets: Sequence[XlsxSheet]) -> FileResponse:
+    """Respuesta de descarga que envia el libro por bloques desde el temporal."""
+    return FileResponse(
+        build_xlsx_file(sheets),
+        as_attachment=True,
+        filename=filename,
+        content_type=XLSX_CONTENT_TYPE,
+    )
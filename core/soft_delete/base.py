@@ -7,6 +7,8 @@ from django.db import models
 from django.utils import timezone
 
 from .cascade import (
+    build_bulk_delete_plan,
+    build_bulk_restore_plan,
     build_delete_plan,
     build_restore_plan,
     execute_delete_plan,
@@ -32,27 +34,38 @@ class SoftDeleteQuerySet(models.QuerySet):
     def hard_delete(self):
         return super().delete()
 
-    def delete(self, user=None, cascade=True):  # pylint: disable=arguments-differ
+    def _overrides(self, method_name):
+        # Los modelos que redefinen delete()/restore() (p. ej. con guardas de
+        # validacion) se procesan instancia por instancia para no saltearlas.
+        return getattr(self.model, method_name) is not getattr(
+            SoftDeleteModelMixin, method_name
+        )
+
+    def _per_instance(self, method_name, **kwargs):
         total = 0
         details = {}
         for instance in self:
-            deleted_count, deleted_details = instance.delete(user=user, cascade=cascade)
-            total += deleted_count
-            for model_key, value in (deleted_details or {}).items():
+            count, instance_details = getattr(instance, method_name)(**kwargs)
+            total += count
+            for model_key, value in (instance_details or {}).items():
                 details[model_key] = details.get(model_key, 0) + value
         return total, details
 
+    def delete(self, user=None, cascade=True):  # pylint: disable=arguments-differ
+        if self._overrides("delete"):
+            return self._per_instance("delete", user=user, cascade=cascade)
+        plan = build_bulk_delete_plan(self, cascade=cascade)
+        if plan is None:
+            return 0, {}
+        return execute_delete_plan(plan, user=user)
+
     def restore(self, user=None, cascade=True):
-        total = 0
-        details = {}
-        for instance in self:
-            restored_count, restored_details = instance.restore(
-                user=user, cascade=cascade
-            )
-            total += restored_count
-            for model_key, value in (restored_details or {}).items():
-                details[model_key] = details.get(model_key, 0) + value
-        return total, details
+        if self._overrides("restore"):
+            return self._per_instance("restore", user=user, cascade=cascade)
+        plan = build_bulk_restore_plan(self, cascade=cascade)
+        if plan is None:
+            return 0, {}
+        return execute_restore_plan(plan, user=user)
 
 
 class SoftDeleteManager(models.Manager):
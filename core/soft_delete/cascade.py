@@ -5,6 +5,7 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass, field
 from functools import lru_cache
+from itertools import groupby
 
 from django.db import models, transaction
 from django.utils import timezone
@@ -20,6 +21,8 @@ MODE_SOFT = "soft"
 MODE_HARD = "hard"
 OP_DELETE = "delete"
 OP_RESTORE = "restore"
+# Tamaño de lote para los filtros ``pk__in`` del recorrido y de los UPDATE.
+BULK_CHUNK_SIZE = 1000
 
 
 @dataclass(frozen=True)
@@ -37,17 +40,25 @@ class CascadeNode:
     instance: models.Model
     mode: str
     depth: int = 0
+    # Raíz desde la que se alcanzó el nodo (en planes masivos, una por instancia).
+    root: models.Model | None = None
 
 
 @dataclass
 class CascadePlan:
-    """A full cascade plan for delete/restore."""
+    """
+    A full cascade plan for delete/restore.
+
+    ``root`` es la primera raíz del plan; cada nodo guarda la suya en
+    ``CascadeNode.root`` y es la que reciben las señales.
+    """
 
     operation: str
     root: models.Model
     nodes: dict[tuple[type[models.Model], int], CascadeNode] = field(
         default_factory=dict
     )
+    cascade: bool = True
 
     @property
     def total(self) -> int:
@@ -107,15 +118,20 @@ def _get_reverse_cascade_relations(
     return tuple(relations)
 
 
-def _related_queryset(
-    instance: models.Model,
+def _chunked(values: list, size: int = BULK_CHUNK_SIZE):
+    for index in range(0, len(values), size):
+        yield values[index : index + size]
+
+
+def _children_queryset(
     relation: CascadeRelation,
+    parent_ids: list[int],
     *,
     operation: str,
     child_mode: str = MODE_SOFT,
 ):
     model = relation.model
-    field_filter = {relation.field_name: instance.pk}
+    field_filter = {f"{relation.field_name}__in": parent_ids}
 
     if _is_soft_delete_model(model):
         queryset = model.all_objects.filter(**field_filter)
@@ -128,6 +144,46 @@ def _related_queryset(
     return model._meta.base_manager.filter(**field_filter)  # noqa: SLF001
 
 
+def _iter_children(
+    relation: CascadeRelation,
+    parents: list[models.Model],
+    *,
+    operation: str,
+    child_mode: str = MODE_SOFT,
+    exclude_protected: bool = False,
+):
+    """
+    Hijos de todos los ``parents`` por una relación, en lotes ``pk__in``.
+
+    Con ``exclude_protected`` descarta, por cada padre, los hijos que ese padre
+    referencia con PROTECT/RESTRICT (ver ``_protected_related_ids_from_parent``).
+    """
+    protected_by_parent: dict[int, set[int]] = {}
+    if exclude_protected:
+        for parent in parents:
+            protected_ids = _protected_related_ids_from_parent(parent, relation.model)
+            if protected_ids:
+                protected_by_parent[int(parent.pk)] = protected_ids
+    parent_attname = relation.model._meta.get_field(  # noqa: SLF001
+        relation.field_name
+    ).attname
+
+    parent_ids = [int(parent.pk) for parent in parents]
+    for chunk in _chunked(parent_ids):
+        queryset = _children_queryset(
+            relation,
+            chunk,
+            operation=operation,
+            child_mode=child_mode,
+        )
+        for child in queryset.iterator(chunk_size=BULK_CHUNK_SIZE):
+            if protected_by_parent:
+                parent_id = getattr(child, parent_attname)
+                if int(child.pk) in protected_by_parent.get(parent_id, ()):
+                    continue
+            yield child
+
+
 def _protected_related_ids_from_parent(
     parent: models.Model, child_model: type[models.Model]
 ) -> set[int]:
@@ -166,96 +222,171 @@ def _protected_related_ids_from_parent(
     return protected_ids
 
 
-def _visit_delete(
+def _add_delete_node(
     plan: CascadePlan,
     instance: models.Model,
     mode: str,
     depth: int,
-):
+    root: models.Model,
+) -> bool:
+    """Registra el nodo; True si hay que recorrer sus hijos (nuevo o soft -> hard)."""
     if instance.pk is None:
-        return
+        return False
 
     key = _node_key(instance)
     existing = plan.nodes.get(key)
 
     if existing is not None:
         if existing.mode == MODE_HARD:
-            return
+            return False
         if existing.mode == MODE_SOFT and mode == MODE_SOFT:
-            return
+            return False
         # Upgrade soft -> hard and continue walking to propagate hard mode.
         existing.mode = MODE_HARD
         existing.depth = max(existing.depth, depth)
-    else:
-        if (
-            mode == MODE_SOFT
-            and _is_soft_delete_instance(instance)
-            and getattr(instance, "deleted_at", None) is not None
-        ):
-            return
-        plan.nodes[key] = CascadeNode(instance=instance, mode=mode, depth=depth)
-
-    for relation in _get_reverse_cascade_relations(instance.__class__):
-        child_mode = (
-            MODE_HARD
-            if mode == MODE_HARD or not _is_soft_delete_model(relation.model)
-            else MODE_SOFT
-        )
-        queryset = _related_queryset(
-            instance,
-            relation,
-            operation=OP_DELETE,
-            child_mode=child_mode,
-        )
-        if mode == MODE_SOFT and child_mode == MODE_HARD:
-            protected_ids = _protected_related_ids_from_parent(
-                instance,
-                relation.model,
-            )
-            if protected_ids:
-                queryset = queryset.exclude(pk__in=protected_ids)
-        for child in queryset.iterator():
-            _visit_delete(plan, child, child_mode, depth + 1)
+        return True
+
+    if (
+        mode == MODE_SOFT
+        and _is_soft_delete_instance(instance)
+        and getattr(instance, "deleted_at", None) is not None
+    ):
+        return False
+    plan.nodes[key] = CascadeNode(instance=instance, mode=mode, depth=depth, root=root)
+    return True
 
 
-def _visit_restore(plan: CascadePlan, instance: models.Model, depth: int):
+def _group_frontier(frontier: list[tuple[models.Model, str]]):
+    grouped: dict[tuple[type[models.Model], str], list[models.Model]] = defaultdict(
+        list
+    )
+    for instance, mode in frontier:
+        grouped[(instance.__class__, mode)].append(instance)
+    return grouped.items()
+
+
+def _walk_delete(plan: CascadePlan, frontier: list[tuple[models.Model, str]]):
+    """Recorre el grafo por niveles: una consulta por relación y lote de padres."""
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier: list[tuple[models.Model, str]] = []
+        for (model, mode), parents in _group_frontier(frontier):
+            for relation in _get_reverse_cascade_relations(model):
+                child_mode = (
+                    MODE_HARD
+                    if mode == MODE_HARD or not _is_soft_delete_model(relation.model)
+                    else MODE_SOFT
+                )
+                children = _iter_children(
+                    relation,
+                    parents,
+                    operation=OP_DELETE,
+                    child_mode=child_mode,
+                    exclude_protected=mode == MODE_SOFT and child_mode == MODE_HARD,
+                )
+                for child in children:
+                    root = _parent_root(plan, relation, child)
+                    if _add_delete_node(plan, child, child_mode, depth, root):
+                        next_frontier.append((child, child_mode))
+        frontier = next_frontier
+
+
+def _parent_root(
+    plan: CascadePlan, relation: CascadeRelation, child: models.Model
+) -> models.Model:
+    parent_field = relation.model._meta.get_field(relation.field_name)  # noqa: SLF001
+    parent_id = getattr(child, parent_field.attname)
+    node = plan.nodes.get((parent_field.related_model, int(parent_id)))
+    if node is None or node.root is None:
+        return plan.root
+    return node.root
+
+
+def _add_restore_node(
+    plan: CascadePlan, instance: models.Model, depth: int, root: models.Model
+) -> bool:
     if instance.pk is None or not _is_soft_delete_instance(instance):
-        return
+        return False
     if getattr(instance, "deleted_at", None) is None:
-        return
+        return False
 
     key = _node_key(instance)
     existing = plan.nodes.get(key)
     if existing is not None:
         existing.depth = max(existing.depth, depth)
-        return
-    plan.nodes[key] = CascadeNode(instance=instance, mode=MODE_SOFT, depth=depth)
+        return False
+    plan.nodes[key] = CascadeNode(
+        instance=instance, mode=MODE_SOFT, depth=depth, root=root
+    )
+    return True
 
-    for relation in _get_reverse_cascade_relations(instance.__class__):
-        if not _is_soft_delete_model(relation.model):
-            continue
-        queryset = _related_queryset(
-            instance,
-            relation,
-            operation=OP_RESTORE,
-            child_mode=MODE_SOFT,
-        )
-        for child in queryset.iterator():
-            _visit_restore(plan, child, depth + 1)
+
+def _walk_restore(plan: CascadePlan, frontier: list[models.Model]):
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier: list[models.Model] = []
+        for (model, _mode), parents in _group_frontier(
+            [(instance, MODE_SOFT) for instance in frontier]
+        ):
+            for relation in _get_reverse_cascade_relations(model):
+                if not _is_soft_delete_model(relation.model):
+                    continue
+                for child in _iter_children(relation, parents, operation=OP_RESTORE):
+                    root = _parent_root(plan, relation, child)
+                    if _add_restore_node(plan, child, depth, root):
+                        next_frontier.append(child)
+        frontier = next_frontier
+
+
+def build_bulk_delete_plan(instances, *, cascade: bool = True) -> CascadePlan | None:
+    """
+    Build a delete plan for several roots at once.
+
+    Sin ``cascade`` el plan solo incluye las raíces y se ejecuta con un único
+    UPDATE por lote; cada raíz recibe ``post_soft_delete`` con ``root=`` ella
+    misma y ``cascade=False``, igual que ``instance.delete(cascade=False)``.
+    Retorna None si no hay instancias.
+    """
+    instances = list(instances)
+    if not instances:
+        return None
+    plan = CascadePlan(operation=OP_DELETE, root=instances[0], cascade=cascade)
+    frontier = [
+        (instance, MODE_SOFT)
+        for instance in instances
+        if _add_delete_node(plan, instance, MODE_SOFT, 0, instance)
+    ]
+    if cascade:
+        _walk_delete(plan, frontier)
+    return plan
+
+
+def build_bulk_restore_plan(instances, *, cascade: bool = True) -> CascadePlan | None:
+    """Build a restore plan for several roots at once (see build_bulk_delete_plan)."""
+    instances = list(instances)
+    if not instances:
+        return None
+    plan = CascadePlan(operation=OP_RESTORE, root=instances[0], cascade=cascade)
+    frontier = [
+        instance
+        for instance in instances
+        if _add_restore_node(plan, instance, 0, instance)
+    ]
+    if cascade:
+        _walk_restore(plan, frontier)
+    return plan
 
 
 def build_delete_plan(instance: models.Model) -> CascadePlan:
     """Build a recursive delete plan from an instance root."""
-    plan = CascadePlan(operation=OP_DELETE, root=instance)
-    _visit_delete(plan, instance, MODE_SOFT, 0)
-    return plan
+    return build_bulk_delete_plan([instance])
 
 
 def build_restore_plan(instance: models.Model) -> CascadePlan:
     """Build a recursive restore plan from an instance root."""
-    plan = CascadePlan(operation=OP_RESTORE, root=instance)
-    _visit_restore(plan, instance, 0)
-    return plan
+    return build_bulk_restore_plan([instance])
 
 
 def _summarize_group_key(node: CascadeNode) -> tuple[str, str, str]:
@@ -331,17 +462,48 @@ def _group_soft_nodes(plan: CascadePlan):
     return by_model
 
 
+def _overrides_instance_delete(model: type[models.Model]) -> bool:
+    from .base import SoftDeleteModelMixin
+
+    if _is_soft_delete_model(model):
+        return model.hard_delete is not SoftDeleteModelMixin.hard_delete
+    return model.delete is not models.Model.delete
+
+
 def _perform_hard_deletes(hard_nodes: list[CascadeNode]) -> None:
-    for node in hard_nodes:
-        model = node.instance.__class__
-        pk = int(node.instance.pk)
-        if _is_soft_delete_model(model):
-            instance = model.all_objects.filter(pk=pk).first()
+    """
+    Borra físicamente de las hojas hacia la raíz: nivel por nivel (``depth``
+    descendente) y, dentro de cada nivel, por modelo y en lotes.
+
+    ``hard_nodes`` debe venir ordenado por ``depth`` descendente. Agrupar solo
+    por modelo mezclaría niveles (p. ej. un modelo autorreferenciado) y podría
+    borrar un padre antes que sus hijos.
+
+    Los modelos que redefinen ``delete``/``hard_delete`` se borran instancia
+    por instancia para no saltear esa lógica.
+    """
+    for _depth, level_nodes in groupby(hard_nodes, key=lambda node: node.depth):
+        ids_by_model: dict[type[models.Model], list[int]] = defaultdict(list)
+        for node in level_nodes:
+            ids_by_model[node.instance.__class__].append(int(node.instance.pk))
+        for model, ids in ids_by_model.items():
+            _hard_delete_ids(model, ids)
+
+
+def _hard_delete_ids(model: type[models.Model], ids: list[int]) -> None:
+    if _is_soft_delete_model(model):
+        manager = model.all_objects
+    else:
+        manager = model._meta.base_manager  # noqa: SLF001
+    for chunk in _chunked(ids):
+        queryset = manager.filter(pk__in=chunk)
+        if _overrides_instance_delete(model):
+            for instance in queryset:
+                _hard_delete_instance(instance)
+        elif _is_soft_delete_model(model):
+            queryset.hard_delete()
         else:
-            instance = model._meta.base_manager.filter(pk=pk).first()  # noqa: SLF001
-        if instance is None:
-            continue
-        _hard_delete_instance(instance)
+            queryset.delete()
 
 
 def _bulk_soft_delete_nodes(
@@ -354,20 +516,44 @@ def _bulk_soft_delete_nodes(
 ) -> None:
     for model, ids in soft_nodes_by_model.items():
         operational_updates = operational_updates_by_model[model]
-        existing = set(
-            model.all_objects.filter(pk__in=ids, deleted_at__isnull=True).values_list(
-                "pk",
-                flat=True,
+        for chunk in _chunked(ids):
+            existing = set(
+                model.all_objects.filter(
+                    pk__in=chunk, deleted_at__isnull=True
+                ).values_list("pk", flat=True)
             )
-        )
-        if not existing:
-            continue
-        model.all_objects.filter(pk__in=existing).update(
-            deleted_at=deleted_at,
-            deleted_by=user,
-            **operational_updates,
-        )
-        updated_by_model[model].update(existing)
+            if not existing:
+                continue
+            model.all_objects.filter(pk__in=existing).update(
+                deleted_at=deleted_at,
+                deleted_by=user,
+                **operational_updates,
+            )
+            updated_by_model[model].update(existing)
+
+
+def _bulk_restore_nodes(
+    *,
+    soft_nodes_by_model: dict[type[models.Model], list[int]],
+    restore_updates_by_model: dict[type[models.Model], dict[str, object]],
+    updated_by_model: dict[type[models.Model], set[int]],
+) -> None:
+    for model, ids in soft_nodes_by_model.items():
+        restore_updates = restore_updates_by_model[model]
+        for chunk in _chunked(ids):
+            existing = set(
+                model.all_objects.filter(
+                    pk__in=chunk, deleted_at__isnull=False
+                ).values_list("pk", flat=True)
+            )
+            if not existing:
+                continue
+            model.all_objects.filter(pk__in=existing).update(
+                deleted_at=None,
+                deleted_by=None,
+                **restore_updates,
+            )
+            updated_by_model[model].update(existing)
 
 
 def _build_delete_summary(
@@ -410,8 +596,8 @@ def _emit_soft_delete_signals(
             sender=model,
             instance=node.instance,
             user=user,
-            cascade=True,
-            root=plan.root,
+            cascade=plan.cascade,
+            root=node.root or plan.root,
         )
 
 
@@ -438,8 +624,8 @@ def _emit_restore_signals(
             sender=model,
             instance=node.instance,
             user=user,
-            cascade=True,
-            root=plan.root,
+            cascade=plan.cascade,
+            root=node.root or plan.root,
         )
 
 
@@ -503,24 +689,11 @@ def execute_restore_plan(plan: CascadePlan, *, user=None) -> tuple[int, dict]:
             for model in soft_nodes_by_model
         }
 
-        for model, ids in soft_nodes_by_model.items():
-            existing = set(
-                model.all_objects.filter(
-                    pk__in=ids, deleted_at__isnull=False
-                ).values_list(
-                    "pk",
-                    flat=True,
-                )
-            )
-            if not existing:
-                continue
-            restore_updates = restore_updates_by_model[model]
-            model.all_objects.filter(pk__in=existing).update(
-                deleted_at=None,
-                deleted_by=None,
-                **restore_updates,
-            )
-            updated_by_model[model].update(existing)
+        _bulk_restore_nodes(
+            soft_nodes_by_model=soft_nodes_by_model,
+            restore_updates_by_model=restore_updates_by_model,
+            updated_by_model=updated_by_model,
+        )
 
         _emit_restore_signals(
             plan,
@@ -50,6 +50,17 @@ def sync_soft_delete_instance_state(
     for field_name, value in operational_updates.items():
         setattr(instance, field_name, value)
 
+    # El estado ya esta en la base: los modelos con FieldTrackingMixin no deben
+    # verlo como cambio pendiente en el proximo save().
+    mark_persisted = getattr(instance, "mark_fields_persisted", None)
+    if mark_persisted is not None:
+        synced = [*operational_updates]
+        if deleted_at is not _UNSET:
+            synced.append("deleted_at")
+        if deleted_by is not _UNSET:
+            synced.append("deleted_by")
+        mark_persisted(*synced)
+
 
 def run_soft_delete_backfill_side_effects(instance) -> None:
     """Run safe soft-delete side effects for backfilled legacy rows."""
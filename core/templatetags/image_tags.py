@@ -1,16 +1,32 @@
-"""Template tags para imágenes optimizadas con WebP."""
+"""
+Template tags para imágenes optimizadas con WebP.
+
+Solo consultan el manifiesto de derivados (``get_image_derivatives``): nunca
+abren la imagen ni convierten durante el render.
+"""
 
 from django import template
 from django.utils.safestring import mark_safe
 from django.utils.html import format_html, escape
 import logging
 
-from core.services.image_service import get_or_create_webp
+from core.services.image_service import (
+    build_srcset,
+    derivative_url,
+    get_image_derivatives,
+    is_image_derivatives_enabled,
+)
 
 register = template.Library()
 logger = logging.getLogger(__name__)
 
 
+def _derivatives_for(image_path):
+    if not is_image_derivatives_enabled():
+        return None
+    return get_image_derivatives(image_path)
+
+
 @register.simple_tag
 def optimized_image(
     image_field,
@@ -20,10 +36,12 @@ def optimized_image(
     width=None,
     height=None,
     extra_attrs="",
+    sizes="",
 ):
     """
     Renderiza imagen optimizada con WebP y fallback.
-    Genera <picture> con lazy loading por defecto.
+    Genera <picture> con ``srcset`` responsivo y lazy loading por defecto;
+    ``sizes`` toma el ``width`` en px si no se indica (o ``100vw``).
     """
     if not image_field:
         return ""
@@ -37,9 +55,10 @@ def optimized_image(
         if not original_url:
             return ""
 
-        webp_url = get_or_create_webp(original_url)
+        variantes = _derivatives_for(original_url)
 
         img_attrs = []
+        width_int = None
 
         if css_class:
             img_attrs.append(f'class="{escape(css_class)}"')
@@ -66,13 +85,14 @@ def optimized_image(
 
         attrs_string = mark_safe(" " + " ".join(img_attrs)) if img_attrs else ""
 
-        if webp_url != original_url and webp_url.endswith(".webp"):
+        if variantes:
             html = format_html(
                 "<picture>"
-                '<source srcset="{}" type="image/webp">'
+                '<source srcset="{}" sizes="{}" type="image/webp">'
                 '<img src="{}" alt="{}"{}>'
                 "</picture>",
-                webp_url,
+                build_srcset(variantes),
+                sizes or (f"{width_int}px" if width_int else "100vw"),
                 original_url,
                 alt_text,
                 attrs_string,
@@ -111,18 +131,12 @@ def webp_exists(image_field):
         return False
 
     try:
-        from core.services.image_service import _get_absolute_path, _get_webp_path
-        import os
-
         if hasattr(image_field, "url"):
             image_path = image_field.url
         else:
             image_path = str(image_field)
 
-        abs_path = _get_absolute_path(image_path)
-        webp_path = _get_webp_path(abs_path)
-
-        return os.path.exists(webp_path)
+        return bool(_derivatives_for(image_path))
 
     except Exception as e:
         logger.error(f"Error en webp_exists: {e}")
@@ -141,7 +155,8 @@ def webp_url(image_field):
         else:
             original_url = str(image_field)
 
-        return get_or_create_webp(original_url)
+        variantes = _derivatives_for(original_url)
+        return derivative_url(variantes["webp"]) if variantes else original_url
 
     except Exception as e:
         logger.error(f"Error en webp_url: {e}")
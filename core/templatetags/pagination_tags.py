@@ -1,6 +1,7 @@
 from django import template
+from django.utils.http import urlencode
 
-from core.pagination import build_compact_page_range
+from core.pagination import KEYSET_CURSOR_PARAM, build_compact_page_range
 
 register = template.Library()
 
@@ -8,3 +9,26 @@ register = template.Library()
 @register.filter
 def compact_page_range(page_obj):
     return build_compact_page_range(page_obj)
+
+
+@register.simple_tag(takes_context=True)
+def page_querystring(context, page_param, number, cursor=None):
+    """
+    Querystring de un link de paginacion que conserva los filtros del request.
+
+    Con ``cursor`` (paginas keyset de ``NoCountPaginator``) se agrega el cursor
+    opaco; los links por numero lo descartan.
+    """
+    params = []
+    query = context.get("query")
+    if query:
+        params.append(("busqueda", query))
+    request = context.get("request")
+    excluded = {page_param, "busqueda", KEYSET_CURSOR_PARAM}
+    for key, value in getattr(request, "GET", {}).items():
+        if key not in excluded:
+            params.append((key, value))
+    params.append((page_param, number))
+    if cursor:
+        params.append((KEYSET_CURSOR_PARAM, cursor))
+    return urlencode(params)
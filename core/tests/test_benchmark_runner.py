@@ -118,3 +118,168 @@ def test_build_payload_and_baseline_only_include_measured_results():
     assert payload["summary"]["skipped"] == 1
     assert "core:programas" in baseline["scenarios"]
     assert "vat:list" not in baseline["scenarios"]
+
+
+def test_ocr_preprocess_benchmark_reports_latency_and_rss_per_variant():
+    from core.benchmarks.ocr_preprocess import run_ocr_preprocess_benchmark
+
+    results = run_ocr_preprocess_benchmark(pages=2, size=(300, 400))
+
+    assert set(results) == {"legacy", "vectorized", "vectorized_batch"}
+    for measured in results.values():
+        assert measured["pages"] == 2
+        assert measured["page_p50_ms"] > 0
+        assert measured["peak_rss_delta_mb"] >= 0
+
+
+def test_percentile_interpolates_like_numpy():
+    from core.benchmarks.load import percentile
+
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50.5
+    assert round(percentile(values, 95), 2) == 95.05
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_load_reports_error_rate_and_throughput():
+    from core.benchmarks.load import WorkerResult, summarize_load
+
+    summary = summarize_load(
+        [
+            WorkerResult([10.0, 20.0, 30.0], errors=1, error_samples=["500"]),
+            WorkerResult([40.0], errors=0, error_samples=[]),
+        ],
+        duration_seconds=2,
+    )
+
+    assert summary["requests"] == 5
+    assert summary["error_rate"] == 0.2
+    assert summary["throughput_rps"] == 2.0
+    assert summary["p50_ms"] == 25.0
+    assert summary["error_samples"] == ["500"]
+
+
+def _load_result(**overrides):
+    result = {
+        "status": "measured",
+        "mode": "thread",
+        "concurrency": 8,
+        "p50_ms": 40.0,
+        "p95_ms": 100.0,
+        "p99_ms": 150.0,
+        "throughput_rps": 80.0,
+        "error_rate": 0.0,
+    }
+    result.update(overrides)
+    return result
+
+
+def test_compare_load_with_baseline_flags_p95_regression():
+    from core.benchmarks.load import (
+        LoadRegressionThresholds,
+        compare_load_with_baseline,
+    )
+
+    comparison = compare_load_with_baseline(
+        baseline_entry=_load_result(),
+        result=_load_result(p95_ms=140.0),
+        thresholds=LoadRegressionThresholds(),
+    )
+
+    assert comparison["status"] == "regression"
+    assert comparison["p95_regression"] is True
+    assert comparison["p99_regression"] is False
+
+
+def test_compare_load_with_baseline_flags_throughput_and_errors():
+    from core.benchmarks.load import (
+        LoadRegressionThresholds,
+        compare_load_with_baseline,
+    )
+
+    comparison = compare_load_with_baseline(
+        baseline_entry=_load_result(),
+        result=_load_result(throughput_rps=50.0, error_rate=0.05),
+        thresholds=LoadRegressionThresholds(),
+    )
+
+    assert comparison["throughput_regression"] is True
+    assert comparison["error_regression"] is True
+
+
+def test_compare_load_with_baseline_ignores_small_latency_noise():
+    from core.benchmarks.load import (
+        LoadRegressionThresholds,
+        compare_load_with_baseline,
+    )
+
+    comparison = compare_load_with_baseline(
+        baseline_entry=_load_result(p95_ms=10.0, p99_ms=12.0),
+        result=_load_result(p95_ms=20.0, p99_ms=25.0),
+        thresholds=LoadRegressionThresholds(latency_regression_ms=25.0),
+    )
+
+    assert comparison["status"] == "ok"
+
+
+def test_compare_load_with_baseline_skips_other_concurrency():
+    from core.benchmarks.load import (
+        LoadRegressionThresholds,
+        compare_load_with_baseline,
+    )
+
+    comparison = compare_load_with_baseline(
+        baseline_entry=_load_result(concurrency=4),
+        result=_load_result(),
+        thresholds=LoadRegressionThresholds(),
+    )
+
+    assert comparison["status"] == "not-compared"
+
+
+def test_load_runner_drives_threads_and_keeps_sequential_baseline(tmp_path, mocker):
+    import json
+    import threading
+
+    from core.benchmarks.bootstrap import BenchmarkSeedState
+    from core.benchmarks.load import LoadBenchmarkRunner, LoadRegressionThresholds
+    from core.benchmarks.scenarios import BenchmarkScenario
+
+    threads_seen = set()
+
+    def _fake_request(client, scenario, seed_state):
+        threads_seen.add(threading.get_ident())
+        return 200
+
+    mocker.patch("core.benchmarks.load.request_scenario", side_effect=_fake_request)
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps({"scenarios": {"x:list": {"a": 1}}}))
+    runner = LoadBenchmarkRunner(
+        scenarios=[
+            BenchmarkScenario("x:list", "x", "Listado", "inicio", requires_auth=False),
+            BenchmarkScenario("x:callable", "x", "Callable", callable_runner=print),
+        ],
+        seed_state=BenchmarkSeedState(),
+        thresholds=LoadRegressionThresholds(),
+        concurrency=3,
+        duration_seconds=0.2,
+        warmups=0,
+    )
+
+    payload = runner.run(
+        baseline_path=baseline_path,
+        output_path=tmp_path / "latest.json",
+        rebuild_baseline=True,
+    )
+
+    measured, skipped = payload["results"]
+    assert measured["status"] == "measured"
+    assert measured["requests"] > 0
+    assert measured["comparison"]["status"] == "new"
+    assert skipped["status"] == "skipped"
+    assert len(threads_seen) == 3
+    baseline = json.loads(baseline_path.read_text())
+    assert baseline["scenarios"] == {"x:list": {"a": 1}}
+    assert baseline["load"]["x:list"]["concurrency"] == 3
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from comedores.models import Referente
+
+
+def _referente_selects(queries):
+    return [
+        q["sql"]
+        for q in queries
+        if q["sql"].startswith("SELECT") and "comedores_referente" in q["sql"]
+    ]
+
+
+class FieldTrackingMixinTest(TestCase):
+    """Estado previo por campo sin releer la fila en pre_save."""
+
+    def setUp(self):
+        self.referente = Referente.objects.create(nombre="Ana", documento=30111222)
+
+    def test_loaded_instance_reports_changes_without_queries(self):
+        referente = Referente.objects.get(pk=self.referente.pk)
+        referente.nombre = "Ana Maria"
+
+        with CaptureQueriesContext(connection) as ctx:
+            changed = referente.changed_fields()
+            previous = referente.previous_value("nombre")
+
+        self.assertEqual(changed, ["nombre"])
+        self.assertEqual(previous, "Ana")
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_save_does_not_reselect_the_row(self):
+        referente = Referente.objects.get(pk=self.referente.pk)
+        referente.apellido = "Gomez"
+
+        with CaptureQueriesContext(connection) as ctx:
+            referente.save()
+
+        self.assertEqual(_referente_selects(ctx.captured_queries), [])
+        self.assertEqual(referente.changed_fields(), [])
+        self.assertEqual(referente.previous_value("apellido"), "Gomez")
+
+    def test_update_fields_only_refreshes_saved_fields(self):
+        referente = Referente.objects.get(pk=self.referente.pk)
+        referente.nombre = "Ana Maria"
+        referente.funcion = "Cocinera"
+
+        referente.save(update_fields=["nombre"])
+
+        self.assertEqual(referente.changed_fields(), ["funcion"])
+
+    def test_instance_built_with_pk_reads_previous_state_once(self):
+        detached = Referente(pk=self.referente.pk, nombre="Otra", documento=30111222)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(detached.changed_fields(), ["nombre"])
+            self.assertEqual(detached.previous_value("nombre"), "Ana")
+
+        self.assertEqual(len(_referente_selects(ctx.captured_queries)), 1)
+
+    def test_new_instance_has_no_previous_state(self):
+        referente = Referente(nombre="Nuevo")
+
+        self.assertFalse(referente.has_previous_state())
+        self.assertEqual(referente.changed_fields(), [])
+
+    def test_assigned_deferred_field_reads_only_that_column(self):
+        referente = Referente.objects.only("nombre").get(pk=self.referente.pk)
+        self.assertEqual(referente.changed_fields(["nombre", "documento"]), [])
+
+        referente.documento = 40111222
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(referente.changed_fields(["documento"]), ["documento"])
+            self.assertEqual(referente.previous_value("documento"), 30111222)
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_queryset_update_requires_marking_fields(self):
+        referente = Referente.objects.get(pk=self.referente.pk)
+        Referente.objects.filter(pk=referente.pk).update(nombre="Externo")
+        referente.nombre = "Externo"
+
+        self.assertEqual(referente.changed_fields(), ["nombre"])
+        referente.mark_fields_persisted("nombre")
+        self.assertEqual(referente.changed_fields(), [])
@@ -0,0 +1,260 @@
+import io
+import json
+import os
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from comedores.tasks import AsyncRemoveComedorToGestionar, AsyncSendComedorToGestionar
+from core.gestionar_outbox import drain_gestionar_outbox, enqueue_gestionar
+from core.gestionar_outbox.engine import release_stale_outbox_entries
+from core.gestionar_outbox.registry import GestionarOutboxKind, registrar_tipo_outbox
+from core.models import GestionarOutbox
+
+
+class _StubGestionar:
+    """Servidor HTTP local que registra los payloads y responde segun ``respond``."""
+
+    def __init__(self, respond=None):
+        self.requests = []
+        self.respond = respond or (lambda path, body: (200, {"Rows": body["Rows"]}))
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802 — API de BaseHTTPRequestHandler
+                length = int(self.headers["Content-Length"])
+                body = json.loads(self.rfile.read(length))
+                stub.requests.append((self.path, body))
+                status, data = stub.respond(self.path, body)
+                payload = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+
+def _comedor_payload(comedor_id, action="Add", nombre="Comedor"):
+    return {
+        "Action": action,
+        "Properties": {"Locale": "es-ES"},
+        "Rows": [{"ComedorID": comedor_id, "nombre": nombre}],
+    }
+
+
+_NEVER_SYNCED_IDS = {"10"}
+
+
+def _never_synced(entity_id):
+    return entity_id in _NEVER_SYNCED_IDS
+
+
+_NUEVO_OUTBOX_KIND = GestionarOutboxKind(
+    name="test_nuevo",
+    url_env="GESTIONAR_API_TEST_NUEVO",
+    never_synced=_never_synced,
+)
+
+
+@override_settings(
+    GESTIONAR_INTEGRATION_ENABLED=True,
+    GESTIONAR_OUTBOX_ENABLED=True,
+    GESTIONAR_OUTBOX_BACKOFF_SECONDS=30,
+    GESTIONAR_OUTBOX_MAX_ATTEMPTS=3,
+)
+class GestionarOutboxTest(TestCase):
+    """Outbox transaccional con coalescing y drenado por lotes."""
+
+    def _enqueue(self, *payloads):
+        with self.captureOnCommitCallbacks(execute=True):
+            for payload in payloads:
+                enqueue_gestionar("comedor", payload["Rows"][0]["ComedorID"], payload)
+
+    def _env(self, stub):
+        return patch.dict(
+            os.environ,
+            {
+                "GESTIONAR_API_CREAR_COMEDOR": f"{stub.url}/comedor",
+                "GESTIONAR_API_BORRAR_COMEDOR": f"{stub.url}/comedor/borrar",
+            },
+        )
+
+    def test_rollback_does_not_write_outbox(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    enqueue_gestionar("comedor", 1, _comedor_payload(1))
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+
+        self.assertFalse(GestionarOutbox.objects.exists())
+
+    def test_repeated_changes_coalesce_into_one_pending_row(self):
+        self._enqueue(
+            _comedor_payload(1, "Add", nombre="v1"),
+            _comedor_payload(1, "Update", nombre="v2"),
+            _comedor_payload(1, "Update", nombre="v3"),
+        )
+
+        entry = GestionarOutbox.objects.get()
+        self.assertEqual(entry.action, "Add")
+        self.assertEqual(entry.row["nombre"], "v3")
+
+        self._enqueue(_comedor_payload(1, "Delete"))
+        self.assertEqual(GestionarOutbox.objects.get().action, "Delete")
+
+    def test_payload_rows_merge_into_the_pending_row(self):
+        payload = _comedor_payload(1, nombre="v1")
+        payload["Rows"].append({"ComedorID": 1, "barrio": "Centro"})
+        self._enqueue(payload, _comedor_payload(1, "Update", nombre="v2"))
+
+        entry = GestionarOutbox.objects.get()
+        self.assertEqual(entry.action, "Add")
+        self.assertEqual(
+            entry.row, {"ComedorID": 1, "nombre": "v2", "barrio": "Centro"}
+        )
+
+    def test_delete_drops_unsent_add_only_when_never_synced(self):
+        registrar_tipo_outbox(_NUEVO_OUTBOX_KIND)
+        with self.captureOnCommitCallbacks(execute=True):
+            for entity_id in (10, 11):
+                enqueue_gestionar("test_nuevo", entity_id, _comedor_payload(entity_id))
+                enqueue_gestionar(
+                    "test_nuevo", entity_id, _comedor_payload(entity_id, "Delete")
+                )
+
+        entry = GestionarOutbox.objects.get()
+        self.assertEqual((entry.entity_id, entry.action), ("11", "Delete"))
+        self.assertEqual(entry.row, {"ComedorID": 11, "nombre": "Comedor"})
+
+    def test_payload_without_id_is_enqueued_without_coalescing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_gestionar("comedor", None, _comedor_payload(None, nombre="a"))
+            enqueue_gestionar("comedor", None, _comedor_payload(None, nombre="b"))
+
+        entries = list(GestionarOutbox.objects.all())
+        self.assertEqual(len(entries), 2)
+        self.assertEqual({entry.coalesce_key for entry in entries}, {None})
+        self.assertEqual({entry.entity_id for entry in entries}, {""})
+        self.assertFalse(
+            GestionarOutbox.objects.filter(coalesce_key="comedor:None").exists()
+        )
+
+    def test_async_classes_enqueue_instead_of_spawning_threads(self):
+        with patch("comedores.tasks._EXECUTOR.submit") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                AsyncSendComedorToGestionar(_comedor_payload(7)).start()
+                AsyncRemoveComedorToGestionar(8).start()
+
+        submit.assert_not_called()
+        self.assertEqual(
+            sorted(GestionarOutbox.objects.values_list("entity_id", "action")),
+            [("7", "Add"), ("8", "Delete")],
+        )
+
+    def test_drain_sends_multi_row_payloads(self):
+        self._enqueue(*[_comedor_payload(i) for i in range(1, 6)])
+
+        with _StubGestionar() as stub, self._env(stub):
+            stats = drain_gestionar_outbox(batch_size=2, workers=3)
+
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["sent"], 5)
+        sent_ids = sorted(
+            row["ComedorID"] for _, body in stub.requests for row in body["Rows"]
+        )
+        self.assertEqual(sent_ids, [1, 2, 3, 4, 5])
+        self.assertEqual(
+            GestionarOutbox.objects.filter(status=GestionarOutbox.Status.SENT).count(),
+            5,
+        )
+
+    def test_failed_batch_is_retried_with_backoff_then_marked_failed(self):
+        self._enqueue(_comedor_payload(1))
+
+        with _StubGestionar(lambda path, body: (503, {})) as stub, self._env(stub):
+            drain_gestionar_outbox()
+            entry = GestionarOutbox.objects.get()
+            self.assertEqual(entry.status, GestionarOutbox.Status.PENDING)
+            self.assertEqual(entry.attempts, 1)
+            self.assertGreater(entry.next_attempt_at, timezone.now())
+
+            # Antes de vencer el backoff no se reintenta.
+            self.assertEqual(drain_gestionar_outbox()["claimed"], 0)
+
+            for _ in range(2):
+                GestionarOutbox.objects.update(next_attempt_at=timezone.now())
+                drain_gestionar_outbox()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, GestionarOutbox.Status.FAILED)
+        self.assertEqual(entry.attempts, 3)
+        self.assertEqual(len(stub.requests), 3)
+
+    def test_rejected_batch_isolates_bad_row_and_flips_action(self):
+        # GESTIONAR rechaza lotes con el comedor 2 como alta (ya existe).
+        def respond(path, body):
+            ids = [row["ComedorID"] for row in body["Rows"]]
+            if 2 in ids and body["Action"] == "Add":
+                return 400, {}
+            return 200, {"Rows": body["Rows"]}
+
+        self._enqueue(*[_comedor_payload(i) for i in range(1, 4)])
+
+        with _StubGestionar(respond) as stub, self._env(stub):
+            stats = drain_gestionar_outbox()
+
+        self.assertEqual(stats["sent"], 3)
+        self.assertEqual(
+            [(body["Action"], len(body["Rows"])) for _, body in stub.requests],
+            [("Add", 3), ("Add", 1), ("Add", 1), ("Update", 1), ("Add", 1)],
+        )
+
+    def test_stale_claim_merges_with_newer_pending_change(self):
+        self._enqueue(_comedor_payload(1, "Add", nombre="v1"))
+
+        # Un drenador reclamo el alta y murio; mientras tanto llega un cambio.
+        entry = GestionarOutbox.objects.get()
+        GestionarOutbox.objects.filter(pk=entry.pk).update(
+            status=GestionarOutbox.Status.PROCESSING,
+            coalesce_key=None,
+            claimed_at=timezone.now() - timedelta(hours=1),
+        )
+        self._enqueue(_comedor_payload(1, "Update", nombre="v2"))
+
+        self.assertEqual(release_stale_outbox_entries(), 1)
+
+        pending = GestionarOutbox.objects.get()
+        self.assertEqual(pending.action, "Add")
+        self.assertEqual(pending.row["nombre"], "v2")
+
+    def test_command_reports_counts_by_status(self):
+        self._enqueue(_comedor_payload(1))
+        out = io.StringIO()
+
+        call_command("drain_gestionar_outbox", "--stats", stdout=out)
+
+        self.assertIn("pending: 1", out.getvalue())
@@ -0,0 +1,188 @@
+from pathlib import Path
+
+import pytest
+
+from comedores.models import Comedor
+from core.benchmarks.query_plans import (
+    _mysql_findings,
+    _sqlite_findings,
+    analyze_filter_engine,
+    build_query_plan_payload,
+    capture_selects,
+    explain_statement,
+    order_column,
+    select_parts,
+    suggest_index,
+)
+from core.services.advanced_filters.engine import AdvancedFilterEngine
+
+
+def test_order_column_resolves_qualified_and_positional_terms():
+    sql = (
+        'SELECT "duplas_dupla"."id", (SELECT MAX(U0."id") FROM "x" U0) AS "m", '
+        '"duplas_dupla"."fecha" FROM "duplas_dupla" '
+        'ORDER BY "duplas_dupla"."nombre" ASC LIMIT 10'
+    )
+    positional = sql.replace('"duplas_dupla"."nombre" ASC', "3 DESC")
+
+    items, table = select_parts(sql)
+
+    assert len(items) == 3
+    assert table == "duplas_dupla"
+    assert order_column(sql) == ("duplas_dupla", "nombre")
+    assert order_column(positional) == ("duplas_dupla", "fecha")
+    assert order_column('SELECT "a"."id" FROM "a"') is None
+
+
+def test_sqlite_and_mysql_findings_flag_scans_and_sorts():
+    _, sqlite = _sqlite_findings(
+        [
+            (2, 0, 0, "SCAN comedores_comedor"),
+            (3, 0, 0, "SEARCH core_provincia USING INTEGER PRIMARY KEY (rowid=?)"),
+            (4, 0, 0, "SCAN duplas_dupla USING INDEX duplas_dupla_estado"),
+            (5, 0, 0, "USE TEMP B-TREE FOR ORDER BY"),
+            (6, 0, 0, "USE TEMP B-TREE FOR DISTINCT"),
+        ]
+    )
+    _, mysql = _mysql_findings(
+        [("comedores_comedor", "ALL", None, "Using where; Using filesort")],
+        ["table", "type", "key", "Extra"],
+    )
+
+    assert [finding["kind"] for finding in sqlite] == [
+        "full_scan",
+        "filesort",
+        "temporary",
+    ]
+    assert sqlite[0]["table"] == "comedores_comedor"
+    assert mysql == [
+        {"kind": "full_scan", "table": "comedores_comedor"},
+        {"kind": "filesort", "table": "comedores_comedor"},
+    ]
+
+
+def test_analyze_filter_engine_classifies_filter_columns():
+    engine = AdvancedFilterEngine(
+        field_map={
+            "id": "id",
+            "provincia": "provincia",
+            "provincia_nombre": "provincia__nombre",
+            "calle": "calle",
+            "barrio": "barrio",
+            "judicializado": "es_judicializado",
+            "anotado": "ultimo_estado_anotado",
+        },
+        field_types={
+            "id": "number",
+            "provincia": "number",
+            "provincia_nombre": "choice",
+            "calle": "text",
+            "barrio": "contains_only",
+            "judicializado": "boolean",
+            "anotado": "text",
+        },
+        allowed_ops={"contains_only": ["contains", "ncontains"]},
+    )
+
+    fields = {
+        field["field"]: field
+        for field in analyze_filter_engine("comedores.Comedor", engine)
+    }
+
+    assert fields["id"]["status"] == "indexed"
+    assert fields["provincia"]["status"] == "indexed"
+    assert fields["provincia_nombre"]["model"] == "core.Provincia"
+    assert fields["calle"]["status"] == "index_gap"
+    assert fields["calle"]["table"] == "comedores_comedor"
+    assert fields["barrio"]["status"] == "not_indexable"
+    assert fields["judicializado"]["status"] == "low_selectivity"
+    assert fields["anotado"]["status"] == "annotation"
+
+
+def test_suggest_index_appends_list_order_column():
+    gap = {
+        "model": "comedores.Comedor",
+        "table": "comedores_comedor",
+        "model_field": "calle",
+    }
+    statements = [
+        {
+            "sql": 'SELECT "comedores_comedor"."id" FROM "comedores_comedor" '
+            'ORDER BY "comedores_comedor"."nombre" ASC'
+        }
+    ]
+
+    suggestion = suggest_index(gap, statements)
+    by_pk = suggest_index(
+        gap, [{"sql": statements[0]["sql"].replace('"nombre"', '"id"')}]
+    )
+
+    assert suggestion["fields"] == ["calle", "nombre"]
+    assert suggestion["definition"].startswith(
+        "models.Index(fields=['calle', 'nombre']"
+    )
+    assert len(suggestion["name"]) <= 30
+    assert by_pk["fields"] == ["calle"]
+
+
+def test_payload_counts_only_gaps_missing_from_baseline_as_regressions():
+    def _gap(field):
+        return {
+            "model": "comedores.Comedor",
+            "model_field": field,
+            "column": field,
+            "suggestion": {
+                "model": "comedores.Comedor",
+                "name": f"idx_{field}",
+                "fields": [field],
+                "definition": "",
+            },
+        }
+
+    results = [
+        {
+            "scenario_id": scenario_id,
+            "module": "comedores",
+            "label": scenario_id,
+            "status": "measured",
+            "statements": [
+                {"findings": [{"kind": "full_scan", "table": "comedores_comedor"}]}
+            ],
+            "index_gaps": [_gap("calle"), _gap("barrio")],
+        }
+        for scenario_id in ("comedores:list", "acompanamientos:list")
+    ]
+
+    payload = build_query_plan_payload(
+        results=results,
+        accepted_gaps={"comedores.Comedor.calle"},
+        baseline_path=Path("benchmarks/baselines/default.json"),
+    )
+
+    assert payload["summary"]["index_gaps"] == 2
+    assert payload["summary"]["regressions"] == 1
+    assert payload["summary"]["full_scans"] == 2
+    nuevo = next(gap for gap in payload["index_gaps"] if gap["new"])
+    assert nuevo["key"] == "comedores.Comedor.barrio"
+    assert nuevo["scenarios"] == ["comedores:list", "acompanamientos:list"]
+    assert [item["name"] for item in payload["suggested_indexes"]] == [
+        "idx_barrio",
+        "idx_calle",
+    ]
+
+
+@pytest.mark.django_db
+def test_capture_and_explain_selects_on_sqlite():
+    statements = capture_selects(
+        lambda: [
+            list(Comedor.all_objects.filter(barrio="Centro").order_by("calle")),
+            list(Comedor.all_objects.filter(barrio="Centro").order_by("calle")),
+        ]
+    )
+
+    assert len(statements) == 1
+    assert statements[0]["executions"] == 2
+    explained = explain_statement(statements[0])
+    kinds = {finding["kind"] for finding in explained["findings"]}
+    assert "error" not in explained
+    assert {"full_scan", "filesort"} <= kinds
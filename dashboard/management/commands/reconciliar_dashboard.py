@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.rollups import ROLLUPS, recalcular_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula los indicadores del dashboard desde las tablas de origen y "
+        "corrige los desvios del mantenimiento incremental. Pensado para "
+        "correr periodicamente (por ejemplo, una vez por noche)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--llave",
+            action="append",
+            dest="llaves",
+            default=[],
+            help="Indicador a recalcular (repetible). Por defecto, todos.",
+        )
+
+    def handle(self, *args, **options):
+        llaves = options["llaves"]
+        desconocidas = sorted(set(llaves) - set(ROLLUPS))
+        if desconocidas:
+            raise CommandError(f"Indicadores desconocidos: {', '.join(desconocidas)}.")
+
+        resultado = recalcular_rollups(*llaves)
+        corregidos = 0
+        for llave, (anterior, nuevo) in resultado.items():
+            if anterior != nuevo:
+                corregidos += 1
+            self.stdout.write(f"{llave}: {anterior} -> {nuevo}")
+        self.stdout.write(f"corregidos: {corregidos}")
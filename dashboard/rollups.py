@@ -0,0 +1,163 @@
+"""
+Indicadores del dashboard mantenidos en la tabla ``Dashboard``.
+
+Cada indicador es una fila ``(llave, cantidad)``. Los conteos se ajustan por
+delta desde las senales (alta, cambio de estado, baja logica, restauracion y
+borrado fisico) con ``UPDATE ... SET cantidad = cantidad + n``, dentro de la
+misma transaccion que el cambio: si esta se revierte, el delta tambien. Los
+presupuestos suman ``ValorComida`` (tabla chica) y se recalculan completos.
+
+Las operaciones masivas que no disparan senales (``bulk_create``,
+``QuerySet.update()``) tienen que llamar a ``recalcular_rollups``. El comando
+``reconciliar_dashboard`` recalcula todo y corrige cualquier desvio.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from dashboard.models import Dashboard
+
+logger = logging.getLogger("django")
+
+
+@dataclass(frozen=True)
+class RollupConteo:
+    """Cantidad de filas vivas de ``modelo`` que cumplen ``filtros`` (igualdades)."""
+
+    modelo: str
+    filtros: dict = field(default_factory=dict)
+
+    def get_model(self):
+        return apps.get_model(self.modelo)
+
+    def coincide(self, valores) -> bool:
+        return all(valores.get(campo) == valor for campo, valor in self.filtros.items())
+
+    def calcular(self) -> int:
+        return self.get_model().objects.filter(**self.filtros).count()
+
+
+@dataclass(frozen=True)
+class RollupSuma:
+    """Suma de ``campo`` sobre las filas de ``modelo`` que cumplen ``filtros``."""
+
+    modelo: str
+    campo: str
+    filtros: dict = field(default_factory=dict)
+
+    def get_model(self):
+        return apps.get_model(self.modelo)
+
+    def calcular(self) -> int:
+        total = (
+            self.get_model()
+            .objects.filter(**self.filtros)
+            .aggregate(total=Sum(self.campo))["total"]
+        )
+        # ``Dashboard.cantidad`` es entero: se redondea al peso.
+        return int(Decimal(total or 0).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+ROLLUPS = {
+    "cantidad_comedores_activos": RollupConteo("comedores.Comedor"),
+    "cantidad_relevamientos_activos": RollupConteo("relevamientos.Relevamiento"),
+    "participantes_total": RollupConteo(
+        "centrodefamilia.ParticipanteActividad", {"estado": "inscrito"}
+    ),
+    "centros_adheridos_totales": RollupConteo(
+        "centrodefamilia.Centro", {"tipo": "adherido"}
+    ),
+    "centros_faro_totales": RollupConteo("centrodefamilia.Centro", {"tipo": "faro"}),
+    "actividades_totales": RollupConteo("centrodefamilia.ActividadCentro"),
+    "presupuesto_desayuno": RollupSuma(
+        "comedores.ValorComida", "valor", {"tipo": "desayuno"}
+    ),
+    "presupuesto_merienda": RollupSuma(
+        "comedores.ValorComida", "valor", {"tipo": "merienda"}
+    ),
+    "presupuesto_comida": RollupSuma(
+        "comedores.ValorComida", "valor", {"tipo": "comida"}
+    ),
+}
+
+
+def rollups_de_modelo(modelo: str) -> dict:
+    """Indicadores que dependen de ``modelo`` ("app_label.Modelo")."""
+    return {
+        llave: rollup for llave, rollup in ROLLUPS.items() if rollup.modelo == modelo
+    }
+
+
+def _guardar(llave: str, cantidad: int) -> None:
+    Dashboard.objects.update_or_create(llave=llave, defaults={"cantidad": cantidad})
+
+
+def aplicar_delta(llave: str, delta: int) -> None:
+    """Suma ``delta`` al indicador; si la fila no existe la calcula completa."""
+    if not delta:
+        return
+    actualizadas = Dashboard.objects.filter(llave=llave).update(
+        cantidad=F("cantidad") + delta
+    )
+    if actualizadas:
+        return
+    # Primera vez: el conteo completo ya incluye el cambio en curso.
+    try:
+        with transaction.atomic():
+            Dashboard.objects.create(llave=llave, cantidad=ROLLUPS[llave].calcular())
+    except IntegrityError:
+        # Otro proceso la creo en paralelo, con o sin este cambio: se recalcula.
+        _guardar(llave, ROLLUPS[llave].calcular())
+
+
+def recalcular_rollups(*llaves: str) -> dict[str, tuple[int | None, int]]:
+    """
+    Recalcula los indicadores pedidos (todos si no se indica ninguno).
+
+    Devuelve ``{llave: (valor_anterior, valor_nuevo)}``; el anterior es
+    ``None`` si la fila no existia.
+    """
+    llaves = llaves or tuple(ROLLUPS)
+    anteriores = dict(
+        Dashboard.objects.filter(llave__in=llaves).values_list("llave", "cantidad")
+    )
+    resultado = {}
+    for llave in llaves:
+        nuevo = ROLLUPS[llave].calcular()
+        anterior = anteriores.get(llave)
+        if anterior != nuevo:
+            _guardar(llave, nuevo)
+        resultado[llave] = (anterior, nuevo)
+    return resultado
+
+
+def obtener_rollups() -> dict[str, int]:
+    """Todos los indicadores en una lectura; completa los que falten."""
+    valores = dict(Dashboard.objects.values_list("llave", "cantidad"))
+    faltantes = [llave for llave in ROLLUPS if llave not in valores]
+    if faltantes:
+        logger.info("Dashboard: inicializando indicadores %s", faltantes)
+        valores.update(
+            {
+                llave: nuevo
+                for llave, (_, nuevo) in recalcular_rollups(*faltantes).items()
+            }
+        )
+    return valores
+
+
+def obtener_rollup(llave: str) -> int:
+    """Valor de un indicador, calculandolo y guardandolo si falta."""
+    cantidad = (
+        Dashboard.objects.filter(llave=llave).values_list("cantidad", flat=True).first()
+    )
+    if cantidad is None:
+        cantidad = recalcular_rollups(llave)[llave][1]
+    return cantidad
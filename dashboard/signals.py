@@ -1,96 +1,78 @@
+"""Mantenimiento incremental de los indicadores del dashboard (ver ``dashboard.rollups``)."""
+
+from django.apps import apps
 from django.db.models.signals import post_delete, post_save
-from django.dispatch import receiver
-
-from relevamientos.models import Relevamiento
-from relevamientos.models import Prestacion
-from comedores.models import Comedor, ValorComida
-from dashboard.models import Dashboard
-from dashboard.utils import (
-    contar_comedores_activos,
-    contar_relevamientos_activos,
-    calcular_presupuesto_desayuno,
-    calcular_presupuesto_merienda,
-    calcular_presupuesto_comida,
+
+from core.soft_delete.signals import post_restore, post_soft_delete
+from dashboard.rollups import (
+    ROLLUPS,
+    RollupSuma,
+    aplicar_delta,
+    recalcular_rollups,
+    rollups_de_modelo,
 )
-from core.soft_delete.signals import post_soft_delete, post_restore
 
-from .utils import table_exists
 
+def _valores_actuales(instance, rollup):
+    return {campo: getattr(instance, campo, None) for campo in rollup.filtros}
+
+
+def _valores_previos(instance, rollup):
+    return {campo: instance.previous_value(campo) for campo in rollup.filtros}
+
+
+def _ajustar(sender, instance, signo):
+    """Suma ``signo`` a los conteos que incluyen a ``instance``; recalcula las sumas."""
+    for llave, rollup in rollups_de_modelo(sender._meta.label).items():
+        if isinstance(rollup, RollupSuma):
+            recalcular_rollups(llave)
+        elif rollup.coincide(_valores_actuales(instance, rollup)):
+            aplicar_delta(llave, signo)
+
+
+def actualizar_por_guardado(sender, instance, created, **kwargs):
+    if kwargs.get("raw") or getattr(instance, "deleted_at", None) is not None:
+        return
+    if created:
+        _ajustar(sender, instance, 1)
+        return
+    for llave, rollup in rollups_de_modelo(sender._meta.label).items():
+        if isinstance(rollup, RollupSuma):
+            recalcular_rollups(llave)
+        elif rollup.filtros:
+            # Estado previo desde FieldTrackingMixin: sin releer la fila.
+            ahora = rollup.coincide(_valores_actuales(instance, rollup))
+            antes = rollup.coincide(_valores_previos(instance, rollup))
+            aplicar_delta(llave, int(ahora) - int(antes))
+
+
+def actualizar_por_borrado(sender, instance, **kwargs):
+    # Una fila dada de baja logica ya se desconto al borrarse.
+    if getattr(instance, "deleted_at", None) is None:
+        _ajustar(sender, instance, -1)
 
-def update_dashboard_key(llave, cantidad):
-    """
-    Actualiza o crea un elemento del Dashboard para el concepto deseado con la cantidad recibida
 
-    :param llave: Concepto en el Dashboard
-    :param cantidad: Cantidad a definir del concepto en el Dashboard
-    """
-    dashboard = Dashboard.objects.update_or_create(
-        llave=llave,
-        defaults={"cantidad": cantidad},
-    )
-    return dashboard
+def actualizar_por_baja_logica(sender, instance, **kwargs):
+    _ajustar(sender, instance, -1)
 
 
-def update_dashboard_comedores(sender, instance, **kwargs):
-    update_dashboard_key("cantidad_comedores_activos", contar_comedores_activos())
-    update_dashboard_key(
-        "cantidad_relevamientos_activos", contar_relevamientos_activos()
-    )
-    # update_dashboard_key("cantidad_beneficiarios", contar_beneficiarios())
-    update_dashboard_key("presupuesto_desayuno", calcular_presupuesto_desayuno())
-    update_dashboard_key("presupuesto_merienda", calcular_presupuesto_merienda())
-    update_dashboard_key("presupuesto_comida", calcular_presupuesto_comida())
+def actualizar_por_restauracion(sender, instance, **kwargs):
+    _ajustar(sender, instance, 1)
 
 
 def register_signals():
-    if (
-        table_exists("comedores_comedor")
-        and table_exists("comedores_relevamiento")
-        and table_exists("comedores_prestacion")
-        and table_exists("comedores_valorcomida")
-    ):
-
-        @receiver(post_save, sender=Comedor)
-        def trigger_update_comedor(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_save, sender=Relevamiento)
-        def trigger_update_relevamiento(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_save, sender=Prestacion)
-        def trigger_update_prestacion(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_save, sender=ValorComida)
-        def trigger_update_valorcomida(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_delete, sender=Comedor)
-        def trigger_update_delete_comedor(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_delete, sender=Relevamiento)
-        def trigger_update_delete_relevamiento(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_soft_delete, sender=Comedor)
-        @receiver(post_restore, sender=Comedor)
-        def trigger_update_soft_delete_comedor(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_soft_delete, sender=Relevamiento)
-        @receiver(post_restore, sender=Relevamiento)
-        def trigger_update_soft_delete_relevamiento(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_delete, sender=Prestacion)
-        def trigger_update_delete_prestacion(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
-
-        @receiver(post_delete, sender=ValorComida)
-        def trigger_update_delete_valorcomida(sender, instance, **kwargs):
-            return update_dashboard_comedores(sender, instance, **kwargs)
+    for label in {rollup.modelo for rollup in ROLLUPS.values()}:
+        model = apps.get_model(label)
+        uid = f"dashboard_rollups:{label}"
+        post_save.connect(actualizar_por_guardado, sender=model, dispatch_uid=uid)
+        post_delete.connect(actualizar_por_borrado, sender=model, dispatch_uid=uid)
+        if hasattr(model, "all_objects"):
+            post_soft_delete.connect(
+                actualizar_por_baja_logica, sender=model, dispatch_uid=uid
+            )
+            post_restore.connect(
+                actualizar_por_restauracion, sender=model, dispatch_uid=uid
+            )
 
 
 register_signals()
@@ -2,15 +2,11 @@
 
 import logging
 
-from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.db import connection
-from django.db.models import Sum
 from django.db.utils import OperationalError, ProgrammingError
 
-from relevamientos.models import Relevamiento
-from comedores.models import Comedor, ValorComida
+from dashboard.rollups import obtener_rollup
 
 
 logger = logging.getLogger(__name__)
@@ -43,70 +39,30 @@ def table_exists(table_name):
         return False
 
 
-# Usar el timeout de settings en lugar de hardcodeado
-CACHE_TIMEOUT = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300)
+# Los indicadores se leen de la tabla ``Dashboard``, que se mantiene al dia por
+# senales (ver ``dashboard.rollups``).
 
 
 def contar_comedores_activos():
     """Contar la cantidad de comedores activos."""
-    cache_key = "contar_comedores_activos"
-    cached_value = cache.get(cache_key)
-    if cached_value is None:
-        cached_value = Comedor.objects.count()
-        cache.set(cache_key, cached_value, timeout=CACHE_TIMEOUT)
-    return cached_value
+    return obtener_rollup("cantidad_comedores_activos")
 
 
 def contar_relevamientos_activos():
     """Contar la cantidad de relevamientos activos."""
-    cache_key = "contar_relevamientos_activos"
-    cached_value = cache.get(cache_key)
-    if cached_value is None:
-        cached_value = Relevamiento.objects.count()
-        cache.set(cache_key, cached_value, timeout=CACHE_TIMEOUT)
-    return cached_value
+    return obtener_rollup("cantidad_relevamientos_activos")
 
 
 def calcular_presupuesto_desayuno():
     """Calcular el presupuesto total para desayunos."""
-    cache_key = "calcular_presupuesto_desayuno"
-    cached_value = cache.get(cache_key)
-    if cached_value is None:
-        cached_value = (
-            ValorComida.objects.filter(tipo="desayuno").aggregate(total=Sum("valor"))[
-                "total"
-            ]
-            or 0
-        )
-        cache.set(cache_key, cached_value, timeout=CACHE_TIMEOUT)
-    return cached_value
+    return obtener_rollup("presupuesto_desayuno")
 
 
 def calcular_presupuesto_merienda():
     """Calcular el presupuesto total para meriendas."""
-    cache_key = "calcular_presupuesto_merienda"
-    cached_value = cache.get(cache_key)
-    if cached_value is None:
-        cached_value = (
-            ValorComida.objects.filter(tipo="merienda").aggregate(total=Sum("valor"))[
-                "total"
-            ]
-            or 0
-        )
-        cache.set(cache_key, cached_value, timeout=CACHE_TIMEOUT)
-    return cached_value
+    return obtener_rollup("presupuesto_merienda")
 
 
 def calcular_presupuesto_comida():
     """Calcular el presupuesto total para comidas."""
-    cache_key = "calcular_presupuesto_comida"
-    cached_value = cache.get(cache_key)
-    if cached_value is None:
-        cached_value = (
-            ValorComida.objects.filter(tipo="comida").aggregate(total=Sum("valor"))[
-                "total"
-            ]
-            or 0
-        )
-        cache.set(cache_key, cached_value, timeout=CACHE_TIMEOUT)
-    return cached_value
+    return obtener_rollup("presupuesto_comida")
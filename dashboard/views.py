@@ -1,8 +1,8 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.views.generic import DetailView, TemplateView
 
-from centrodefamilia.models import Centro, ActividadCentro, ParticipanteActividad
-from dashboard.models import Dashboard, Tablero
+from dashboard.models import Tablero
+from dashboard.rollups import obtener_rollups
 
 
 class DashboardView(LoginRequiredMixin, TemplateView):
@@ -10,24 +10,8 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-
-        # 1) Datos fijos
-        dashboard_data = Dashboard.objects.all()
-        context.update({item.llave: item.cantidad for item in dashboard_data})
-
-        # 2) Indicadores dinámicos
-        context["participantes_total"] = ParticipanteActividad.objects.filter(
-            estado="inscrito"
-        ).count()
-
-        context["centros_adheridos_totales"] = Centro.objects.filter(
-            tipo="adherido"
-        ).count()
-
-        context["centros_faro_totales"] = Centro.objects.filter(tipo="faro").count()
-
-        context["actividades_totales"] = ActividadCentro.objects.count()
-
+        # Indicadores precalculados en la tabla Dashboard (dashboard.rollups).
+        context.update(obtener_rollups())
         return context
 
 
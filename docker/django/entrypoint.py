@@ -12,12 +12,15 @@ if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger("django")
 DEPLOY_GUNICORN_ENVIRONMENTS = {"qa", "homologacion", "prd"}
+DEFAULT_METRICS_MULTIPROC_DIR = "/tmp/sisoc-metrics"
 SERVICE_ROLE_WEB = "web"
 SERVICE_ROLE_BULK_CREDENTIALS_WORKER = "bulk_credentials_worker"
 SERVICE_ROLE_CIUDADANOS_IMPORT_WORKER = "ciudadanos_import_worker"
 SERVICE_ROLE_MAILING_WORKER = "mailing_worker"
 SERVICE_ROLE_USER_IMPORT_WORKER = "user_import_worker"
 SERVICE_ROLE_OCR_WORKER = "ocr_worker"
+SERVICE_ROLE_JOBS_WORKER = "jobs_worker"
+SERVICE_ROLE_GESTIONAR_OUTBOX_WORKER = "gestionar_outbox_worker"
 
 
 def run_command(cmd, *, stage, **kwargs):
@@ -222,6 +225,24 @@ def run_ocr_worker():
     )
 
 
+def run_jobs_worker():
+    """Inicia el pool unificado que procesa todas las colas de jobs."""
+    logger.info("[worker] Iniciando pool unificado de jobs...")
+    run_command(
+        ["python", "manage.py", "process_jobs"],
+        stage="jobs_worker",
+    )
+
+
+def run_gestionar_outbox_worker():
+    """Inicia el drenador del outbox de GESTIONAR."""
+    logger.info("[worker] Iniciando drenador del outbox de GESTIONAR...")
+    run_command(
+        ["python", "manage.py", "drain_gestionar_outbox"],
+        stage="gestionar_outbox_worker",
+    )
+
+
 def main():
     wait_for_mysql()
     service_role = os.getenv("DJANGO_SERVICE_ROLE", SERVICE_ROLE_WEB).strip().lower()
@@ -240,6 +261,12 @@ def main():
     if service_role == SERVICE_ROLE_OCR_WORKER:
         run_ocr_worker()
         return
+    if service_role == SERVICE_ROLE_JOBS_WORKER:
+        run_jobs_worker()
+        return
+    if service_role == SERVICE_ROLE_GESTIONAR_OUTBOX_WORKER:
+        run_gestionar_outbox_worker()
+        return
     run_django_commands()
 
 
@@ -253,8 +280,9 @@ def run_server():
 
     if deploy_gunicorn:
         cache_busting()
-        logger.info("[server] Iniciando Django en modo produccion con Gunicorn...")
         workers = os.getenv("GUNICORN_WORKERS", "4")
+        reset_metrics_dir(workers)
+        logger.info("[server] Iniciando Django en modo produccion con Gunicorn...")
         threads = os.getenv("GUNICORN_THREADS", "1")
         cmd = [
             "gunicorn",
@@ -277,6 +305,32 @@ def run_server():
         )
 
 
+def reset_metrics_dir(workers="1"):
+    """
+    Vacia METRICS_MULTIPROC_DIR: los contadores arrancan de cero con el servicio.
+
+    Con varios workers y sin directorio configurado usa uno por defecto (lo
+    heredan los workers): sin el, /metrics/ solo mostraria lo del worker que
+    atiende cada scrape.
+    """
+    metrics_dir = os.getenv("METRICS_MULTIPROC_DIR", "").strip()
+    if not metrics_dir:
+        if str(workers).strip() in ("", "1"):
+            return
+        metrics_dir = DEFAULT_METRICS_MULTIPROC_DIR
+        os.environ["METRICS_MULTIPROC_DIR"] = metrics_dir
+        logger.warning(
+            "[metrics] METRICS_MULTIPROC_DIR vacio con %s workers; se usa %s",
+            workers,
+            metrics_dir,
+        )
+    path = Path(metrics_dir)
+    if path.is_dir():
+        logger.info("[metrics] Vaciando directorio de metricas: %s", path)
+        shutil.rmtree(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+
 def cache_busting():
     static_root = (
         Path(__file__).resolve().parent.parent / "static_root"
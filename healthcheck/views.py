@@ -1,5 +1,35 @@
-from django.http import HttpResponse
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from core.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    collect,
+    is_metrics_enabled,
+    render_prometheus,
+)
 
 
 def health_check(request):
     return HttpResponse("OK", status=200)
+
+
+def _metrics_authorized(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    header = request.headers.get("Authorization", "")
+    if token and header.startswith("Bearer "):
+        return hmac.compare_digest(header[len("Bearer ") :].strip(), token)
+    user = getattr(request, "user", None)
+    return bool(user and user.is_authenticated and user.is_superuser)
+
+
+def metrics(request):
+    """Metricas de requests en formato Prometheus (ver ``core.metrics``)."""
+    if not is_metrics_enabled():
+        raise Http404
+    if not _metrics_authorized(request):
+        return HttpResponse("Forbidden", status=403)
+    return HttpResponse(
+        render_prometheus(*collect()), content_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -2,13 +2,26 @@ from __future__ import annotations
 
 from typing import Iterable
 
+from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils.text import slugify
 
+from core.cache_utils import IAM_PERMISSIONS_CACHE_NAMESPACE, namespaced_key
 from core.permissions.registry import resolve_permission_codes
 
+# Atributos que se cuelgan del usuario durante el request.
+_USER_PERMISSION_CACHE_ATTRS = (
+    "_iam_compiled_permissions",
+    "cached_permission_codes",
+    "cached_role_names",
+    "_perm_cache",
+    "_user_perm_cache",
+    "_group_perm_cache",
+)
+
 
 def _normalize(values: Iterable[str]) -> set[str]:
     return {value for value in (str(v).strip() for v in values or []) if value}
@@ -20,6 +33,61 @@ def _is_authenticated(user) -> bool:
     return bool(getattr(user, "is_authenticated", False))
 
 
+def is_permission_cache_enabled() -> bool:
+    return bool(getattr(settings, "IAM_PERMISSION_CACHE_ENABLED", False))
+
+
+def clear_user_permission_caches(user) -> None:
+    """Descarta lo memoizado en la instancia (por ejemplo, tras editar sus grupos)."""
+    for attr in _USER_PERMISSION_CACHE_ATTRS:
+        if hasattr(user, attr):
+            delattr(user, attr)
+
+
+def _compile_user_permissions(user) -> tuple[frozenset[str], frozenset[str]]:
+    """Codigos ``app_label.codename`` y nombres de permisos del usuario, en una query."""
+    rows = list(
+        Permission.objects.filter(Q(group__user=user) | Q(user=user))
+        .distinct()
+        .values_list("content_type__app_label", "codename", "name")
+    )
+    role_names = frozenset(name for _, _, name in rows)
+    if user.is_superuser:
+        # Igual que ModelBackend: el superusuario tiene todos los permisos.
+        rows = Permission.objects.values_list("content_type__app_label", "codename")
+        codes = frozenset(f"{app_label}.{codename}" for app_label, codename in rows)
+    else:
+        codes = frozenset(f"{app_label}.{codename}" for app_label, codename, _ in rows)
+    return codes, role_names
+
+
+def _compiled_permissions(user) -> tuple[frozenset[str], frozenset[str]]:
+    """
+    Permisos compilados del usuario desde el cache compartido.
+
+    La clave se versiona con el namespace ``iam_permissions``, que se bumpea
+    ante cualquier cambio de grupos o permisos (ver ``core.cache_utils``).
+    """
+    compiled = getattr(user, "_iam_compiled_permissions", None)
+    if compiled is not None:
+        return compiled
+
+    key = namespaced_key(
+        IAM_PERMISSIONS_CACHE_NAMESPACE,
+        f"user:{user.pk}:{int(bool(user.is_superuser))}",
+    )
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = _compile_user_permissions(user)
+        cache.set(key, compiled, settings.IAM_PERMISSION_CACHE_TTL_SECONDS)
+    user._iam_compiled_permissions = compiled
+    if user.is_active and not hasattr(user, "_perm_cache"):
+        # ModelBackend.has_perm/get_all_permissions leen este atributo: las
+        # llamadas directas a user.has_perm tampoco van a la base.
+        user._perm_cache = set(compiled[0])
+    return compiled
+
+
 def get_effective_role_names(user) -> set[str]:
     """Retorna roles efectivos (interpretados como permisos por nombre)."""
     if not _is_authenticated(user):
@@ -29,6 +97,11 @@ def get_effective_role_names(user) -> set[str]:
     if cached is not None:
         return cached
 
+    if is_permission_cache_enabled():
+        role_names = set(_compiled_permissions(user)[1])
+        user.cached_role_names = role_names
+        return role_names
+
     # Modelo objetivo: roles == permisos de Django asignados al usuario y sus grupos.
     role_names = set(
         Permission.objects.filter(Q(group__user=user) | Q(user=user))
@@ -66,7 +139,11 @@ def get_effective_permission_codes(user) -> set[str]:
     if cached is not None:
         return cached
 
-    result = set(user.get_all_permissions())
+    if is_permission_cache_enabled():
+        # ModelBackend no otorga permisos a usuarios inactivos.
+        result = set(_compiled_permissions(user)[0]) if user.is_active else set()
+    else:
+        result = set(user.get_all_permissions())
     user.cached_permission_codes = result
     return result
 
@@ -84,6 +161,9 @@ def user_has_permission_code(user, permission_code: str) -> bool:
     if not permission_codes:
         return False
 
+    if is_permission_cache_enabled():
+        return permission_codes[0] in get_effective_permission_codes(user)
+
     has_perm = getattr(user, "has_perm", None)
     if not callable(has_perm):
         return False
@@ -5,3 +5,13 @@ class OcrConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ocr"
     verbose_name = "OCR"
+
+    def ready(self):
+        from core.jobs import (  # pylint: disable=import-outside-toplevel
+            registrar_cola_jobs,
+        )
+        from ocr.services_ocr_jobs import (  # pylint: disable=import-outside-toplevel
+            OCR_JOB_QUEUE,
+        )
+
+        registrar_cola_jobs(OCR_JOB_QUEUE)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from ocr.services_ocr_cache import (
+    clear_ocr_page_cache,
+    get_ocr_cache_stats,
+    prune_ocr_page_cache,
+)
+
+
+class Command(BaseCommand):
+    help = "Muestra el tamaño y la tasa de aciertos del cache de resultados OCR."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help=(
+                "Aplica la política de evicción (TTL y tope de entradas). "
+                "Pensado para correr desde cron."
+            ),
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Descarta todas las páginas cacheadas.",
+        )
+
+    def handle(self, *args, **options):
+        if options["prune"]:
+            deleted = prune_ocr_page_cache()
+            self.stdout.write(f"Páginas descartadas: {deleted}")
+        if options["clear"]:
+            deleted = clear_ocr_page_cache()
+            self.stdout.write(f"Cache vaciado: {deleted} páginas.")
+
+        for name, value in get_ocr_cache_stats().items():
+            self.stdout.write(f"{name}: {value}")
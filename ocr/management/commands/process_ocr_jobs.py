@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 
-from ocr.services_ocr_jobs import run_ocr_jobs_worker
+from core.jobs import run_job_worker
+from ocr.services_ocr_jobs import OCR_JOB_QUEUE
 
 
 class Command(BaseCommand):
@@ -14,4 +15,4 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        run_ocr_jobs_worker(once=bool(options["once"]))
+        run_job_worker(queue_names=[OCR_JOB_QUEUE.name], once=bool(options["once"]))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.16 on 2026-10-18 02:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ocr", "0002_ocrjob_opt_auto_orient_ocrjob_opt_pdf_text_layer_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OCRPageCache",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("text", models.TextField(blank=True)),
+                ("source", models.CharField(default="ocr", max_length=20)),
+                ("ocr_words", models.PositiveIntegerField(default=0)),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_used_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Página OCR cacheada",
+                "verbose_name_plural": "Páginas OCR cacheadas",
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.16 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ocr", "0003_ocrpagecache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ocrjob",
+            name="available_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="ocrjob",
+            name="retry_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
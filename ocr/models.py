@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 def ocr_document_upload_to(instance, filename):
@@ -47,6 +48,8 @@ class OCRJob(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
     last_activity_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    available_at = models.DateTimeField(null=True, blank=True)
+    retry_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-requested_at", "-id"]
@@ -101,3 +104,22 @@ class OCRJobDocument(models.Model):
 
     def __str__(self):
         return f"Doc {self.id} '{self.original_filename}' ({self.get_status_display()})"
+
+
+class OCRPageCache(models.Model):
+    """Resultado OCR de una pagina, direccionado por contenido + opciones."""
+
+    key = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    source = models.CharField(max_length=20, default="ocr")
+    ocr_words = models.PositiveIntegerField(default=0)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "Página OCR cacheada"
+        verbose_name_plural = "Páginas OCR cacheadas"
+
+    def __str__(self):
+        return f"Cache OCR {self.key[:12]} ({self.hits} hits)"
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import json
 import logging
+import multiprocessing
 import os
 import re
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from django.conf import settings
 from PIL import Image
 
+from ocr.services_ocr_cache import (
+    get_cached_pages,
+    image_cache_key,
+    pdf_page_cache_keys,
+    store_cached_pages,
+)
+
 logger = logging.getLogger("django")
 
 _NO_TEXT_MESSAGE = "No se pudo extraer texto legible del archivo."
@@ -117,13 +130,21 @@ def _extract_from_image(
     import pytesseract
 
     opts = opts or _resolve_options(None)
-    image = Image.open(file_path)
-    image = _maybe_auto_orient(image, opts["auto_orient"])
-    image = _maybe_preprocess(image, opts["preprocess"])
-    text = pytesseract.image_to_string(
-        image, lang=language, config=_tesseract_config(language)
-    )
-    text = text.strip()
+    cache_key = image_cache_key(file_path, _cache_fingerprint(language, opts))
+    cached = get_cached_pages([cache_key]) if cache_key else {}
+
+    if cache_key in cached:
+        text = cached[cache_key][0]
+    else:
+        image = Image.open(file_path)
+        image = _maybe_auto_orient(image, opts["auto_orient"])
+        image = _maybe_preprocess(image, opts["preprocess"])
+        text = pytesseract.image_to_string(
+            image, lang=language, config=_tesseract_config(language)
+        )
+        text = text.strip()
+        if cache_key:
+            store_cached_pages({cache_key: (text, "ocr", len(text.split()))})
     return {
         "text": text,
         "page_count": None,
@@ -218,6 +239,28 @@ def _extract_pdf_page_text(
     return page_text, source, len(ocr_text.split())
 
 
+def _summarize_page_results(
+    page_results: Iterable[tuple[str, str, int]],
+) -> tuple[list[str], dict[str, int]]:
+    """Agrega los resultados por pagina (en orden) en textos + métricas."""
+    texts: list[str] = []
+    stats = {"hybrid_words": 0, "ocr_only_words": 0, "layer_pages": 0}
+
+    for page_text, source, page_ocr_words in page_results:
+        stats["ocr_only_words"] += page_ocr_words
+        stats["hybrid_words"] += len(page_text.split())
+        if source == "text_layer":
+            stats["layer_pages"] += 1
+        if page_text:
+            texts.append(page_text)
+
+    return texts, stats
+
+
+def _layer_entry_for(layer: list[dict] | None, index: int) -> dict | None:
+    return layer[index] if layer and index < len(layer) else None
+
+
 def _collect_pdf_page_results(
     pages: list[Image.Image],
     *,
@@ -226,25 +269,244 @@ def _collect_pdf_page_results(
     layer: list[dict] | None,
 ) -> tuple[list[str], dict[str, int]]:
     """Procesa todas las paginas y devuelve textos + métricas agregadas."""
-    texts: list[str] = []
-    stats = {"hybrid_words": 0, "ocr_only_words": 0, "layer_pages": 0}
-
-    for index, page_image in enumerate(pages):
-        layer_entry = layer[index] if layer and index < len(layer) else None
-        page_text, source, page_ocr_words = _extract_pdf_page_text(
+    return _summarize_page_results(
+        _extract_pdf_page_text(
             page_image,
             language=language,
             opts=opts,
-            layer_entry=layer_entry,
+            layer_entry=_layer_entry_for(layer, index),
         )
-        stats["ocr_only_words"] += page_ocr_words
-        stats["hybrid_words"] += len(page_text.split())
-        if source == "text_layer":
-            stats["layer_pages"] += 1
-        if page_text:
-            texts.append(page_text)
+        for index, page_image in enumerate(pages)
+    )
 
-    return texts, stats
+
+def _get_pdf_page_workers() -> int:
+    """Procesos para OCR de paginas de un PDF; 1 = modo secuencial."""
+    try:
+        workers = int(getattr(settings, "OCR_PDF_PAGE_WORKERS", 1))
+    except (TypeError, ValueError):
+        return 1
+    return max(1, workers)
+
+
+def _get_pdf_pages_in_flight(workers: int) -> int:
+    """Paginas rasterizadas en vuelo como maximo (acota la memoria pico)."""
+    try:
+        in_flight = int(getattr(settings, "OCR_PDF_PAGES_IN_FLIGHT", 0))
+    except (TypeError, ValueError):
+        in_flight = 0
+    if in_flight <= 0:
+        in_flight = workers * 2
+    return max(workers, in_flight)
+
+
+def _ocr_pdf_page(
+    file_path: str,
+    page_number: int,
+    language: str,
+    opts: dict,
+    layer_entry: dict | None,
+) -> tuple[str, str, int]:
+    """Rasteriza y procesa una sola pagina (se ejecuta en el proceso worker).
+
+    Solo viaja de vuelta el texto: la imagen de la pagina nunca cruza el limite
+    del proceso y se libera al terminar.
+    """
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(
+        file_path, dpi=300, first_page=page_number, last_page=page_number
+    )
+    if not images:
+        return "", "ocr", 0
+    return _extract_pdf_page_text(
+        images[0], language=language, opts=opts, layer_entry=layer_entry
+    )
+
+
+def _ocr_pdf_page_range(
+    file_path: str,
+    first_page: int,
+    last_page: int,
+    *,
+    language: str,
+    opts: dict,
+    layer: list[dict] | None,
+) -> Iterator[tuple[str, str, int]]:
+    """Rasteriza un tramo contiguo de paginas con una sola llamada a poppler."""
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(
+        file_path, dpi=300, first_page=first_page, last_page=last_page
+    )
+    for offset, number in enumerate(range(first_page, last_page + 1)):
+        if offset >= len(images):
+            yield "", "ocr", 0
+            continue
+        image, images[offset] = images[offset], None
+        yield _extract_pdf_page_text(
+            image,
+            language=language,
+            opts=opts,
+            layer_entry=_layer_entry_for(layer, number - 1),
+        )
+
+
+def _contiguous_ranges(page_numbers: list[int]) -> Iterator[tuple[int, int]]:
+    """Agrupa numeros de pagina ordenados en tramos ``(primera, ultima)``."""
+    start = previous = None
+    for number in page_numbers:
+        if previous is not None and number == previous + 1:
+            previous = number
+            continue
+        if start is not None:
+            yield start, previous
+        start = previous = number
+    if start is not None:
+        yield start, previous
+
+
+def _iter_pdf_page_results_parallel(
+    file_path: str,
+    page_numbers: list[int],
+    *,
+    language: str,
+    opts: dict,
+    layer: list[dict] | None,
+    workers: int,
+    max_in_flight: int,
+) -> Iterator[tuple[str, str, int]]:
+    """Procesa paginas en un pool de procesos y las devuelve en orden.
+
+    Se envian como maximo ``max_in_flight`` paginas a la vez: cada una se
+    rasteriza dentro de su worker, asi la memoria pico no crece con el tamano
+    del PDF.
+    """
+    # Igual que los workers de jobs: fork hereda settings y modulos cargados.
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = deque()
+        to_submit = iter(page_numbers)
+        exhausted = False
+        while not exhausted or pending:
+            while not exhausted and len(pending) < max_in_flight:
+                page_number = next(to_submit, None)
+                if page_number is None:
+                    exhausted = True
+                    break
+                pending.append(
+                    executor.submit(
+                        _ocr_pdf_page,
+                        file_path,
+                        page_number,
+                        language,
+                        opts,
+                        _layer_entry_for(layer, page_number - 1),
+                    )
+                )
+            if pending:
+                yield pending.popleft().result()
+
+
+def _iter_pdf_page_results(
+    file_path: str,
+    page_numbers: list[int],
+    *,
+    language: str,
+    opts: dict,
+    layer: list[dict] | None,
+    workers: int,
+) -> Iterator[tuple[str, str, int]]:
+    """Procesa las paginas pedidas (numeradas desde 1), en orden.
+
+    En modo secuencial cada tramo contiguo se rasteriza en una sola llamada
+    (en un cache miss, las paginas faltantes suelen ser consecutivas). En
+    paralelo cada pagina se rasteriza en su worker para acotar la memoria.
+    """
+    if workers > 1:
+        return _iter_pdf_page_results_parallel(
+            file_path,
+            page_numbers,
+            language=language,
+            opts=opts,
+            layer=layer,
+            workers=workers,
+            max_in_flight=_get_pdf_pages_in_flight(workers),
+        )
+    return (
+        result
+        for first_page, last_page in _contiguous_ranges(page_numbers)
+        for result in _ocr_pdf_page_range(
+            file_path,
+            first_page,
+            last_page,
+            language=language,
+            opts=opts,
+            layer=layer,
+        )
+    )
+
+
+def _cache_fingerprint(language: str, opts: dict) -> str:
+    """Huella de todo lo que cambia el resultado OCR de una pagina."""
+    return json.dumps(
+        {
+            "language": language,
+            "options": opts,
+            "tesseract": _tesseract_config(language),
+            "color_stamps": [
+                getattr(settings, "OCR_REMOVE_COLOR_STAMPS", False),
+                getattr(settings, "OCR_COLOR_SAT_THRESHOLD", 90),
+            ],
+            "text_layer": [
+                getattr(settings, "OCR_PDF_TEXT_LAYER_MIN_WORDS", 8),
+                getattr(settings, "OCR_PDF_TEXT_LAYER_IMG_MAXSIDE", 1000),
+            ],
+        },
+        sort_keys=True,
+    )
+
+
+def _pdf_page_results_with_cache(
+    file_path: str,
+    page_keys: list[str],
+    *,
+    language: str,
+    opts: dict,
+    workers: int,
+) -> list[tuple[str, str, int]]:
+    """Resultados por pagina: cacheados o procesados solo para las faltantes."""
+    cached = get_cached_pages(page_keys)
+    missing = [
+        number for number, key in enumerate(page_keys, start=1) if key not in cached
+    ]
+    computed: dict[int, tuple[str, str, int]] = {}
+    if missing:
+        layer = _read_text_layer(file_path) if opts["pdf_text_layer"] else None
+        computed = dict(
+            zip(
+                missing,
+                _iter_pdf_page_results(
+                    file_path,
+                    missing,
+                    language=language,
+                    opts=opts,
+                    layer=layer,
+                    workers=workers,
+                ),
+            )
+        )
+        store_cached_pages({page_keys[n - 1]: computed[n] for n in missing})
+    return [
+        cached[key] if key in cached else computed[number]
+        for number, key in enumerate(page_keys, start=1)
+    ]
+
+
+def _pdf_page_count(file_path: str) -> int:
+    from pdf2image import pdfinfo_from_path
+
+    return int(pdfinfo_from_path(file_path)["Pages"])
 
 
 def _log_pdf_layer_stats(stats: dict[str, int], page_count: int) -> None:
@@ -271,19 +533,44 @@ def _extract_from_pdf(file_path: str, language: str, opts: dict | None = None) -
     from pdf2image import convert_from_path
 
     opts = opts or _resolve_options(None)
-    pages = convert_from_path(file_path, dpi=300)
-    page_count = len(pages)
-
-    layer = _read_text_layer(file_path) if opts["pdf_text_layer"] else None
-
-    texts, stats = _collect_pdf_page_results(
-        pages,
-        language=language,
-        opts=opts,
-        layer=layer,
-    )
+    workers = _get_pdf_page_workers()
+    page_keys = pdf_page_cache_keys(file_path, _cache_fingerprint(language, opts))
+
+    if page_keys is not None:
+        page_count = len(page_keys)
+        layer_used = opts["pdf_text_layer"]
+        texts, stats = _summarize_page_results(
+            _pdf_page_results_with_cache(
+                file_path, page_keys, language=language, opts=opts, workers=workers
+            )
+        )
+    elif workers > 1:
+        page_count = _pdf_page_count(file_path)
+        layer = _read_text_layer(file_path) if opts["pdf_text_layer"] else None
+        layer_used = layer is not None
+        texts, stats = _summarize_page_results(
+            _iter_pdf_page_results(
+                file_path,
+                list(range(1, page_count + 1)),
+                language=language,
+                opts=opts,
+                layer=layer,
+                workers=workers,
+            )
+        )
+    else:
+        pages = convert_from_path(file_path, dpi=300)
+        page_count = len(pages)
+        layer = _read_text_layer(file_path) if opts["pdf_text_layer"] else None
+        layer_used = layer is not None
+        texts, stats = _collect_pdf_page_results(
+            pages,
+            language=language,
+            opts=opts,
+            layer=layer,
+        )
 
-    if layer is not None:
+    if layer_used:
         _log_pdf_layer_stats(stats, page_count)
 
     text = "\n\n".join(texts)
@@ -318,16 +605,29 @@ def extract_text_from_file(
     opts = _resolve_options(options)
     ext = Path(original_filename).suffix.lower()
 
-    if ext == ".pdf":
-        result = _extract_from_pdf(file_path, language, opts)
-    elif ext in (".jpg", ".jpeg", ".png"):
-        result = _extract_from_image(file_path, language, opts)
-    else:
-        raise ValueError(f"Tipo de archivo no soportado: '{ext}'")
+    try:
+        if ext == ".pdf":
+            result = _extract_from_pdf(file_path, language, opts)
+        elif ext in (".jpg", ".jpeg", ".png"):
+            result = _extract_from_image(file_path, language, opts)
+        else:
+            raise ValueError(f"Tipo de archivo no soportado: '{ext}'")
+    finally:
+        _release_preprocess_buffers()
 
     return _maybe_spellcheck(result, language)
 
 
+def _release_preprocess_buffers() -> None:
+    """Libera los buffers de preprocesado del hilo al cerrar cada documento.
+
+    Solo si el modulo ya se cargo: no tiene sentido importar OpenCV para esto.
+    """
+    preprocess = sys.modules.get("ocr.services_preprocess")
+    if preprocess is not None:
+        preprocess.release_thread_buffers()
+
+
 def _maybe_spellcheck(result: dict, language: str) -> dict:
     """Aplica corrección ortográfica al texto si OCR_SPELLCHECK está activo.
 
@@ -0,0 +1,202 @@
+"""
+Cache de resultados OCR direccionado por contenido.
+
+Los mismos escaneos (DNI, estatutos) se suben una y otra vez. Cada pagina se
+identifica por el hash de su contenido (imagen completa o streams de la pagina
+del PDF) mas una huella de las opciones resueltas (idioma, preprocesado,
+orientacion, capa de texto, flags de Tesseract). Asi una re-subida o un PDF
+que comparte paginas con otro ya procesado no vuelve a pasar por Tesseract.
+
+Politica de eviccion: se descartan las paginas sin uso en
+``OCR_CACHE_TTL_DAYS`` y, si se supera ``OCR_CACHE_MAX_ENTRIES``, las menos
+usadas recientemente (LRU por ``last_used_at``). La aplica el comando
+``ocr_cache --prune`` (cron diario), no cada lote.
+
+Los aciertos se cuentan en la columna ``hits`` de cada pagina, asi las
+estadisticas no dependen del cache de Django (que es por proceso en LocMem).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from ocr.models import OCRPageCache
+
+logger = logging.getLogger("django")
+
+#: Subir al cambiar el pipeline de OCR de forma que invalide resultados previos.
+OCR_CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_TTL_DAYS = 90
+PRUNE_CHUNK_SIZE = 1000
+_MAX_XOBJECT_DEPTH = 3
+
+PageResult = tuple[str, str, int]
+
+
+def is_ocr_cache_enabled() -> bool:
+    return bool(getattr(settings, "OCR_CACHE_ENABLED", True))
+
+
+def _positive_setting(name: str, default: int) -> int:
+    try:
+        value = int(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+    return max(0, value)
+
+
+def _page_key(fingerprint: str, content_digest: str) -> str:
+    raw = f"{OCR_CACHE_VERSION}:{fingerprint}:{content_digest}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stream_bytes(obj) -> bytes:
+    # Bytes tal como estan en el archivo: no hace falta decodificar imagenes.
+    data = getattr(obj, "_data", None)
+    return data if isinstance(data, bytes) else obj.get_data()
+
+
+def _hash_xobjects(digest, resources, depth: int) -> None:
+    xobjects = resources.get("/XObject") if resources else None
+    if not xobjects or depth > _MAX_XOBJECT_DEPTH:
+        return
+    for name in sorted(xobjects):
+        obj = xobjects[name].get_object()
+        digest.update(str(name).encode("utf-8"))
+        digest.update(_stream_bytes(obj))
+        if obj.get("/Subtype") == "/Form":
+            _hash_xobjects(digest, obj.get("/Resources"), depth + 1)
+
+
+def _pdf_page_digest(page) -> str:
+    digest = hashlib.sha256()
+    digest.update(repr([float(v) for v in page.mediabox]).encode("utf-8"))
+    digest.update(str(page.get("/Rotate", 0)).encode("utf-8"))
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    _hash_xobjects(digest, page.get("/Resources"), depth=0)
+    return digest.hexdigest()
+
+
+def pdf_page_cache_keys(file_path: str, fingerprint: str) -> list[str] | None:
+    """Clave de cache por pagina del PDF, o None si el cache no aplica.
+
+    Best-effort: si ``pypdf`` no puede leer el archivo se devuelve None y el
+    caller procesa el documento sin cache.
+    """
+    if not is_ocr_cache_enabled():
+        return None
+    try:
+        from pypdf import PdfReader
+
+        reader = PdfReader(file_path)
+        return [_page_key(fingerprint, _pdf_page_digest(p)) for p in reader.pages]
+    except Exception:  # noqa: BLE001 — el cache nunca debe romper el OCR
+        logger.warning("No se pudo calcular el hash por pagina del PDF; sin cache")
+        return None
+
+
+def image_cache_key(file_path: str, fingerprint: str) -> str | None:
+    if not is_ocr_cache_enabled():
+        return None
+    return _page_key(fingerprint, file_digest(file_path))
+
+
+def get_cached_pages(keys: list[str]) -> dict[str, PageResult]:
+    """Resultados cacheados para las claves dadas (marca uso y suma ``hits``)."""
+    if not keys:
+        return {}
+    rows = OCRPageCache.objects.filter(key__in=set(keys)).values_list(
+        "key", "text", "source", "ocr_words"
+    )
+    found = {key: (text, source, ocr_words) for key, text, source, ocr_words in rows}
+    if found:
+        OCRPageCache.objects.filter(key__in=found).update(
+            hits=F("hits") + 1, last_used_at=timezone.now()
+        )
+    return found
+
+
+def store_cached_pages(results: dict[str, PageResult]) -> None:
+    if not results:
+        return
+    OCRPageCache.objects.bulk_create(
+        [
+            OCRPageCache(key=key, text=text, source=source, ocr_words=ocr_words)
+            for key, (text, source, ocr_words) in results.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def prune_ocr_page_cache(*, now=None) -> int:
+    """Aplica la politica de eviccion (TTL + LRU). Retorna paginas borradas."""
+    now = now or timezone.now()
+    deleted = 0
+
+    ttl_days = _positive_setting("OCR_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS)
+    if ttl_days:
+        deleted += OCRPageCache.objects.filter(
+            last_used_at__lt=now - timedelta(days=ttl_days)
+        ).delete()[0]
+
+    max_entries = _positive_setting("OCR_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+    if max_entries:
+        # Se piden las ``excess`` menos usadas con LIMIT en lugar de saltear
+        # las ``max_entries`` mas usadas con OFFSET.
+        excess = OCRPageCache.objects.count() - max_entries
+        while excess > 0:
+            chunk = list(
+                OCRPageCache.objects.order_by("last_used_at", "id").values_list(
+                    "id", flat=True
+                )[: min(excess, PRUNE_CHUNK_SIZE)]
+            )
+            if not chunk:
+                break
+            removed = OCRPageCache.objects.filter(id__in=chunk).delete()[0]
+            deleted += removed
+            excess -= len(chunk)
+    return deleted
+
+
+def clear_ocr_page_cache() -> int:
+    return OCRPageCache.objects.all().delete()[0]
+
+
+def get_ocr_cache_stats() -> dict[str, float]:
+    """Tamano del cache y aciertos persistidos de las paginas vigentes.
+
+    Cada pagina cacheada fue un miss la primera vez, asi que ``entries`` cuenta
+    los misses y ``hits`` la suma de reusos. Las paginas podadas dejan de
+    contar en ambos.
+    """
+    totals = OCRPageCache.objects.aggregate(
+        text_chars=Sum(Length("text")), hits=Sum("hits")
+    )
+    entries = OCRPageCache.objects.count()
+    hits = int(totals["hits"] or 0)
+    total = hits + entries
+    return {
+        "entries": entries,
+        "text_chars": int(totals["text_chars"] or 0),
+        "hits": hits,
+        "reused_entries": OCRPageCache.objects.filter(hits__gt=0).count(),
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
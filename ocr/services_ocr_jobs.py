@@ -2,12 +2,11 @@ from __future__ import annotations
 
 import logging
 import os
-import time
-from datetime import timedelta
 
 from django.db import models
 from django.utils import timezone
 
+from core.jobs import JobQueue, claim_next_job
 from ocr.models import OCRJob, OCRJobDocument
 from ocr.services_ocr import extract_text_from_file
 
@@ -76,55 +75,9 @@ def get_recent_ocr_jobs(limit: int = 10, *, requested_by=None):
     return list(queryset[:limit])
 
 
-def mark_stale_ocr_jobs_as_failed() -> int:
-    """Marca como fallidos los jobs en estado 'processing' sin actividad reciente."""
-    stale_seconds = get_ocr_job_stale_seconds()
-    cutoff = timezone.now() - timedelta(seconds=stale_seconds)
-    updated = OCRJob.objects.filter(
-        status=OCRJob.Status.PROCESSING,
-        last_activity_at__lt=cutoff,
-    ).update(
-        status=OCRJob.Status.FAILED,
-        last_error_message=(
-            "El lote se interrumpió antes de finalizar (timeout de worker)."
-        ),
-        finished_at=timezone.now(),
-    )
-    if updated:
-        logger.warning(
-            "[ocr] %s lote(s) marcados como fallidos por inactividad.", updated
-        )
-    return updated
-
-
 def claim_next_ocr_job() -> OCRJob | None:
-    """
-    Reclama atómicamente el próximo job pendiente.
-    Itera candidatos de más antiguo a más nuevo hasta lograr reclamar uno.
-    Retorna None si no hay jobs pendientes.
-    """
-    candidates = list(
-        OCRJob.objects.filter(status=OCRJob.Status.PENDING)
-        .order_by("requested_at", "id")[:20]
-        .values_list("id", flat=True)
-    )
-    if not candidates:
-        return None
-
-    now = timezone.now()
-    for candidate_id in candidates:
-        updated = OCRJob.objects.filter(
-            pk=candidate_id,
-            status=OCRJob.Status.PENDING,
-        ).update(
-            status=OCRJob.Status.PROCESSING,
-            started_at=now,
-            last_activity_at=now,
-        )
-        if updated:
-            return OCRJob.objects.get(pk=candidate_id)
-
-    return None
+    """Reclama el próximo lote pendiente con el motor compartido de jobs."""
+    return claim_next_job(OCR_JOB_QUEUE)
 
 
 def _process_document(doc: OCRJobDocument) -> bool:
@@ -234,48 +187,22 @@ def process_ocr_job(job: OCRJob) -> None:
     job.save(update_fields=["status", "finished_at", "last_activity_at"])
 
 
-def process_next_ocr_job() -> bool:
-    """
-    Intenta procesar el próximo job pendiente.
-    Retorna True si procesó un job (continuar de inmediato), False si no había ninguno.
-    """
-    mark_stale_ocr_jobs_as_failed()
-
-    job = claim_next_ocr_job()
-    if job is None:
-        return False
-
-    logger.info("[ocr] Procesando lote OCR #%s...", job.id)
-    try:
-        process_ocr_job(job)
-        logger.info(
-            "[ocr] Lote OCR #%s finalizado con estado '%s'.", job.id, job.status
-        )
-    except Exception as exc:
-        logger.exception("[ocr] Error inesperado en lote OCR #%s: %s", job.id, exc)
-        OCRJob.objects.filter(pk=job.pk).update(
-            status=OCRJob.Status.FAILED,
-            last_error_message=str(exc),
-            finished_at=timezone.now(),
-        )
-
-    return True
-
-
-def run_ocr_jobs_worker(once: bool = False) -> None:
-    """Loop principal del worker OCR."""
-    logger.info("[ocr] Worker OCR iniciado.")
-    poll_seconds = get_ocr_job_poll_seconds()
-
-    while True:
-        try:
-            did_work = process_next_ocr_job()
-        except Exception as exc:
-            logger.exception("[ocr] Error inesperado en el worker OCR: %s", exc)
-            did_work = False
+def _fail_ocr_job(job: OCRJob, message: str) -> None:
+    OCRJob.objects.filter(pk=job.pk).update(
+        status=OCRJob.Status.FAILED,
+        last_error_message=message,
+        finished_at=timezone.now(),
+    )
 
-        if once:
-            break
 
-        if not did_work:
-            time.sleep(poll_seconds)
+OCR_JOB_QUEUE = JobQueue(
+    name="ocr",
+    model=OCRJob,
+    process=process_ocr_job,
+    fail=_fail_ocr_job,
+    get_stale_seconds=get_ocr_job_stale_seconds,
+    stale_error_message=(
+        "El lote se interrumpió antes de finalizar (timeout de worker)."
+    ),
+    get_poll_seconds=get_ocr_job_poll_seconds,
+)
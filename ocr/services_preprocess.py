@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 
 import cv2
 import numpy as np
@@ -33,6 +34,105 @@ def _cv2_attr(name: str):
     return getattr(cv2, name)
 
 
+class PreprocessBuffers:
+    """Arrays de trabajo reutilizables entre páginas del mismo tamaño.
+
+    Las páginas de un mismo PDF suelen compartir dimensiones: reutilizar los
+    buffers intermedios (RGB de trabajo, HSV, máscara, reescalado) evita
+    reservar y liberar decenas de MB por página.
+
+    Con ``max_bytes`` solo se retienen arrays mientras el total no supere ese
+    tope; una página más grande usa arrays nuevos que se liberan con ella.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self._arrays: dict[str, np.ndarray] = {}
+        self._max_bytes = max_bytes
+
+    @property
+    def retained_bytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays.values())
+
+    def take(self, name: str, shape: tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        array = self._arrays.get(name)
+        if array is not None and array.shape == shape and array.dtype == dtype:
+            return array
+        self._arrays.pop(name, None)
+        array = np.empty(shape, dtype=dtype)
+        if (
+            self._max_bytes is None
+            or self.retained_bytes + array.nbytes <= self._max_bytes
+        ):
+            self._arrays[name] = array
+        return array
+
+    def release(self) -> None:
+        self._arrays.clear()
+
+
+_thread_state = threading.local()
+
+
+def _buffers_max_bytes() -> int | None:
+    try:
+        max_mb = int(getattr(settings, "OCR_PREPROCESS_BUFFERS_MAX_MB", 128))
+    except (TypeError, ValueError):
+        return None
+    return max_mb * 1024 * 1024 if max_mb > 0 else None
+
+
+def _thread_buffers() -> PreprocessBuffers:
+    buffers = getattr(_thread_state, "buffers", None)
+    if buffers is None:
+        buffers = _thread_state.buffers = PreprocessBuffers(_buffers_max_bytes())
+    return buffers
+
+
+def release_thread_buffers() -> None:
+    """Libera los buffers del hilo actual (al terminar cada documento)."""
+    _thread_state.buffers = None
+
+
+def _as_array(pil_image: Image.Image) -> np.ndarray:
+    """Vista NumPy de la página (RGB o L) sin pasar por pasos PIL intermedios."""
+    if pil_image.mode not in ("RGB", "L"):
+        pil_image = pil_image.convert("RGB")
+    return np.asarray(pil_image)
+
+
+def preprocess_array_for_ocr(
+    array: np.ndarray, buffers: PreprocessBuffers | None = None
+) -> np.ndarray:
+    """
+    Pipeline NumPy/OpenCV sobre un array RGB (H, W, 3) o gris (H, W).
+
+    Los intermedios se escriben en ``buffers``; solo el resultado binarizado
+    es un array nuevo (es lo que se entrega a Tesseract).
+    """
+    buffers = buffers or PreprocessBuffers()
+    if array.ndim == 3:
+        array = _maybe_remove_color_stamps(array, buffers)
+        gray = _cv2_attr("cvtColor")(
+            array,
+            _cv2_attr("COLOR_RGB2GRAY"),
+            dst=buffers.take("gray", array.shape[:2]),
+        )
+    else:
+        gray = array
+
+    gray = _resize_if_small(gray, buffers)
+
+    return _cv2_attr("adaptiveThreshold")(
+        gray,
+        255,
+        _cv2_attr("ADAPTIVE_THRESH_GAUSSIAN_C"),
+        _cv2_attr("THRESH_BINARY"),
+        _ADAPTIVE_BLOCK_SIZE,
+        _ADAPTIVE_C,
+        dst=np.empty(gray.shape[:2], dtype=np.uint8),
+    )
+
+
 def preprocess_for_ocr(pil_image: Image.Image) -> Image.Image:
     """
     Limpia una imagen PIL antes del OCR para mejorar la precisión en
@@ -43,6 +143,9 @@ def preprocess_for_ocr(pil_image: Image.Image) -> Image.Image:
       b. Redimensionado si el lado mayor < 1500px (~300 DPI efectivos).
       c. Binarización adaptativa (Gaussian, bloque 31, C=10).
 
+    Los pasos corren sobre arrays NumPy con buffers reutilizados por hilo
+    (ver ``PreprocessBuffers``); PIL solo interviene a la entrada y a la salida.
+
     Devuelve una nueva imagen PIL en modo "L". Ante cualquier error, registra
     el problema y devuelve la imagen original sin modificar.
 
@@ -51,48 +154,66 @@ def preprocess_for_ocr(pil_image: Image.Image) -> Image.Image:
     (incluso lo empeoró levemente), además de ser propenso a rotaciones
     catastróficas. Ver docs/ocr.md.
     """
-    try:
-        rgb = np.array(pil_image.convert("RGB"))
-        rgb = _maybe_remove_color_stamps(rgb)
-        gray = _cv2_attr("cvtColor")(rgb, _cv2_attr("COLOR_RGB2GRAY"))
-
-        gray = _resize_if_small(gray)
-
-        binary = _cv2_attr("adaptiveThreshold")(
-            gray,
-            255,
-            _cv2_attr("ADAPTIVE_THRESH_GAUSSIAN_C"),
-            _cv2_attr("THRESH_BINARY"),
-            _ADAPTIVE_BLOCK_SIZE,
-            _ADAPTIVE_C,
-        )
+    return _preprocess_with_buffers(pil_image, _thread_buffers())
 
+
+def preprocess_batch_for_ocr(pil_images) -> list[Image.Image]:
+    """Preprocesa varias páginas compartiendo un único juego de buffers.
+
+    Cada página es best-effort igual que ``preprocess_for_ocr``: si una falla
+    se devuelve esa página original y el resto sigue.
+    """
+    buffers = PreprocessBuffers(_buffers_max_bytes())
+    return [_preprocess_with_buffers(image, buffers) for image in pil_images]
+
+
+def _preprocess_with_buffers(
+    pil_image: Image.Image, buffers: PreprocessBuffers
+) -> Image.Image:
+    try:
+        binary = preprocess_array_for_ocr(_as_array(pil_image), buffers)
         return Image.fromarray(binary)
     except Exception:  # noqa: BLE001 — preprocesado best-effort, no debe romper el OCR
         logger.exception("Fallo el preprocesamiento OCR; se usa la imagen original")
         return pil_image
 
 
-def _maybe_remove_color_stamps(rgb: np.ndarray) -> np.ndarray:
+def _maybe_remove_color_stamps(
+    rgb: np.ndarray, buffers: PreprocessBuffers | None = None
+) -> np.ndarray:
     """Blanquea la tinta de color (sellos azules/rojos) por saturación HSV.
 
     Los píxeles de alta saturación (color) se llevan a blanco; el texto negro
     (baja saturación) se preserva. Solo actúa si OCR_REMOVE_COLOR_STAMPS está
     activo. Best-effort: ante error devuelve la imagen sin tocar.
 
+    El blanqueo se hace sobre una copia en ``buffers`` (la entrada puede ser
+    una vista de solo lectura de la imagen PIL).
+
     Limitación conocida: los sellos **negros** tienen baja saturación, igual que
     el texto, y NO pueden separarse con este método. Ver docs/ocr.md.
     """
     if not getattr(settings, "OCR_REMOVE_COLOR_STAMPS", False):
         return rgb
+    buffers = buffers or PreprocessBuffers()
     try:
         threshold = getattr(
             settings, "OCR_COLOR_SAT_THRESHOLD", _DEFAULT_COLOR_SAT_THRESHOLD
         )
-        hsv = _cv2_attr("cvtColor")(rgb, _cv2_attr("COLOR_RGB2HSV"))
-        color_mask = hsv[:, :, 1] > threshold
-        out = rgb.copy()
-        out[color_mask] = (255, 255, 255)
+        hsv = _cv2_attr("cvtColor")(
+            rgb, _cv2_attr("COLOR_RGB2HSV"), dst=buffers.take("hsv", rgb.shape)
+        )
+        color_mask = _cv2_attr("extractChannel")(
+            hsv, 1, dst=buffers.take("mask", rgb.shape[:2])
+        )
+        _, color_mask = _cv2_attr("threshold")(
+            color_mask, threshold, 255, _cv2_attr("THRESH_BINARY"), dst=color_mask
+        )
+        # Con la máscara calculada el HSV ya no hace falta: su buffer pasa a ser
+        # la copia de trabajo y el OR con 255 lleva la tinta de color a blanco.
+        out = hsv
+        np.copyto(out, rgb)
+        out = _cv2_attr("bitwise_or")(out, (255, 255, 255, 0), dst=out, mask=color_mask)
         return out
     except Exception:  # noqa: BLE001 — paso opcional, no debe romper el preprocesado
         logger.warning(
@@ -101,7 +222,9 @@ def _maybe_remove_color_stamps(rgb: np.ndarray) -> np.ndarray:
         return rgb
 
 
-def _resize_if_small(gray: np.ndarray) -> np.ndarray:
+def _resize_if_small(
+    gray: np.ndarray, buffers: PreprocessBuffers | None = None
+) -> np.ndarray:
     height, width = gray.shape[:2]
     long_side = max(height, width)
     if long_side >= _MIN_LONG_SIDE or long_side == 0:
@@ -109,4 +232,10 @@ def _resize_if_small(gray: np.ndarray) -> np.ndarray:
 
     scale = _MIN_LONG_SIDE / long_side
     new_size = (int(round(width * scale)), int(round(height * scale)))
-    return _cv2_attr("resize")(gray, new_size, interpolation=_cv2_attr("INTER_CUBIC"))
+    buffers = buffers or PreprocessBuffers()
+    return _cv2_attr("resize")(
+        gray,
+        new_size,
+        dst=buffers.take("resized", (new_size[1], new_size[0])),
+        interpolation=_cv2_attr("INTER_CUBIC"),
+    )
@@ -0,0 +1,201 @@
+import io
+import os
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject
+
+from ocr.models import OCRPageCache
+from ocr.services_ocr import extract_text_from_file
+from ocr.services_ocr_cache import get_ocr_cache_stats, prune_ocr_page_cache
+
+
+def _write_pdf(directory, name, page_streams):
+    writer = PdfWriter()
+    for stream_data in page_streams:
+        page = writer.add_blank_page(200, 200)
+        stream = DecodedStreamObject()
+        stream.set_data(stream_data)
+        page.replace_contents(stream)
+    path = os.path.join(directory, name)
+    with open(path, "wb") as handle:
+        writer.write(handle)
+    return path
+
+
+def _fake_convert(file_path, dpi, first_page, last_page):
+    name = os.path.basename(file_path)
+    return [f"{name}:{number}" for number in range(first_page, last_page + 1)]
+
+
+def _fake_ocr(image, lang, config):
+    return f"texto de {image}"
+
+
+@override_settings(OCR_CACHE_ENABLED=True, OCR_PDF_TEXT_LAYER=False)
+class OCRPageCacheTest(TestCase):
+    """Cache de resultados OCR por hash de contenido de pagina + opciones."""
+
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        convert_patcher = patch(
+            "pdf2image.convert_from_path", side_effect=_fake_convert
+        )
+        self.mock_convert = convert_patcher.start()
+        self.addCleanup(convert_patcher.stop)
+        patches = [
+            patch("ocr.services_ocr._maybe_auto_orient", side_effect=lambda i, *a: i),
+            patch("ocr.services_ocr._maybe_preprocess", side_effect=lambda i, *a: i),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        ocr_patcher = patch("pytesseract.image_to_string", side_effect=_fake_ocr)
+        self.mock_ocr = ocr_patcher.start()
+        self.addCleanup(ocr_patcher.stop)
+
+    def test_reupload_of_same_pdf_skips_ocr(self):
+        first = _write_pdf(self.tmp.name, "a.pdf", [b"0 0 m 1 1 l S", b"0 0 m 2 2 l S"])
+        again = _write_pdf(self.tmp.name, "b.pdf", [b"0 0 m 1 1 l S", b"0 0 m 2 2 l S"])
+
+        original = extract_text_from_file(first, "a.pdf")
+        repeated = extract_text_from_file(again, "b.pdf")
+
+        self.assertEqual(self.mock_ocr.call_count, 2)
+        self.assertEqual(repeated["text"], original["text"])
+        self.assertEqual(repeated["page_count"], 2)
+
+    def test_partially_overlapping_pdf_only_processes_new_pages(self):
+        shared = b"0 0 m 2 2 l S"
+        first = _write_pdf(self.tmp.name, "a.pdf", [b"0 0 m 1 1 l S", shared])
+        second = _write_pdf(self.tmp.name, "b.pdf", [shared, b"0 0 m 3 3 l S"])
+
+        extract_text_from_file(first, "a.pdf")
+        self.mock_ocr.reset_mock()
+        result = extract_text_from_file(second, "b.pdf")
+
+        self.mock_ocr.assert_called_once()
+        self.assertEqual(result["text"], "texto de a.pdf:2\n\ntexto de b.pdf:2")
+        stats = get_ocr_cache_stats()
+        self.assertEqual(stats["entries"], 3)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["reused_entries"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.25)
+
+    def test_missing_pages_are_rasterized_by_contiguous_range(self):
+        shared = b"0 0 m 2 2 l S"
+        first = _write_pdf(self.tmp.name, "a.pdf", [shared])
+        streams = [b"0 0 m 5 5 l S", shared, b"0 0 m 6 6 l S", b"0 0 m 7 7 l S"]
+        second = _write_pdf(self.tmp.name, "b.pdf", streams)
+
+        extract_text_from_file(first, "a.pdf")
+        self.mock_convert.reset_mock()
+        result = extract_text_from_file(second, "b.pdf")
+
+        # Faltan 1, 3 y 4: un tramo suelto y uno de dos paginas.
+        self.assertEqual(
+            [
+                (call.kwargs["first_page"], call.kwargs["last_page"])
+                for call in self.mock_convert.call_args_list
+            ],
+            [(1, 1), (3, 4)],
+        )
+        self.assertEqual(
+            result["text"].split("\n\n"),
+            [
+                "texto de b.pdf:1",
+                "texto de a.pdf:1",
+                "texto de b.pdf:3",
+                "texto de b.pdf:4",
+            ],
+        )
+
+    def test_different_options_do_not_share_results(self):
+        path = _write_pdf(self.tmp.name, "a.pdf", [b"0 0 m 1 1 l S"])
+
+        extract_text_from_file(path, "a.pdf", options={"preprocess": True})
+        extract_text_from_file(path, "a.pdf", options={"preprocess": False})
+
+        self.assertEqual(self.mock_ocr.call_count, 2)
+
+    def test_image_reupload_uses_cache(self):
+        path = os.path.join(self.tmp.name, "dni.png")
+        Image.new("L", (10, 10), color=255).save(path)
+
+        extract_text_from_file(path, "dni.png")
+        result = extract_text_from_file(path, "dni.png")
+
+        self.mock_ocr.assert_called_once()
+        self.assertTrue(result["text"].startswith("texto de"))
+
+    @override_settings(OCR_CACHE_ENABLED=False)
+    def test_disabled_cache_always_runs_ocr(self):
+        path = os.path.join(self.tmp.name, "dni.png")
+        Image.new("L", (10, 10), color=255).save(path)
+
+        extract_text_from_file(path, "dni.png")
+        extract_text_from_file(path, "dni.png")
+
+        self.assertEqual(self.mock_ocr.call_count, 2)
+        self.assertFalse(OCRPageCache.objects.exists())
+
+
+class OCRPageCacheEvictionTest(TestCase):
+    def _entry(self, key, days_ago):
+        return OCRPageCache.objects.create(
+            key=key,
+            text="x",
+            last_used_at=timezone.now() - timedelta(days=days_ago),
+        )
+
+    @override_settings(OCR_CACHE_TTL_DAYS=30, OCR_CACHE_MAX_ENTRIES=0)
+    def test_prune_drops_entries_unused_beyond_ttl(self):
+        self._entry("viejo", days_ago=40)
+        self._entry("reciente", days_ago=1)
+
+        self.assertEqual(prune_ocr_page_cache(), 1)
+        self.assertEqual(
+            list(OCRPageCache.objects.values_list("key", flat=True)), ["reciente"]
+        )
+
+    @override_settings(OCR_CACHE_TTL_DAYS=0, OCR_CACHE_MAX_ENTRIES=2)
+    def test_prune_keeps_most_recently_used_entries(self):
+        self._entry("a", days_ago=3)
+        self._entry("b", days_ago=2)
+        self._entry("c", days_ago=1)
+
+        self.assertEqual(prune_ocr_page_cache(), 1)
+        self.assertEqual(
+            set(OCRPageCache.objects.values_list("key", flat=True)), {"b", "c"}
+        )
+
+    def test_command_reports_size_and_persisted_hits(self):
+        OCRPageCache.objects.create(key="k", text="hola mundo", hits=3)
+        out = io.StringIO()
+
+        call_command("ocr_cache", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("entries: 1", output)
+        self.assertIn("text_chars: 10", output)
+        self.assertIn("hits: 3", output)
+        self.assertIn("hit_ratio: 0.75", output)
+
+    @override_settings(OCR_CACHE_TTL_DAYS=30, OCR_CACHE_MAX_ENTRIES=0)
+    def test_command_prune_applies_eviction(self):
+        self._entry("viejo", days_ago=40)
+        out = io.StringIO()
+
+        call_command("ocr_cache", "--prune", stdout=out)
+
+        self.assertIn("Páginas descartadas: 1", out.getvalue())
+        self.assertFalse(OCRPageCache.objects.exists())
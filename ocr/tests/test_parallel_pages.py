@@ -0,0 +1,112 @@
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from ocr.services_ocr import (
+    _extract_from_pdf,
+    _get_pdf_pages_in_flight,
+    _iter_pdf_page_results_parallel,
+)
+
+
+def _fake_convert(file_path, dpi, first_page, last_page):
+    # "Rasteriza" solo la pagina pedida; la imagen es el numero de pagina.
+    return [first_page]
+
+
+def _fake_ocr(image, lang, config):
+    return f"pagina{image} texto escaneado"
+
+
+class ParallelPdfPagesTest(TestCase):
+    """OCR de paginas de PDF en un pool de procesos."""
+
+    def _patches(self, page_count, layer):
+        return (
+            patch("pdf2image.convert_from_path", side_effect=_fake_convert),
+            patch("pdf2image.pdfinfo_from_path", return_value={"Pages": page_count}),
+            patch("pytesseract.image_to_string", side_effect=_fake_ocr),
+            patch("ocr.services_ocr._maybe_auto_orient", side_effect=lambda i, *a: i),
+            patch("ocr.services_ocr._maybe_preprocess", side_effect=lambda i, *a: i),
+            patch("ocr.services_ocr._read_text_layer", return_value=layer),
+        )
+
+    @override_settings(OCR_PDF_PAGE_WORKERS=3, OCR_PDF_PAGES_IN_FLIGHT=2)
+    def test_pages_are_returned_in_order(self):
+        p1, p2, p3, p4, p5, p6 = self._patches(7, None)
+        with p1, p2, p3, p4, p5, p6:
+            result = _extract_from_pdf("/fake/doc.pdf", "spa")
+
+        self.assertEqual(result["page_count"], 7)
+        self.assertEqual(
+            [chunk.split()[0] for chunk in result["text"].split("\n\n")],
+            [f"pagina{n}" for n in range(1, 8)],
+        )
+
+    @override_settings(
+        OCR_PDF_PAGE_WORKERS=2,
+        OCR_PDF_TEXT_LAYER=True,
+        OCR_PDF_TEXT_LAYER_MIN_WORDS=8,
+    )
+    def test_born_digital_page_uses_text_layer(self):
+        emb = " ".join(f"digital{i}" for i in range(20))
+        layer = [
+            {"text": "", "has_big_image": True},
+            {"text": emb, "has_big_image": False},
+        ]
+        p1, p2, p3, p4, p5, p6 = self._patches(2, layer)
+        with p1, p2, p3, p4, p5, p6:
+            result = _extract_from_pdf("/fake/doc.pdf", "spa")
+
+        self.assertEqual(result["text"], f"pagina1 texto escaneado\n\n{emb}")
+
+    def test_in_flight_window_bounds_submitted_pages(self):
+        p1, p2, p3, p4, p5, p6 = self._patches(6, None)
+        with p1, p2, p3, p4, p5, p6:
+            with patch("ocr.services_ocr.ProcessPoolExecutor", _InlineExecutor):
+                results = _iter_pdf_page_results_parallel(
+                    "/fake/doc.pdf",
+                    list(range(1, 7)),
+                    language="spa",
+                    opts={"auto_orient": False, "preprocess": False},
+                    layer=None,
+                    workers=2,
+                    max_in_flight=2,
+                )
+                first = next(results)
+                submitted_before_consuming = list(_InlineExecutor.submitted)
+                rest = list(results)
+
+        self.assertEqual(first[0], "pagina1 texto escaneado")
+        self.assertEqual(submitted_before_consuming, [1, 2])
+        self.assertEqual(len(rest), 5)
+
+    @override_settings(OCR_PDF_PAGES_IN_FLIGHT=0)
+    def test_in_flight_defaults_to_twice_the_workers(self):
+        self.assertEqual(_get_pdf_pages_in_flight(3), 6)
+
+    @override_settings(OCR_PDF_PAGES_IN_FLIGHT=1)
+    def test_in_flight_never_below_workers(self):
+        self.assertEqual(_get_pdf_pages_in_flight(4), 4)
+
+
+class _InlineExecutor:
+    """Ejecuta en el mismo proceso y registra las paginas enviadas."""
+
+    submitted: list[int] = []
+
+    def __init__(self, *args, **kwargs):
+        _InlineExecutor.submitted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        _InlineExecutor.submitted.append(args[1])
+        future = Future()
+        future.set_result(fn(*args))
+        return future
@@ -6,6 +6,17 @@ from ocr.services_ocr import extract_text_from_file
 
 
 class ExtractTextFromFileTest(TestCase):
+    @patch("ocr.services_ocr._extract_from_image", side_effect=RuntimeError("boom"))
+    def test_releases_preprocess_buffers_after_each_document(self, _mock_img):
+        from ocr import services_preprocess
+
+        buffers = services_preprocess._thread_buffers()
+
+        with self.assertRaises(RuntimeError):
+            extract_text_from_file("/fake/img.png", "img.png")
+
+        self.assertIsNot(services_preprocess._thread_buffers(), buffers)
+
     @patch("ocr.services_ocr._extract_from_image")
     def test_routes_png_to_image_extractor(self, mock_img):
         mock_img.return_value = {
@@ -6,12 +6,13 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 from django.utils import timezone
 
+from core.jobs.engine import mark_stale_processing_jobs
 from ocr.models import OCRJob, OCRJobDocument
 from ocr.services_ocr_jobs import (
+    OCR_JOB_QUEUE,
     claim_next_ocr_job,
     create_ocr_job,
     get_recent_ocr_jobs,
-    mark_stale_ocr_jobs_as_failed,
     process_ocr_job,
 )
 
@@ -99,7 +100,7 @@ class MarkStaleJobsTest(TestCase):
             status=OCRJob.Status.PROCESSING,
             last_activity_at=timezone.now() - timedelta(seconds=700),
         )
-        count = mark_stale_ocr_jobs_as_failed()
+        count = mark_stale_processing_jobs(OCR_JOB_QUEUE)
         self.assertEqual(count, 1)
         job.refresh_from_db()
         self.assertEqual(job.status, OCRJob.Status.FAILED)
@@ -110,7 +111,7 @@ class MarkStaleJobsTest(TestCase):
             status=OCRJob.Status.PROCESSING,
             last_activity_at=timezone.now() - timedelta(seconds=10),
         )
-        count = mark_stale_ocr_jobs_as_failed()
+        count = mark_stale_processing_jobs(OCR_JOB_QUEUE)
         self.assertEqual(count, 0)
 
     def test_does_not_mark_pending_job_as_failed(self):
@@ -118,7 +119,7 @@ class MarkStaleJobsTest(TestCase):
             requested_by=self.user,
             status=OCRJob.Status.PENDING,
         )
-        count = mark_stale_ocr_jobs_as_failed()
+        count = mark_stale_processing_jobs(OCR_JOB_QUEUE)
         self.assertEqual(count, 0)
 
 
@@ -156,3 +156,106 @@ class PreprocessIntegrationTest(TestCase):
         _extract_from_pdf("/fake/doc.pdf", "spa")
 
         self.assertEqual(mock_preprocess.call_count, 2)
+
+
+class VectorizedPipelineTest(TestCase):
+    """El pipeline con buffers reutilizados equivale al anterior, píxel a píxel."""
+
+    def _page(self, size):
+        from core.benchmarks.ocr_preprocess import build_synthetic_pages
+
+        return build_synthetic_pages(1, size)[0]
+
+    def _assert_same_as_legacy(self, image):
+        from core.benchmarks.ocr_preprocess import legacy_preprocess_for_ocr
+        from ocr.services_preprocess import preprocess_for_ocr
+
+        expected = np.asarray(legacy_preprocess_for_ocr(image))
+        result = np.asarray(preprocess_for_ocr(image))
+        self.assertEqual(result.shape, expected.shape)
+        self.assertTrue((result == expected).all())
+
+    @override_settings(OCR_REMOVE_COLOR_STAMPS=False)
+    def test_matches_legacy_pipeline(self):
+        self._assert_same_as_legacy(self._page((1240, 1754)))
+        self._assert_same_as_legacy(self._page((600, 800)))
+
+    @override_settings(OCR_REMOVE_COLOR_STAMPS=True, OCR_COLOR_SAT_THRESHOLD=90)
+    def test_matches_legacy_pipeline_with_color_stamps(self):
+        self._assert_same_as_legacy(self._page((1240, 1754)))
+        self._assert_same_as_legacy(self._page((1240, 1754)).convert("L"))
+
+    def test_batch_reuses_buffers_and_returns_independent_pages(self):
+        from ocr import services_preprocess
+
+        pages = [self._page((900, 1200)), self._page((900, 1200))]
+        taken = []
+        original_take = services_preprocess.PreprocessBuffers.take
+
+        def _spy(buffers, name, shape, dtype=np.uint8):
+            array = original_take(buffers, name, shape, dtype)
+            taken.append((name, id(array)))
+            return array
+
+        with patch.object(services_preprocess.PreprocessBuffers, "take", _spy):
+            results = services_preprocess.preprocess_batch_for_ocr(pages)
+
+        gray_buffers = {array_id for name, array_id in taken if name == "gray"}
+        self.assertEqual(len(gray_buffers), 1)
+        self.assertEqual(len(results), 2)
+        self.assertIsNot(np.asarray(results[0]), np.asarray(results[1]))
+        self.assertEqual(results[0].mode, "L")
+
+    def test_batch_keeps_original_page_on_error(self):
+        from ocr import services_preprocess
+
+        ok_page = self._page((900, 1200))
+        broken_page = MagicMock()
+        broken_page.mode = "RGB"
+
+        with patch.object(
+            services_preprocess,
+            "_as_array",
+            side_effect=[RuntimeError("boom"), np.asarray(ok_page)],
+        ):
+            results = services_preprocess.preprocess_batch_for_ocr(
+                [broken_page, ok_page]
+            )
+
+        self.assertIs(results[0], broken_page)
+        self.assertEqual(results[1].mode, "L")
+
+
+class PreprocessBuffersLifecycleTest(TestCase):
+    def test_take_does_not_retain_arrays_over_the_cap(self):
+        from ocr.services_preprocess import PreprocessBuffers
+
+        buffers = PreprocessBuffers(max_bytes=1000)
+        small = buffers.take("gray", (10, 10))
+        big = buffers.take("work", (100, 100))
+
+        self.assertIs(buffers.take("gray", (10, 10)), small)
+        self.assertIsNot(buffers.take("work", (100, 100)), big)
+        self.assertEqual(buffers.retained_bytes, 100)
+
+    def test_take_drops_previous_array_when_shape_changes(self):
+        from ocr.services_preprocess import PreprocessBuffers
+
+        buffers = PreprocessBuffers(max_bytes=1000)
+        buffers.take("gray", (10, 10))
+        buffers.take("gray", (100, 100))
+
+        self.assertEqual(buffers.retained_bytes, 0)
+
+    @override_settings(OCR_PREPROCESS_BUFFERS_MAX_MB=1)
+    def test_thread_buffers_use_setting_cap_and_release(self):
+        from ocr import services_preprocess
+
+        services_preprocess.release_thread_buffers()
+        buffers = services_preprocess._thread_buffers()
+        buffers.take("work", (2048, 2048))
+
+        self.assertEqual(buffers.retained_bytes, 0)
+        self.assertIs(services_preprocess._thread_buffers(), buffers)
+        services_preprocess.release_thread_buffers()
+        self.assertIsNot(services_preprocess._thread_buffers(), buffers)
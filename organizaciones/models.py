@@ -3,6 +3,7 @@ from django.db import models
 from django.utils import timezone
 from django.core.validators import MaxValueValidator, MinValueValidator
 from core.models import Municipio, Provincia, Localidad
+from core.field_tracking import FieldTrackingMixin
 from core.soft_delete import SoftDeleteModelMixin
 
 
@@ -63,7 +64,7 @@ class RolFirmante(models.Model):
         verbose_name_plural = "Roles de Firmante"
 
 
-class Firmante(SoftDeleteModelMixin, models.Model):
+class Firmante(FieldTrackingMixin, SoftDeleteModelMixin, models.Model):
     organizacion = models.ForeignKey(
         "Organizacion", on_delete=models.CASCADE, related_name="firmantes"
     )
@@ -93,7 +94,7 @@ class Firmante(SoftDeleteModelMixin, models.Model):
         return f"{self.nombre} ({rol})"
 
 
-class Aval(SoftDeleteModelMixin, models.Model):
+class Aval(FieldTrackingMixin, SoftDeleteModelMixin, models.Model):
     organizacion = models.ForeignKey(
         "Organizacion",
         on_delete=models.CASCADE,
@@ -1,6 +1,5 @@
 from io import BytesIO
 import copy
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
@@ -18,6 +17,7 @@ from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, Tabl
 from lxml import etree
 
 from comedores.models import Nomina
+from core.services.office_pdf import convertir_plantilla_docx_a_pdf
 from pwa.models import NominaDestinatariosDocumentoPWA
 
 
@@ -318,8 +318,6 @@ def _build_pdf_from_template(*, comedor, periodo_referencia, nominas, actor):
     with tempfile.TemporaryDirectory(prefix="nomina-destinatarios-") as temp_dir:
         temp_path = Path(temp_dir)
         docx_path = temp_path / "nomina-destinatarios.docx"
-        pdf_path = temp_path / "nomina-destinatarios.pdf"
-        profile_uri = (temp_path / "libreoffice-profile").resolve().as_uri()
         _render_nomina_docx(
             template_path,
             docx_path,
@@ -328,28 +326,11 @@ def _build_pdf_from_template(*, comedor, periodo_referencia, nominas, actor):
             nominas=nominas,
             actor=actor,
         )
-        result = subprocess.run(
-            [
-                "libreoffice",
-                "--headless",
-                "--nologo",
-                "--nodefault",
-                "--nofirststartwizard",
-                f"-env:UserInstallation={profile_uri}",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                str(temp_path),
-                str(docx_path),
-            ],
-            capture_output=True,
-            check=False,
-            timeout=120,
+        return convertir_plantilla_docx_a_pdf(
+            template_path,
+            docx_path,
+            error_message="No se pudo generar el PDF de nómina.",
         )
-        if result.returncode != 0 or not pdf_path.exists():
-            detail = result.stderr.decode("utf-8", errors="replace").strip()
-            raise RuntimeError(detail or "No se pudo generar el PDF de nómina.")
-        return pdf_path.read_bytes()
 
 
 def serialize_nomina_destinatarios_documento(documento, request=None):
@@ -7,3 +7,12 @@ class RelevamientosConfig(AppConfig):
 
     def ready(self):
         import relevamientos.signals  # pylint: disable=unused-import, import-outside-toplevel
+        from core.gestionar_outbox import (  # pylint: disable=import-outside-toplevel
+            registrar_tipo_outbox,
+        )
+        from relevamientos.tasks import (  # pylint: disable=import-outside-toplevel
+            GESTIONAR_OUTBOX_KINDS,
+        )
+
+        for kind in GESTIONAR_OUTBOX_KINDS:
+            registrar_tipo_outbox(kind)
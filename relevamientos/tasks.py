@@ -7,6 +7,11 @@ from django.conf import settings
 from django.db import close_old_connections
 from django.utils import timezone
 
+from core.gestionar_outbox import (
+    GestionarOutboxKind,
+    enqueue_gestionar,
+    is_gestionar_outbox_enabled,
+)
 from relevamientos.models import PrimerSeguimiento, Relevamiento
 
 
@@ -62,6 +67,30 @@ def build_relevamiento_payload(relevamiento):
     }
 
 
+def build_relevamiento_delete_payload(relevamiento_id):
+    return {
+        "Action": "Delete",
+        "Properties": {"Locale": "es-ES"},
+        "Rows": [{"Relevamiento id": f"{relevamiento_id}"}],
+    }
+
+
+def build_primer_seguimiento_delete_payload(gestionar_id, relevamiento_id):
+    # La tabla `Seguimientos1erVisita` tiene CLAVE COMPUESTA
+    # (ID_Seguimiento1 + Id_Relevamiento): el Delete debe informar ambos o
+    # AppSheet responde 400 "Row key field 'Id_Relevamiento' value is missing".
+    return {
+        "Action": "Delete",
+        "Properties": {"Locale": "es-ES"},
+        "Rows": [
+            {
+                "ID_Seguimiento1": f"{gestionar_id}",
+                "Id_Relevamiento": f"{relevamiento_id}",
+            }
+        ],
+    }
+
+
 def build_primer_seguimiento_payload(seguimiento):
     # IMPORTANTE: el alta SOLO debe mandar Id_Relevamiento. En la tabla AppSheet
     # `Seguimientos1erVisita`, `ID_Seguimiento1` es la CLAVE autogenerada: si el
@@ -94,6 +123,11 @@ class AsyncSendRelevamientoToGestionar(threading.Thread):
                 "Integración con GESTIONAR deshabilitada: se omite sync de relevamiento"
             )
             return None
+        if is_gestionar_outbox_enabled():
+            enqueue_gestionar(
+                RELEVAMIENTO_OUTBOX_KIND.name, self.relevamiento_id, self.payload
+            )
+            return None
         # Encola la ejecución en un pool limitado para evitar demasiadas conexiones
         if _run_async_threads():
             _EXECUTOR.submit(self.run)
@@ -171,6 +205,13 @@ class AsyncRemoveRelevamientoToGestionar(threading.Thread):
                 "Integración con GESTIONAR deshabilitada: se omite baja de relevamiento"
             )
             return None
+        if is_gestionar_outbox_enabled():
+            enqueue_gestionar(
+                RELEVAMIENTO_OUTBOX_KIND.name,
+                self.relevamiento_id,
+                build_relevamiento_delete_payload(self.relevamiento_id),
+            )
+            return None
         if _run_async_threads():
             _EXECUTOR.submit(self.run)
             return None
@@ -181,11 +222,7 @@ class AsyncRemoveRelevamientoToGestionar(threading.Thread):
         if not _is_gestionar_integration_enabled():
             return
         close_old_connections()
-        data = {
-            "Action": "Delete",
-            "Properties": {"Locale": "es-ES"},
-            "Rows": [{"Relevamiento id": f"{self.relevamiento_id}"}],
-        }
+        data = build_relevamiento_delete_payload(self.relevamiento_id)
         headers = {
             "applicationAccessKey": os.getenv("GESTIONAR_API_KEY"),
         }
@@ -225,6 +262,11 @@ class AsyncSendPrimerSeguimientoToGestionar(threading.Thread):
                 "se omite sync de primer seguimiento"
             )
             return None
+        if is_gestionar_outbox_enabled():
+            enqueue_gestionar(
+                PRIMER_SEGUIMIENTO_OUTBOX_KIND.name, self.seguimiento_id, self.payload
+            )
+            return None
         if _run_async_threads():
             _EXECUTOR.submit(self.run)
             return None
@@ -314,6 +356,15 @@ class AsyncRemovePrimerSeguimientoToGestionar(threading.Thread):
                 self.seguimiento_id,
             )
             return None
+        if is_gestionar_outbox_enabled():
+            enqueue_gestionar(
+                PRIMER_SEGUIMIENTO_OUTBOX_KIND.name,
+                self.seguimiento_id,
+                build_primer_seguimiento_delete_payload(
+                    self.gestionar_id, self.relevamiento_id
+                ),
+            )
+            return None
         if _run_async_threads():
             _EXECUTOR.submit(self.run)
             return None
@@ -324,19 +375,9 @@ class AsyncRemovePrimerSeguimientoToGestionar(threading.Thread):
         if not _is_gestionar_integration_enabled():
             return
         close_old_connections()
-        # La tabla `Seguimientos1erVisita` tiene CLAVE COMPUESTA
-        # (ID_Seguimiento1 + Id_Relevamiento): el Delete debe informar ambos o
-        # AppSheet responde 400 "Row key field 'Id_Relevamiento' value is missing".
-        data = {
-            "Action": "Delete",
-            "Properties": {"Locale": "es-ES"},
-            "Rows": [
-                {
-                    "ID_Seguimiento1": f"{self.gestionar_id}",
-                    "Id_Relevamiento": f"{self.relevamiento_id}",
-                }
-            ],
-        }
+        data = build_primer_seguimiento_delete_payload(
+            self.gestionar_id, self.relevamiento_id
+        )
         headers = {
             "applicationAccessKey": os.getenv("GESTIONAR_API_KEY"),
         }
@@ -360,3 +401,82 @@ class AsyncRemovePrimerSeguimientoToGestionar(threading.Thread):
             )
         finally:
             close_old_connections()
+
+
+def _build_relevamiento_outbox_payload(relevamiento_id):
+    relevamiento = Relevamiento.objects.filter(id=relevamiento_id).first()
+    return build_relevamiento_payload(relevamiento) if relevamiento else None
+
+
+def _build_primer_seguimiento_outbox_payload(seguimiento_id):
+    seguimiento = PrimerSeguimiento.objects.filter(id=seguimiento_id).first()
+    return build_primer_seguimiento_payload(seguimiento) if seguimiento else None
+
+
+def _relevamiento_never_synced(relevamiento_id):
+    # Si la fila ya no existe no se puede confirmar: se envia la baja igual.
+    return Relevamiento.all_objects.filter(
+        pk=relevamiento_id, sincronizado_gestionar=False
+    ).exists()
+
+
+def _mark_relevamientos_sent(action, entries, response_rows):
+    if action == "Delete":
+        return
+    rows_by_id = {
+        f"{row.get('Relevamiento id')}": row
+        for row in response_rows
+        if row.get("Relevamiento id")
+    }
+    for entry in entries:
+        row = rows_by_id.get(entry.entity_id)
+        if row is None:
+            logger.warning(
+                "RELEVAMIENTO %s: GESTIONAR respondio 2xx pero no devolvio su fila; "
+                "la alta podria no haberse registrado.",
+                entry.entity_id,
+            )
+            continue
+        campos_sync = {"sincronizado_gestionar": True}
+        if row.get("docPDF"):
+            campos_sync["docPDF"] = row["docPDF"]
+        Relevamiento.objects.filter(pk=entry.entity_id).update(**campos_sync)
+
+
+def _mark_primer_seguimiento_sent(action, entries, response_rows):
+    # batch_size=1: la respuesta no trae un id propio de SISOC para asociarla.
+    if action == "Delete" or not entries:
+        return
+    entry = entries[0]
+    if not response_rows:
+        logger.warning(
+            "PRIMER SEGUIMIENTO %s: GESTIONAR respondio 2xx pero no devolvio "
+            "filas; la alta podria no haberse registrado.",
+            entry.entity_id,
+        )
+        return
+    gestionar_id = (response_rows[0].get("ID_Seguimiento1") or "").strip()
+    campos_sync = {"sincronizado_gestionar": True}
+    if gestionar_id:
+        campos_sync["gestionar_id"] = gestionar_id
+    PrimerSeguimiento.objects.filter(pk=entry.entity_id).update(**campos_sync)
+
+
+# Tipos del outbox de GESTIONAR (se registran en RelevamientosConfig.ready()).
+RELEVAMIENTO_OUTBOX_KIND = GestionarOutboxKind(
+    name="relevamiento",
+    url_env="GESTIONAR_API_CREAR_RELEVAMIENTO",
+    delete_url_env="GESTIONAR_API_BORRAR_RELEVAMIENTO",
+    build_payload=_build_relevamiento_outbox_payload,
+    on_sent=_mark_relevamientos_sent,
+    never_synced=_relevamiento_never_synced,
+)
+PRIMER_SEGUIMIENTO_OUTBOX_KIND = GestionarOutboxKind(
+    name="primer_seguimiento",
+    url_env="GESTIONAR_API_CREAR_PRIMER_SEGUIMIENTO",
+    delete_url_env="GESTIONAR_API_BORRAR_PRIMER_SEGUIMIENTO",
+    build_payload=_build_primer_seguimiento_outbox_payload,
+    on_sent=_mark_primer_seguimiento_sent,
+    batch_size=1,
+)
+GESTIONAR_OUTBOX_KINDS = (RELEVAMIENTO_OUTBOX_KIND, PRIMER_SEGUIMIENTO_OUTBOX_KIND)
@@ -1,4 +1,3 @@
-import subprocess
 import tempfile
 from io import BytesIO
 from pathlib import Path
@@ -8,6 +7,8 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
+from core.services.office_pdf import convertir_a_pdf
+
 
 def construir_documentacion_para_detalle(
     documentos, categorias, categorias_con_historial
@@ -155,8 +156,6 @@ def convertir_documento_office_a_pdf(archivo, extension):
     with tempfile.TemporaryDirectory(prefix="rendicion-office-") as temp_dir:
         temp_path = Path(temp_dir)
         input_path = temp_path / f"documento{extension}"
-        output_path = temp_path / "documento.pdf"
-        profile_uri = (temp_path / "libreoffice-profile").resolve().as_uri()
 
         try:
             archivo.open("rb")
@@ -164,28 +163,9 @@ def convertir_documento_office_a_pdf(archivo, extension):
         finally:
             cerrar_archivo_seguro(archivo)
 
-        result = subprocess.run(
-            [
-                "libreoffice",
-                "--headless",
-                "--nologo",
-                "--nodefault",
-                "--nofirststartwizard",
-                f"-env:UserInstallation={profile_uri}",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                str(temp_path),
-                str(input_path),
-            ],
-            capture_output=True,
-            check=False,
-            timeout=120,
+        return convertir_a_pdf(
+            input_path, error_message="LibreOffice no generó el archivo PDF."
         )
-        if result.returncode != 0 or not output_path.exists():
-            detalle = result.stderr.decode("utf-8", errors="replace").strip()
-            raise RuntimeError(detalle or "LibreOffice no generó el archivo PDF.")
-        return output_path.read_bytes()
 
 
 def iterar_documentos_para_pdf(categorias):
@@ -1,6 +1,7 @@
 """DB-backed regression tests for admisiones service helpers."""
 
 import pytest
+from django.core.exceptions import ValidationError
 
 from admisiones.models.admisiones import (
     Admision,
@@ -53,3 +54,13 @@ def test_todos_obligatorios_tienen_archivos_evita_n_plus_one(
         assert (
             module.AdmisionService._todos_obligatorios_tienen_archivos(admision) is True
         )
+
+
+def test_baja_masiva_de_archivos_respeta_guarda_de_rectificar():
+    admision = _crear_admision_con_documentos_obligatorios(cantidad=2)
+    ArchivoAdmision.objects.filter(admision=admision).update(rectificar=True)
+
+    with pytest.raises(ValidationError):
+        ArchivoAdmision.objects.filter(admision=admision).delete()
+
+    assert ArchivoAdmision.objects.filter(admision=admision).count() == 2
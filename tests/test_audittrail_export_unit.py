@@ -0,0 +1,133 @@
+"""Tests del listado keyset y las exportaciones por bloques de auditoría."""
+
+import csv
+import io
+from datetime import timedelta
+
+import pytest
+from auditlog.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from audittrail.services import query_service
+from comedores.models import Comedor
+from core.pagination import iter_keyset
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_client(client):
+    user = get_user_model().objects.create_superuser(username="auditor", password="x")
+    client.force_login(user)
+    return client
+
+
+def _entries(total, timestamp=None):
+    content_type = ContentType.objects.get_for_model(Comedor)
+    base = timestamp or timezone.now()
+    return LogEntry.objects.bulk_create(
+        LogEntry(
+            content_type=content_type,
+            object_pk=str(index),
+            object_repr=f"Comedor {index}",
+            action=LogEntry.Action.UPDATE,
+            changes={"nombre": [f"a{index}", f"b{index}"]},
+            # Con timestamp fijo todas las filas empatan en el primer campo.
+            timestamp=base if timestamp else base - timedelta(seconds=index),
+        )
+        for index in range(total)
+    )
+
+
+def _export_params(export_format):
+    today = timezone.localdate()
+    return {
+        "export": export_format,
+        "start_date": (today - timedelta(days=1)).isoformat(),
+        "end_date": today.isoformat(),
+    }
+
+
+def test_allowlist_filtra_por_ids_de_content_type_sin_join():
+    query_service.get_tracked_content_type_ids()
+    with CaptureQueriesContext(connection) as ctx:
+        ids = query_service.get_tracked_content_type_ids()
+        sql = str(query_service.get_base_queryset().query)
+
+    assert ctx.captured_queries == []
+    assert ContentType.objects.get_for_model(Comedor).pk in ids
+    assert "content_type_id` IN" in sql or 'content_type_id" IN' in sql
+    assert "WHERE" in sql and "django_content_type.app_label" not in sql
+
+
+def test_iter_keyset_recorre_empates_de_timestamp_sin_repetir():
+    _entries(7, timestamp=timezone.now())
+
+    ids = [
+        entry.pk
+        for entry in iter_keyset(
+            LogEntry.objects.all(), query_service.LIST_ORDERING, chunk_size=2
+        )
+    ]
+
+    assert ids == sorted(ids, reverse=True)
+    assert len(set(ids)) == 7
+
+
+def test_listado_pagina_por_cursor(admin_client):
+    _entries(30)
+    url = reverse("audittrail:log_list")
+
+    first = admin_client.get(url)
+    page = first.context["page_obj"]
+    assert len(page.object_list) == 25 and page.has_next()
+
+    second = admin_client.get(url, {"page": 2, "cursor": page.next_cursor})
+    second_page = second.context["page_obj"]
+    first_ids = {entry.pk for entry in page.object_list}
+    second_ids = {entry.pk for entry in second_page.object_list}
+    assert not first_ids & second_ids
+    # Incluye el alta del usuario, que también se audita.
+    assert len(first_ids | second_ids) == LogEntry.objects.count()
+    assert not second_page.has_next()
+    assert "cursor=" in second.content.decode()
+
+
+def test_exportacion_csv_en_streaming(admin_client, monkeypatch):
+    monkeypatch.setattr(query_service, "EXPORT_CHUNK_SIZE", 4)
+    _entries(10)
+
+    response = admin_client.get(reverse("audittrail:log_list"), _export_params("csv"))
+
+    assert response.streaming
+    rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert rows[0][0] == "event_id"
+    assert len(rows) == LogEntry.objects.count() + 1
+
+
+def test_exportacion_xlsx(admin_client):
+    _entries(3)
+
+    response = admin_client.get(reverse("audittrail:log_list"), _export_params("xlsx"))
+
+    content = b"".join(response.streaming_content)
+    sheet = load_workbook(io.BytesIO(content), read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0][0] == "event_id"
+    assert len(rows) == LogEntry.objects.count() + 1
+
+
+def test_json_mantiene_tope_en_memoria(admin_client, monkeypatch):
+    monkeypatch.setattr(query_service, "EXPORT_JSON_MAX_ROWS", 2)
+    _entries(3)
+
+    response = admin_client.get(reverse("audittrail:log_list"), _export_params("json"))
+
+    assert response.status_code == 200
+    assert "excede el máximo permitido (2 filas)" in response.content.decode()
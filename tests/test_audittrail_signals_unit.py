@@ -66,22 +66,29 @@ def test_log_creation_signals_for_admision_intervencion_relevamiento(mocker):
     assert log_comedor.called
 
 
-def test_cache_and_log_referente_update(mocker):
-    sender = SimpleNamespace(
-        objects=SimpleNamespace(
-            get=lambda **_k: SimpleNamespace(
-                nombre="A",
-                apellido="B",
-                mail="a@a",
-                celular="1",
-                documento="2",
-                funcion="F",
-            )
-        ),
-        DoesNotExist=Exception,
-        _meta=_Meta(),
-    )
-    inst = SimpleNamespace(
+class _Tracked(SimpleNamespace):
+    """Instancia falsa con la API de FieldTrackingMixin."""
+
+    def __init__(self, previous=None, **values):
+        super().__init__(**values)
+        self._previous = previous or {}
+
+    def previous_value(self, field_name, default=None):
+        return self._previous.get(field_name, default)
+
+    def changed_fields(self, fields):
+        return [
+            name
+            for name in fields
+            if name in self._previous
+            and self._previous[name] != getattr(self, f"{name}_id", getattr(self, name))
+        ]
+
+
+def test_log_referente_update_uses_tracked_previous_values(mocker):
+    sender = SimpleNamespace(_meta=_Meta())
+    inst = _Tracked(
+        previous={"nombre": "A", "apellido": "B", "documento": "2"},
         pk=1,
         nombre="A2",
         apellido="B",
@@ -91,41 +98,35 @@ def test_cache_and_log_referente_update(mocker):
         funcion="F",
     )
 
-    module.cache_referente_state(sender, inst)
-    assert getattr(inst, "_previous_state", None) is not None
-
     log_comedor = mocker.patch("audittrail.signals._log_comedor_event")
     mocker.patch("audittrail.signals.Comedor.objects.filter", return_value=["c1", "c2"])
     module.log_referente_update(sender, inst, created=False)
     assert log_comedor.call_count == 2
-    assert not hasattr(inst, "_previous_state")
+    assert log_comedor.call_args.args[1] == {"Referente: nombre": ["A", "A2"]}
 
 
-def test_cache_and_log_imagen_comedor_change_and_delete(mocker):
-    previous = SimpleNamespace(imagen=SimpleNamespace(name="old.jpg"), comedor_id=1)
-    sender = SimpleNamespace(
-        objects=SimpleNamespace(get=lambda **_k: previous), DoesNotExist=Exception
-    )
-
-    inst = SimpleNamespace(
+def test_log_imagen_comedor_change_and_delete(mocker):
+    inst = _Tracked(
+        previous={"imagen": "old.jpg", "comedor": 1},
         pk=1,
         imagen=SimpleNamespace(name="new.jpg"),
         comedor_id=2,
         comedor="comedor",
     )
-    module.cache_imagen_comedor_state(sender, inst)
-    assert getattr(inst, "_previous_imagen", None)["imagen"] == "old.jpg"
+    inst.changed_fields = lambda fields: ["imagen", "comedor"]
 
     log_comedor = mocker.patch("audittrail.signals._log_comedor_event")
-    module.log_imagen_comedor_change(sender, inst, created=False)
-    assert log_comedor.called
-    assert not hasattr(inst, "_previous_imagen")
+    module.log_imagen_comedor_change(None, inst, created=False)
+    assert log_comedor.call_args.args[1] == {
+        "Imagen": ["old.jpg", "new.jpg"],
+        "Imagen: Comedor": [1, 2],
+    }
 
     module.log_imagen_comedor_change(
-        sender, SimpleNamespace(imagen=None, comedor="comedor"), created=True
+        None, SimpleNamespace(imagen=None, comedor="comedor"), created=True
     )
     module.log_imagen_comedor_deletion(
-        sender, SimpleNamespace(imagen=None, comedor="comedor")
+        None, SimpleNamespace(imagen=None, comedor="comedor")
     )
     assert log_comedor.call_count >= 3
 
@@ -145,17 +146,20 @@ def test_firmante_and_aval_changes(mocker):
     module.log_firmante_changes(None, firmante, created=True)
     assert log_org.called
 
-    # Firmante updated
-    firmante2 = SimpleNamespace(
+    # Firmante updated (nombre/cuit, sin cambio de rol: no se consulta el rol)
+    firmante2 = _Tracked(
+        previous={"nombre": "A", "cuit": "1", "rol": 1},
         organizacion="org",
-        _previous_state=SimpleNamespace(nombre="A", cuit="1", rol_id=1, rol="R1"),
         nombre="B",
         cuit="2",
-        rol_id=2,
-        rol="R2",
+        rol_id=1,
+        rol="R1",
     )
     module.log_firmante_changes(None, firmante2, created=False)
-    assert not hasattr(firmante2, "_previous_state")
+    assert log_org.call_args.args[1] == {
+        "Firmante: Nombre": ["A", "B"],
+        "Firmante: CUIT": ["1", "2"],
+    }
 
     # Aval created + updated
     aval = SimpleNamespace(
@@ -163,40 +167,14 @@ def test_firmante_and_aval_changes(mocker):
     )
     module.log_aval_changes(None, aval, created=True)
 
-    aval2 = SimpleNamespace(
+    aval2 = _Tracked(
+        previous={"nombre": "N1", "cuit": "2"},
         organizacion="org",
-        _previous_state=SimpleNamespace(nombre="N1", cuit="1"),
         nombre="N2",
         cuit="2",
     )
     module.log_aval_changes(None, aval2, created=False)
-    assert not hasattr(aval2, "_previous_state")
-
-
-def test_cache_firmante_and_aval_state_does_not_exist_paths():
-    sender_f = SimpleNamespace(
-        objects=SimpleNamespace(
-            select_related=lambda *_: SimpleNamespace(
-                get=lambda **_k: (_ for _ in ()).throw(Exception())
-            )
-        ),
-        DoesNotExist=Exception,
-    )
-    inst_f = SimpleNamespace(pk=1)
-    module.cache_firmante_state(sender_f, inst_f)
-    assert getattr(inst_f, "_previous_state", None) is None
-
-    sender_a = SimpleNamespace(
-        objects=SimpleNamespace(
-            select_related=lambda *_: SimpleNamespace(
-                get=lambda **_k: (_ for _ in ()).throw(Exception())
-            )
-        ),
-        DoesNotExist=Exception,
-    )
-    inst_a = SimpleNamespace(pk=1)
-    module.cache_aval_state(sender_a, inst_a)
-    assert getattr(inst_a, "_previous_state", None) is None
+    assert log_org.call_args.args[1] == {"Aval: Nombre": ["N1", "N2"]}
 
 
 def test_firmante_and_aval_delete_signals_without_duplicates(mocker):
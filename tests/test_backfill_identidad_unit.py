@@ -12,7 +12,8 @@ from io import StringIO
 import pytest
 from django.core.management import call_command
 
-from ciudadanos.models import Ciudadano
+from ciudadanos.models import Ciudadano, CiudadanoTerminoBusqueda
+from ciudadanos.services_busqueda import terminos_de_ciudadano
 
 
 def _ciudadano(**kwargs):
@@ -112,3 +113,25 @@ def test_dry_run_no_escribe_en_db():
     c.refresh_from_db()
     assert c.identificador_interno is None
     assert c.tipo_registro_identidad == Ciudadano.TIPO_REGISTRO_ESTANDAR  # default
+
+
+@pytest.mark.django_db
+def test_backfill_reindexa_terminos_de_busqueda():
+    c = _ciudadano(documento=None, nombre="Ana", apellido="Paz")
+    Ciudadano.all_objects.filter(pk=c.pk).update(identificador_interno=None)
+
+    call_command(
+        "backfill_identidad", batch_size=1, stdout=StringIO(), stderr=StringIO()
+    )
+
+    c.refresh_from_db()
+    esperados = set(terminos_de_ciudadano("Paz", "Ana", c.identificador_interno))
+    assert (
+        set(
+            CiudadanoTerminoBusqueda.objects.filter(ciudadano=c).values_list(
+                "termino", flat=True
+            )
+        )
+        == esperados
+    )
+    assert esperados > {"paz", "ana"}
@@ -0,0 +1,106 @@
+"""Tests for core cache utils (namespaces versionados y backend compartido)."""
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+
+from core import cache_utils
+from core.cache_utils import (
+    DASHBOARD_CACHE_NAMESPACE,
+    bump_namespace_version,
+    comedor_cache_namespace,
+    get_namespace_version,
+    invalidate_cache_pattern,
+    invalidate_comedor_cache,
+    namespaced_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _fake_redis_cache():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisCache(
+        "redis://cache-tests:6379/0",
+        {
+            "KEY_PREFIX": "sisoc-tests",
+            "OPTIONS": {"connection_class": fakeredis.FakeRedisConnection},
+        },
+    )
+
+
+def test_namespaced_key_is_stable_until_bump():
+    first = namespaced_key("pruebas", "total")
+
+    assert namespaced_key("pruebas", "total") == first
+
+    bump_namespace_version("pruebas")
+
+    assert namespaced_key("pruebas", "total") != first
+
+
+def test_bump_namespace_version_initializes_missing_version():
+    new_version = bump_namespace_version("sin_version")
+
+    assert get_namespace_version("sin_version") == new_version
+
+
+def test_invalidate_cache_pattern_bumps_namespace():
+    version = get_namespace_version(DASHBOARD_CACHE_NAMESPACE)
+
+    new_version = invalidate_cache_pattern(f"{DASHBOARD_CACHE_NAMESPACE}:*")
+
+    assert new_version == version + 1
+    assert get_namespace_version(DASHBOARD_CACHE_NAMESPACE) == new_version
+
+
+def test_invalidate_cache_pattern_without_namespace_is_noop():
+    assert invalidate_cache_pattern("*") is None
+
+
+def test_invalidate_comedor_cache_only_touches_that_comedor():
+    key_comedor_1 = namespaced_key(comedor_cache_namespace(1), "presupuestos")
+    key_comedor_2 = namespaced_key(comedor_cache_namespace(2), "presupuestos")
+    cache.set(key_comedor_1, ("a",))
+    cache.set(key_comedor_2, ("b",))
+
+    invalidate_comedor_cache(1)
+
+    new_key_comedor_1 = namespaced_key(comedor_cache_namespace(1), "presupuestos")
+    assert cache.get(new_key_comedor_1) is None
+    assert cache.get(namespaced_key(comedor_cache_namespace(2), "presupuestos")) == (
+        "b",
+    )
+
+
+def test_namespace_invalidation_is_shared_between_workers(monkeypatch):
+    worker_a = _fake_redis_cache()
+    worker_b = _fake_redis_cache()
+    worker_a.clear()
+
+    monkeypatch.setattr(cache_utils, "cache", worker_a)
+    key = namespaced_key(DASHBOARD_CACHE_NAMESPACE, "contar_comedores_activos")
+    worker_a.set(key, 10)
+
+    monkeypatch.setattr(cache_utils, "cache", worker_b)
+    assert (
+        worker_b.get(
+            namespaced_key(DASHBOARD_CACHE_NAMESPACE, "contar_comedores_activos")
+        )
+        == 10
+    )
+
+    cache_utils.invalidate_dashboard_cache()
+
+    monkeypatch.setattr(cache_utils, "cache", worker_a)
+    assert (
+        worker_a.get(
+            namespaced_key(DASHBOARD_CACHE_NAMESPACE, "contar_comedores_activos")
+        )
+        is None
+    )
@@ -0,0 +1,108 @@
+"""Tests de la busqueda indexada de ciudadanos por nombre."""
+
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ciudadanos.models import Ciudadano, CiudadanoTerminoBusqueda
+from ciudadanos.services_busqueda import (
+    buscar_ciudadanos_por_nombre,
+    filtrar_por_nombre,
+    terminos_de_consulta,
+    tokenizar,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _crear(apellido, nombre, documento, **extra):
+    return Ciudadano.objects.create(
+        apellido=apellido,
+        nombre=nombre,
+        documento=documento,
+        fecha_nacimiento=date(1990, 1, 1),
+        **extra,
+    )
+
+
+def _terminos(ciudadano):
+    return set(
+        CiudadanoTerminoBusqueda.objects.filter(ciudadano=ciudadano).values_list(
+            "termino", flat=True
+        )
+    )
+
+
+def test_tokenizar_normaliza_y_parte_puntuacion():
+    assert tokenizar("  Núñez D'Angelo ") == ["nunez", "d", "angelo", "dangelo"]
+    assert tokenizar(None) == []
+    assert terminos_de_consulta("garcia j") == ["garcia"]
+    assert terminos_de_consulta("j") == ["j"]
+
+
+def test_alta_y_cambio_de_nombre_sincronizan_terminos():
+    ciudadano = _crear("Gómez", "María José", 30111222)
+    assert _terminos(ciudadano) == {"gomez", "maria", "jose"}
+
+    ciudadano.apellido = "Pereyra"
+    ciudadano.save()
+    assert _terminos(ciudadano) == {"pereyra", "maria", "jose"}
+
+
+def test_guardado_sin_cambios_indexados_no_reescribe():
+    ciudadano = _crear("Gomez", "Ana", 30111223)
+    ciudadano.documento = 30111224
+
+    with CaptureQueriesContext(connection) as ctx:
+        ciudadano.save()
+
+    tabla = CiudadanoTerminoBusqueda._meta.db_table
+    assert not [q for q in ctx.captured_queries if tabla in q["sql"]]
+
+
+def test_busqueda_por_prefijos_en_cualquier_orden(settings):
+    settings.CIUDADANOS_BUSQUEDA_INDEXADA_ENABLED = True
+    ana = _crear("Garcia", "Ana Julia", 30111225)
+    _crear("Garcia", "Pedro", 30111226)
+    _crear("Lopez", "Julia", 30111227)
+
+    resultados = filtrar_por_nombre(Ciudadano.objects.all(), "jul garc")
+
+    assert list(resultados) == [ana]
+
+
+def test_relevancia_prioriza_palabras_completas(settings):
+    settings.CIUDADANOS_BUSQUEDA_INDEXADA_ENABLED = True
+    acosta = _crear("Acosta", "Perezoso", 30111228)
+    zapata = _crear("Zapata", "Perez", 30111229)
+
+    # Sin coincidencia completa se ordena por apellido.
+    assert list(buscar_ciudadanos_por_nombre("pere")) == [acosta, zapata]
+    assert list(buscar_ciudadanos_por_nombre("perez")) == [zapata, acosta]
+
+
+def test_buscar_respeta_flag_y_documento(settings):
+    ciudadano = _crear("Sosa", "Carla", 30111230)
+
+    settings.CIUDADANOS_BUSQUEDA_INDEXADA_ENABLED = False
+    assert list(Ciudadano.buscar("sosa")) == []
+
+    settings.CIUDADANOS_BUSQUEDA_INDEXADA_ENABLED = True
+    assert list(Ciudadano.buscar("sosa")) == [ciudadano]
+    assert list(Ciudadano.buscar("3011123")) == [ciudadano]
+
+
+def test_comando_reindexar_reconstruye_terminos():
+    ciudadano = _crear("Rios", "Juan", 30111231)
+    Ciudadano.objects.filter(pk=ciudadano.pk).update(apellido="Paz")
+    out = StringIO()
+
+    call_command("reindexar_busqueda_ciudadanos", batch_size=1, stdout=out)
+
+    assert _terminos(ciudadano) == {"paz", "juan"}
+    assert "procesados: 1" in out.getvalue()
+    assert "terminos: 2" in out.getvalue()
@@ -21,14 +21,13 @@ from ciudadanos.services_importacion_masiva import (
     parse_cuil_o_dni,
 )
 from ciudadanos.services_importacion_masiva_jobs import (
-    STALE_JOB_ERROR_MESSAGE,
+    CIUDADANOS_IMPORT_JOB_QUEUE,
     can_resume_ciudadanos_import_job,
     create_ciudadanos_import_job,
-    mark_stale_ciudadanos_import_jobs_as_failed,
     process_ciudadanos_import_job,
     request_resume_ciudadanos_import_job,
-    run_ciudadanos_import_jobs_worker,
 )
+from ciudadanos.services_importacion_masiva_renaper import RenaperRequestBudget
 from ciudadanos.views import CiudadanosListView
 from ciudadanos.views_importacion_masiva import (
     CiudadanosImportJobExportView,
@@ -37,6 +36,8 @@ from ciudadanos.views_importacion_masiva import (
     CiudadanosImportTemplateView,
     CiudadanosImportUploadView,
 )
+from core.jobs.engine import mark_stale_processing_jobs
+from core.jobs.registry import STALE_JOB_ERROR_MESSAGE
 from core.models import Localidad, Municipio, Nacionalidad, Provincia, Sexo
 
 User = get_user_model()
@@ -217,7 +218,7 @@ def test_create_ciudadanos_import_job_persists_pending_job():
 
 
 @pytest.mark.django_db
-@override_settings(CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS=0)
+@override_settings(CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=1)
 def test_process_ciudadanos_import_job_creates_existing_and_failed_rows(mocker):
     user = User.objects.create_user(username="ciudadanos_import_processor")
     existing = Ciudadano.objects.create(
@@ -274,7 +275,7 @@ def test_process_ciudadanos_import_job_creates_existing_and_failed_rows(mocker):
 
 
 @pytest.mark.django_db
-@override_settings(CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS=0)
+@override_settings(CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=1)
 def test_process_ciudadanos_import_job_tries_all_sexes_when_missing(mocker):
     user = User.objects.create_user(username="ciudadanos_import_fallback")
     upload = _build_excel_file([("30111222", "")])
@@ -301,7 +302,7 @@ def test_process_ciudadanos_import_job_tries_all_sexes_when_missing(mocker):
 
 
 @pytest.mark.django_db
-@override_settings(CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS=0)
+@override_settings(CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=1)
 def test_process_ciudadanos_import_job_fails_row_on_cuil_mismatch_and_continues(
     mocker,
 ):
@@ -335,7 +336,7 @@ def test_process_ciudadanos_import_job_fails_row_on_cuil_mismatch_and_continues(
 
 
 @pytest.mark.django_db
-@override_settings(CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS=0)
+@override_settings(CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=1)
 def test_process_ciudadanos_import_job_continues_after_invalid_short_dni(mocker):
     user = User.objects.create_user(username="ciudadanos_import_invalid_dni")
     upload = _build_excel_file(
@@ -363,7 +364,7 @@ def test_process_ciudadanos_import_job_continues_after_invalid_short_dni(mocker)
 
 
 @pytest.mark.django_db
-@override_settings(CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS=0)
+@override_settings(CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=1)
 def test_process_ciudadanos_import_job_continues_after_renaper_unexpected_error(
     mocker,
 ):
@@ -399,7 +400,7 @@ def test_process_ciudadanos_import_job_continues_after_renaper_unexpected_error(
 
 
 @pytest.mark.django_db
-@override_settings(CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS=0)
+@override_settings(CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=1)
 def test_process_ciudadanos_import_job_records_unexpected_row_error_detail(mocker):
     user = User.objects.create_user(username="ciudadanos_import_row_exception")
     upload = _build_excel_file(
@@ -409,6 +410,10 @@ def test_process_ciudadanos_import_job_records_unexpected_row_error_detail(mocke
         ]
     )
     job = create_ciudadanos_import_job(uploaded_file=upload, requested_by=user)
+    mocker.patch(
+        "ciudadanos.services_importacion_masiva.consultar_datos_renaper",
+        return_value=_renaper_error("No se encontraron datos.", "not_found"),
+    )
     mocker.patch(
         "ciudadanos.services_importacion_masiva_jobs.process_ciudadanos_import_row",
         side_effect=[
@@ -437,7 +442,7 @@ def test_process_ciudadanos_import_job_records_unexpected_row_error_detail(mocke
 
 
 @pytest.mark.django_db
-@override_settings(CIUDADANOS_IMPORT_RENAPER_SLEEP_SECONDS=0)
+@override_settings(CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=1)
 def test_process_ciudadanos_import_job_pauses_on_systemic_error_and_resumes(mocker):
     user = User.objects.create_user(username="ciudadanos_import_pause")
     upload = _build_excel_file([("30111222", "M")])
@@ -474,6 +479,80 @@ def test_process_ciudadanos_import_job_pauses_on_systemic_error_and_resumes(mock
     assert row.attempts == 2
 
 
+@pytest.mark.django_db
+@override_settings(
+    CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=4,
+    CIUDADANOS_IMPORT_RENAPER_MAX_RPS=0,
+)
+def test_process_ciudadanos_import_job_prefetches_renaper_concurrently(mocker):
+    user = User.objects.create_user(username="ciudadanos_import_concurrent")
+    Ciudadano.objects.create(
+        apellido="Existente",
+        nombre="Ciudadano",
+        tipo_documento=Ciudadano.DOCUMENTO_DNI,
+        documento=30111200,
+        tipo_registro_identidad=Ciudadano.TIPO_REGISTRO_ESTANDAR,
+    )
+    dnis = [str(30111200 + offset) for offset in range(12)]
+    upload = _build_excel_file([(dni, "M") for dni in dnis])
+    job = create_ciudadanos_import_job(uploaded_file=upload, requested_by=user)
+    mock_consultar = mocker.patch(
+        "ciudadanos.services_importacion_masiva.consultar_datos_renaper",
+        side_effect=lambda dni, sexo: _renaper_success(dni=dni, sexo=sexo),
+    )
+
+    process_ciudadanos_import_job(job)
+    job.refresh_from_db()
+
+    assert job.status == CiudadanosImportJob.Status.COMPLETED
+    assert job.created_rows == 11
+    assert job.existing_rows == 1
+    assert job.next_row_index == 12
+    # El ciudadano existente no se consulta a RENAPER.
+    assert sorted(call.args[0] for call in mock_consultar.call_args_list) == dnis[1:]
+    created = job.rows.filter(status=CiudadanosImportJobRow.Status.CREATED)
+    assert {row.dni for row in created} == {
+        str(ciudadano.documento) for ciudadano in (row.ciudadano for row in created)
+    }
+
+
+@pytest.mark.django_db
+@override_settings(
+    CIUDADANOS_IMPORT_RENAPER_MAX_IN_FLIGHT=3,
+    CIUDADANOS_IMPORT_RENAPER_MAX_RPS=0,
+)
+def test_process_ciudadanos_import_job_resume_only_prefetches_pending_rows(mocker):
+    user = User.objects.create_user(username="ciudadanos_import_resume_prefetch")
+    dnis = [str(30111300 + offset) for offset in range(6)]
+    upload = _build_excel_file([(dni, "M") for dni in dnis])
+    job = create_ciudadanos_import_job(uploaded_file=upload, requested_by=user)
+    CiudadanosImportJob.objects.filter(pk=job.pk).update(next_row_index=4)
+    job.refresh_from_db()
+    mock_consultar = mocker.patch(
+        "ciudadanos.services_importacion_masiva.consultar_datos_renaper",
+        side_effect=lambda dni, sexo: _renaper_success(dni=dni, sexo=sexo),
+    )
+
+    process_ciudadanos_import_job(job)
+
+    assert sorted(call.args[0] for call in mock_consultar.call_args_list) == dnis[4:]
+
+
+def test_renaper_request_budget_waits_when_window_is_full(mocker):
+    hit = mocker.patch(
+        "ciudadanos.services_importacion_masiva_renaper.hit_rate_limit",
+        side_effect=[True, True, False],
+    )
+    sleep = mocker.patch("ciudadanos.services_importacion_masiva_renaper.time.sleep")
+
+    RenaperRequestBudget(4).acquire()
+
+    assert hit.call_count == 3
+    assert [call.args for call in sleep.call_args_list] == [(0.25,), (0.25,)]
+    assert hit.call_args.kwargs["window_seconds"] == 1
+    assert hit.call_args.kwargs["limit"] == 4
+
+
 @pytest.mark.django_db
 def test_mark_stale_ciudadanos_import_jobs_as_failed():
     user = User.objects.create_user(username="ciudadanos_import_stale")
@@ -485,12 +564,13 @@ def test_mark_stale_ciudadanos_import_jobs_as_failed():
         last_activity_at=timezone.now() - timedelta(seconds=901),
     )
 
-    updated_count = mark_stale_ciudadanos_import_jobs_as_failed()
+    updated_count = mark_stale_processing_jobs(CIUDADANOS_IMPORT_JOB_QUEUE)
     job.refresh_from_db()
 
     assert updated_count == 1
     assert job.status == CiudadanosImportJob.Status.FAILED
     assert job.last_error_message == STALE_JOB_ERROR_MESSAGE
+    assert job.last_error_type == "stale_job"
 
 
 @pytest.mark.django_db
@@ -769,25 +849,12 @@ def test_ciudadanos_import_resume_view_marks_failed_job_pending():
 def test_process_ciudadanos_import_jobs_command_invokes_worker_once(mocker):
     mock_worker = mocker.patch(
         "ciudadanos.management.commands.process_ciudadanos_import_jobs."
-        "run_ciudadanos_import_jobs_worker"
+        "run_job_worker"
     )
 
     call_command("process_ciudadanos_import_jobs", "--once")
 
-    mock_worker.assert_called_once_with(once=True)
-
-
-@pytest.mark.django_db
-def test_run_ciudadanos_import_jobs_worker_once_processes_one_cycle(mocker):
-    mock_process_next = mocker.patch(
-        "ciudadanos.services_importacion_masiva_jobs."
-        "process_next_ciudadanos_import_job",
-        return_value=False,
-    )
-
-    run_ciudadanos_import_jobs_worker(once=True)
-
-    mock_process_next.assert_called_once_with()
+    mock_worker.assert_called_once_with(queue_names=["ciudadanos_import"], once=True)
 
 
 @pytest.mark.django_db
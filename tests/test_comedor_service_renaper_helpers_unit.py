@@ -10,25 +10,7 @@ from django.db import IntegrityError
 from ciudadanos.models import Ciudadano
 from comedores.services import comedor_service as module
 from comedores.views import comedor as comedor_views_module
-
-
-class _QS(list):
-    def filter(self, **kwargs):
-        out = list(self)
-        if "provincia" in kwargs:
-            prov = kwargs["provincia"]
-            out = [x for x in out if getattr(x, "provincia", None) == prov]
-        if "municipio" in kwargs:
-            mun = kwargs["municipio"]
-            out = [x for x in out if getattr(x, "municipio", None) == mun]
-        if "municipio__provincia" in kwargs:
-            prov = kwargs["municipio__provincia"]
-            out = [
-                x
-                for x in out
-                if getattr(getattr(x, "municipio", None), "provincia", None) == prov
-            ]
-        return _QS(out)
+from core.services.gazetteer import Gazetteer
 
 
 class _ComedoresListQS:
@@ -152,21 +134,15 @@ def test_parse_fecha_and_text_normalizers():
 
 
 def test_match_geo_mapear_and_nacionalidad(mocker):
-    prov = SimpleNamespace(pk=1, nombre="Buenos Aires")
-    mun = SimpleNamespace(pk=2, nombre="General Pueyrredon", provincia=prov)
-    loc = SimpleNamespace(pk=3, nombre="Mar del Plata", municipio=mun)
-
-    mocker.patch(
-        "comedores.services.comedor_service.impl.Provincia.objects.all",
-        return_value=_QS([prov]),
-    )
-    mocker.patch(
-        "comedores.services.comedor_service.impl.Municipio.objects.all",
-        return_value=_QS([mun]),
+    gazetteer = Gazetteer(
+        provincias=[(1, "Buenos Aires"), (5, "Ciudad Autónoma de Buenos Aires")],
+        municipios=[(2, "General Pueyrredon", 1), (9, "Veinticinco de Mayo", 1)],
+        localidades=[(3, "Mar del Plata", 2), (4, "Mar del Plata", 9)],
+        nacionalidades=[(8, "Argentina")],
     )
     mocker.patch(
-        "comedores.services.comedor_service.impl.Localidad.objects.all",
-        return_value=_QS([loc]),
+        "comedores.services.comedor_service.impl.get_gazetteer",
+        return_value=gazetteer,
     )
 
     mapped = module.ComedorService._mapear_ubicacion_desde_renaper(
@@ -176,16 +152,32 @@ def test_match_geo_mapear_and_nacionalidad(mocker):
             "localidad_api": "mar del plata",
         }
     )
-    assert mapped["provincia"] is prov
-    assert mapped["municipio"] is mun
-    assert mapped["localidad"] is loc
+    assert mapped["provincia"].pk == 1
+    assert mapped["municipio"].pk == 2
+    assert mapped["municipio"].provincia_id == 1
+    assert mapped["localidad"].pk == 3
 
-    nac = SimpleNamespace(pk=8, nacionalidad="Argentina")
-    mocker.patch(
-        "comedores.services.comedor_service.impl.Nacionalidad.objects.all",
-        return_value=[nac],
+    mapped = module.ComedorService._mapear_ubicacion_desde_renaper(
+        {
+            "provincia_api": "BUENOS-AIRES",
+            "municipio_api": "25 de Mayo",
+            "localidad_api": "Mar del Plata",
+        }
     )
-    assert module.ComedorService._match_nacionalidad("argentina") is nac
+    assert mapped["municipio"].pk == 9
+    assert mapped["localidad"].pk == 4
+
+    mapped = module.ComedorService._mapear_ubicacion_desde_renaper(
+        {"provincia_api": "CABA", "localidad_api": "Inexistente"}
+    )
+    assert mapped["provincia"].pk == 5
+    assert mapped["municipio"] is None
+    assert mapped["localidad"] is None
+
+    nac = module.ComedorService._match_nacionalidad("argentina")
+    assert nac.pk == 8
+    assert nac.nacionalidad == "Argentina"
+    assert module.ComedorService._match_nacionalidad("marciana") is None
 
 
 def test_consultar_renaper_and_build_data(mocker):
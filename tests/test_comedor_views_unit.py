@@ -183,7 +183,13 @@ def test_comedor_detail_get_object_presupuestos_and_post_paths(mocker):
 
     # get_presupuestos_data cache hit
     view.object = SimpleNamespace(id=1, relevamientos_optimized=[1])
-    mocker.patch("comedores.views.comedor.cache.get", return_value=(1, 2, 3, 4, 5, 6))
+    # Solo la clave de presupuestos: la version del namespace tambien usa cache.get.
+    mocker.patch(
+        "comedores.views.comedor.cache.get",
+        side_effect=lambda key, default=None: (
+            (1, 2, 3, 4, 5, 6) if key.endswith(":presupuestos") else 1
+        ),
+    )
     data = view.get_presupuestos_data()
     assert data["count_beneficiarios"] == 1
     assert data["monto_prestacion_mensual"] == 6
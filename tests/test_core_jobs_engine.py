@@ -0,0 +1,249 @@
+"""Tests del motor unificado de jobs en background (core.jobs)."""
+
+import threading
+import time
+from dataclasses import replace
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.utils import timezone
+
+from core.jobs import engine
+from core.jobs.engine import claim_next_job, process_job, run_job_worker
+from core.jobs.registry import obtener_colas_jobs, registrar_cola_jobs
+from core.models import JobQueueLock
+from ocr.models import OCRJob
+from ocr.services_ocr_jobs import OCR_JOB_QUEUE, create_ocr_job
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(name="user")
+def user_fixture():
+    return get_user_model().objects.create_user(username="jobs", password="pass")
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(engine.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def _queue(**overrides):
+    return replace(OCR_JOB_QUEUE, **overrides)
+
+
+def test_todas_las_colas_de_dominio_quedan_registradas():
+    nombres = [queue.name for queue in obtener_colas_jobs()]
+
+    assert nombres == [
+        "bulk_credentials",
+        "ciudadanos_import",
+        "imagenes",
+        "mailing",
+        "ocr",
+        "user_import",
+    ]
+
+
+def test_registrar_cola_con_nombre_existente_y_otra_definicion_falla():
+    registrar_cola_jobs(OCR_JOB_QUEUE)
+
+    with pytest.raises(ValueError):
+        registrar_cola_jobs(_queue(max_retries=9))
+
+
+def test_claim_toma_el_mas_antiguo_y_lo_marca_en_proceso(user):
+    primero = create_ocr_job(requested_by=user, files=[])
+    create_ocr_job(requested_by=user, files=[])
+
+    job = claim_next_job(OCR_JOB_QUEUE)
+
+    assert job.pk == primero.pk
+    assert job.status == OCRJob.Status.PROCESSING
+    assert job.started_at is not None
+    assert job.last_activity_at is not None
+
+
+def test_claim_respeta_concurrencia_maxima_por_cola(user, settings):
+    settings.JOB_QUEUE_CONCURRENCY = {"ocr": 1}
+    create_ocr_job(requested_by=user, files=[])
+    create_ocr_job(requested_by=user, files=[])
+
+    assert claim_next_job(OCR_JOB_QUEUE) is not None
+    assert claim_next_job(OCR_JOB_QUEUE) is None
+    assert OCRJob.objects.filter(status=OCRJob.Status.PENDING).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_claim_concurrente_no_supera_la_concurrencia_maxima(user, settings):
+    settings.JOB_QUEUE_CONCURRENCY = {"ocr": 1}
+    for _ in range(3):
+        create_ocr_job(requested_by=user, files=[])
+    # Sin el lock de la cola, ambos workers leerian 0 en proceso antes de
+    # que el otro reclame: se espera a que los dos hayan contado.
+    contaron = threading.Barrier(2)
+    contar = engine.count_processing_jobs
+
+    def _contar_y_esperar(queue):
+        total = contar(queue)
+        try:
+            contaron.wait(timeout=0.5)
+        except threading.BrokenBarrierError:
+            pass
+        return total
+
+    reclamados = []
+
+    def _worker():
+        # SQLite en memoria no espera el lock: responde "table is locked" y el
+        # worker reintenta, como haria en el proximo poll.
+        try:
+            for _ in range(100):
+                try:
+                    reclamados.append(claim_next_job(OCR_JOB_QUEUE))
+                    return
+                except OperationalError:
+                    time.sleep(0.05)
+        finally:
+            connection.close()
+
+    with patch.object(engine, "count_processing_jobs", _contar_y_esperar):
+        workers = [threading.Thread(target=_worker) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    assert len([job for job in reclamados if job is not None]) == 1
+    assert OCRJob.objects.filter(status=OCRJob.Status.PROCESSING).count() == 1
+
+
+def test_claim_cuenta_en_proceso_bajo_el_lock_de_la_cola(user, settings):
+    # SQLite serializa las escrituras y no reproduce la carrera de MySQL
+    # (dos workers leyendo "limite - 1"): se verifica que el conteo corre
+    # dentro de la transaccion y despues de tomar el lock de la cola.
+    settings.JOB_QUEUE_CONCURRENCY = {"ocr": 2}
+    create_ocr_job(requested_by=user, files=[])
+    eventos = []
+    lock_queue = engine._lock_queue
+    contar = engine.count_processing_jobs
+
+    def _lock(queue):
+        lock_queue(queue)
+        eventos.append("lock")
+
+    def _contar(queue):
+        eventos.append(("count", connection.in_atomic_block))
+        return contar(queue)
+
+    with (
+        patch.object(engine, "_lock_queue", _lock),
+        patch.object(engine, "count_processing_jobs", _contar),
+    ):
+        assert claim_next_job(OCR_JOB_QUEUE) is not None
+
+    assert eventos == ["lock", ("count", True)]
+    assert JobQueueLock.objects.get(name="ocr").acquired_at is not None
+
+
+def test_process_job_reprograma_el_reintento_sin_dormir(user, _no_sleep):
+    create_ocr_job(requested_by=user, files=[])
+
+    def _broken(_job):
+        raise RuntimeError("tesseract caido")
+
+    queue = _queue(process=_broken, retry_backoff_seconds=2.0)
+    job = claim_next_job(queue)
+    antes = timezone.now()
+
+    assert process_job(queue, job) is False
+    job.refresh_from_db()
+    assert _no_sleep == []
+    assert job.status == OCRJob.Status.PENDING
+    assert job.retry_count == 1
+    assert job.available_at >= antes + timedelta(seconds=2)
+    # Hasta que vence el backoff ningun worker lo reclama.
+    assert claim_next_job(queue) is None
+
+
+def test_reintento_vencido_se_reclama_con_backoff_exponencial(user):
+    create_ocr_job(requested_by=user, files=[])
+    calls = []
+
+    def _flaky(job):
+        calls.append(job.pk)
+        if len(calls) < 3:
+            raise RuntimeError("tesseract caido")
+
+    queue = _queue(process=_flaky, retry_backoff_seconds=2.0)
+    demoras = []
+    for _ in range(3):
+        job = claim_next_job(queue)
+        antes = timezone.now()
+        if process_job(queue, job):
+            break
+        job.refresh_from_db()
+        demoras.append(round((job.available_at - antes).total_seconds()))
+        OCRJob.objects.filter(pk=job.pk).update(available_at=timezone.now())
+
+    job.refresh_from_db()
+    assert len(calls) == 3
+    assert demoras == [2, 4]
+    assert job.retry_count == 2
+    assert job.available_at is None
+
+
+def test_process_job_marca_fallido_al_agotar_reintentos(user):
+    create_ocr_job(requested_by=user, files=[])
+
+    def _broken(_job):
+        raise RuntimeError("boom")
+
+    queue = _queue(process=_broken, max_retries=1)
+    for _ in range(2):
+        job = claim_next_job(queue)
+        assert process_job(queue, job) is False
+        OCRJob.objects.filter(pk=job.pk).update(available_at=None)
+
+    job.refresh_from_db()
+    assert job.status == OCRJob.Status.FAILED
+    assert "boom" in job.last_error_message
+    # Al reanudarlo a mano vuelve a tener todos sus reintentos.
+    assert job.retry_count == 0
+
+
+def test_mark_stale_jobs_usa_la_logica_generica_de_la_cola(user, settings):
+    job = create_ocr_job(requested_by=user, files=[])
+    OCRJob.objects.filter(pk=job.pk).update(
+        status=OCRJob.Status.PROCESSING,
+        last_activity_at=timezone.now() - timedelta(hours=1),
+        retry_count=1,
+    )
+
+    assert engine.mark_stale_jobs([OCR_JOB_QUEUE]) == 1
+    job.refresh_from_db()
+    assert job.status == OCRJob.Status.FAILED
+    assert "timeout de worker" in job.last_error_message
+    assert job.retry_count == 0
+
+
+def test_run_job_worker_once_drena_la_cola(user):
+    for _ in range(3):
+        create_ocr_job(requested_by=user, files=[])
+
+    run_job_worker(queue_names=["ocr"], once=True)
+
+    assert set(OCRJob.objects.values_list("status", flat=True)) == {
+        OCRJob.Status.COMPLETED
+    }
+
+
+def test_process_jobs_command_rechaza_cola_desconocida():
+    with pytest.raises(CommandError):
+        call_command("process_jobs", "--queue", "inexistente", "--once")
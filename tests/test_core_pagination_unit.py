@@ -1,12 +1,21 @@
 """Tests unitarios para core.pagination."""
 
 from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
 
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.models import Municipio, Provincia
 from core.pagination import (
     NoCountPaginator,
     build_compact_page_range,
     build_no_count_page_range,
 )
+from VAT.pagination import VATPageNumberPagination
 
 
 class _ExplodingPageRange:
@@ -91,3 +100,98 @@ def test_build_compact_page_range_falls_back_for_no_count_paginator():
     page_obj = paginator.get_page(2)
 
     assert build_compact_page_range(page_obj) == [1, 2, 3, "..."]
+
+
+def _provincias(*nombres):
+    return [Provincia.objects.create(nombre=nombre).pk for nombre in nombres]
+
+
+@pytest.mark.django_db
+def test_no_count_paginator_keyset_navega_con_cursores_sin_offset():
+    ids = _provincias("A", "B", "C", "D", "E")
+    paginator = NoCountPaginator(
+        Provincia.objects.values_list("pk", flat=True), 2, ordering=("pk",)
+    )
+
+    first = paginator.get_page(1)
+    assert first.object_list == ids[:2]
+    assert first.previous_cursor is None
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = paginator.get_page(99, cursor=first.next_cursor)
+    assert "offset" not in ctx.captured_queries[0]["sql"].lower()
+    assert second.number == 2
+    assert second.object_list == ids[2:4]
+    assert second.has_previous() is True
+
+    last = paginator.get_page(None, cursor=second.next_cursor)
+    assert last.object_list == ids[4:]
+    assert last.has_next() is False
+    assert last.next_cursor is None
+
+    back = paginator.get_page(None, cursor=second.previous_cursor)
+    assert back.number == 1
+    assert back.object_list == ids[:2]
+    assert back.has_previous() is False
+
+
+@pytest.mark.django_db
+def test_no_count_paginator_keyset_desempata_por_pk_en_orden_descendente():
+    norte = Provincia.objects.create(nombre="Norte")
+    sur = Provincia.objects.create(nombre="Sur")
+    ids = [
+        Municipio.objects.create(nombre=nombre, provincia=provincia).pk
+        for nombre, provincia in (("B", norte), ("A", norte), ("B", sur), ("C", sur))
+    ]
+    paginator = NoCountPaginator(Municipio.objects.all(), 2, ordering=("-nombre",))
+
+    first = paginator.get_page(1)
+    second = paginator.get_page(None, cursor=first.next_cursor)
+
+    assert [p.pk for p in first.object_list] == [ids[3], ids[2]]
+    assert [p.pk for p in second.object_list] == [ids[0], ids[1]]
+
+
+@pytest.mark.django_db
+def test_no_count_paginator_keyset_ignora_cursor_invalido():
+    ids = _provincias("A", "B", "C")
+    paginator = NoCountPaginator(
+        Provincia.objects.values_list("pk", flat=True), 2, ordering=("pk",)
+    )
+
+    page_obj = paginator.get_page(2, cursor="no-es-un-cursor")
+
+    assert page_obj.number == 2
+    assert page_obj.object_list == ids[2:]
+
+
+@pytest.mark.django_db
+def test_vat_pagination_pasa_a_keyset_con_cursor():
+    _provincias("A", "B", "C")
+    factory = APIRequestFactory()
+    pagination = VATPageNumberPagination()
+
+    request = Request(factory.get("/", {"pagination": "cursor", "page_size": 2}))
+    page = pagination.paginate_queryset(Provincia.objects.order_by("pk"), request)
+    data = pagination.get_paginated_response([p.pk for p in page]).data
+
+    assert "count" not in data
+    assert "cursor=" in data["next"]
+    assert data["previous"] is None
+
+    cursor = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+    request = Request(factory.get("/", {"cursor": cursor, "page_size": 2}))
+    page = pagination.paginate_queryset(Provincia.objects.order_by("pk"), request)
+    assert len(page) == 1
+
+
+@pytest.mark.django_db
+def test_vat_pagination_sin_cursor_mantiene_page_number():
+    _provincias("A", "B", "C")
+    pagination = VATPageNumberPagination()
+    request = Request(APIRequestFactory().get("/", {"page": 2, "page_size": 2}))
+
+    page = pagination.paginate_queryset(Provincia.objects.order_by("pk"), request)
+
+    assert len(page) == 1
+    assert pagination.get_paginated_response([]).data["count"] == 3
@@ -113,12 +113,29 @@ def test_generar_nomina_sintys_excel_without_db(mocker):
             self.ciudadano_id = cid
 
     class Qs(list):
+        def all(self):
+            return self
+
         def select_related(self, *_args, **_kwargs):
             return self
 
         def values_list(self, *_args, **_kwargs):
             return [x.ciudadano_id for x in self]
 
+        def values(self, *_args, **_kwargs):
+            return SimpleNamespace(
+                iterator=lambda **_kw: iter(
+                    {
+                        "ciudadano_id": x.ciudadano_id,
+                        "ciudadano__documento": x.ciudadano.documento,
+                        "ciudadano__nombre": x.ciudadano.nombre,
+                        "ciudadano__apellido": x.ciudadano.apellido,
+                        "ciudadano__sexo__sexo": None,
+                    }
+                    for x in self
+                )
+            )
+
     qs = Qs([Legajo(1, "20123456783", "A", "B"), Legajo(2, "12345678", "C", "D")])
     expediente = SimpleNamespace(expediente_ciudadanos=qs)
 
@@ -0,0 +1,153 @@
+"""Tests de los indicadores incrementales del dashboard."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+
+from centrodefamilia.models import (
+    Actividad,
+    ActividadCentro,
+    Categoria,
+    Centro,
+    ParticipanteActividad,
+)
+from centrodefamilia.services.participante import ParticipanteService
+from ciudadanos.models import Ciudadano
+from comedores.models import ValorComida
+from dashboard.models import Dashboard
+from dashboard.rollups import ROLLUPS, obtener_rollups, recalcular_rollups
+
+pytestmark = pytest.mark.django_db
+
+
+def _valor(llave):
+    return Dashboard.objects.get(llave=llave).cantidad
+
+
+def _centro(codigo, tipo="faro"):
+    return Centro.objects.create(nombre=codigo, tipo=tipo, codigo=codigo)
+
+
+def _actividad_centro(centro):
+    categoria = Categoria.objects.create(nombre="Deportes")
+    actividad = Actividad.objects.create(nombre="Futbol", categoria=categoria)
+    return ActividadCentro.objects.create(
+        centro=centro,
+        actividad=actividad,
+        cantidad_personas=20,
+        horariosdesde="10:00",
+    )
+
+
+def _ciudadano(documento):
+    return Ciudadano.objects.create(
+        apellido=f"Apellido{documento}",
+        nombre="Nombre",
+        fecha_nacimiento=date(2000, 1, 1),
+        documento=documento,
+    )
+
+
+def _participante(actividad_centro, documento, estado="inscrito"):
+    return ParticipanteActividad.objects.create(
+        actividad_centro=actividad_centro,
+        ciudadano=_ciudadano(documento),
+        estado=estado,
+    )
+
+
+def _assert_consistente(*llaves):
+    esperados = {llave: ROLLUPS[llave].calcular() for llave in llaves}
+    assert {llave: _valor(llave) for llave in llaves} == esperados
+
+
+def test_participantes_por_alta_cambio_baja_y_restauracion():
+    actividad_centro = _actividad_centro(_centro("F1"))
+    inscripto = _participante(actividad_centro, 30111001)
+    espera = _participante(actividad_centro, 30111002, estado="lista_espera")
+    assert _valor("participantes_total") == 1
+
+    espera.estado = "inscrito"
+    espera.save()
+    assert _valor("participantes_total") == 2
+
+    inscripto = ParticipanteActividad.objects.get(pk=inscripto.pk)
+    inscripto.estado = "dado_baja"
+    inscripto.save()
+    assert _valor("participantes_total") == 1
+
+    espera.delete()
+    assert _valor("participantes_total") == 0
+    espera.restore()
+    assert _valor("participantes_total") == 1
+
+    espera.hard_delete()
+    assert _valor("participantes_total") == 0
+    _assert_consistente("participantes_total", "actividades_totales")
+
+
+def test_cambio_de_tipo_de_centro_mueve_el_conteo():
+    centro = _centro("C1", tipo="adherido")
+    _centro("C2", tipo="faro")
+    assert (_valor("centros_adheridos_totales"), _valor("centros_faro_totales")) == (
+        1,
+        1,
+    )
+
+    centro.tipo = "faro"
+    centro.save()
+    _assert_consistente("centros_adheridos_totales", "centros_faro_totales")
+    assert _valor("centros_faro_totales") == 2
+
+
+def test_rollback_descarta_el_delta():
+    _centro("C1")
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            _centro("C2")
+            raise RuntimeError
+    assert _valor("centros_faro_totales") == 1
+
+
+def test_presupuestos_se_recalculan_y_el_bulk_create_tambien():
+    ValorComida.objects.create(
+        tipo="comida", valor=Decimal("100.40"), fecha=date.today()
+    )
+    valor = ValorComida.objects.create(
+        tipo="comida", valor=Decimal("50.20"), fecha=date.today()
+    )
+    assert _valor("presupuesto_comida") == 151
+    valor.delete()
+    assert _valor("presupuesto_comida") == 100
+
+    actividad_centro = _actividad_centro(_centro("F1"))
+    _ciudadano(30111003)
+    ParticipanteService.cargar_participantes_desde_lista([30111003], actividad_centro)
+    assert _valor("participantes_total") == 1
+
+
+def test_lectura_unica_y_faltantes(django_assert_num_queries):
+    recalcular_rollups()
+    with django_assert_num_queries(1):
+        valores = obtener_rollups()
+    assert set(ROLLUPS) <= set(valores)
+
+    Dashboard.objects.filter(llave="actividades_totales").delete()
+    assert obtener_rollups()["actividades_totales"] == 0
+    assert _valor("actividades_totales") == 0
+
+
+def test_comando_reconciliar_corrige_desvios():
+    _centro("C1")
+    Dashboard.objects.filter(llave="centros_faro_totales").update(cantidad=7)
+    out = StringIO()
+
+    call_command("reconciliar_dashboard", llaves=["centros_faro_totales"], stdout=out)
+
+    assert _valor("centros_faro_totales") == 1
+    assert "centros_faro_totales: 7 -> 1" in out.getvalue()
+    assert "corregidos: 1" in out.getvalue()
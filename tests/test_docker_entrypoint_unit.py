@@ -111,6 +111,7 @@ def test_run_django_commands_respeta_flag_explicito_para_makemigrations(
 def test_run_server_usa_gunicorn_en_entornos_deploy(mocker, monkeypatch, environment):
     module = _load_entrypoint_module()
     mock_cache_busting = mocker.patch.object(module, "cache_busting")
+    mock_reset_metrics = mocker.patch.object(module, "reset_metrics_dir")
     mock_run_command = mocker.patch.object(module, "run_command")
     monkeypatch.setenv("ENVIRONMENT", environment)
     monkeypatch.setenv("GUNICORN_WORKERS", "2")
@@ -119,12 +120,29 @@ def test_run_server_usa_gunicorn_en_entornos_deploy(mocker, monkeypatch, environ
     module.run_server()
 
     mock_cache_busting.assert_called_once_with()
+    mock_reset_metrics.assert_called_once_with("2")
     mock_run_command.assert_called_once()
     args, kwargs = mock_run_command.call_args
     assert args[0][:2] == ["gunicorn", "config.wsgi:application"]
     assert kwargs["stage"] == "gunicorn"
 
 
+def test_reset_metrics_dir_usa_directorio_por_defecto_con_varios_workers(
+    monkeypatch, tmp_path
+):
+    module = _load_entrypoint_module()
+    default_dir = tmp_path / "metrics"
+    monkeypatch.setattr(module, "DEFAULT_METRICS_MULTIPROC_DIR", str(default_dir))
+    monkeypatch.setenv("METRICS_MULTIPROC_DIR", "")
+
+    module.reset_metrics_dir("1")
+    assert not default_dir.exists()
+
+    module.reset_metrics_dir("4")
+    assert default_dir.is_dir()
+    assert module.os.environ["METRICS_MULTIPROC_DIR"] == str(default_dir)
+
+
 def test_run_bulk_credentials_worker_lanza_comando_dedicado(mocker):
     module = _load_entrypoint_module()
     mock_run_command = mocker.patch.object(module, "run_command")
@@ -149,6 +167,30 @@ def test_run_ciudadanos_import_worker_lanza_comando_dedicado(mocker):
     )
 
 
+def test_run_jobs_worker_lanza_pool_unificado(mocker):
+    module = _load_entrypoint_module()
+    mock_run_command = mocker.patch.object(module, "run_command")
+
+    module.run_jobs_worker()
+
+    mock_run_command.assert_called_once_with(
+        ["python", "manage.py", "process_jobs"],
+        stage="jobs_worker",
+    )
+
+
+def test_run_gestionar_outbox_worker_lanza_drenador(mocker):
+    module = _load_entrypoint_module()
+    mock_run_command = mocker.patch.object(module, "run_command")
+
+    module.run_gestionar_outbox_worker()
+
+    mock_run_command.assert_called_once_with(
+        ["python", "manage.py", "drain_gestionar_outbox"],
+        stage="gestionar_outbox_worker",
+    )
+
+
 def test_main_ejecuta_worker_segun_service_role(mocker, monkeypatch):
     module = _load_entrypoint_module()
     mocker.patch.object(module, "wait_for_mysql")
@@ -0,0 +1,103 @@
+"""Tests del nomenclador territorial en memoria."""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Localidad, Municipio, Provincia
+from core.services.gazetteer import (
+    Gazetteer,
+    get_gazetteer,
+    normalize_geo_name,
+    reset_local_gazetteer,
+)
+
+
+@pytest.fixture(name="gazetteer")
+def _gazetteer():
+    return Gazetteer(
+        provincias=[(1, "Buenos Aires"), (2, "Ciudad Autónoma de Buenos Aires")],
+        municipios=[
+            (10, "General Pueyrredón", 1),
+            (11, "Veinticinco de Mayo", 1),
+            (12, "San Martín", 1),
+        ],
+        localidades=[
+            (100, "Mar del Plata", 10),
+            (101, "Batán", 10),
+            (102, "San Martín", 12),
+            (103, "San Martín", 11),
+        ],
+        nacionalidades=[(5, "Argentina"), (6, "Boliviana")],
+    )
+
+
+def test_normaliza_alias_acentos_y_numeros():
+    assert normalize_geo_name("Capital-Federal") == "ciudad autonoma de buenos aires"
+    assert normalize_geo_name("  Veinticinco   de MAYO ") == "25 de mayo"
+    assert normalize_geo_name("General_Pueyrredón") == "general pueyrredon"
+    assert normalize_geo_name(None) == ""
+
+
+def test_resuelve_por_nombre_y_padre(gazetteer):
+    assert gazetteer.resolve_provincia("CABA") == 2
+    assert gazetteer.resolve_municipio("25 de mayo", provincia_id=1) == 11
+    assert gazetteer.resolve_municipio("general pueyrredon", provincia_id=2) is None
+    assert gazetteer.resolve_localidad("batan", municipio_id=10) == 101
+    assert gazetteer.resolve_localidad("San Martin", municipio_id=11) == 103
+    # Sin municipio gana el PK mas bajo dentro de la provincia.
+    assert gazetteer.resolve_localidad("San Martin", provincia_id=1) == 102
+    assert gazetteer.localidad_candidates("san martin", provincia_id=1) == [102, 103]
+    assert gazetteer.resolve_nacionalidad("BOLIVIANA") == 6
+
+
+def test_fallback_aproximado_dentro_del_ambito(gazetteer, settings):
+    settings.GAZETTEER_FUZZY_CUTOFF = 0.85
+
+    assert gazetteer.resolve_provincia("Buenos Aries") == 1
+    assert gazetteer.resolve_localidad("Mar del Plat", municipio_id=10) == 100
+    assert (
+        gazetteer.resolve_localidad("Mar del Plat", municipio_id=10, fuzzy=False)
+        is None
+    )
+    assert gazetteer.resolve_localidad("Rosario", municipio_id=10) is None
+
+
+def test_relaciones_e_instancias_sin_queries(gazetteer):
+    # Sin marca django_db: cualquier query haria fallar el test.
+    localidad = gazetteer.get_localidad(100)
+    assert localidad.nombre == "Mar del Plata"
+    assert localidad.municipio_id == 10
+    assert gazetteer.municipio_provincia_id(localidad.municipio_id) == 1
+    assert gazetteer.search_localidades("martin", provincia_id=1) == [102, 103]
+    assert gazetteer.get_provincia(99) is None
+
+
+@pytest.mark.django_db
+def test_cache_de_proceso_se_invalida_al_cambiar_el_catalogo(
+    settings, django_capture_on_commit_callbacks
+):
+    settings.GAZETTEER_CACHE_ENABLED = True
+    settings.GAZETTEER_VERSION_CHECK_SECONDS = 0
+    cache.clear()
+    reset_local_gazetteer()
+    try:
+        provincia = Provincia.objects.create(nombre="Santa Fe")
+        municipio = Municipio.objects.create(nombre="Rosario", provincia=provincia)
+
+        first = get_gazetteer()
+        with CaptureQueriesContext(connection) as ctx:
+            assert get_gazetteer() is first
+        assert ctx.captured_queries == []
+        assert first.resolve_localidad("Rosario", provincia_id=provincia.pk) is None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Localidad.objects.create(nombre="Rosario", municipio=municipio)
+
+        rebuilt = get_gazetteer()
+        assert rebuilt is not first
+        assert rebuilt.resolve_localidad("rosario", provincia_id=provincia.pk)
+    finally:
+        reset_local_gazetteer()
+        cache.clear()
@@ -0,0 +1,107 @@
+"""Tests del cache compartido de permisos compilados por usuario."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.permissions.registry import (
+    permission_codes_for_alias,
+    resolve_permission_codes,
+)
+from core.templatetags.custom_filters import has_any_perm, has_perm_code
+from iam.services import (
+    get_effective_permission_codes,
+    get_effective_role_names,
+    user_has_permission_code,
+)
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def permission_cache(settings):
+    settings.IAM_PERMISSION_CACHE_ENABLED = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _permission(codename):
+    return Permission.objects.get(content_type__app_label="auth", codename=codename)
+
+
+def _usuario_con_grupo(*codenames):
+    user = User.objects.create_user(username="operador", password="x")
+    group = Group.objects.create(name="Operadores")
+    group.permissions.add(*(_permission(codename) for codename in codenames))
+    user.groups.add(group)
+    return user, group
+
+
+def test_cache_caliente_no_consulta_permisos():
+    user, _ = _usuario_con_grupo("view_user")
+    assert user_has_permission_code(user, "auth.view_user") is True
+
+    # Otro request: nueva instancia del mismo usuario.
+    fresh = User.objects.get(pk=user.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        assert has_perm_code(fresh, "auth.view_user") is True
+        assert has_any_perm(fresh, "auth.add_user, auth.view_user") is True
+        assert has_perm_code(fresh, "auth.delete_user") is False
+        assert fresh.has_perm("auth.view_user") is True
+        assert "Can view user" in get_effective_role_names(fresh)
+
+    assert ctx.captured_queries == []
+
+
+def test_cambio_de_grupo_invalida_permisos(django_capture_on_commit_callbacks):
+    user, group = _usuario_con_grupo("view_user")
+    assert user_has_permission_code(user, "auth.add_user") is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group.permissions.add(_permission("add_user"))
+
+    fresh = User.objects.get(pk=user.pk)
+    assert user_has_permission_code(fresh, "auth.add_user") is True
+
+    with django_capture_on_commit_callbacks(execute=True):
+        fresh.groups.remove(group)
+
+    fresh = User.objects.get(pk=user.pk)
+    assert get_effective_permission_codes(fresh) == set()
+
+
+def test_permiso_directo_invalida(django_capture_on_commit_callbacks):
+    user = User.objects.create_user(username="directo", password="x")
+    assert user_has_permission_code(user, "auth.change_user") is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.user_permissions.add(_permission("change_user"))
+
+    fresh = User.objects.get(pk=user.pk)
+    assert user_has_permission_code(fresh, "auth.change_user") is True
+
+
+def test_usuario_inactivo_y_superusuario():
+    user, _ = _usuario_con_grupo("view_user")
+    user.is_active = False
+    user.save()
+    fresh = User.objects.get(pk=user.pk)
+    assert user_has_permission_code(fresh, "auth.view_user") is False
+
+    admin = User.objects.create_superuser(username="admin", password="x")
+    assert "auth.delete_user" in get_effective_permission_codes(admin)
+
+
+def test_registry_resuelve_aliases_sin_mutar_el_mapa():
+    assert resolve_permission_codes(["auth.view_user", " auth.view_user ", "x"]) == (
+        "auth.view_user",
+    )
+    assert resolve_permission_codes("auth.add_user") == ("auth.add_user",)
+    assert permission_codes_for_alias("Usuario Ver") == ("auth.view_user",)
+    assert permission_codes_for_alias("Rol Nuevo") == ("auth.role_rol_nuevo",)
@@ -0,0 +1,176 @@
+"""Tests del pipeline de derivados WebP (core.services.image_service)."""
+
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.signals import request_finished, request_started
+from PIL import Image
+
+from centrodefamilia.models import Centro
+from core.jobs import obtener_colas_jobs
+from core.models import ImagenDerivada
+from core.services import image_service
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+    cache.clear()
+    yield tmp_path
+    cache.clear()
+
+
+def _create_image(path: Path, size=(800, 400)):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", size, color=(255, 0, 0)).save(path, format="JPEG")
+
+
+def test_generate_derivatives_crea_anchos_menores_al_original(tmp_path):
+    _create_image(tmp_path / "a" / "foto.jpg")
+
+    manifest = image_service.generate_derivatives("a/foto.jpg")
+
+    assert manifest["ancho"] == 800
+    assert manifest["alto"] == 400
+    assert manifest["variantes"] == {
+        "webp": "a/foto.webp",
+        "srcset": [
+            [320, "a/foto.w320.webp"],
+            [640, "a/foto.w640.webp"],
+            [800, "a/foto.webp"],
+        ],
+    }
+    with Image.open(tmp_path / "a" / "foto.w320.webp") as variant:
+        assert variant.size == (320, 160)
+    assert not list(tmp_path.glob("a/*.tmp"))
+
+
+def test_get_storage_name_normaliza_url_y_descarta_lo_que_no_convierte(tmp_path):
+    assert image_service.get_storage_name("/media/a/foto.jpg") == "a/foto.jpg"
+    assert image_service.get_storage_name(str(tmp_path / "b.png")) == "b.png"
+    assert image_service.get_storage_name("/otro/lugar/c.jpg") == ""
+    assert image_service.get_storage_name("/media/anim.gif") == ""
+    assert image_service.get_storage_name("") == ""
+
+
+def test_lookup_sin_manifiesto_encola_y_no_toca_el_filesystem(
+    mocker, django_capture_on_commit_callbacks
+):
+    exists = mocker.patch("os.path.exists")
+    convert = mocker.patch("core.services.image_service._save_webp")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert image_service.get_image_derivatives("/media/a/foto.jpg") is None
+        assert image_service.get_image_derivatives("/media/a/foto.jpg") is None
+        assert not ImagenDerivada.objects.exists()
+
+    job = ImagenDerivada.objects.get()
+    assert job.original == "a/foto.jpg"
+    assert job.status == ImagenDerivada.Status.PENDING
+    exists.assert_not_called()
+    convert.assert_not_called()
+
+
+def test_misses_de_una_request_se_encolan_al_terminarla():
+    request_started.send(sender=None)
+    for nombre in ("a.jpg", "b.jpg", "a.jpg"):
+        assert image_service.get_image_derivatives(f"/media/{nombre}") is None
+    assert not ImagenDerivada.objects.exists()
+
+    request_finished.send(sender=None)
+
+    assert sorted(ImagenDerivada.objects.values_list("original", flat=True)) == [
+        "a.jpg",
+        "b.jpg",
+    ]
+
+
+def test_job_de_la_cola_genera_el_manifiesto_y_renueva_el_cache(
+    tmp_path, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    _create_image(tmp_path / "a" / "foto.jpg")
+    with django_capture_on_commit_callbacks(execute=True):
+        assert image_service.get_image_derivatives("/media/a/foto.jpg") is None
+    queue = obtener_colas_jobs(["imagenes"])[0]
+
+    queue.process(ImagenDerivada.objects.get())
+
+    variantes = image_service.get_image_derivatives("/media/a/foto.jpg")
+    assert variantes["webp"] == "a/foto.webp"
+    with django_assert_num_queries(0):
+        assert image_service.get_image_derivatives("/media/a/foto.jpg") == variantes
+    job = ImagenDerivada.objects.get()
+    assert job.status == ImagenDerivada.Status.COMPLETED
+    assert image_service.build_srcset(variantes).startswith(
+        "/media/a/foto.w320.webp 320w, "
+    )
+
+
+def test_tag_con_derivados_activos_muestra_los_regenerados(settings, tmp_path):
+    from core.templatetags.image_tags import optimized_image
+
+    settings.IMAGE_DERIVATIVES_ENABLED = True
+    _create_image(tmp_path / "a" / "foto.jpg")
+    queue = obtener_colas_jobs(["imagenes"])[0]
+    queue.process(ImagenDerivada.objects.create(original="a/foto.jpg"))
+    assert "foto.w640.webp 640w" in optimized_image("/media/a/foto.jpg")
+
+    settings.IMAGE_DERIVATIVE_WIDTHS = (320,)
+    queue.process(ImagenDerivada.objects.get())
+
+    html = optimized_image("/media/a/foto.jpg")
+    assert "foto.w320.webp 320w" in html
+    assert "640w" not in html
+
+
+def test_job_sin_original_queda_fallido():
+    job = ImagenDerivada.objects.create(original="a/no-existe.jpg")
+
+    image_service.process_image_derivative_job(job)
+
+    job.refresh_from_db()
+    assert job.status == ImagenDerivada.Status.FAILED
+    assert job.last_error_message
+
+
+def test_subida_encola_solo_imagenes_nuevas(
+    settings, django_capture_on_commit_callbacks
+):
+    settings.IMAGE_DERIVATIVES_ENABLED = True
+    buffer = Path(settings.MEDIA_ROOT) / "upload.jpg"
+    _create_image(buffer, size=(20, 20))
+    foto = SimpleUploadedFile("centro.jpg", buffer.read_bytes(), "image/jpeg")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        centro = Centro.objects.create(
+            nombre="Centro", tipo="faro", codigo="C1", foto=foto
+        )
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        centro.nombre = "Otro"
+        centro.save()
+
+    assert list(ImagenDerivada.objects.values_list("original", flat=True)) == [
+        centro.foto.name
+    ]
+    assert callbacks == []
+
+
+def test_backfill_es_incremental(tmp_path, mocker):
+    _create_image(tmp_path / "centros" / "foto.jpg")
+    centro = Centro.objects.create(nombre="Centro", tipo="faro", codigo="C1")
+    Centro.objects.filter(pk=centro.pk).update(foto="centros/foto.jpg")
+    generate = mocker.spy(image_service, "generate_derivatives")
+
+    call_command("generate_webp_images", "--app", "centrodefamilia", "--workers", "1")
+    call_command("generate_webp_images", "--app", "centrodefamilia", "--workers", "1")
+
+    assert generate.call_count == 1
+    job = ImagenDerivada.objects.get()
+    assert job.status == ImagenDerivada.Status.COMPLETED
+    assert (tmp_path / "centros" / "foto.w320.webp").exists()
@@ -2,6 +2,8 @@
 
 from types import SimpleNamespace
 
+import pytest
+
 from core.templatetags.image_tags import (
     image_info,
     optimized_image,
@@ -19,10 +21,24 @@ def test_optimized_image_returns_empty_when_url_is_blank():
     assert optimized_image(SimpleNamespace(url="")) == ""
 
 
+VARIANTES = {
+    "webp": "a.webp",
+    "srcset": [[320, "a.w320.webp"], [800, "a.webp"]],
+}
+
+
+@pytest.fixture(autouse=True)
+def _derivados_habilitados(settings):
+    settings.IMAGE_DERIVATIVES_ENABLED = True
+
+
+def _mock_derivados(mocker, **kwargs):
+    kwargs.setdefault("return_value", None)
+    return mocker.patch("core.templatetags.image_tags.get_image_derivatives", **kwargs)
+
+
 def test_optimized_image_renders_picture_with_webp(mocker):
-    mocker.patch(
-        "core.templatetags.image_tags.get_or_create_webp", return_value="/media/a.webp"
-    )
+    _mock_derivados(mocker, return_value=VARIANTES)
     image = SimpleNamespace(url="/media/a.jpg")
 
     html = optimized_image(
@@ -37,6 +53,8 @@ def test_optimized_image_renders_picture_with_webp(mocker):
 
     assert "<picture>" in html
     assert 'type="image/webp"' in html
+    assert 'srcset="/media/a.w320.webp 320w, /media/a.webp 800w"' in html
+    assert 'sizes="100px"' in html
     assert 'src="/media/a.jpg"' in html
     assert 'loading="lazy"' in html
     assert 'width="100"' in html
@@ -44,9 +62,7 @@ def test_optimized_image_renders_picture_with_webp(mocker):
 
 
 def test_optimized_image_renders_img_fallback_when_no_webp(mocker):
-    mocker.patch(
-        "core.templatetags.image_tags.get_or_create_webp", return_value="/media/a.jpg"
-    )
+    _mock_derivados(mocker)
 
     html = optimized_image("/media/a.jpg", alt_text="A")
 
@@ -54,10 +70,18 @@ def test_optimized_image_renders_img_fallback_when_no_webp(mocker):
     assert '<img src="/media/a.jpg"' in html
 
 
+def test_optimized_image_skips_lookup_when_disabled(mocker, settings):
+    settings.IMAGE_DERIVATIVES_ENABLED = False
+    lookup = _mock_derivados(mocker, return_value=VARIANTES)
+
+    html = optimized_image("/media/a.jpg", alt_text="A")
+
+    assert html.startswith('<img src="/media/a.jpg"')
+    lookup.assert_not_called()
+
+
 def test_optimized_image_ignores_invalid_dimensions(mocker):
-    mocker.patch(
-        "core.templatetags.image_tags.get_or_create_webp", return_value="/media/a.jpg"
-    )
+    _mock_derivados(mocker)
 
     html = optimized_image("/media/a.jpg", width="abc", height="xyz")
 
@@ -66,9 +90,7 @@ def test_optimized_image_ignores_invalid_dimensions(mocker):
 
 
 def test_optimized_image_exception_fallback_with_url(mocker):
-    mocker.patch(
-        "core.templatetags.image_tags.get_or_create_webp", side_effect=RuntimeError
-    )
+    _mock_derivados(mocker, side_effect=RuntimeError)
     image = SimpleNamespace(url="/media/a.jpg")
 
     html = optimized_image(image, alt_text="A", css_class="c")
@@ -83,47 +105,37 @@ def test_optimized_image_exception_without_url_returns_empty(mocker):
         def url(self):
             raise RuntimeError("boom")
 
-    mocker.patch(
-        "core.templatetags.image_tags.get_or_create_webp", side_effect=RuntimeError
-    )
+    _mock_derivados(mocker, side_effect=RuntimeError)
 
     assert optimized_image(FailingImage()) == ""
 
 
 def test_webp_exists_paths(mocker):
-    mocker.patch(
-        "core.services.image_service._get_absolute_path", return_value="/tmp/a.jpg"
-    )
-    mocker.patch(
-        "core.services.image_service._get_webp_path", return_value="/tmp/a.webp"
-    )
-    mock_exists = mocker.patch("os.path.exists", return_value=True)
+    lookup = _mock_derivados(mocker, return_value=VARIANTES)
+    mock_exists = mocker.patch("os.path.exists")
 
     assert webp_exists(SimpleNamespace(url="/media/a.jpg")) is True
-    assert mock_exists.called
+    lookup.assert_called_once_with("/media/a.jpg")
+    mock_exists.assert_not_called()
 
 
 def test_webp_exists_handles_empty_and_exception(mocker):
     assert webp_exists(None) is False
-    mocker.patch(
-        "core.services.image_service._get_absolute_path", side_effect=RuntimeError
-    )
+    _mock_derivados(mocker, side_effect=RuntimeError)
 
     assert webp_exists("/media/a.jpg") is False
 
 
 def test_webp_url_branches(mocker):
-    mocker.patch(
-        "core.templatetags.image_tags.get_or_create_webp", return_value="/media/a.webp"
-    )
+    lookup = _mock_derivados(mocker, return_value=VARIANTES)
     assert webp_url("/media/a.jpg") == "/media/a.webp"
     assert webp_url(None) == ""
+    lookup.return_value = None
+    assert webp_url("/media/b.jpg") == "/media/b.jpg"
 
 
 def test_webp_url_exception_fallback(mocker):
-    mocker.patch(
-        "core.templatetags.image_tags.get_or_create_webp", side_effect=RuntimeError
-    )
+    _mock_derivados(mocker, side_effect=RuntimeError)
     image = SimpleNamespace(url="/media/a.jpg")
 
     assert webp_url(image) == "/media/a.jpg"
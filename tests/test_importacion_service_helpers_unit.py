@@ -18,10 +18,22 @@ from celiaquia.models import (
     RegistroErroneo,
 )
 from ciudadanos.models import Ciudadano, GrupoFamiliar
+from core.services.gazetteer import Gazetteer
 
 pytestmark = pytest.mark.django_db
 
 
+def _patch_gazetteer(mocker, provincias=(), municipios=(), localidades=()):
+    gazetteer = Gazetteer(
+        provincias=provincias, municipios=municipios, localidades=localidades
+    )
+    mocker.patch(
+        "celiaquia.services.importacion_service.get_gazetteer",
+        return_value=gazetteer,
+    )
+    return gazetteer
+
+
 class _DummyFile:
     def __init__(self, raw: bytes, name="data.csv"):
         self._raw = raw
@@ -113,13 +125,10 @@ def test_generar_plantilla_and_preview_csv(mocker):
     ).encode("utf-8")
     f = _DummyFile(raw_csv, name="datos.csv")
 
-    mocker.patch(
-        "celiaquia.services.importacion_service.Municipio.objects.get",
-        side_effect=lambda pk: SimpleNamespace(nombre=f"M{pk}"),
-    )
-    mocker.patch(
-        "celiaquia.services.importacion_service.Localidad.objects.get",
-        side_effect=lambda pk: SimpleNamespace(nombre=f"L{pk}"),
+    _patch_gazetteer(
+        mocker,
+        municipios=[(1, "M1", None), (3, "M3", None)],
+        localidades=[(2, "L2", 1), (4, "L4", 3)],
     )
 
     preview = module.ImportacionService.preview_excel(f, max_rows="1")
@@ -143,10 +152,7 @@ def test_preview_excel_parses_all_and_semicolon_fallback(mocker):
     mocker.patch(
         "celiaquia.services.importacion_service.pd.read_csv", side_effect=_read_csv
     )
-    mocker.patch(
-        "celiaquia.services.importacion_service.Municipio.objects.get",
-        return_value=SimpleNamespace(nombre="M1"),
-    )
+    _patch_gazetteer(mocker, municipios=[(1, "M1", None)])
 
     out = module.ImportacionService.preview_excel(f, max_rows="all")
     assert out["shown_rows"] == 1
@@ -161,10 +167,7 @@ def test_validar_edad_exception_and_preview_limit_variants(mocker):
 
     raw_csv = "nombre,municipio\nJuan,1\n".encode("utf-8")
     f = _DummyFile(raw_csv, name="limites.csv")
-    mocker.patch(
-        "celiaquia.services.importacion_service.Municipio.objects.get",
-        return_value=SimpleNamespace(nombre="M1"),
-    )
+    _patch_gazetteer(mocker, municipios=[(1, "M1", None)])
 
     out_zero = module.ImportacionService.preview_excel(f, max_rows="0")
     assert out_zero["shown_rows"] == 1
@@ -202,27 +205,10 @@ def test_importacion_helpers_normalizan_dataframe_y_precargas(mocker):
     assert ids["sexos_nombres"] == {"masculino"}
     assert ids["nacionalidades_nombres"] == {"argentina"}
 
-    class _FakeMunicipiosQS(list):
-        def filter(self, provincia_id=None, **_kwargs):
-            if provincia_id is None:
-                return self
-            return [x for x in self if x.provincia_id == provincia_id]
-
-        def only(self, *_fields):
-            return self
-
-    mocker.patch(
-        "celiaquia.services.importacion_service.Municipio.objects.filter",
-        return_value=_FakeMunicipiosQS(
-            [
-                SimpleNamespace(pk=1, provincia_id=7),
-                SimpleNamespace(pk=3, provincia_id=8),
-            ]
-        ),
-    )
-    mocker.patch(
-        "celiaquia.services.importacion_service.Localidad.objects.filter",
-        return_value=[SimpleNamespace(pk=2)],
+    _patch_gazetteer(
+        mocker,
+        municipios=[(1, "M1", 7), (3, "M3", 8)],
+        localidades=[(2, "L2", 1)],
     )
     mocker.patch(
         "celiaquia.services.importacion_service.Sexo.objects.all",
@@ -234,7 +220,8 @@ def test_importacion_helpers_normalizan_dataframe_y_precargas(mocker):
 
     precargas = module._precargar_datos_importacion(out, provincia_usuario_id=7)
     assert precargas["municipios_cache"] == {1: 1}
-    assert precargas["municipio_provincia_map"] == {1: 7, 3: 8}
+    assert precargas["municipio_provincia_map"] == {1: 7}
+    assert module._cargar_municipios_cache({1, 3, 99}, provincia_usuario_id=7) == {1: 1}
     assert precargas["localidades_cache"] == {2: 2}
     assert precargas["sexos_cache"]["masculino"] == 1
     assert precargas["sexos_cache"]["f"] == 2
@@ -602,27 +589,10 @@ def test_importacion_helpers_responsable_enriquecimiento_y_relacion(mocker):
     def _add_warning(fila, campo, detalle):
         warnings.append((fila, campo, detalle))
 
-    class _LocalidadesQS:
-        def filter(self, **kwargs):
-            if "municipio__provincia_id" in kwargs:
-                return self
-            if kwargs == {"nombre__iexact": "Rosario"}:
-                return [
-                    SimpleNamespace(
-                        pk=11, municipio=SimpleNamespace(pk=22, provincia_id=7)
-                    )
-                ]
-            if kwargs == {"nombre__icontains": "Rosario"}:
-                return [
-                    SimpleNamespace(
-                        pk=11, municipio=SimpleNamespace(pk=22, provincia_id=7)
-                    )
-                ]
-            return []
-
-    mocker.patch(
-        "celiaquia.services.importacion_service.Localidad.objects.select_related",
-        return_value=_LocalidadesQS(),
+    _patch_gazetteer(
+        mocker,
+        municipios=[(22, "Rosario", 7)],
+        localidades=[(11, "Rosario", 22)],
     )
 
     responsable_payload = {"fecha_nacimiento": "2001-02-03"}
@@ -675,21 +645,14 @@ def test_importacion_helpers_responsable_enriquecimiento_y_relacion(mocker):
 
 
 def test_importacion_helpers_resuelve_localidad_responsable_con_parentesis(mocker):
-    class _LocalidadesQS:
-        def filter(self, **kwargs):
-            if "municipio__provincia_id" in kwargs:
-                return self
-            if kwargs == {"nombre__iexact": "Rosario"}:
-                return [
-                    SimpleNamespace(
-                        pk=44, municipio=SimpleNamespace(pk=55, provincia_id=7)
-                    )
-                ]
-            return []
-
-    mocker.patch(
-        "celiaquia.services.importacion_service.Localidad.objects.select_related",
-        return_value=_LocalidadesQS(),
+    _patch_gazetteer(
+        mocker,
+        municipios=[(55, "Rosario", 7), (66, "Rosario", 8)],
+        localidades=[
+            (44, "Rosario", 55),
+            (45, "Rosario", 66),
+            (46, "Villa Rosario", 55),
+        ],
     )
 
     responsable_payload = {}
@@ -706,6 +669,15 @@ def test_importacion_helpers_resuelve_localidad_responsable_con_parentesis(mocke
     assert responsable_payload["municipio"] == 55
     assert responsable_payload["provincia"] == 7
 
+    with pytest.raises(ValidationError):
+        module._resolver_localidad_responsable_payload_importacion(
+            responsable_payload={},
+            payload={"localidad_responsable": "Rosario"},
+            provincia_usuario_id=None,
+            offset=1,
+            add_warning=lambda *_args, **_kwargs: None,
+        )
+
 
 def test_importacion_helpers_crear_responsable_y_legajo(mocker):
     warnings = []
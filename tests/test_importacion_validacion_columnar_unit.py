@@ -0,0 +1,180 @@
+"""Tests de la etapa columnar de validacion de la importacion de celiaquia."""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from django.core.exceptions import ValidationError
+
+from celiaquia.services import importacion_service as module
+from celiaquia.services.ciudadano_service import CiudadanoService
+
+pytestmark = pytest.mark.django_db
+
+
+def _fila(**extra):
+    fila = {
+        "apellido": "Perez",
+        "nombre": "Ana",
+        "documento": "20123456789",
+        "fecha_nacimiento": "1990-05-20",
+        "sexo": "F",
+        "nacionalidad": "Argentina",
+        "municipio": "10",
+        "localidad": "100",
+        "calle": "Mitre",
+        "altura": "123",
+        "codigo_postal": "1406",
+        "telefono": "",
+        "email": "",
+        "apellido_responsable": "",
+        "nombre_responsable": "",
+        "documento_responsable": "",
+    }
+    fila.update(extra)
+    return fila
+
+
+def _contexto(**extra):
+    contexto = {
+        "municipios_cache": {10: 10, 20: 20},
+        "localidades_cache": {100: 100},
+        "municipio_provincia_map": {10: 1, 20: 2},
+        "nacionalidades_cache": {"argentina": SimpleNamespace(pk=5)},
+        "paises_a_nacionalidad": {"argentina": "argentina"},
+        "provincias_permitidas_ids": {1},
+        "normalizar_sexo": module._build_normalizar_sexo_importacion(
+            {"f": 2, "m": 1, "femenino": 2, "masculino": 1}
+        ),
+        "to_date": CiudadanoService._to_date,
+        "validar_documento": module._validar_documento_importacion,
+    }
+    contexto.update(extra)
+    return contexto
+
+
+def _payload_fila_a_fila(row, contexto):
+    return module._construir_payload_fila_importacion(
+        row=row,
+        offset=2,
+        numeric_fields=module.IMPORTACION_NUMERIC_FIELDS,
+        provincia_usuario_id=None,
+        provincias_permitidas_ids=contexto["provincias_permitidas_ids"],
+        validar_documento=contexto["validar_documento"],
+        add_warning=lambda *_a: None,
+        to_date=contexto["to_date"],
+        municipios_cache=contexto["municipios_cache"],
+        localidades_cache=contexto["localidades_cache"],
+        municipio_provincia_map=contexto["municipio_provincia_map"],
+        normalizar_sexo=contexto["normalizar_sexo"],
+        nacionalidades_cache=contexto["nacionalidades_cache"],
+        paises_a_nacionalidad=contexto["paises_a_nacionalidad"],
+    )
+
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_payloads_columnares_coinciden_con_el_camino_fila_a_fila():
+    filas = [
+        _fila(),
+        _fila(documento="20-12345678-9", fecha_nacimiento="20/05/1990"),
+        _fila(fecha_nacimiento="1990-05-20 00:00:00", telefono="(011) 4555-1234"),
+        _fila(nacionalidad="ARGENTINA", sexo=" m ", email="ana@example.com"),
+        _fila(fecha_nacimiento="1990-05-20T10:30"),
+        _fila(municipio="10.0", localidad="100", email="nan"),
+        _fila(documento="123"),
+        _fila(documento="abc"),
+        _fila(fecha_nacimiento="31/02/1990"),
+        _fila(sexo="X"),
+        _fila(nacionalidad="Marte"),
+        _fila(municipio="99"),
+        _fila(municipio="20"),
+        _fila(email="ana@@example"),
+        _fila(email="ana@[127.0.0.1]"),
+        _fila(telefono="1234"),
+        _fila(calle=""),
+        _fila(fecha_nacimiento=date.today().replace(year=date.today().year - 5)),
+        _fila(
+            fecha_nacimiento=date.today().replace(year=date.today().year - 5),
+            apellido_responsable="Gomez",
+        ),
+        _fila(documento_responsable="99"),
+    ]
+    df = pd.DataFrame(filas).astype(str)
+    contexto = _contexto()
+
+    payloads = module._validar_dataframe_importacion(df, contexto)
+
+    assert len(payloads) == len(filas)
+    for row, payload in zip(df.to_dict(orient="records"), payloads):
+        try:
+            esperado = _payload_fila_a_fila(row, contexto)
+        except ValidationError:
+            assert payload is None, row
+            continue
+        if payload is not None:
+            assert payload == esperado, row
+    validas = [i for i, payload in enumerate(payloads) if payload is not None]
+    assert validas == [0, 1, 2, 3, 4, 5, 18]
+    assert payloads[0]["fecha_nacimiento"] == date(1990, 5, 20)
+    assert payloads[0]["provincia"] == 1
+    assert payloads[0]["tipo_documento"] == "CUIT"
+
+
+def test_emails_validos_columnar_devuelve_mascara_bool():
+    emails = pd.Series(["ana@example.com", "ana@@example", "ana@[127.0.0.1]"])
+
+    validos = module._emails_validos_columnar_importacion(emails)
+
+    assert validos.dtype == bool
+    assert validos.tolist() == [True, False, False]
+
+
+def test_lookups_se_resuelven_una_vez_por_valor_distinto():
+    llamadas = []
+    sexos = {"f": 2, "m": 1}
+
+    def normalizar_sexo(valor):
+        llamadas.append(valor)
+        return sexos.get(str(valor).strip().lower())
+
+    df = pd.DataFrame(
+        [
+            _fila(sexo="F" if i % 2 else "M", documento=f"2012345{i:04d}")
+            for i in range(50)
+        ]
+    )
+
+    payloads = module._validar_dataframe_importacion(
+        df, _contexto(normalizar_sexo=normalizar_sexo)
+    )
+
+    assert all(payload is not None for payload in payloads)
+    assert sorted(llamadas) == ["F", "M"]
+
+
+def test_fila_validada_no_repite_la_validacion_por_fila(mocker):
+    build = mocker.patch.object(module, "_build_payload_importacion_from_row")
+    payload = {"documento": "20123456789"}
+
+    resultado = module._construir_payload_fila_importacion(
+        row={},
+        offset=2,
+        numeric_fields=module.IMPORTACION_NUMERIC_FIELDS,
+        provincia_usuario_id=None,
+        provincias_permitidas_ids=None,
+        validar_documento=None,
+        add_warning=None,
+        to_date=None,
+        municipios_cache={},
+        localidades_cache={},
+        municipio_provincia_map={},
+        normalizar_sexo=None,
+        nacionalidades_cache={},
+        paises_a_nacionalidad={},
+        payload_validado=payload,
+    )
+
+    assert resultado == payload
+    assert resultado is not payload
+    build.assert_not_called()
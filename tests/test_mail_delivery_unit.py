@@ -0,0 +1,254 @@
+"""Tests del motor de envio masivo (core.services.mail_delivery) y su uso en mailing."""
+
+import smtplib
+from io import BytesIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail import EmailMessage
+from openpyxl import Workbook
+
+from comunicados.models import MailingJob, MailingJobAttachment, MailingJobRow
+from comunicados.services_mailing_jobs import create_mailing_job, process_mailing_job
+from core.services import mail_delivery
+
+
+class _FakeConnection:
+    """Conexion SMTP en memoria: cuenta aperturas y puede fallar por destinatario."""
+
+    def __init__(self, errors=None):
+        self.errors = errors or {}
+        self.is_open = False
+        self.opened = 0
+        self.sent = []
+
+    def open(self):
+        if self.is_open:
+            return False
+        self.is_open = True
+        self.opened += 1
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, messages):
+        for message in messages:
+            error = self.errors.get(message.to[0])
+            if isinstance(error, list):
+                error = error.pop(0) if error else None
+            if error is not None:
+                raise error
+            self.sent.append(message.to[0])
+        return len(messages)
+
+
+@pytest.fixture
+def fake_connections(mocker):
+    connections = []
+    errors = {}
+
+    def _get_connection(**kwargs):
+        connection = _FakeConnection(errors)
+        connections.append(connection)
+        return connection
+
+    mocker.patch.object(mail_delivery, "get_connection", side_effect=_get_connection)
+    return connections, errors
+
+
+def _messages(*destinos):
+    return [
+        (index, EmailMessage(subject="s", body="b", to=[destino]))
+        for index, destino in enumerate(destinos)
+    ]
+
+
+def _deliver(messages, **kwargs):
+    batches = []
+    mail_delivery.deliver_messages(messages, on_batch=batches.append, **kwargs)
+    return batches
+
+
+def test_deliver_reutiliza_conexiones_y_reparte_en_lotes(fake_connections):
+    connections, _ = fake_connections
+    destinos = [f"u{index}@example.com" for index in range(7)]
+
+    batches = _deliver(_messages(*destinos), batch_size=3, connections=2)
+
+    assert sorted(len(batch) for batch in batches) == [1, 3, 3]
+    assert len(connections) == 2
+    assert sum(connection.opened for connection in connections) == 2
+    assert sorted(sum((c.sent for c in connections), [])) == sorted(destinos)
+    assert not any(connection.is_open for connection in connections)
+
+
+def test_deliver_consume_el_iterable_de_a_un_lote_por_conexion(fake_connections):
+    mensajes = _messages(*[f"u{index}@example.com" for index in range(6)])
+    leidos = []
+    leidos_por_lote = []
+
+    def _generador():
+        for item in mensajes:
+            leidos.append(item[0])
+            yield item
+
+    mail_delivery.deliver_messages(
+        _generador(),
+        on_batch=lambda results: leidos_por_lote.append(len(leidos)),
+        batch_size=2,
+        connections=1,
+    )
+
+    assert leidos_por_lote == [2, 4, 6]
+
+
+def test_rechazo_de_destinatario_no_corta_y_desconexion_reconecta(fake_connections):
+    connections, errors = fake_connections
+    errors["rechazado@example.com"] = smtplib.SMTPRecipientsRefused({})
+    errors["cortado@example.com"] = [smtplib.SMTPServerDisconnected("bye")]
+
+    batches = _deliver(
+        _messages("ok@example.com", "rechazado@example.com", "cortado@example.com"),
+        batch_size=10,
+        connections=1,
+    )
+
+    results = {result.key: result for result in batches[0]}
+    assert results[0].sent and results[2].sent
+    assert isinstance(results[1].error, smtplib.SMTPRecipientsRefused)
+    assert connections[0].opened == 2
+
+
+def test_error_de_autenticacion_corta_el_envio(fake_connections):
+    _, errors = fake_connections
+    errors["b@example.com"] = smtplib.SMTPAuthenticationError(535, b"no")
+
+    batches = []
+    with pytest.raises(mail_delivery.MailDeliveryAborted) as excinfo:
+        mail_delivery.deliver_messages(
+            _messages("a@example.com", "b@example.com", "c@example.com"),
+            on_batch=batches.append,
+            batch_size=10,
+            connections=1,
+        )
+
+    assert isinstance(excinfo.value.error, smtplib.SMTPAuthenticationError)
+    assert [result.key for result in batches[0]] == [0]
+
+
+def test_rate_budget_espacia_los_envios(mocker):
+    clock = iter([100.0, 100.0, 100.0])
+    mocker.patch.object(mail_delivery.time, "monotonic", side_effect=clock)
+    sleep = mocker.patch.object(mail_delivery.time, "sleep")
+    budget = mail_delivery.RateBudget(per_minute=120)
+
+    budget.acquire()
+    budget.acquire()
+    budget.acquire()
+
+    assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0]
+    assert mail_delivery.RateBudget(per_minute=0).interval == 0
+
+
+def test_adjunto_codificado_una_vez_se_comparte():
+    part = mail_delivery.encode_attachment("nota.txt", b"hola", "text/plain")
+    mensajes = [EmailMessage(subject="s", body="b", to=[f"{i}@x.com"]) for i in (1, 2)]
+    for mensaje in mensajes:
+        mensaje.attach(part)
+
+    for mensaje in mensajes:
+        raw = mensaje.message().as_string()
+        assert 'filename="nota.txt"' in raw
+        assert "aG9sYQ==" in raw
+
+
+def _mailing_upload(*mails):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "mailing"
+    worksheet.append(["mail"])
+    for destino in mails:
+        worksheet.append([destino])
+    output = BytesIO()
+    workbook.save(output)
+    return SimpleUploadedFile("mailing.xlsx", output.getvalue())
+
+
+@pytest.fixture
+def mailing_job(db, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.MAIL_DELIVERY_BATCH_SIZE = 2
+    user = get_user_model().objects.create_user(username="mailing", password="x")
+    job = create_mailing_job(
+        uploaded_file=_mailing_upload(
+            "a@example.com", "no-es-mail", "b@example.com", "c@example.com"
+        ),
+        asunto="Aviso",
+        cuerpo="Hola",
+        requested_by=user,
+        attachments=[SimpleUploadedFile("nota.txt", b"hola")],
+    )
+    return job
+
+
+def test_process_mailing_job_escribe_resultados_por_lote(mailing_job):
+    job = process_mailing_job(mailing_job)
+
+    job.refresh_from_db()
+    assert job.status == MailingJob.Status.COMPLETED
+    assert (job.total_rows, job.processed_rows, job.sent_rows, job.rejected_rows) == (
+        4,
+        4,
+        3,
+        1,
+    )
+    assert job.next_row_index == 4
+    assert sorted(message.to[0] for message in mail.outbox) == [
+        "a@example.com",
+        "b@example.com",
+        "c@example.com",
+    ]
+    assert all(message.attachments for message in mail.outbox)
+    estados = dict(MailingJobRow.objects.filter(job=job).values_list("fila", "status"))
+    assert estados == {
+        2: MailingJobRow.Status.SENT,
+        3: MailingJobRow.Status.FAILED,
+        4: MailingJobRow.Status.SENT,
+        5: MailingJobRow.Status.SENT,
+    }
+    assert MailingJobAttachment.objects.filter(job=job).count() == 1
+
+
+def test_reanudar_mailing_job_no_reenvia_filas_enviadas(mailing_job, mocker):
+    mocker.patch(
+        "comunicados.services_mailing_jobs.deliver_messages",
+        side_effect=_abort_after_first_message,
+    )
+    job = process_mailing_job(mailing_job)
+    assert job.status == MailingJob.Status.FAILED
+    # Los mensajes se arman por lote: la fila invalida todavia no se leyo.
+    assert job.next_row_index == 1
+
+    mocker.stopall()
+    mail.outbox.clear()
+    job.status = MailingJob.Status.PENDING
+    process_mailing_job(job)
+
+    job.refresh_from_db()
+    assert job.status == MailingJob.Status.COMPLETED
+    assert (job.processed_rows, job.sent_rows, job.rejected_rows) == (4, 3, 1)
+    assert sorted(message.to[0] for message in mail.outbox) == [
+        "b@example.com",
+        "c@example.com",
+    ]
+    assert MailingJobRow.objects.get(job=job, fila=2).attempts == 1
+
+
+def _abort_after_first_message(messages, *, on_batch):
+    key, _message = next(iter(messages))
+    on_batch([mail_delivery.DeliveryResult(key)])
+    raise mail_delivery.MailDeliveryAborted(smtplib.SMTPServerDisconnected("caido"))
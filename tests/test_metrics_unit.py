@@ -0,0 +1,193 @@
+"""Tests de las metricas por request (core.metrics y su middleware)."""
+
+import json
+import logging
+import subprocess
+import sys
+import time
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from config.middlewares.metrics import RequestMetricsMiddleware
+from core import metrics as module
+from healthcheck.views import metrics as metrics_view
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _registry_limpio():
+    module.registry.reset()
+    yield
+    module.registry.reset()
+
+
+def _request(path="/health/"):
+    request = RequestFactory().get(path)
+    request.resolver_match = resolve(path)
+    return request
+
+
+def _vista_con_consultas_y_cache(request):
+    user_model = get_user_model()
+    user_model.objects.count()
+    user_model.objects.exists()
+    cache.set("metrics-test", 1)
+    cache.get("metrics-test")
+    cache.get("metrics-test-ausente")
+    return HttpResponse("x" * 10)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_MULTIPROC_DIR="")
+def test_middleware_registra_consultas_cache_y_tamano():
+    middleware = RequestMetricsMiddleware(_vista_con_consultas_y_cache)
+
+    middleware(_request())
+
+    counters, histograms = module.collect()
+    route = (("route", "health/"),)
+    assert counters[("sisoc_http_db_queries_total", route)] == 2
+    assert counters[("sisoc_http_response_size_bytes_total", route)] == 10
+    assert counters[("sisoc_cache_requests_total", (*route, ("result", "hit")))] == 1
+    assert counters[("sisoc_cache_requests_total", (*route, ("result", "miss")))] == 1
+    requests_key = (
+        "sisoc_http_requests_total",
+        (("method", "GET"), ("route", "health/"), ("status", 200)),
+    )
+    assert counters[requests_key] == 1
+    histogram = histograms[
+        ("sisoc_http_request_duration_seconds", (("method", "GET"), *route))
+    ]
+    assert histogram[-1] == 1
+
+
+@override_settings(METRICS_ENABLED=False)
+def test_middleware_deshabilitado_no_se_usa():
+    with pytest.raises(MiddlewareNotUsed):
+        RequestMetricsMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(
+    METRICS_ENABLED=True,
+    METRICS_MULTIPROC_DIR="",
+    METRICS_SLOW_REQUEST_SECONDS=0.000001,
+    METRICS_SLOW_QUERY_SAMPLE_SIZE=1,
+)
+def test_request_lenta_loguea_las_consultas_mas_lentas(caplog):
+    middleware = RequestMetricsMiddleware(_vista_con_consultas_y_cache)
+
+    with caplog.at_level(logging.WARNING, logger="django"):
+        middleware(_request())
+
+    registro = next(r for r in caplog.records if "Request lenta" in r.getMessage())
+    assert len(registro.data["slowest_queries"]) == 1
+    counters, _ = module.collect()
+    assert counters[("sisoc_http_slow_requests_total", (("route", "health/"),))] == 1
+
+
+def test_render_acumula_buckets_y_escapa_labels():
+    registry = module.MetricsRegistry()
+    labels = (("method", "GET"), ("route", 'a"b\\c'))
+    registry.observe("sisoc_http_request_duration_seconds", labels, 0.02)
+    registry.observe("sisoc_http_request_duration_seconds", labels, 3.0)
+
+    texto = module.render_prometheus(*module._merge([registry.snapshot()]))
+
+    assert "# TYPE sisoc_http_request_duration_seconds histogram" in texto
+    prefijo = (
+        'sisoc_http_request_duration_seconds_bucket{method="GET",route="a\\"b\\\\c"'
+    )
+    assert f'{prefijo},le="0.025"}} 1' in texto
+    assert f'{prefijo},le="2.5"}} 1' in texto
+    assert f'{prefijo},le="5.0"}} 2' in texto
+    assert f'{prefijo},le="+Inf"}} 2' in texto
+    assert (
+        'sisoc_http_request_duration_seconds_count{method="GET",route="a\\"b\\\\c"} 2'
+        in texto
+    )
+
+
+def test_collect_suma_los_archivos_de_todos_los_workers(tmp_path):
+    otro_worker = module.MetricsRegistry()
+    otro_worker.inc("sisoc_http_db_queries_total", (("route", "x/"),), 3)
+    (tmp_path / "metrics-99999.json").write_text(json.dumps(otro_worker.snapshot()))
+    (tmp_path / "metrics-99998.json").write_text("{corrupto")
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        module.registry.inc("sisoc_http_db_queries_total", (("route", "x/"),), 2)
+        counters, _ = module.collect()
+
+    assert counters[("sisoc_http_db_queries_total", (("route", "x/"),))] == 5
+    assert not list(tmp_path.glob(".metrics-*"))
+
+
+def test_proceso_ocioso_vuelca_su_ultimo_intervalo(tmp_path):
+    worker = module.MetricsRegistry()
+
+    with override_settings(
+        METRICS_MULTIPROC_DIR=str(tmp_path), METRICS_FLUSH_INTERVAL_SECONDS=0.05
+    ):
+        worker.inc("sisoc_renaper_cache_lookups_total", (("result", "hits"),))
+        deadline = time.monotonic() + 5
+        while not list(tmp_path.glob(module.SNAPSHOT_GLOB)):
+            assert time.monotonic() < deadline, "el hilo no volco las metricas"
+            time.sleep(0.02)
+
+    (snapshot,) = tmp_path.glob(module.SNAPSHOT_GLOB)
+    assert json.loads(snapshot.read_text())["counters"] == [
+        ["sisoc_renaper_cache_lookups_total", [["result", "hits"]], 1.0]
+    ]
+
+
+def test_flush_final_al_salir_del_proceso(tmp_path):
+    script = (
+        "from django.conf import settings\n"
+        f"settings.configure(METRICS_MULTIPROC_DIR={str(tmp_path)!r}, "
+        "METRICS_FLUSH_INTERVAL_SECONDS=3600)\n"
+        "from core.metrics import registry\n"
+        "registry.inc('sisoc_http_slow_requests_total', ())\n"
+    )
+
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=settings.BASE_DIR)
+
+    (snapshot,) = tmp_path.glob(module.SNAPSHOT_GLOB)
+    assert json.loads(snapshot.read_text())["counters"] == [
+        ["sisoc_http_slow_requests_total", [], 1.0]
+    ]
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN="secreto")
+def test_endpoint_exige_token_o_superusuario():
+    factory = RequestFactory()
+    anonima = factory.get("/metrics/")
+    anonima.user = AnonymousUser()
+    assert metrics_view(anonima).status_code == 403
+
+    token_erroneo = factory.get("/metrics/", HTTP_AUTHORIZATION="Bearer otro")
+    token_erroneo.user = AnonymousUser()
+    assert metrics_view(token_erroneo).status_code == 403
+
+    con_token = factory.get("/metrics/", HTTP_AUTHORIZATION="Bearer secreto")
+    con_token.user = AnonymousUser()
+    response = metrics_view(con_token)
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+
+    superusuario = factory.get("/metrics/")
+    superusuario.user = get_user_model().objects.create_superuser(
+        "metrics-admin", "admin@example.com", "x"
+    )
+    assert metrics_view(superusuario).status_code == 200
+
+
+@override_settings(METRICS_ENABLED=False)
+def test_endpoint_deshabilitado_responde_404(client):
+    assert client.get("/metrics/").status_code == 404
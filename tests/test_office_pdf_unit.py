@@ -0,0 +1,144 @@
+"""Tests del pool de conversion DOCX->PDF (core.services.office_pdf)."""
+
+import subprocess
+import zipfile
+
+import pytest
+from django.core.cache import cache
+
+from core.services import office_pdf
+
+
+@pytest.fixture(autouse=True)
+def _pool(settings, tmp_path):
+    settings.OFFICE_PDF_PROFILE_DIR = str(tmp_path / "pool")
+    settings.OFFICE_PDF_POOL_SIZE = 2
+    settings.OFFICE_PDF_QUEUE_TIMEOUT_SECONDS = 0
+    settings.OFFICE_PDF_CACHE_ENABLED = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _docx(path, document_xml):
+    with zipfile.ZipFile(path, "w") as docx:
+        docx.writestr("word/document.xml", document_xml)
+        docx.writestr("word/styles.xml", "<styles/>")
+    return path
+
+
+class _FakeLibreOffice:
+    """Reemplaza ``_run_libreoffice``: escribe el PDF y registra el slot usado."""
+
+    def __init__(self, returncode=0):
+        self.returncode = returncode
+        self.calls = []
+
+    def __call__(self, slot, input_path, timeout):
+        self.calls.append(slot.index)
+        slot.profile_path.mkdir(parents=True, exist_ok=True)
+        if self.returncode == 0:
+            input_path.with_suffix(".pdf").write_bytes(
+                b"%PDF " + input_path.read_bytes()[:4]
+            )
+        return self.returncode, b"error de conversion"
+
+
+def test_convierte_y_reutiliza_el_perfil_del_slot(mocker, tmp_path):
+    fake = mocker.patch.object(office_pdf, "_run_libreoffice", _FakeLibreOffice())
+    origen = tmp_path / "a.txt"
+    origen.write_text("hola")
+
+    assert office_pdf.convertir_a_pdf(origen, error_message="x") == b"%PDF hola"
+    assert office_pdf.convertir_a_pdf(origen, error_message="x") == b"%PDF hola"
+
+    assert fake.calls == [0, 0]
+    assert office_pdf.get_slots()[0].is_warm
+
+
+def test_fallo_descarta_el_perfil_del_slot(mocker, tmp_path):
+    mocker.patch.object(office_pdf, "_run_libreoffice", _FakeLibreOffice(returncode=1))
+    origen = tmp_path / "a.txt"
+    origen.write_text("hola")
+
+    with pytest.raises(office_pdf.OfficeConversionError, match="error de conversion"):
+        office_pdf.convertir_a_pdf(origen, error_message="x")
+
+    assert not office_pdf.get_slots()[0].is_warm
+
+
+def test_timeout_mata_el_grupo_y_descarta_el_perfil(mocker, tmp_path):
+    slot = office_pdf.get_slots()[0]
+    slot.profile_path.mkdir(parents=True)
+    process = mocker.Mock(pid=4321)
+    process.communicate.side_effect = [
+        subprocess.TimeoutExpired("libreoffice", 1),
+        (b"", b""),
+    ]
+    mocker.patch.object(office_pdf.subprocess, "Popen", return_value=process)
+    killpg = mocker.patch.object(office_pdf.os, "killpg")
+    origen = tmp_path / "a.txt"
+    origen.write_text("hola")
+
+    with pytest.raises(office_pdf.OfficeConversionError, match="superó"):
+        office_pdf.convertir_a_pdf(origen, error_message="Fallo.")
+
+    killpg.assert_called_once_with(4321, office_pdf.signal.SIGKILL)
+    assert not slot.is_warm
+
+
+def test_sin_slots_libres_falla_al_vencer_la_espera():
+    with office_pdf.reservar_slot() as primero, office_pdf.reservar_slot() as segundo:
+        assert {primero.index, segundo.index} == {0, 1}
+        with pytest.raises(office_pdf.OfficeConversionError, match="libres"):
+            with office_pdf.reservar_slot():
+                pass
+
+    with office_pdf.reservar_slot() as liberado:
+        assert liberado.index == 0
+
+
+def test_cache_por_plantilla_y_document_xml(mocker, tmp_path):
+    fake = mocker.patch.object(office_pdf, "_run_libreoffice", _FakeLibreOffice())
+    plantilla = _docx(tmp_path / "plantilla.docx", "<doc>{campo}</doc>")
+    primero = _docx(tmp_path / "uno.docx", "<doc>enero</doc>")
+    repetido = _docx(tmp_path / "dos.docx", "<doc>enero</doc>")
+    distinto = _docx(tmp_path / "tres.docx", "<doc>febrero</doc>")
+
+    resultados = [
+        office_pdf.convertir_plantilla_docx_a_pdf(plantilla, docx, error_message="x")
+        for docx in (primero, repetido, distinto)
+    ]
+
+    assert resultados[0] == resultados[1]
+    assert len(fake.calls) == 2
+    assert office_pdf.plantilla_cache_key(
+        plantilla, primero
+    ) == office_pdf.plantilla_cache_key(plantilla, repetido)
+    assert office_pdf.plantilla_cache_key(
+        plantilla, primero
+    ) != office_pdf.plantilla_cache_key(plantilla, distinto)
+
+
+def test_verificar_slots_informa_ocupados_y_errores(mocker):
+    mocker.patch.object(office_pdf, "_run_libreoffice", _FakeLibreOffice())
+
+    with office_pdf.reservar_slot():
+        resultados = office_pdf.verificar_slots()
+
+    assert resultados[0] == {"slot": 0, "status": "busy"}
+    assert resultados[1]["status"] == "ok"
+    assert resultados[1]["warm"] is False
+
+
+def test_cambio_de_plantilla_invalida_el_pdf_cacheado(mocker, tmp_path):
+    fake = mocker.patch.object(office_pdf, "_run_libreoffice", _FakeLibreOffice())
+    plantilla = _docx(tmp_path / "plantilla.docx", "<doc>{campo}</doc>")
+    documento = _docx(tmp_path / "uno.docx", "<doc>enero</doc>")
+
+    office_pdf.convertir_plantilla_docx_a_pdf(plantilla, documento, error_message="x")
+    office_pdf.convertir_plantilla_docx_a_pdf(plantilla, documento, error_message="x")
+    _docx(plantilla, "<doc>{campo} v2</doc>")
+    office_pdf.convertir_plantilla_docx_a_pdf(plantilla, documento, error_message="x")
+
+    assert len(fake.calls) == 2
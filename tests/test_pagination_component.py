@@ -49,3 +49,30 @@ def test_pagination_component_does_not_iterate_full_paginator_page_range():
     assert "page=1" in html
     assert "page=50000" in html
     assert "page=100000" in html
+
+
+def test_pagination_component_usa_cursor_en_links_keyset():
+    page = SimpleNamespace(
+        number=2,
+        paginator=SimpleNamespace(count=None, num_pages=None),
+        next_cursor="abc:1",
+        previous_cursor="xyz",
+        has_previous=lambda: True,
+        has_next=lambda: True,
+        previous_page_number=lambda: 1,
+        next_page_number=lambda: 3,
+    )
+
+    html = render_to_string(
+        "components/pagination.html",
+        {
+            "is_paginated": True,
+            "page_obj": page,
+            "page_range": [1, 2, 3],
+            "request": SimpleNamespace(GET={"cursor": "viejo", "estado": "a b"}),
+        },
+    )
+
+    assert "estado=a+b&amp;page=3&amp;cursor=abc%3A1" in html
+    assert "estado=a+b&amp;page=1&amp;cursor=xyz" in html
+    assert "viejo" not in html
@@ -5,6 +5,7 @@ from types import SimpleNamespace
 
 import pandas as pd
 import pytest
+from openpyxl import load_workbook
 from django.core.exceptions import ValidationError
 
 from celiaquia.services import pago_service as module
@@ -12,6 +13,24 @@ from celiaquia.services import pago_service as module
 pytestmark = pytest.mark.django_db
 
 
+def _values_qs(rows=None):
+    """Queryset minimo para ``values(...).iterator(chunk_size=...)``."""
+    if rows is None:
+        rows = [
+            {
+                "ciudadano__documento": "123",
+                "ciudadano__nombre": "A",
+                "ciudadano__apellido": "B",
+                "expediente_id": 9,
+            }
+        ]
+    return SimpleNamespace(
+        values=lambda *fields: SimpleNamespace(
+            iterator=lambda chunk_size=None: iter(rows)
+        )
+    )
+
+
 def test_norm_digits_and_leer_tabla_fallbacks(mocker):
     assert module._norm_digits("20-123") == "20123"
 
@@ -56,14 +75,8 @@ def test_crear_expediente_pago_generates_file_and_updates_state(mocker):
         return_value=pago,
     )
 
-    leg = SimpleNamespace(
-        ciudadano=SimpleNamespace(
-            documento="123", cuil="20-12345678-3", nombre="A", apellido="B"
-        ),
-        expediente_id=9,
-    )
     mocker.patch.object(
-        module.PagoService, "_qs_consolidado_activo", return_value=[leg]
+        module.PagoService, "_qs_consolidado_activo", return_value=_values_qs()
     )
 
     out = module.PagoService.crear_expediente_pago(
@@ -143,15 +156,40 @@ def test_procesar_respuesta_validations_and_processing(mocker):
 
 
 def test_exportar_nomina_actual_excel(mocker):
-    leg = SimpleNamespace(
-        ciudadano=SimpleNamespace(
-            documento="123", cuil="20-12345678-3", nombre="A", apellido="B"
-        ),
-        expediente_id=9,
-    )
     mocker.patch.object(
-        module.PagoService, "_qs_consolidado_activo", return_value=[leg]
+        module.PagoService, "_qs_consolidado_activo", return_value=_values_qs()
     )
     out = module.PagoService.exportar_nomina_actual_excel(provincia="P")
     assert isinstance(out, (bytes, bytearray))
-    assert len(out) > 0
+
+    ws = load_workbook(BytesIO(out)).active
+    assert ws.title == "nomina_actual"
+    assert [list(row) for row in ws.iter_rows(values_only=True)] == [
+        ["dni", "cuit", "nombre", "apellido", "expediente"],
+        # La columna cuit sale vacia, como en la nomina original.
+        ["123", None, "A", "B", "9"],
+    ]
+
+
+def test_crear_expediente_pago_sin_candidatos_no_adjunta_archivo(mocker):
+    pago = SimpleNamespace(
+        pk=1,
+        total_candidatos=None,
+        archivo_envio=SimpleNamespace(save=mocker.Mock()),
+        estado=None,
+        save=mocker.Mock(),
+    )
+    mocker.patch(
+        "celiaquia.services.pago_service.PagoExpediente.objects.create",
+        return_value=pago,
+    )
+    mocker.patch.object(
+        module.PagoService, "_qs_consolidado_activo", return_value=_values_qs([])
+    )
+
+    module.PagoService.crear_expediente_pago(
+        provincia=SimpleNamespace(id=2), usuario="u", periodo="2026-01"
+    )
+
+    assert pago.total_candidatos == 0
+    pago.archivo_envio.save.assert_not_called()
@@ -4,7 +4,7 @@ from datetime import date
 import pytest
 from django.apps import apps as django_apps
 
-from ciudadanos.models import Ciudadano
+from ciudadanos.models import Ciudadano, CiudadanoTerminoBusqueda
 from comedores.models import (
     ActividadColaboradorEspacio,
     AuditColaboradorEspacio,
@@ -173,6 +173,11 @@ def test_replace_pnud_colaboradores_replaces_only_pnud_comedores(tmp_path):
     assert creado.codigo_telefono is None
     assert creado.numero_telefono is None
     assert not creado.actividades.exists()
+    assert set(
+        CiudadanoTerminoBusqueda.objects.filter(ciudadano=creado.ciudadano).values_list(
+            "termino", flat=True
+        )
+    ) == {"nuevo", "ciudadano"}
     assert not Ciudadano.objects.filter(documento=44444444).exists()
 
     assert AuditColaboradorEspacio.objects.filter(
@@ -0,0 +1,187 @@
+"""Tests del cache compartido de consultas RENAPER."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+import centrodefamilia.services.consulta_renaper as centrodefamilia_renaper
+from core.metrics import _merge, registry, render_prometheus
+from core.services.renaper_cache import (
+    RENAPER_CACHE_METRIC,
+    consultar_renaper_con_cache,
+    invalidate_renaper_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _renaper_cache(settings):
+    settings.RENAPER_CACHE_ENABLED = True
+    settings.METRICS_ENABLED = True
+    settings.METRICS_MULTIPROC_DIR = ""
+    cache.clear()
+    registry.reset()
+    yield
+    cache.clear()
+    registry.reset()
+
+
+def get_renaper_cache_stats():
+    stats = dict.fromkeys(("hits", "negative_hits", "misses", "coalesced"), 0)
+    for name, labels, value in registry.snapshot()["counters"]:
+        if name == RENAPER_CACHE_METRIC:
+            stats[dict(labels)["result"]] = value
+    return stats
+
+
+def _success(dni):
+    return {"success": True, "data": {"dni": dni, "apellido": "PEREZ"}}
+
+
+def test_respuesta_exitosa_se_cachea_por_dni_y_sexo():
+    calls = []
+
+    def fetch(dni, sexo):
+        calls.append((dni, sexo))
+        return _success(dni)
+
+    first = consultar_renaper_con_cache("30111222", "m", fetch)
+    second = consultar_renaper_con_cache("30111222", "M", fetch)
+    consultar_renaper_con_cache("30111222", "F", fetch)
+
+    assert first == second == _success("30111222")
+    assert calls == [("30111222", "m"), ("30111222", "F")]
+    stats = get_renaper_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_sin_coincidencia_se_cachea_como_negativo():
+    calls = []
+
+    def fetch(dni, sexo):
+        calls.append(dni)
+        return {"success": False, "error": "No", "error_type": "no_match"}
+
+    consultar_renaper_con_cache("30111222", "M", fetch)
+    out = consultar_renaper_con_cache("30111222", "M", fetch)
+
+    assert out["error_type"] == "no_match"
+    assert len(calls) == 1
+    assert get_renaper_cache_stats()["negative_hits"] == 1
+
+
+@pytest.mark.parametrize("error_type", ["timeout", "auth_error", "remote_error"])
+def test_errores_transitorios_no_se_cachean(error_type):
+    calls = []
+
+    def fetch(dni, sexo):
+        calls.append(dni)
+        return {"success": False, "error": "x", "error_type": error_type}
+
+    consultar_renaper_con_cache("30111222", "M", fetch)
+    consultar_renaper_con_cache("30111222", "M", fetch)
+
+    assert len(calls) == 2
+
+
+def test_consultas_concurrentes_colapsan_en_una_llamada():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(dni, sexo):
+        calls.append(dni)
+        started.set()
+        release.wait(timeout=5)
+        return _success(dni)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [
+            executor.submit(consultar_renaper_con_cache, "30111222", "M", fetch)
+            for _ in range(6)
+        ]
+        started.wait(timeout=5)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result == _success("30111222") for result in results)
+    stats = get_renaper_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] + stats["coalesced"] == 5
+
+
+def test_invalidar_descarta_respuestas_cacheadas():
+    calls = []
+
+    def fetch(dni, sexo):
+        calls.append(dni)
+        return _success(dni)
+
+    consultar_renaper_con_cache("30111222", "M", fetch)
+    invalidate_renaper_cache()
+    consultar_renaper_con_cache("30111222", "M", fetch)
+
+    assert len(calls) == 2
+
+
+def test_cache_deshabilitado_siempre_consulta(settings):
+    settings.RENAPER_CACHE_ENABLED = False
+    calls = []
+
+    def fetch(dni, sexo):
+        calls.append(dni)
+        return _success(dni)
+
+    consultar_renaper_con_cache("30111222", "M", fetch)
+    consultar_renaper_con_cache("30111222", "M", fetch)
+
+    assert len(calls) == 2
+    assert get_renaper_cache_stats()["misses"] == 0
+
+
+def test_consultar_datos_renaper_usa_el_cache(mocker):
+    client = mocker.Mock()
+    client.consultar_ciudadano.return_value = {
+        "success": False,
+        "error": "No se encontro coincidencia.",
+        "error_type": "no_match",
+    }
+    mocker.patch(
+        "centrodefamilia.services.consulta_renaper.impl.APIClient", return_value=client
+    )
+
+    centrodefamilia_renaper.consultar_datos_renaper("13163071", "M")
+    out = centrodefamilia_renaper.consultar_datos_renaper("13163071", "M")
+
+    assert out["error_type"] == "no_match"
+    client.consultar_ciudadano.assert_called_once_with("13163071", "M")
+
+
+def test_comando_renaper_cache_invalida_las_respuestas(capsys):
+    calls = []
+
+    def fetch(dni, sexo):
+        calls.append(dni)
+        return _success(dni)
+
+    consultar_renaper_con_cache("30111222", "M", fetch)
+
+    call_command("renaper_cache", "--invalidate")
+    consultar_renaper_con_cache("30111222", "M", fetch)
+
+    assert "invalidadas" in capsys.readouterr().out
+    assert len(calls) == 2
+
+
+def test_contadores_se_exponen_en_metrics():
+    consultar_renaper_con_cache("30111222", "M", lambda dni, sexo: _success(dni))
+    consultar_renaper_con_cache("30111222", "M", lambda dni, sexo: _success(dni))
+
+    texto = render_prometheus(*_merge([registry.snapshot()]))
+
+    assert 'sisoc_renaper_cache_lookups_total{result="hits"} 1' in texto
+    assert 'sisoc_renaper_cache_lookups_total{result="misses"} 1' in texto
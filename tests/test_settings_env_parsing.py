@@ -164,3 +164,27 @@ def test_env_example_declares_valid_email_assignments():
     assert 'EMAIL_HOST_USER=""' in active_assignments
     assert 'EMAIL_HOST_PASSWORD=""' in active_assignments
     assert 'DEFAULT_FROM_EMAIL="no-reply@sisoc.local"' in active_assignments
+
+
+def test_settings_cache_defaults_to_locmem_without_redis_url(monkeypatch):
+    monkeypatch.delenv("CACHE_REDIS_URL", raising=False)
+
+    module = _load_settings_module()
+
+    assert (
+        module.CACHES["default"]["BACKEND"]
+        == "core.cache_backends.InstrumentedLocMemCache"
+    )
+
+
+def test_settings_cache_uses_redis_when_url_is_configured(monkeypatch):
+    monkeypatch.setenv("CACHE_REDIS_URL", "redis://redis:6379/1")
+    monkeypatch.setenv("CACHE_REDIS_SOCKET_TIMEOUT_SECONDS", "abc")
+
+    module = _load_settings_module()
+
+    default_cache = module.CACHES["default"]
+    assert default_cache["BACKEND"] == "core.cache_backends.InstrumentedRedisCache"
+    assert default_cache["LOCATION"] == "redis://redis:6379/1"
+    assert default_cache["KEY_PREFIX"] == "sisoc"
+    assert default_cache["OPTIONS"]["socket_timeout"] == 1.0
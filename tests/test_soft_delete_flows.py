@@ -2,7 +2,9 @@ from datetime import datetime
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db.utils import OperationalError
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -111,6 +113,166 @@ def test_soft_delete_cascade_and_restore_cascade():
     assert Actividad.objects.filter(pk=actividad.pk).exists()
 
 
+def _create_categoria_con_actividades(nombre, cantidad):
+    categoria = Categoria.objects.create(nombre=nombre)
+    Actividad.objects.bulk_create(
+        [
+            Actividad(nombre=f"{nombre} {index}", categoria=categoria)
+            for index in range(cantidad)
+        ]
+    )
+    return categoria
+
+
+def _count_queries(callback):
+    with CaptureQueriesContext(connection) as queries:
+        callback()
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_soft_delete_cascade_queries_no_dependen_de_la_cantidad_de_hijos():
+    chica = _create_categoria_con_actividades("Cascada chica", 3)
+    grande = _create_categoria_con_actividades("Cascada grande", 60)
+
+    queries_chica = _count_queries(lambda: chica.delete(cascade=True))
+    queries_grande = _count_queries(lambda: grande.delete(cascade=True))
+
+    assert queries_grande == queries_chica
+    assert Actividad.objects.filter(categoria=grande).count() == 0
+
+    restore_chica = _count_queries(
+        lambda: Categoria.all_objects.get(pk=chica.pk).restore(cascade=True)
+    )
+    restore_grande = _count_queries(
+        lambda: Categoria.all_objects.get(pk=grande.pk).restore(cascade=True)
+    )
+
+    assert restore_grande == restore_chica
+    assert Actividad.objects.filter(categoria=grande).count() == 60
+
+
+@pytest.mark.django_db
+def test_queryset_delete_y_restore_masivo_en_cascada():
+    user = get_user_model().objects.create_user(username="bulk_sd", password="x")
+    categorias = [
+        _create_categoria_con_actividades(f"Masiva {index}", 2) for index in range(3)
+    ]
+    pks = [categoria.pk for categoria in categorias]
+    received = []
+    post_soft_delete.connect(
+        lambda sender, **kwargs: received.append(sender), weak=False, dispatch_uid="t"
+    )
+    try:
+        total, detalle = Categoria.objects.filter(pk__in=pks).delete(user=user)
+    finally:
+        post_soft_delete.disconnect(dispatch_uid="t")
+
+    assert total == 9
+    assert detalle == {
+        _categoria_model_key(): 3,
+        f"{Actividad._meta.app_label}.{Actividad.__name__}": 6,
+    }
+    assert len(received) == 9
+    assert set(
+        Actividad.all_objects.filter(categoria_id__in=pks).values_list(
+            "deleted_by", flat=True
+        )
+    ) == {user.pk}
+
+    total, _ = Categoria.all_objects.filter(pk__in=pks).restore(user=user)
+
+    assert total == 9
+    assert Actividad.objects.filter(categoria_id__in=pks).count() == 6
+
+
+@pytest.mark.django_db
+def test_queryset_delete_sin_cascada_solo_afecta_raices():
+    categoria = _create_categoria_con_actividades("Sin cascada", 2)
+
+    total, _ = Categoria.objects.filter(pk=categoria.pk).delete(cascade=False)
+
+    assert total == 1
+    assert Actividad.objects.filter(categoria=categoria).count() == 2
+
+
+@pytest.mark.django_db
+def test_queryset_delete_masivo_informa_la_raiz_de_cada_instancia():
+    categorias = [
+        _create_categoria_con_actividades(f"Raiz {index}", 2) for index in range(2)
+    ]
+    received = []
+    post_soft_delete.connect(
+        lambda sender, instance, root, **kwargs: received.append(
+            (sender, instance.pk, root.pk)
+        ),
+        weak=False,
+        dispatch_uid="t-root",
+    )
+    try:
+        Categoria.objects.filter(pk__in=[c.pk for c in categorias]).delete()
+    finally:
+        post_soft_delete.disconnect(dispatch_uid="t-root")
+
+    for categoria in categorias:
+        actividades = Actividad.all_objects.filter(categoria=categoria)
+        assert (Categoria, categoria.pk, categoria.pk) in received
+        for actividad in actividades:
+            assert (Actividad, actividad.pk, categoria.pk) in received
+
+
+@pytest.mark.django_db
+def test_queryset_delete_sin_cascada_emite_la_misma_senal_que_la_instancia():
+    # El camino masivo hace un UPDATE por lote, pero cada raiz recibe la senal
+    # como con ``instance.delete(cascade=False)``: root=ella misma, sin cascada.
+    categorias = [Categoria.objects.create(nombre=f"Sola {i}") for i in range(2)]
+    received = []
+    post_soft_delete.connect(
+        lambda sender, instance, root, cascade, **kwargs: received.append(
+            (instance.pk, root.pk, cascade)
+        ),
+        weak=False,
+        dispatch_uid="t-sin-cascada",
+    )
+    try:
+        total, _ = Categoria.objects.filter(pk__in=[c.pk for c in categorias]).delete(
+            cascade=False
+        )
+    finally:
+        post_soft_delete.disconnect(dispatch_uid="t-sin-cascada")
+
+    assert total == 2
+    assert sorted(received) == sorted((c.pk, c.pk, False) for c in categorias)
+
+
+def test_hard_delete_respeta_el_orden_por_nivel(monkeypatch):
+    from core.soft_delete import cascade
+
+    class Padre:
+        def __init__(self, pk):
+            self.pk = pk
+
+    class Hijo(Padre):
+        pass
+
+    borrados = []
+    monkeypatch.setattr(
+        cascade,
+        "_hard_delete_ids",
+        lambda model, ids: borrados.append((model.__name__, ids)),
+    )
+    # Un mismo modelo en dos niveles (p. ej. autorreferencia) no se agrupa.
+    nodes = [
+        cascade.CascadeNode(instance=Hijo(3), mode=cascade.MODE_HARD, depth=2),
+        cascade.CascadeNode(instance=Padre(2), mode=cascade.MODE_HARD, depth=1),
+        cascade.CascadeNode(instance=Hijo(1), mode=cascade.MODE_HARD, depth=0),
+    ]
+
+    cascade._perform_hard_deletes(nodes)
+
+    assert borrados == [("Hijo", [3]), ("Padre", [2]), ("Hijo", [1])]
+
+
 @pytest.mark.django_db
 def test_soft_delete_apaga_activo_antes_de_emitir_post_soft_delete():
     user = get_user_model().objects.create_user(
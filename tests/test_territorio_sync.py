@@ -93,3 +93,38 @@ def test_sync_crea_solo_faltantes_normaliza_y_es_idempotente(tmp_path):
         "saltadas_por_integridad": 0,
     }
     assert Localidad.objects.count() == 4
+
+
+def test_sync_no_unifica_alias_del_nomenclador(tmp_path):
+    fixture_path = tmp_path / "territorio.json"
+    fixture_path.write_text(
+        json.dumps(
+            [
+                {"model": "core.provincia", "pk": 1, "fields": {"nombre": "CABA"}},
+                {
+                    "model": "core.municipio",
+                    "pk": 2,
+                    "fields": {"nombre": "Comuna 1", "provincia": 1},
+                },
+            ]
+            + [
+                {
+                    "model": "core.localidad",
+                    "pk": pk,
+                    "fields": {"nombre": nombre, "municipio": 2},
+                }
+                for pk, nombre in (
+                    (3, "Ciudad Autónoma de Buenos Aires"),
+                    (4, "CABA"),
+                    (5, "Ciudad de Buenos Aires"),
+                )
+            ],
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+
+    resultado = sync_territorio_desde_fixture(fixture_path)
+
+    assert resultado["localidades_creadas"] == 3
+    assert set(Localidad.objects.values_list("pk", flat=True)) == {3, 4, 5}
@@ -2,6 +2,7 @@
 
 import pytest
 from django.contrib.auth import SESSION_KEY, get_user_model
+from django.core.cache import cache
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
@@ -82,6 +83,45 @@ def test_api_login_rejects_non_pwa_user():
     assert response.data["detail"] == "Este usuario no tiene acceso PWA activo."
 
 
+@pytest.mark.django_db
+def test_api_login_returns_429_after_rate_limit(comedor):
+    cache.clear()
+    _create_representante(comedor=comedor, username="rep_rate_limit")
+    client = APIClient()
+
+    statuses = [
+        client.post(
+            "/api/users/login/",
+            {"username": "rep_rate_limit", "password": "incorrecta"},
+            format="json",
+        ).status_code
+        for _ in range(11)
+    ]
+    cache.clear()
+
+    assert statuses[:10] == [401] * 10
+    assert statuses[10] == 429
+
+
+@pytest.mark.django_db
+def test_api_login_exitoso_no_consume_el_rate_limit(comedor):
+    cache.clear()
+    _create_representante(comedor=comedor, username="rep_frecuente")
+    client = APIClient()
+
+    statuses = [
+        client.post(
+            "/api/users/login/",
+            {"username": "rep_frecuente", "password": "testpass123"},
+            format="json",
+        ).status_code
+        for _ in range(12)
+    ]
+    cache.clear()
+
+    assert statuses == [200] * 12
+
+
 @pytest.mark.django_db
 def test_users_me_requires_authentication():
     client = APIClient()
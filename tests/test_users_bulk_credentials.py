@@ -17,6 +17,9 @@ from django.contrib.sessions.middleware import SessionMiddleware
 from django.utils import timezone
 from openpyxl import Workbook, load_workbook
 
+from core.jobs.engine import mark_stale_processing_jobs
+from core.jobs.registry import STALE_JOB_ERROR_MESSAGE
+
 from users.forms import BulkCredentialsUploadForm
 from users.models import BulkCredentialsJob, BulkCredentialsJobRow
 from users.services_bulk_credentials import (
@@ -24,13 +27,11 @@ from users.services_bulk_credentials import (
     process_bulk_credentials_file,
 )
 from users.services_bulk_credentials_jobs import (
-    STALE_JOB_ERROR_MESSAGE,
+    BULK_CREDENTIALS_JOB_QUEUE,
     can_resume_bulk_credentials_job,
     create_bulk_credentials_job,
-    mark_stale_bulk_credentials_jobs_as_failed,
     process_bulk_credentials_job,
     request_resume_bulk_credentials_job,
-    run_bulk_credentials_jobs_worker,
 )
 from users.services import UsuariosService
 from users.views import (
@@ -499,6 +500,52 @@ def test_process_bulk_credentials_groups_shared_recipient_into_one_email():
     assert "bulk_shared_two" in mail.outbox[0].body
 
 
+@pytest.mark.django_db
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+def test_process_bulk_credentials_reuses_one_connection_and_reconnects(mocker):
+    from django.core.mail.backends.locmem import EmailBackend
+
+    for index in range(3):
+        user = User.objects.create_user(
+            username=f"bulk_conn_{index}",
+            email=f"conn{index}@example.com",
+            password="Inicial123!",
+        )
+        _set_visible_temporary_password(user, "Inicial123!")
+    connection = EmailBackend()
+    close_spy = mocker.spy(connection, "close")
+    get_connection = mocker.patch(
+        "core.services.mail_delivery.get_connection", return_value=connection
+    )
+    destinos = []
+    send_messages = connection.send_messages
+
+    def _send(messages):
+        destinos.append(messages[0].to[0])
+        if len(destinos) == 1:
+            raise smtplib.SMTPServerDisconnected("bye")
+        return send_messages(messages)
+
+    mocker.patch.object(connection, "send_messages", side_effect=_send)
+    mocker.patch("users.services_bulk_credentials.time.sleep")
+    upload = _build_excel_file(
+        [(f"bulk_conn_{index}", f"destino{index}@example.com") for index in range(3)],
+    )
+
+    result = process_bulk_credentials_file(uploaded_file=upload, send_type="standard")
+
+    assert result["summary"]["enviadas"] == 3
+    get_connection.assert_called_once()
+    assert destinos == [
+        "destino0@example.com",
+        "destino0@example.com",
+        "destino1@example.com",
+        "destino2@example.com",
+    ]
+    # Un cierre por la desconexion y otro al terminar el archivo.
+    assert close_spy.call_count == 2
+
+
 @pytest.mark.django_db
 def test_process_bulk_credentials_rolls_back_row_when_email_send_fails(mocker):
     user = User.objects.create_user(
@@ -982,7 +1029,7 @@ def test_mark_stale_bulk_credentials_jobs_as_failed(settings, tmp_path, monkeypa
     job.last_activity_at = timezone.now() - timedelta(minutes=5)
     job.save(update_fields=["status", "last_activity_at"])
 
-    updated = mark_stale_bulk_credentials_jobs_as_failed()
+    updated = mark_stale_processing_jobs(BULK_CREDENTIALS_JOB_QUEUE)
 
     job.refresh_from_db()
     assert updated == 1
@@ -1163,34 +1210,12 @@ def test_bulk_credentials_job_resume_view_sets_job_pending(settings, tmp_path):
 
 def test_process_bulk_credentials_jobs_command_invokes_worker_once(mocker):
     run_worker = mocker.patch(
-        "users.management.commands.process_bulk_credentials_jobs."
-        "run_bulk_credentials_jobs_worker"
+        "users.management.commands.process_bulk_credentials_jobs.run_job_worker"
     )
 
     call_command("process_bulk_credentials_jobs", "--once")
 
-    run_worker.assert_called_once_with(once=True)
-
-
-def test_run_bulk_credentials_jobs_worker_once_processes_single_cycle(mocker):
-    process_next = mocker.patch(
-        "users.services_bulk_credentials_jobs.process_next_bulk_credentials_job",
-        return_value=True,
-    )
-
-    run_bulk_credentials_jobs_worker(once=True)
-
-    process_next.assert_called_once_with()
-
-
-def test_run_bulk_credentials_jobs_worker_once_reraises_unexpected_error(mocker):
-    mocker.patch(
-        "users.services_bulk_credentials_jobs.process_next_bulk_credentials_job",
-        side_effect=RuntimeError("boom"),
-    )
-
-    with pytest.raises(RuntimeError, match="boom"):
-        run_bulk_credentials_jobs_worker(once=True)
+    run_worker.assert_called_once_with(queue_names=["bulk_credentials"], once=True)
 
 
 @pytest.mark.django_db
@@ -0,0 +1,138 @@
+"""Tests for users rate limits."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+
+from core.cache_backends import InstrumentedRedisCache
+from users import rate_limits
+from users.rate_limits import (
+    ALGORITHM_TOKEN_BUCKET,
+    get_rate_limit_policy,
+    hit_rate_limit,
+    is_rate_limited,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(name="redis_cache")
+def redis_cache_fixture(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    redis_cache = InstrumentedRedisCache(
+        "redis://rate-limit-tests:6379/0",
+        {"OPTIONS": {"connection_class": fakeredis.FakeRedisConnection}},
+    )
+    redis_cache.clear()
+    monkeypatch.setattr(rate_limits, "caches", {"default": redis_cache})
+    return redis_cache
+
+
+def _hits(scope, identity, *, attempts, limit=3, window_seconds=60):
+    return [
+        hit_rate_limit(
+            scope=scope,
+            identity=identity,
+            limit=limit,
+            window_seconds=window_seconds,
+        )
+        for _ in range(attempts)
+    ]
+
+
+def test_sliding_window_blocks_after_limit_per_identity():
+    assert _hits("login", "1.1.1.1:ana", attempts=4) == [False, False, False, True]
+    assert _hits("login", "1.1.1.1:beto", attempts=1) == [False]
+
+
+def test_sliding_window_releases_after_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limits.time, "monotonic", lambda: now[0])
+
+    assert _hits("login", "ana", attempts=4, window_seconds=10)[-1] is True
+
+    now[0] += 11
+
+    assert _hits("login", "ana", attempts=1, window_seconds=10) == [False]
+
+
+def test_token_bucket_refills_proportionally(settings, monkeypatch):
+    settings.RATE_LIMIT_SCOPES = {"reset": {"algorithm": ALGORITHM_TOKEN_BUCKET}}
+    now = [1000.0]
+    monkeypatch.setattr(rate_limits.time, "monotonic", lambda: now[0])
+
+    assert _hits("reset", "ana", attempts=4, window_seconds=30) == [
+        False,
+        False,
+        False,
+        True,
+    ]
+
+    # Con limit=3 y window=30s se recupera un token cada 10s.
+    now[0] += 10
+
+    assert _hits("reset", "ana", attempts=2, window_seconds=30) == [False, True]
+
+
+def test_policy_overrides_from_settings(settings):
+    settings.RATE_LIMIT_SCOPES = {"login": {"limit": 1, "window_seconds": 5}}
+
+    policy = get_rate_limit_policy("login", limit=10, window_seconds=300)
+
+    assert policy.limit == 1
+    assert policy.window_seconds == 5
+    assert _hits("login", "ana", attempts=2) == [False, True]
+
+
+def test_policy_rejects_unknown_algorithm(settings):
+    settings.RATE_LIMIT_SCOPES = {"login": {"algorithm": "leaky"}}
+
+    with pytest.raises(ValueError):
+        get_rate_limit_policy("login", limit=1, window_seconds=1)
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", ALGORITHM_TOKEN_BUCKET])
+def test_redis_backend_counts_concurrent_hits_atomically(
+    redis_cache, settings, algorithm
+):
+    settings.RATE_LIMIT_SCOPES = {"login": {"algorithm": algorithm}}
+
+    def _check(_):
+        return hit_rate_limit(
+            scope="login", identity="ana", limit=20, window_seconds=300
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_check, range(100)))
+
+    assert results.count(False) == 20
+    assert results.count(True) == 80
+
+
+def test_redis_sliding_window_sets_ttl_from_window(redis_cache):
+    hit_rate_limit(scope="login", identity="ana", limit=5, window_seconds=60)
+
+    key = redis_cache.make_and_validate_key("ratelimit:sliding_window:login:ana")
+    ttl_ms = redis_cache._cache.get_client(key).pttl(key)
+
+    assert 0 < ttl_ms <= 60_000
+
+
+@pytest.mark.parametrize("backend", ["local", "redis"])
+@pytest.mark.parametrize("algorithm", ["sliding_window", ALGORITHM_TOKEN_BUCKET])
+def test_is_rate_limited_no_registra_el_intento(request, settings, backend, algorithm):
+    if backend == "redis":
+        request.getfixturevalue("redis_cache")
+    settings.RATE_LIMIT_SCOPES = {"login": {"algorithm": algorithm}}
+    kwargs = {"scope": "login", "identity": "ana", "limit": 2, "window_seconds": 60}
+
+    assert [is_rate_limited(**kwargs) for _ in range(5)] == [False] * 5
+    assert [hit_rate_limit(**kwargs) for _ in range(2)] == [False, False]
+    assert is_rate_limited(**kwargs) is True
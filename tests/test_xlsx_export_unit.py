@@ -0,0 +1,73 @@
+"""Tests del motor de exportacion XLSX write-only."""
+
+from datetime import date, datetime
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from core.services.xlsx_export import (
+    XLSX_CONTENT_TYPE,
+    XlsxSheet,
+    build_xlsx_bytes,
+    iter_batches,
+    xlsx_response,
+)
+from VAT.services.reportes_inscripciones_asistencia import export_rows_to_excel
+
+
+def _filas_consumidas_una_vez():
+    yield ["Perez", datetime(1990, 5, 4, 10, 30), 1]
+    yield ["Gomez", None, 2]
+
+
+def test_build_xlsx_bytes_escribe_encabezado_filas_y_fechas():
+    sheet = XlsxSheet(
+        title="nomina",
+        headers=["apellido", "fecha", "n"],
+        rows=_filas_consumidas_una_vez(),
+        bold_headers=True,
+        freeze_headers=True,
+        date_columns=frozenset({1}),
+    )
+
+    worksheet = load_workbook(BytesIO(build_xlsx_bytes([sheet])))["nomina"]
+
+    assert sheet.rows_written == 2
+    assert [list(row) for row in worksheet.iter_rows(values_only=True)] == [
+        ["apellido", "fecha", "n"],
+        ["Perez", datetime(1990, 5, 4), 1],
+        ["Gomez", None, 2],
+    ]
+    assert worksheet["A1"].font.bold is True
+    assert worksheet["B2"].number_format == "DD/MM/YYYY"
+    assert worksheet.freeze_panes == "A2"
+
+
+def test_xlsx_response_envia_el_libro_por_bloques():
+    response = xlsx_response(
+        "reporte.xlsx",
+        [XlsxSheet(title="a", headers=["x"], rows=[[date(2026, 1, 2)]])],
+    )
+
+    assert response.streaming is True
+    assert response["Content-Type"] == XLSX_CONTENT_TYPE
+    assert 'filename="reporte.xlsx"' in response["Content-Disposition"]
+    content = b"".join(response.streaming_content)
+    response.file_to_stream.close()
+    assert load_workbook(BytesIO(content))["a"]["A2"].value.date() == date(2026, 1, 2)
+
+
+def test_iter_batches_agrupa_sin_materializar_el_iterable():
+    assert list(iter_batches(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_batches([], 2)) == []
+
+
+def test_export_rows_to_excel_vat_usa_el_motor():
+    response = export_rows_to_excel([{"grupo": "Centro A", "inscripciones_total": 3}])
+
+    worksheet = load_workbook(BytesIO(b"".join(response.streaming_content))).active
+    response.file_to_stream.close()
+    rows = list(worksheet.iter_rows(values_only=True))
+    assert worksheet.title == "Reporte VAT"
+    assert rows[0][:2] == ("Agrupador", "Inscriptos totales")
+    assert rows[1][:3] == ("Centro A", 3, 0)
@@ -26,7 +26,7 @@ from users.auth_audit import (
     RESULTADO_OK,
     registrar_evento_auth,
 )
-from users.rate_limits import hit_rate_limit
+from users.rate_limits import hit_rate_limit, is_rate_limited
 from users.profile_utils import get_profile_or_none
 from users.services_auth import (
     change_password_for_authenticated_user,
@@ -38,6 +38,10 @@ from users.services_pwa import get_access_rows, is_pwa_user
 
 logger = logging.getLogger("django")
 
+# Solo cuentan los intentos con credenciales invalidas: un usuario que ingresa
+# seguido no se bloquea.
+PWA_LOGIN_RATE_LIMIT = {"scope": "pwa_login", "limit": 10, "window_seconds": 300}
+
 
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -69,6 +73,24 @@ class UserLoginViewSet(viewsets.ViewSet):
 
     @extend_schema(request=LoginSerializer)
     def create(self, request):
+        ip = request.META.get("REMOTE_ADDR", "anon")
+        identity = f"{ip}:{request.data.get('username') or ''}"
+        if is_rate_limited(identity=identity, **PWA_LOGIN_RATE_LIMIT):
+            detail = "Demasiados intentos. Intente nuevamente en unos minutos."
+            response = Response(
+                {"detail": detail},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+            registrar_evento_auth(
+                request=request,
+                evento=EVENTO_LOGIN_ERROR,
+                resultado=RESULTADO_ERROR,
+                username_intentado=request.data.get("username"),
+                codigo_respuesta=response.status_code,
+                motivo_error=detail,
+            )
+            return response
+
         serializer = LoginSerializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
@@ -78,6 +100,7 @@ class UserLoginViewSet(viewsets.ViewSet):
                 if isinstance(exc, AuthenticationFailed)
                 else "Credenciales inválidas."
             )
+            hit_rate_limit(identity=identity, **PWA_LOGIN_RATE_LIMIT)
             response = Response(
                 {"detail": detail},
                 status=status.HTTP_401_UNAUTHORIZED,
@@ -12,4 +12,16 @@ class UsersConfig(AppConfig):
             registrar_filtros_favoritos,
         )
 
+        from core.jobs import (  # pylint: disable=import-outside-toplevel
+            registrar_cola_jobs,
+        )
+        from users.services_bulk_credentials_jobs import (  # pylint: disable=import-outside-toplevel
+            BULK_CREDENTIALS_JOB_QUEUE,
+        )
+        from users.services_user_import_jobs import (  # pylint: disable=import-outside-toplevel
+            USER_IMPORT_JOB_QUEUE,
+        )
+
         registrar_filtros_favoritos()
+        registrar_cola_jobs(BULK_CREDENTIALS_JOB_QUEUE)
+        registrar_cola_jobs(USER_IMPORT_JOB_QUEUE)
@@ -15,6 +15,7 @@ from django.utils import timezone
 
 from core.constants import UserGroups
 from core.models import Provincia
+from iam.services import clear_user_permission_caches
 from users.form_catalogs import obtener_queryset_formulario
 from users.models import AccesoComedorPWA, Profile
 from users.services_delegation import effective_delegatable_groups_qs
@@ -867,9 +868,7 @@ class UserCreationForm(
 
     @staticmethod
     def _clear_permission_caches(user):
-        for attr in ("_perm_cache", "_user_perm_cache"):
-            if hasattr(user, attr):
-                delattr(user, attr)
+        clear_user_permission_caches(user)
 
     def _save_atomic(self, commit=True):
         user = super().save(commit=False)
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 
-from users.services_bulk_credentials_jobs import run_bulk_credentials_jobs_worker
+from core.jobs import run_job_worker
+from users.services_bulk_credentials_jobs import BULK_CREDENTIALS_JOB_QUEUE
 
 
 class Command(BaseCommand):
@@ -10,8 +11,11 @@ class Command(BaseCommand):
         parser.add_argument(
             "--once",
             action="store_true",
-            help="Procesa como maximo un lote pendiente y finaliza.",
+            help="Procesa los lotes pendientes y finaliza.",
         )
 
     def handle(self, *args, **options):
-        run_bulk_credentials_jobs_worker(once=bool(options["once"]))
+        run_job_worker(
+            queue_names=[BULK_CREDENTIALS_JOB_QUEUE.name],
+            once=bool(options["once"]),
+        )
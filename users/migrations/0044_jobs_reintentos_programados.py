@@ -0,0 +1,33 @@
+# Generated by Django 5.2.16 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0043_merge_issue_2225_profile_datos_identificatorios"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulkcredentialsjob",
+            name="available_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="bulkcredentialsjob",
+            name="retry_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="userimportjob",
+            name="available_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="userimportjob",
+            name="retry_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,15 +1,182 @@
-from django.core.cache import cache
+"""
+Rate limiting por scope e identidad sobre el cache compartido.
+
+Con el backend Redis del proyecto (``core.cache_backends``) cada chequeo es un
+único script Lua (atómico entre workers) que corre por ``run_script``. Con
+otros backends (LocMemCache en dev/tests) se serializa con un lock de proceso,
+que alcanza porque ese cache tampoco se comparte entre procesos.
+
+``hit_rate_limit`` chequea y registra el intento; ``is_rate_limited`` solo
+chequea, para los endpoints que registran únicamente los intentos fallidos.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+
+ALGORITHM_SLIDING_WINDOW = "sliding_window"
+ALGORITHM_TOKEN_BUCKET = "token_bucket"
+ALGORITHMS = (ALGORITHM_SLIDING_WINDOW, ALGORITHM_TOKEN_BUCKET)
+
+# Ventana deslizante con log de timestamps (ZSET). Solo registra el intento
+# (ARGV[5] = 1) cuando no supera el límite, igual que el contador previo.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now_ms = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now_ms - window_ms)
+if redis.call('ZCARD', key) >= limit then
+    return 1
+end
+if ARGV[5] == '1' then
+    redis.call('ZADD', key, now_ms, ARGV[4])
+    redis.call('PEXPIRE', key, window_ms)
+end
+return 0
+"""
+
+# Token bucket: capacidad ``limit`` y recarga completa en ``window``. Sin
+# registrar (ARGV[4] = 0) solo calcula si queda un token.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local now_ms = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local record = ARGV[4] == '1'
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now_ms
+end
+local elapsed = math.max(0, now_ms - ts)
+tokens = math.min(capacity, tokens + elapsed * capacity / window_ms)
+if tokens < 1 then
+    return 1
+end
+if record then
+    redis.call('HSET', key, 'tokens', tostring(tokens - 1), 'ts', tostring(now_ms))
+    redis.call('PEXPIRE', key, window_ms)
+end
+return 0
+"""
+
+_LOCAL_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Configuración efectiva de un scope de rate limit."""
+
+    limit: int
+    window_seconds: int
+    algorithm: str = ALGORITHM_SLIDING_WINDOW
+
+
+def get_rate_limit_policy(
+    scope: str, *, limit: int, window_seconds: int
+) -> RateLimitPolicy:
+    """
+    Resuelve la política de un scope.
+
+    Los valores del llamador son el default; ``settings.RATE_LIMIT_SCOPES``
+    puede sobreescribir ``limit``, ``window_seconds`` y ``algorithm`` por scope.
+    """
+    overrides = (getattr(settings, "RATE_LIMIT_SCOPES", None) or {}).get(scope) or {}
+    algorithm = overrides.get("algorithm", ALGORITHM_SLIDING_WINDOW)
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo de rate limit desconocido: {algorithm}")
+    return RateLimitPolicy(
+        limit=int(overrides.get("limit", limit)),
+        window_seconds=int(overrides.get("window_seconds", window_seconds)),
+        algorithm=algorithm,
+    )
+
+
+def _build_key(policy: RateLimitPolicy, scope: str, identity: str) -> str:
+    return f"ratelimit:{policy.algorithm}:{scope}:{identity}"
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _hit_redis(cache, key: str, policy: RateLimitPolicy, record: bool) -> bool:
+    window_ms = policy.window_seconds * 1000
+    now_ms = _now_ms()
+    if policy.algorithm == ALGORITHM_TOKEN_BUCKET:
+        script_source = TOKEN_BUCKET_SCRIPT
+        args = [now_ms, window_ms, policy.limit, int(record)]
+    else:
+        script_source = SLIDING_WINDOW_SCRIPT
+        member = f"{now_ms}:{uuid.uuid4().hex}"
+        args = [now_ms, window_ms, policy.limit, member, int(record)]
+    return bool(cache.run_script(script_source, key, args))
+
+
+def _hit_local(cache, key: str, policy: RateLimitPolicy, record: bool) -> bool:
+    now = time.monotonic()
+    window = float(policy.window_seconds)
+    with _LOCAL_LOCK:
+        if policy.algorithm == ALGORITHM_TOKEN_BUCKET:
+            tokens, last = cache.get(key) or (float(policy.limit), now)
+            elapsed = max(0.0, now - last)
+            tokens = min(float(policy.limit), tokens + elapsed * policy.limit / window)
+            if tokens < 1:
+                return True
+            if record:
+                cache.set(key, (tokens - 1, now), timeout=policy.window_seconds)
+            return False
+
+        hits = [ts for ts in cache.get(key, ()) if ts > now - window]
+        if len(hits) >= policy.limit:
+            return True
+        if not record:
+            return False
+        hits.append(now)
+        # El TTL acompaña al intento más viejo vivo: nuevos hits no extienden la
+        # ventana de los anteriores.
+        cache.set(key, hits, timeout=max(1, int(hits[0] + window - now) + 1))
+        return False
+
+
+def _check(*, scope, identity, limit, window_seconds, record) -> bool:
+    identity = (identity or "anon").strip().lower() or "anon"
+    policy = get_rate_limit_policy(scope, limit=limit, window_seconds=window_seconds)
+    cache = caches["default"]
+    key = _build_key(policy, scope, identity)
+    if hasattr(cache, "run_script"):
+        return _hit_redis(cache, key, policy, record)
+    return _hit_local(cache, key, policy, record)
 
 
 def hit_rate_limit(
     *, scope: str, identity: str, limit: int, window_seconds: int
 ) -> bool:
     """Retorna True si supera limite para la identidad dada."""
-    identity = (identity or "anon").strip().lower() or "anon"
-    key = f"ratelimit:{scope}:{identity}"
-    current = cache.get(key, 0)
-    if current >= limit:
-        return True
+    return _check(
+        scope=scope,
+        identity=identity,
+        limit=limit,
+        window_seconds=window_seconds,
+        record=True,
+    )
 
-    cache.set(key, current + 1, timeout=window_seconds)
-    return False
+
+def is_rate_limited(
+    *, scope: str, identity: str, limit: int, window_seconds: int
+) -> bool:
+    """Como ``hit_rate_limit``, pero sin registrar el intento."""
+    return _check(
+        scope=scope,
+        identity=identity,
+        limit=limit,
+        window_seconds=window_seconds,
+        record=False,
+    )
@@ -21,6 +21,12 @@ from django.template.loader import render_to_string
 from django.urls import reverse
 from openpyxl import Workbook, load_workbook
 
+from core.services.mail_delivery import (
+    get_rate_budget,
+    is_connection_error,
+    reused_connection,
+)
+
 User = get_user_model()
 logger = logging.getLogger("django")
 
@@ -422,6 +428,7 @@ def _send_bulk_credentials_email_once(
     entries: list[BulkCredentialEntry],
     login_url: str,
     send_type: str | None = None,
+    connection=None,
 ) -> None:
     send_type_config = get_bulk_credentials_send_type_config(send_type)
     # nombre_del_centro y first_name/last_name del primer entry se exponen al
@@ -445,6 +452,7 @@ def _send_bulk_credentials_email_once(
         from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[recipient_email],
         fail_silently=False,
+        connection=connection,
     )
 
 
@@ -492,7 +500,13 @@ def send_bulk_credentials_email(
     login_url: str,
     send_type: str | None = None,
     max_total_seconds: float | None = None,
+    connection=None,
 ) -> None:
+    """
+    Envia el correo con reintentos. Con ``connection`` se reutiliza una conexion
+    abierta entre filas; si un intento falla por la conexion se cierra para que
+    el siguiente reconecte.
+    """
     if not entries:
         raise ValidationError("No hay credenciales para enviar.")
     timeout_seconds = _get_bulk_credentials_email_attempt_timeout_seconds()
@@ -516,13 +530,17 @@ def send_bulk_credentials_email(
                 max(1, int(remaining_total_seconds)),
             )
 
+        get_rate_budget().acquire()
         try:
             with _mail_send_timeout_guard(attempt_timeout_seconds):
+                if connection is not None:
+                    connection.open()
                 _send_bulk_credentials_email_once(
                     recipient_email=recipient_email,
                     entries=entries,
                     login_url=login_url,
                     send_type=send_type,
+                    connection=connection,
                 )
             return
         except (
@@ -532,6 +550,8 @@ def send_bulk_credentials_email(
             OSError,
         ) as exc:
             last_error = exc
+            if connection is not None and is_connection_error(exc):
+                connection.close()
             logger.warning(
                 (
                     "Fallo enviando credenciales por correo. "
@@ -665,6 +685,7 @@ def process_bulk_credentials_group(
     send_type_config: BulkCredentialsSendTypeConfig,
     login_url: str,
     max_total_seconds: float | None = None,
+    connection=None,
 ) -> list[dict[str, object]]:
     """Envía un único correo con las credenciales de todas las filas del grupo.
 
@@ -696,6 +717,7 @@ def process_bulk_credentials_group(
             login_url=login_url,
             send_type=send_type_config.key,
             max_total_seconds=max_total_seconds,
+            connection=connection,
         )
 
     grouped = len(resolved) > 1
@@ -865,90 +887,93 @@ def process_bulk_credentials_file(  # pylint: disable=too-many-locals,too-many-b
     handled_indices: set[int] = set()
     recipient_cache = _build_recipient_cache(rows)
 
-    for row_index, _row in enumerate(rows):
-        if row_index in handled_indices:
-            continue
-        if not _has_enough_batch_time(processing_deadline):
-            timeout_message = _get_batch_timeout_message()
-            for pending_index in range(row_index, len(rows)):
-                if pending_index in handled_indices:
-                    continue
-                pending_row = rows[pending_index]
-                summary["procesadas"] += 1
-                summary["rechazadas"] += 1
-                results_by_index[pending_index] = {
-                    "fila": pending_row.fila,
-                    "usuario": pending_row.usuario,
-                    "mail_destino": pending_row.mail,
-                    "estado": "rechazada",
-                    "mensaje": timeout_message,
-                    "password_actualizada": False,
-                }
-                handled_indices.add(pending_index)
-            break
-
-        group_indices, _recipient = _collect_group_indices(
-            rows=rows,
-            start_index=row_index,
-            send_type_config=send_type_config,
-            skip_indices=handled_indices,
-            recipient_cache=recipient_cache,
-        )
-        group_rows = [rows[i] for i in group_indices]
-
-        try:
-            group_results = process_bulk_credentials_group(
-                rows=group_rows,
+    # Una sola conexion SMTP para todo el archivo en lugar de una por correo.
+    with reused_connection() as connection:
+        for row_index, _row in enumerate(rows):
+            if row_index in handled_indices:
+                continue
+            if not _has_enough_batch_time(processing_deadline):
+                timeout_message = _get_batch_timeout_message()
+                for pending_index in range(row_index, len(rows)):
+                    if pending_index in handled_indices:
+                        continue
+                    pending_row = rows[pending_index]
+                    summary["procesadas"] += 1
+                    summary["rechazadas"] += 1
+                    results_by_index[pending_index] = {
+                        "fila": pending_row.fila,
+                        "usuario": pending_row.usuario,
+                        "mail_destino": pending_row.mail,
+                        "estado": "rechazada",
+                        "mensaje": timeout_message,
+                        "password_actualizada": False,
+                    }
+                    handled_indices.add(pending_index)
+                break
+
+            group_indices, _recipient = _collect_group_indices(
+                rows=rows,
+                start_index=row_index,
                 send_type_config=send_type_config,
-                login_url=login_url,
-                max_total_seconds=_get_remaining_processing_seconds(
-                    processing_deadline
-                ),
-            )
-            for idx, group_result in zip(group_indices, group_results):
-                summary["procesadas"] += 1
-                if group_result.get("password_actualizada"):
-                    summary["actualizadas"] += 1
-                else:
-                    summary["sin_cambios"] += 1
-                summary["enviadas"] += 1
-                results_by_index[idx] = group_result
-                handled_indices.add(idx)
-        except ValidationError as exc:
-            message = build_bulk_credentials_error_message(exc)
-            for idx in group_indices:
-                fail_row = rows[idx]
-                summary["procesadas"] += 1
-                summary["rechazadas"] += 1
-                results_by_index[idx] = {
-                    "fila": fail_row.fila,
-                    "usuario": fail_row.usuario,
-                    "mail_destino": fail_row.mail,
-                    "estado": "rechazada",
-                    "mensaje": message,
-                    "password_actualizada": False,
-                }
-                handled_indices.add(idx)
-        except Exception as exc:
-            message = build_bulk_credentials_error_message(exc)
-            logger.exception(
-                "Fallo procesando envio masivo de credenciales. tipo=%s filas=%s",
-                send_type_config.key,
-                [rows[i].fila for i in group_indices],
+                skip_indices=handled_indices,
+                recipient_cache=recipient_cache,
             )
-            for idx in group_indices:
-                fail_row = rows[idx]
-                summary["procesadas"] += 1
-                summary["rechazadas"] += 1
-                results_by_index[idx] = {
-                    "fila": fail_row.fila,
-                    "usuario": fail_row.usuario,
-                    "mail_destino": fail_row.mail,
-                    "estado": "rechazada",
-                    "mensaje": message,
-                    "password_actualizada": False,
-                }
-                handled_indices.add(idx)
+            group_rows = [rows[i] for i in group_indices]
+
+            try:
+                group_results = process_bulk_credentials_group(
+                    rows=group_rows,
+                    send_type_config=send_type_config,
+                    login_url=login_url,
+                    max_total_seconds=_get_remaining_processing_seconds(
+                        processing_deadline
+                    ),
+                    connection=connection,
+                )
+                for idx, group_result in zip(group_indices, group_results):
+                    summary["procesadas"] += 1
+                    if group_result.get("password_actualizada"):
+                        summary["actualizadas"] += 1
+                    else:
+                        summary["sin_cambios"] += 1
+                    summary["enviadas"] += 1
+                    results_by_index[idx] = group_result
+                    handled_indices.add(idx)
+            except ValidationError as exc:
+                message = build_bulk_credentials_error_message(exc)
+                for idx in group_indices:
+                    fail_row = rows[idx]
+                    summary["procesadas"] += 1
+                    summary["rechazadas"] += 1
+                    results_by_index[idx] = {
+                        "fila": fail_row.fila,
+                        "usuario": fail_row.usuario,
+                        "mail_destino": fail_row.mail,
+                        "estado": "rechazada",
+                        "mensaje": message,
+                        "password_actualizada": False,
+                    }
+                    handled_indices.add(idx)
+            except Exception as exc:
+                message = build_bulk_credentials_error_message(exc)
+                logger.exception(
+                    "Fallo procesando envio masivo de credenciales. tipo=%s filas=%s",
+                    send_type_config.key,
+                    [rows[i].fila for i in group_indices],
+                )
+                for idx in group_indices:
+                    fail_row = rows[idx]
+                    summary["procesadas"] += 1
+                    summary["rechazadas"] += 1
+                    results_by_index[idx] = {
+                        "fila": fail_row.fila,
+                        "usuario": fail_row.usuario,
+                        "mail_destino": fail_row.mail,
+                        "estado": "rechazada",
+                        "mensaje": message,
+                        "password_actualizada": False,
+                    }
+                    handled_indices.add(idx)
 
     for idx in range(len(rows)):
         if idx in results_by_index:
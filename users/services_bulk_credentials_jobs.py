@@ -2,14 +2,13 @@ from __future__ import annotations
 
 import logging
 import os
-import time
-from datetime import timedelta
 
 from django.core.exceptions import ValidationError
-from django.db import OperationalError, models
 from django.http import Http404
 from django.utils import timezone
 
+from core.jobs import JobQueue, claim_next_job
+from core.services.mail_delivery import reused_connection
 from users.models import BulkCredentialsJob, BulkCredentialsJobRow
 from users.services_bulk_credentials import (
     _build_login_url,
@@ -25,10 +24,6 @@ from users.services_bulk_credentials import (
 logger = logging.getLogger("django")
 DEFAULT_BULK_CREDENTIALS_JOB_POLL_SECONDS = 2
 DEFAULT_BULK_CREDENTIALS_JOB_STALE_SECONDS = 900
-STALE_JOB_ERROR_MESSAGE = (
-    "El lote se interrumpio antes de finalizar. "
-    "Puede reanudarlo desde la ultima fila pendiente."
-)
 
 
 def _safe_positive_int(value, default: int) -> int:
@@ -118,59 +113,9 @@ def request_resume_bulk_credentials_job(
     return job
 
 
-def mark_stale_bulk_credentials_jobs_as_failed() -> int:
-    stale_threshold = timezone.now() - timedelta(
-        seconds=get_bulk_credentials_job_stale_seconds()
-    )
-    stale_jobs = BulkCredentialsJob.objects.filter(
-        status=BulkCredentialsJob.Status.PROCESSING,
-    ).filter(
-        models.Q(last_activity_at__isnull=True)
-        | models.Q(last_activity_at__lt=stale_threshold)
-    )
-    updated_count = 0
-    for job in stale_jobs.iterator():
-        job.status = BulkCredentialsJob.Status.FAILED
-        job.last_error_message = STALE_JOB_ERROR_MESSAGE
-        job.last_error_at = timezone.now()
-        job.finished_at = timezone.now()
-        job.save(
-            update_fields=[
-                "status",
-                "last_error_message",
-                "last_error_at",
-                "finished_at",
-            ]
-        )
-        updated_count += 1
-    return updated_count
-
-
 def claim_next_bulk_credentials_job() -> BulkCredentialsJob | None:
-    candidate_ids = list(
-        BulkCredentialsJob.objects.filter(status=BulkCredentialsJob.Status.PENDING)
-        .order_by("requested_at", "id")
-        .values_list("id", flat=True)[:20]
-    )
-    now = timezone.now()
-    for job_id in candidate_ids:
-        updated = BulkCredentialsJob.objects.filter(
-            pk=job_id,
-            status=BulkCredentialsJob.Status.PENDING,
-        ).update(
-            status=BulkCredentialsJob.Status.PROCESSING,
-            finished_at=None,
-            last_activity_at=now,
-        )
-        if not updated:
-            continue
-
-        job = BulkCredentialsJob.objects.get(pk=job_id)
-        if not job.started_at:
-            job.started_at = now
-            job.save(update_fields=["started_at"])
-        return job
-    return None
+    """Reclama el próximo lote pendiente con el motor compartido de jobs."""
+    return claim_next_job(BULK_CREDENTIALS_JOB_QUEUE)
 
 
 def _row_contribution(status: str | None, password_updated: bool) -> dict[str, int]:
@@ -603,122 +548,110 @@ def process_bulk_credentials_job(  # pylint: disable=too-many-locals,too-many-re
 
     recipient_cache = _build_recipient_cache(rows)
 
-    for row_index in range(job.next_row_index, total_rows):
-        row = rows[row_index]
-        _start_job_row_attempt(job=job, row_index=row_index, row=row)
-        row_log, old_status, old_password_updated = _get_job_row_log(job=job, row=row)
-
-        if row_log.status == BulkCredentialsJobRow.Status.SENT:
-            # Ya enviada por un agrupamiento anterior; solo avanzo el puntero.
-            job = _advance_job_pointer(
-                job=job, row_index=row_index, total_rows=total_rows
+    # Una sola conexion SMTP para todo el lote en lugar de una por correo.
+    with reused_connection() as connection:
+        for row_index in range(job.next_row_index, total_rows):
+            row = rows[row_index]
+            _start_job_row_attempt(job=job, row_index=row_index, row=row)
+            row_log, old_status, old_password_updated = _get_job_row_log(
+                job=job, row=row
             )
-            if job.status == BulkCredentialsJob.Status.COMPLETED:
-                return job
-            continue
-
-        row_state = _build_row_processing_state(
-            row_log=row_log,
-            old_status=old_status,
-            old_password_updated=old_password_updated,
-        )
 
-        fresh_indices, group_rows = _select_group_for_row(
-            job=job,
-            rows=rows,
-            row_index=row_index,
-            send_type_config=send_type_config,
-            recipient_cache=recipient_cache,
-            primary_attempts=row_log.attempts,
-        )
+            if row_log.status == BulkCredentialsJobRow.Status.SENT:
+                # Ya enviada por un agrupamiento anterior; solo avanzo el puntero.
+                job = _advance_job_pointer(
+                    job=job, row_index=row_index, total_rows=total_rows
+                )
+                if job.status == BulkCredentialsJob.Status.COMPLETED:
+                    return job
+                continue
 
-        try:
-            results = process_bulk_credentials_group(
-                rows=group_rows,
-                send_type_config=send_type_config,
-                login_url=login_url,
-                max_total_seconds=None,
+            row_state = _build_row_processing_state(
+                row_log=row_log,
+                old_status=old_status,
+                old_password_updated=old_password_updated,
             )
-        except ValidationError as exc:
-            return _record_row_failure(
-                job=job,
-                row=row,
-                row_state=row_state,
-                message=build_bulk_credentials_error_message(exc),
-            )
-        except Exception as exc:
-            logger.exception(
-                (
-                    "Fallo inesperado procesando lote de credenciales. "
-                    "job_id=%s fila=%s usuario=%s"
-                ),
-                job.id,
-                row.fila,
-                row.usuario,
-            )
-            return _record_row_failure(
+
+            fresh_indices, group_rows = _select_group_for_row(
                 job=job,
-                row=row,
-                row_state=row_state,
-                message=build_bulk_credentials_error_message(exc),
+                rows=rows,
+                row_index=row_index,
+                send_type_config=send_type_config,
+                recipient_cache=recipient_cache,
+                primary_attempts=row_log.attempts,
             )
 
-        for fresh_idx, result in zip(fresh_indices, results):
-            fresh_row = rows[fresh_idx]
-            if fresh_idx == row_index:
-                _persist_grouped_row_success(
-                    job=job, row=fresh_row, row_state=row_state, result=result
+            try:
+                results = process_bulk_credentials_group(
+                    rows=group_rows,
+                    send_type_config=send_type_config,
+                    login_url=login_url,
+                    max_total_seconds=None,
+                    connection=connection,
+                )
+            except ValidationError as exc:
+                return _record_row_failure(
+                    job=job,
+                    row=row,
+                    row_state=row_state,
+                    message=build_bulk_credentials_error_message(exc),
+                )
+            except Exception as exc:
+                logger.exception(
+                    (
+                        "Fallo inesperado procesando lote de credenciales. "
+                        "job_id=%s fila=%s usuario=%s"
+                    ),
+                    job.id,
+                    row.fila,
+                    row.usuario,
+                )
+                return _record_row_failure(
+                    job=job,
+                    row=row,
+                    row_state=row_state,
+                    message=build_bulk_credentials_error_message(exc),
                 )
-                continue
-            other_log, other_old_status, other_old_password = _get_job_row_log(
-                job=job, row=fresh_row
-            )
-            other_state = _build_row_processing_state(
-                row_log=other_log,
-                old_status=other_old_status,
-                old_password_updated=other_old_password,
-            )
-            _persist_grouped_row_success(
-                job=job, row=fresh_row, row_state=other_state, result=result
-            )
-
-        job = _advance_job_pointer(job=job, row_index=row_index, total_rows=total_rows)
-        if job.status == BulkCredentialsJob.Status.COMPLETED:
-            return job
 
-    return job
+            for fresh_idx, result in zip(fresh_indices, results):
+                fresh_row = rows[fresh_idx]
+                if fresh_idx == row_index:
+                    _persist_grouped_row_success(
+                        job=job, row=fresh_row, row_state=row_state, result=result
+                    )
+                    continue
+                other_log, other_old_status, other_old_password = _get_job_row_log(
+                    job=job, row=fresh_row
+                )
+                other_state = _build_row_processing_state(
+                    row_log=other_log,
+                    old_status=other_old_status,
+                    old_password_updated=other_old_password,
+                )
+                _persist_grouped_row_success(
+                    job=job, row=fresh_row, row_state=other_state, result=result
+                )
 
+            job = _advance_job_pointer(
+                job=job, row_index=row_index, total_rows=total_rows
+            )
+            if job.status == BulkCredentialsJob.Status.COMPLETED:
+                return job
 
-def process_next_bulk_credentials_job() -> bool:
-    try:
-        mark_stale_bulk_credentials_jobs_as_failed()
-        job = claim_next_bulk_credentials_job()
-    except OperationalError:
-        logger.exception(
-            "No se pudieron consultar lotes pendientes de credenciales masivas."
-        )
-        return False
+        return job
 
-    if not job:
-        return False
 
-    process_bulk_credentials_job(job)
-    return True
+def _fail_bulk_credentials_job(job: BulkCredentialsJob, message: str) -> None:
+    _record_job_level_failure(job=job, message=message)
 
 
-def run_bulk_credentials_jobs_worker(*, once: bool = False) -> None:
-    poll_seconds = get_bulk_credentials_job_poll_seconds()
-    while True:
-        try:
-            processed_job = process_next_bulk_credentials_job()
-        except Exception:
-            logger.exception("Fallo inesperado en el worker de credenciales masivas.")
-            if once:
-                raise
-            time.sleep(poll_seconds)
-            continue
-        if once:
-            return
-        if processed_job:
-            continue
-        time.sleep(poll_seconds)
+BULK_CREDENTIALS_JOB_QUEUE = JobQueue(
+    name="bulk_credentials",
+    model=BulkCredentialsJob,
+    process=process_bulk_credentials_job,
+    fail=_fail_bulk_credentials_job,
+    get_stale_seconds=get_bulk_credentials_job_stale_seconds,
+    get_poll_seconds=get_bulk_credentials_job_poll_seconds,
+    # Reintentar podría reenviar correos ya despachados: falla al primer error.
+    max_retries=0,
+)
@@ -2,14 +2,12 @@ from __future__ import annotations
 
 import logging
 import os
-import time
-from datetime import timedelta
 
 from django.core.exceptions import ValidationError
-from django.db import OperationalError, models
 from django.http import Http404
 from django.utils import timezone
 
+from core.jobs import JobQueue, claim_next_job
 from users.models import UserImportJob, UserImportJobRow
 from users.services_user_import import (
     build_user_import_error_message,
@@ -21,10 +19,6 @@ from users.services_user_import import (
 logger = logging.getLogger("django")
 DEFAULT_USER_IMPORT_JOB_POLL_SECONDS = 2
 DEFAULT_USER_IMPORT_JOB_STALE_SECONDS = 900
-STALE_JOB_ERROR_MESSAGE = (
-    "El lote se interrumpio antes de finalizar. "
-    "Puede reanudarlo desde la ultima fila pendiente."
-)
 
 
 def _safe_positive_int(value, default: int) -> int:
@@ -96,59 +90,9 @@ def request_resume_user_import_job(*, job: UserImportJob) -> UserImportJob:
     return job
 
 
-def mark_stale_user_import_jobs_as_failed() -> int:
-    stale_threshold = timezone.now() - timedelta(
-        seconds=get_user_import_job_stale_seconds()
-    )
-    stale_jobs = UserImportJob.objects.filter(
-        status=UserImportJob.Status.PROCESSING,
-    ).filter(
-        models.Q(last_activity_at__isnull=True)
-        | models.Q(last_activity_at__lt=stale_threshold)
-    )
-    updated_count = 0
-    for job in stale_jobs.iterator():
-        job.status = UserImportJob.Status.FAILED
-        job.last_error_message = STALE_JOB_ERROR_MESSAGE
-        job.last_error_at = timezone.now()
-        job.finished_at = timezone.now()
-        job.save(
-            update_fields=[
-                "status",
-                "last_error_message",
-                "last_error_at",
-                "finished_at",
-            ]
-        )
-        updated_count += 1
-    return updated_count
-
-
 def claim_next_user_import_job() -> UserImportJob | None:
-    candidate_ids = list(
-        UserImportJob.objects.filter(status=UserImportJob.Status.PENDING)
-        .order_by("requested_at", "id")
-        .values_list("id", flat=True)[:20]
-    )
-    now = timezone.now()
-    for job_id in candidate_ids:
-        updated = UserImportJob.objects.filter(
-            pk=job_id,
-            status=UserImportJob.Status.PENDING,
-        ).update(
-            status=UserImportJob.Status.PROCESSING,
-            finished_at=None,
-            last_activity_at=now,
-        )
-        if not updated:
-            continue
-
-        job = UserImportJob.objects.get(pk=job_id)
-        if not job.started_at:
-            job.started_at = now
-            job.save(update_fields=["started_at"])
-        return job
-    return None
+    """Reclama el próximo lote pendiente con el motor compartido de jobs."""
+    return claim_next_job(USER_IMPORT_JOB_QUEUE)
 
 
 def _load_job_rows(job: UserImportJob) -> list[dict] | None:
@@ -483,38 +427,17 @@ def process_user_import_job(job: UserImportJob) -> UserImportJob:
     return job
 
 
-def process_next_user_import_job() -> bool:
-    try:
-        mark_stale_user_import_jobs_as_failed()
-        job = claim_next_user_import_job()
-    except OperationalError:
-        logger.exception(
-            "No se pudieron consultar lotes pendientes de importacion de usuarios."
-        )
-        return False
-
-    if not job:
-        return False
-
-    process_user_import_job(job)
-    return True
+def _fail_user_import_job(job: UserImportJob, message: str) -> None:
+    _record_job_level_failure(job=job, message=message)
 
 
-def run_user_import_jobs_worker(*, once: bool = False) -> None:
-    poll_seconds = get_user_import_job_poll_seconds()
-    while True:
-        try:
-            processed_job = process_next_user_import_job()
-        except Exception:
-            logger.exception(
-                "Fallo inesperado en el worker de importacion de usuarios."
-            )
-            if once:
-                raise
-            time.sleep(poll_seconds)
-            continue
-        if once:
-            return
-        if processed_job:
-            continue
-        time.sleep(poll_seconds)
+USER_IMPORT_JOB_QUEUE = JobQueue(
+    name="user_import",
+    model=UserImportJob,
+    process=process_user_import_job,
+    fail=_fail_user_import_job,
+    get_stale_seconds=get_user_import_job_stale_seconds,
+    get_poll_seconds=get_user_import_job_poll_seconds,
+    # Reintentar podría reenviar correos ya despachados: falla al primer error.
+    max_retries=0,
+)